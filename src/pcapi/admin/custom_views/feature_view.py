@@ -1,4 +1,5 @@
 from pcapi.admin.base_configuration import BaseAdminView
+from pcapi.repository import feature_queries
 
 
 class FeatureView(BaseAdminView):
@@ -6,3 +7,7 @@ class FeatureView(BaseAdminView):
     column_list = ["name", "description", "isActive"]
     column_labels = dict(name="Nom", description="Description", isActive="Activé")
     form_columns = ["isActive"]
+
+    def after_model_change(self, form, model, is_created):
+        super().after_model_change(form, model, is_created)
+        feature_queries.invalidate_features_cache()
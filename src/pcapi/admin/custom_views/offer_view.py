@@ -29,6 +29,7 @@ class OfferView(BaseAdminView):
     form_columns = ["criteria"]
 
     def on_model_change(self, form: Form, offer: Offer, is_created: bool = False) -> None:
+        redis.delete_offer_response(client=app.redis_client, offer_id=offer.id)
         redis.add_offer_id(client=app.redis_client, offer_id=offer.id)
 
 
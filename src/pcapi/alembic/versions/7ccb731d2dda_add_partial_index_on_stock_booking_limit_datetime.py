@@ -0,0 +1,30 @@
+"""Add partial index on stock.bookingLimitDatetime for stocks that are not soft deleted
+
+Revision ID: 7ccb731d2dda
+Revises: b00c0a0dec8f
+Create Date: 2021-02-25 10:12:43.517204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "7ccb731d2dda"
+down_revision = "b00c0a0dec8f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("COMMIT")  # Close the automatically opened transaction so we can create/drop indexes "concurrently"
+    op.execute(
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS "idx_stock_bookingLimitDatetime_not_soft_deleted"
+        ON stock ("bookingLimitDatetime") WHERE NOT "isSoftDeleted";
+        """
+    )
+
+
+def downgrade():
+    op.execute("COMMIT")  # Close the automatically opened transaction so we can create/drop indexes "concurrently"
+    op.execute("""DROP INDEX CONCURRENTLY IF EXISTS "idx_stock_bookingLimitDatetime_not_soft_deleted";""")
@@ -0,0 +1,142 @@
+"""Add wallet_ledger, maintained by a trigger on booking, and read it in get_wallet_balance
+
+Revision ID: a1f7c93e5d42
+Revises: 7ccb731d2dda
+Create Date: 2021-03-01 10:21:37.402718
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a1f7c93e5d42"
+down_revision = "7ccb731d2dda"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "wallet_ledger",
+        sa.Column("id", sa.BigInteger, primary_key=True, autoincrement=True),
+        sa.Column("userId", sa.BigInteger, sa.ForeignKey("user.id", ondelete="CASCADE"), unique=True, nullable=False),
+        sa.Column("bookedAmount", sa.Numeric(10, 2), nullable=False, server_default="0"),
+        sa.Column("usedAmount", sa.Numeric(10, 2), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+    CREATE OR REPLACE FUNCTION add_to_wallet_ledger(user_id BIGINT, booked_amount NUMERIC, used_amount NUMERIC)
+    RETURNS VOID AS $$
+    BEGIN
+        INSERT INTO wallet_ledger ("userId", "bookedAmount", "usedAmount")
+        VALUES (user_id, booked_amount, used_amount)
+        ON CONFLICT ("userId") DO UPDATE
+        SET "bookedAmount" = wallet_ledger."bookedAmount" + EXCLUDED."bookedAmount",
+            "usedAmount" = wallet_ledger."usedAmount" + EXCLUDED."usedAmount";
+    END; $$
+    LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION update_wallet_ledger()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') AND NOT OLD."isCancelled" THEN
+            PERFORM add_to_wallet_ledger(
+                OLD."userId",
+                -OLD.amount * OLD.quantity,
+                CASE WHEN OLD."isUsed" THEN -OLD.amount * OLD.quantity ELSE 0 END
+            );
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NOT NEW."isCancelled" THEN
+            PERFORM add_to_wallet_ledger(
+                NEW."userId",
+                NEW.amount * NEW.quantity,
+                CASE WHEN NEW."isUsed" THEN NEW.amount * NEW.quantity ELSE 0 END
+            );
+        END IF;
+        RETURN NULL;
+    END; $$
+    LANGUAGE plpgsql;
+        """
+    )
+    # Bookings are locked from the creation of the trigger until the end of
+    # the backfill, so that no booking is counted twice or missed.
+    op.execute("LOCK TABLE booking IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        """
+    CREATE TRIGGER booking_ledger_update
+    AFTER INSERT
+    OR UPDATE OF quantity, amount, "isCancelled", "isUsed", "userId"
+    OR DELETE
+    ON booking
+    FOR EACH ROW EXECUTE PROCEDURE update_wallet_ledger();
+
+    INSERT INTO wallet_ledger ("userId", "bookedAmount", "usedAmount")
+    SELECT "userId", SUM(amount * quantity), SUM(CASE WHEN "isUsed" THEN amount * quantity ELSE 0 END)
+    FROM booking
+    WHERE NOT "isCancelled"
+    GROUP BY "userId";
+
+    CREATE OR REPLACE FUNCTION get_wallet_balance(user_id BIGINT, only_used_bookings BOOLEAN)
+    RETURNS NUMERIC(10,2) AS $$
+    DECLARE
+        sum_deposits NUMERIC ;
+        sum_bookings NUMERIC ;
+    BEGIN
+        SELECT COALESCE(SUM(amount), 0)
+        INTO sum_deposits
+        FROM deposit
+        WHERE "userId"=user_id
+        AND ("expirationDate" > now() OR "expirationDate" IS NULL);
+
+        SELECT CASE only_used_bookings WHEN true THEN "usedAmount" ELSE "bookedAmount" END
+        INTO sum_bookings
+        FROM wallet_ledger
+        WHERE "userId"=user_id;
+
+        RETURN (sum_deposits - COALESCE(sum_bookings, 0));
+    END; $$
+    LANGUAGE plpgsql;
+        """
+    )
+
+
+def downgrade():
+    op.execute(
+        """
+    CREATE OR REPLACE FUNCTION get_wallet_balance(user_id BIGINT, only_used_bookings BOOLEAN)
+    RETURNS NUMERIC(10,2) AS $$
+    DECLARE
+        sum_deposits NUMERIC ;
+        sum_bookings NUMERIC ;
+    BEGIN
+        SELECT COALESCE(SUM(amount), 0)
+        INTO sum_deposits
+        FROM deposit
+        WHERE "userId"=user_id
+        AND ("expirationDate" > now() OR "expirationDate" IS NULL);
+
+        CASE
+            only_used_bookings
+        WHEN true THEN
+            SELECT COALESCE(SUM(amount * quantity), 0)
+            INTO sum_bookings
+            FROM booking
+            WHERE "userId"=user_id AND NOT "isCancelled" AND "isUsed" = true;
+        WHEN false THEN
+            SELECT COALESCE(SUM(amount * quantity), 0)
+            INTO sum_bookings
+            FROM booking
+            WHERE "userId"=user_id AND NOT "isCancelled";
+        END CASE;
+
+        RETURN (sum_deposits - sum_bookings);
+    END; $$
+    LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS booking_ledger_update ON booking;
+    DROP FUNCTION IF EXISTS update_wallet_ledger();
+    DROP FUNCTION IF EXISTS add_to_wallet_ledger(BIGINT, NUMERIC, NUMERIC);
+        """
+    )
+    op.drop_table("wallet_ledger")
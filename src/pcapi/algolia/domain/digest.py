@@ -0,0 +1,14 @@
+import hashlib
+import json
+from typing import Dict
+
+
+def compute_object_digest(object_to_index: Dict) -> str:
+    serialized_object = json.dumps(object_to_index, sort_keys=True, default=str)
+    return hashlib.blake2b(serialized_object.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def has_object_changed(object_digest: str, indexed_offer_details: Dict) -> bool:
+    # Offers indexed before digests were stored have no digest and are
+    # considered as changed, so that they get one on their next indexation.
+    return indexed_offer_details.get("digest") != object_digest
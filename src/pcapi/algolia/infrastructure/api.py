@@ -1,24 +1,31 @@
+from functools import lru_cache
+import os
 from typing import Dict
 from typing import List
 
-from algoliasearch.search_client import SearchClient
-from algoliasearch.search_index import SearchIndex
-
 from pcapi import settings
-
-
-def init_connection() -> SearchIndex:
-    client = SearchClient.create(settings.ALGOLIA_APPLICATION_ID, settings.ALGOLIA_API_KEY)
-    return client.init_index(settings.ALGOLIA_INDEX_NAME)
+from pcapi.algolia.infrastructure.backends.base import BaseBackend
+from pcapi.utils.module_loading import import_string
 
 
 def add_objects(objects: List[Dict]) -> None:
-    init_connection().save_objects(objects)
+    _get_backend(settings.ALGOLIA_BACKEND).save_objects(objects)
 
 
 def delete_objects(object_ids: List[str]) -> None:
-    init_connection().delete_objects(object_ids)
+    _get_backend(settings.ALGOLIA_BACKEND).delete_objects(object_ids)
 
 
 def clear_index() -> None:
-    init_connection().clear_objects()
+    _get_backend(settings.ALGOLIA_BACKEND).clear_objects()
+
+
+@lru_cache(maxsize=None)
+def _get_backend(backend_path: str) -> BaseBackend:
+    # Backends are instantiated once per process so that the underlying
+    # HTTP session (and its TLS connections) is reused between calls.
+    return import_string(backend_path)()
+
+
+# A forked process must not share the HTTP session of its parent
+os.register_at_fork(after_in_child=_get_backend.cache_clear)
@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+from typing import Dict
+from typing import Iterator
+from typing import List
+
+from algoliasearch.search_client import SearchClient
+
+from pcapi import settings
+
+from .base import BaseBackend
+
+
+class AlgoliaBackend(BaseBackend):
+    """A backend that keeps a single Algolia client, hence a single HTTP
+    session, for the lifetime of the process.
+    """
+
+    def __init__(self):
+        super().__init__()
+        client = SearchClient.create(settings.ALGOLIA_APPLICATION_ID, settings.ALGOLIA_API_KEY)
+        self.index = client.init_index(settings.ALGOLIA_INDEX_NAME)
+
+    def save_objects(self, objects: List[Dict]) -> None:
+        batches = list(
+            split_into_batches(
+                objects,
+                max_objects=settings.ALGOLIA_SAVE_OBJECTS_BATCH_SIZE,
+                max_bytes=settings.ALGOLIA_SAVE_OBJECTS_BATCH_MAX_BYTES,
+            )
+        )
+        if len(batches) <= 1 or settings.ALGOLIA_SAVE_OBJECTS_CONCURRENCY <= 1:
+            for batch in batches:
+                self.index.save_objects(batch)
+            return
+
+        with ThreadPoolExecutor(max_workers=settings.ALGOLIA_SAVE_OBJECTS_CONCURRENCY) as executor:
+            futures = [executor.submit(self.index.save_objects, batch) for batch in batches]
+            for future in futures:
+                future.result()
+
+    def delete_objects(self, object_ids: List[str]) -> None:
+        self.index.delete_objects(object_ids)
+
+    def clear_objects(self) -> None:
+        self.index.clear_objects()
+
+
+def split_into_batches(objects: List[Dict], max_objects: int, max_bytes: int) -> Iterator[List[Dict]]:
+    batch = []
+    batch_bytes = 0
+    for object_to_index in objects:
+        object_bytes = len(json.dumps(object_to_index, default=str).encode("utf-8"))
+        if batch and (len(batch) >= max_objects or batch_bytes + object_bytes > max_bytes):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(object_to_index)
+        batch_bytes += object_bytes
+    if batch:
+        yield batch
@@ -0,0 +1,13 @@
+from typing import Dict
+from typing import List
+
+
+class BaseBackend:
+    def save_objects(self, objects: List[Dict]) -> None:
+        raise NotImplementedError()
+
+    def delete_objects(self, object_ids: List[str]) -> None:
+        raise NotImplementedError()
+
+    def clear_objects(self) -> None:
+        raise NotImplementedError()
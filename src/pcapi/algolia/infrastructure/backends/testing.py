@@ -0,0 +1,22 @@
+from typing import Dict
+from typing import List
+
+from .. import testing
+from .base import BaseBackend
+
+
+class TestingBackend(BaseBackend):
+    """A backend that stores objects in a global Python dict that is
+    accessible from tests.
+    """
+
+    def save_objects(self, objects: List[Dict]) -> None:
+        for object_to_index in objects:
+            testing.indexed_objects[object_to_index["objectID"]] = object_to_index
+
+    def delete_objects(self, object_ids: List[str]) -> None:
+        for object_id in object_ids:
+            testing.indexed_objects.pop(object_id, None)
+
+    def clear_objects(self) -> None:
+        testing.indexed_objects.clear()
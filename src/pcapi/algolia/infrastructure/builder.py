@@ -1,9 +1,20 @@
 from datetime import datetime
+from decimal import Decimal
 from typing import Dict
+from typing import List
+from typing import Optional
 
+from pcapi import settings
+from pcapi.models import Mediation
 from pcapi.models import Offer
+from pcapi.models import Product
+from pcapi.models.offer_type import ALL_OFFER_TYPES_DICT
+from pcapi.models.offer_type import CATEGORIES_LABEL_DICT
+from pcapi.models.offer_type import ProductType
+from pcapi.repository import offer_queries
 from pcapi.utils.date import get_time_in_seconds_from_datetime
 from pcapi.utils.human_ids import humanize
+from pcapi.utils.string_processing import get_model_plural_name
 
 
 DEFAULT_LONGITUDE_FOR_NUMERIC_OFFER = 2.409289
@@ -13,49 +24,143 @@ DEFAULT_LATITUDE_FOR_NUMERIC_OFFER = 47.158459
 def build_object(offer: Offer) -> Dict:
     venue = offer.venue
     offerer = venue.managingOfferer
-    humanize_offer_id = humanize(offer.id)
-    has_coordinates = venue.latitude is not None and venue.longitude is not None
-    author = offer.extraData and offer.extraData.get("author")
-    stage_director = offer.extraData and offer.extraData.get("stageDirector")
-    visa = offer.extraData and offer.extraData.get("visa")
-    isbn = offer.extraData and offer.extraData.get("isbn")
-    speaker = offer.extraData and offer.extraData.get("speaker")
-    performer = offer.extraData and offer.extraData.get("performer")
-    show_type = offer.extraData and offer.extraData.get("showType")
-    show_sub_type = offer.extraData and offer.extraData.get("showSubType")
-    music_type = offer.extraData and offer.extraData.get("musicType")
-    music_sub_type = offer.extraData and offer.extraData.get("musicSubType")
-    prices = map(lambda stock: stock.price, offer.bookableStocks)
-    prices_sorted = sorted(prices, key=float)
+    bookable_stocks = offer.bookableStocks
+
+    return _build_object_to_index(
+        offer_id=offer.id,
+        offer_date_created=offer.dateCreated,
+        offer_description=offer.description,
+        offer_extra_data=offer.extraData,
+        offer_is_digital=offer.isDigital,
+        offer_is_duo=offer.isDuo,
+        offer_name=offer.name,
+        offer_thumb_url=offer.thumbUrl,
+        offer_type=offer.type,
+        offer_withdrawal_details=offer.withdrawalDetails,
+        offerer_name=offerer.name,
+        stocks_beginning_datetimes=[stock.beginningDatetime for stock in bookable_stocks],
+        stocks_dates_created=[stock.dateCreated for stock in bookable_stocks],
+        stocks_prices=[stock.price for stock in bookable_stocks],
+        tags=[criterion.name for criterion in offer.criteria],
+        venue_city=venue.city,
+        venue_departement_code=venue.departementCode,
+        venue_latitude=venue.latitude,
+        venue_longitude=venue.longitude,
+        venue_name=venue.name,
+        venue_public_name=venue.publicName,
+    )
+
+
+def build_objects(offer_ids: List[int]) -> List[Dict]:
+    # Offers without any bookable stock are not returned by the query,
+    # hence not built: they must not be indexed.
+    offers_data = offer_queries.get_bookable_offers_data_for_indexing(offer_ids)
+
+    return [
+        _build_object_to_index(
+            offer_id=offer_data.id,
+            offer_date_created=offer_data.dateCreated,
+            offer_description=offer_data.description,
+            offer_extra_data=offer_data.extraData,
+            offer_is_digital=offer_data.url is not None and offer_data.url != "",
+            offer_is_duo=offer_data.isDuo,
+            offer_name=offer_data.name,
+            offer_thumb_url=_build_thumb_url(offer_data),
+            offer_type=offer_data.type,
+            offer_withdrawal_details=offer_data.withdrawalDetails,
+            offerer_name=offer_data.offererName,
+            stocks_beginning_datetimes=offer_data.stocksBeginningDatetimes,
+            stocks_dates_created=offer_data.stocksDatesCreated,
+            stocks_prices=offer_data.stocksPrices,
+            tags=offer_data.tags or [],
+            venue_city=offer_data.venueCity,
+            venue_departement_code=offer_data.venueDepartementCode,
+            venue_latitude=offer_data.venueLatitude,
+            venue_longitude=offer_data.venueLongitude,
+            venue_name=offer_data.venueName,
+            venue_public_name=offer_data.venuePublicName,
+        )
+        for offer_data in offers_data
+    ]
+
+
+def _build_thumb_url(offer_data: tuple) -> Optional[str]:
+    thumb_url = settings.OBJECT_STORAGE_URL + "/thumbs"
+    if offer_data.mediationId:
+        return "{}/{}/{}".format(thumb_url, get_model_plural_name(Mediation), humanize(offer_data.mediationId))
+    if offer_data.productThumbCount:
+        return "{}/{}/{}".format(thumb_url, get_model_plural_name(Product), humanize(offer_data.productId))
+    return None
+
+
+def _build_object_to_index(  # pylint: disable=too-many-arguments,too-many-locals
+    offer_id: int,
+    offer_date_created: datetime,
+    offer_description: Optional[str],
+    offer_extra_data: Optional[Dict],
+    offer_is_digital: bool,
+    offer_is_duo: bool,
+    offer_name: str,
+    offer_thumb_url: Optional[str],
+    offer_type: str,
+    offer_withdrawal_details: Optional[str],
+    offerer_name: str,
+    stocks_beginning_datetimes: List[datetime],
+    stocks_dates_created: List[datetime],
+    stocks_prices: List[Decimal],
+    tags: List[str],
+    venue_city: Optional[str],
+    venue_departement_code: Optional[str],
+    venue_latitude: Optional[Decimal],
+    venue_longitude: Optional[Decimal],
+    venue_name: str,
+    venue_public_name: Optional[str],
+) -> Dict:
+    humanize_offer_id = humanize(offer_id)
+    offer_type_as_dict = ALL_OFFER_TYPES_DICT[offer_type]
+    is_event = ProductType.is_event(offer_type)
+    has_coordinates = venue_latitude is not None and venue_longitude is not None
+    author = offer_extra_data and offer_extra_data.get("author")
+    stage_director = offer_extra_data and offer_extra_data.get("stageDirector")
+    visa = offer_extra_data and offer_extra_data.get("visa")
+    isbn = offer_extra_data and offer_extra_data.get("isbn")
+    speaker = offer_extra_data and offer_extra_data.get("speaker")
+    performer = offer_extra_data and offer_extra_data.get("performer")
+    show_type = offer_extra_data and offer_extra_data.get("showType")
+    show_sub_type = offer_extra_data and offer_extra_data.get("showSubType")
+    music_type = offer_extra_data and offer_extra_data.get("musicType")
+    music_sub_type = offer_extra_data and offer_extra_data.get("musicSubType")
+    prices_sorted = sorted(stocks_prices, key=float)
     price_min = prices_sorted[0]
     price_max = prices_sorted[-1]
     dates = []
     times = []
-    if offer.isEvent:
-        dates = [datetime.timestamp(stock.beginningDatetime) for stock in offer.bookableStocks]
-        times = [get_time_in_seconds_from_datetime(stock.beginningDatetime) for stock in offer.bookableStocks]
-    date_created = datetime.timestamp(offer.dateCreated)
-    stocks_date_created = [datetime.timestamp(stock.dateCreated) for stock in offer.bookableStocks]
-    tags = [criterion.name for criterion in offer.criteria]
+    if is_event:
+        dates = [datetime.timestamp(beginning_datetime) for beginning_datetime in stocks_beginning_datetimes]
+        times = [
+            get_time_in_seconds_from_datetime(beginning_datetime) for beginning_datetime in stocks_beginning_datetimes
+        ]
+    date_created = datetime.timestamp(offer_date_created)
+    stocks_date_created = [datetime.timestamp(stock_date_created) for stock_date_created in stocks_dates_created]
 
     object_to_index = {
         "objectID": humanize_offer_id,
         "offer": {
             "author": author,
-            "category": offer.offer_category,
+            "category": CATEGORIES_LABEL_DICT.get(offer_type_as_dict["appLabel"]),
             "dateCreated": date_created,
             "dates": sorted(dates),
-            "description": offer.description,
+            "description": offer_description,
             "id": humanize_offer_id,
             "isbn": isbn,
-            "isDigital": offer.isDigital,
-            "isDuo": offer.isDuo,
-            "isEvent": offer.isEvent,
-            "isThing": offer.isThing,
-            "label": offer.offerType["appLabel"],
+            "isDigital": offer_is_digital,
+            "isDuo": offer_is_duo,
+            "isEvent": is_event,
+            "isThing": ProductType.is_thing(offer_type),
+            "label": offer_type_as_dict["appLabel"],
             "musicSubType": music_sub_type,
             "musicType": music_type,
-            "name": offer.name,
+            "name": offer_name,
             "performer": performer,
             "prices": prices_sorted,
             "priceMin": price_min,
@@ -65,26 +170,26 @@ def build_object(offer: Offer) -> Dict:
             "speaker": speaker,
             "stageDirector": stage_director,
             "stocksDateCreated": sorted(stocks_date_created),
-            "thumbUrl": offer.thumbUrl,
-            "tags": tags,
-            "times": list(set(times)),
-            "type": offer.offerType["sublabel"],
+            "thumbUrl": offer_thumb_url,
+            "tags": sorted(tags),
+            "times": sorted(set(times)),
+            "type": offer_type_as_dict["sublabel"],
             "visa": visa,
-            "withdrawalDetails": offer.withdrawalDetails,
+            "withdrawalDetails": offer_withdrawal_details,
         },
         "offerer": {
-            "name": offerer.name,
+            "name": offerer_name,
         },
         "venue": {
-            "city": venue.city,
-            "departementCode": venue.departementCode,
-            "name": venue.name,
-            "publicName": venue.publicName,
+            "city": venue_city,
+            "departementCode": venue_departement_code,
+            "name": venue_name,
+            "publicName": venue_public_name,
         },
     }
 
     if has_coordinates:
-        object_to_index.update({"_geoloc": {"lat": float(venue.latitude), "lng": float(venue.longitude)}})
+        object_to_index.update({"_geoloc": {"lat": float(venue_latitude), "lng": float(venue_longitude)}})
     else:
         object_to_index.update(
             {"_geoloc": {"lat": DEFAULT_LATITUDE_FOR_NUMERIC_OFFER, "lng": DEFAULT_LONGITUDE_FOR_NUMERIC_OFFER}}
@@ -0,0 +1,6 @@
+indexed_objects = {}
+
+
+def reset_indexed_objects():
+    global indexed_objects  # pylint: disable=global-statement
+    indexed_objects = {}
@@ -1,6 +1,12 @@
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+import multiprocessing
 from time import sleep
 from typing import Dict
+from typing import List
 
+from flask import current_app
 from redis import Redis
 
 from pcapi import settings
@@ -10,6 +16,7 @@ from pcapi.connectors.redis import get_number_of_venue_providers_currently_in_sy
 from pcapi.connectors.redis import get_venue_providers
 from pcapi.connectors.scalingo_api import ScalingoApiException
 from pcapi.connectors.scalingo_api import run_process_in_one_off_container
+from pcapi.scripts.algolia_indexing.indexing import process_venue_provider
 from pcapi.utils.logger import logger
 
 
@@ -19,6 +26,10 @@ ALGOLIA_WAIT_TIME_FOR_AVAILABLE_WORKER = 60
 def process_multi_indexing(client: Redis) -> None:
     venue_providers_to_process = get_venue_providers(client=client)
     delete_venue_providers(client=client)
+    if settings.ALGOLIA_SYNC_WORKERS_IN_PROCESS:
+        _run_indexing_in_process_pool(venue_providers=venue_providers_to_process)
+        return
+
     sync_worker_pool = settings.ALGOLIA_SYNC_WORKERS_POOL_SIZE
 
     while len(venue_providers_to_process) > 0:
@@ -58,3 +69,52 @@ def _run_indexing(client: Redis, venue_provider: Dict) -> None:
             venue_provider_id,
             error,
         )
+
+
+def _run_indexing_in_process_pool(venue_providers: List[Dict]) -> None:
+    if not venue_providers:
+        return
+
+    # The pool never runs more than ALGOLIA_SYNC_WORKERS_POOL_SIZE venue
+    # providers at once and starts the next one as soon as a worker is free.
+    with _create_indexing_pool(settings.ALGOLIA_SYNC_WORKERS_POOL_SIZE) as indexing_pool:
+        indexings = {}
+        for venue_provider in venue_providers:
+            indexings[indexing_pool.submit(_index_venue_provider, venue_provider)] = venue_provider
+            logger.info("[ALGOLIA][Worker] Indexing offers from VenueProvider %s in process pool", venue_provider["id"])
+
+        for indexing in as_completed(indexings):
+            error = indexing.exception()
+            if error is not None:
+                logger.error(
+                    "[ALGOLIA][Worker] Error indexing offers from VenueProvider %s in process pool: %r",
+                    indexings[indexing]["id"],
+                    error,
+                )
+
+
+def _create_indexing_pool(pool_size: int) -> Executor:
+    # Workers are spawned rather than forked: the clock that runs this
+    # function also runs other jobs in threads, whose locks and database
+    # connections must not be inherited.
+    return ProcessPoolExecutor(
+        max_workers=pool_size,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_indexing_process,
+    )
+
+
+def _init_indexing_process() -> None:
+    # avoid import loop
+    from pcapi.flask_app import app
+
+    app.app_context().push()
+
+
+def _index_venue_provider(venue_provider: Dict) -> None:
+    process_venue_provider(
+        client=current_app.redis_client,
+        provider_id=venue_provider["providerId"],
+        venue_provider_id=venue_provider["id"],
+        venue_id=venue_provider["venueId"],
+    )
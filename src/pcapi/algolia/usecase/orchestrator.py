@@ -5,43 +5,42 @@ from algoliasearch.exceptions import AlgoliaException
 from redis import Redis
 from redis.client import Pipeline
 
-from pcapi.algolia.domain.rules_engine import is_eligible_for_reindexing
+from pcapi.algolia.domain.digest import compute_object_digest
+from pcapi.algolia.domain.digest import has_object_changed
 from pcapi.algolia.infrastructure.api import add_objects
 from pcapi.algolia.infrastructure.api import delete_objects
 from pcapi.algolia.infrastructure.builder import build_object
+from pcapi.algolia.infrastructure.builder import build_objects
 from pcapi.connectors.redis import add_offer_ids_in_error
 from pcapi.connectors.redis import add_to_indexed_offers
-from pcapi.connectors.redis import check_offer_exists
 from pcapi.connectors.redis import delete_indexed_offers
-from pcapi.connectors.redis import get_offer_details
+from pcapi.connectors.redis import get_indexed_offers_details
 from pcapi.models import Offer
 from pcapi.repository import offer_queries
+from pcapi.utils.human_ids import dehumanize
 from pcapi.utils.human_ids import humanize
 from pcapi.utils.logger import logger
 
 
-def process_eligible_offers(client: Redis, offer_ids: List[int], from_provider_update: bool = False) -> None:
+def process_eligible_offers(client: Redis, offer_ids: List[int]) -> None:
     offers_to_add = []
     offers_to_delete = []
     pipeline = client.pipeline()
 
     offers = offer_queries.get_offers_by_ids(offer_ids)
+    indexed_offers_details = get_indexed_offers_details(client=client, offer_ids=[offer.id for offer in offers])
     for offer in offers:
-        offer_exists = check_offer_exists(client=client, offer_id=offer.id)
+        offer_exists = offer.id in indexed_offers_details
 
         if offer and offer.isBookable:
-            if from_provider_update and offer_exists:
-                offer_details = get_offer_details(client=client, offer_id=offer.id)
-                if offer_details and is_eligible_for_reindexing(offer, offer_details):
-                    offers_to_add.append(build_object(offer=offer))
-                    add_to_indexed_offers(
-                        pipeline=pipeline, offer_id=offer.id, offer_details=_build_offer_details_to_be_indexed(offer)
-                    )
-            else:
-                offers_to_add.append(build_object(offer=offer))
-                add_to_indexed_offers(
-                    pipeline=pipeline, offer_id=offer.id, offer_details=_build_offer_details_to_be_indexed(offer)
-                )
+            object_to_index = build_object(offer=offer)
+            object_digest = compute_object_digest(object_to_index)
+            if offer_exists and not has_object_changed(object_digest, indexed_offers_details[offer.id]):
+                continue
+            offers_to_add.append(object_to_index)
+            offer_details = _build_offer_details_to_be_indexed(offer)
+            offer_details["digest"] = object_digest
+            add_to_indexed_offers(pipeline=pipeline, offer_id=offer.id, offer_details=offer_details)
         else:
             if offer_exists:
                 offers_to_delete.append(offer.id)
@@ -56,13 +55,44 @@ def process_eligible_offers(client: Redis, offer_ids: List[int], from_provider_u
         logger.info("[ALGOLIA] no objects were added nor deleted!")
 
 
-def delete_expired_offers(client: Redis, offer_ids: List[int]) -> None:
-    offer_ids_to_delete = []
-    for offer_id in offer_ids:
-        offer_exists = check_offer_exists(client=client, offer_id=offer_id)
+def process_offers_in_bulk(client: Redis, offer_ids: List[int]) -> None:
+    process_built_objects(client=client, offer_ids=offer_ids, built_objects=build_objects(offer_ids))
+
+
+def process_built_objects(client: Redis, offer_ids: List[int], built_objects: List[dict]) -> None:
+    offers_to_add = []
+    pipeline = client.pipeline()
+    indexed_offers_details = get_indexed_offers_details(client=client, offer_ids=offer_ids)
+
+    indexable_offer_ids = set()
+    for object_to_index in built_objects:
+        offer_id = dehumanize(object_to_index["objectID"])
+        indexable_offer_ids.add(offer_id)
+        offer_details = _build_offer_details_from_object(object_to_index)
+        if offer_id in indexed_offers_details and not has_object_changed(
+            offer_details["digest"], indexed_offers_details[offer_id]
+        ):
+            continue
+        offers_to_add.append(object_to_index)
+        add_to_indexed_offers(pipeline=pipeline, offer_id=offer_id, offer_details=offer_details)
+
+    offers_to_delete = [
+        offer_id for offer_id in offer_ids if offer_id not in indexable_offer_ids and offer_id in indexed_offers_details
+    ]
+
+    if len(offers_to_add) > 0:
+        _process_adding(pipeline=pipeline, client=client, offer_ids=offer_ids, adding_objects=offers_to_add)
+
+    if len(offers_to_delete) > 0:
+        _process_deleting(client=client, offer_ids_to_delete=offers_to_delete)
+
+    if not (offers_to_add or offers_to_delete):
+        logger.info("[ALGOLIA] no objects were added nor deleted!")
 
-        if offer_exists:
-            offer_ids_to_delete.append(offer_id)
+
+def delete_expired_offers(client: Redis, offer_ids: List[int]) -> None:
+    indexed_offers_details = get_indexed_offers_details(client=client, offer_ids=offer_ids)
+    offer_ids_to_delete = [offer_id for offer_id in offer_ids if offer_id in indexed_offers_details]
 
     if len(offer_ids_to_delete) > 0:
         _process_deleting(client=client, offer_ids_to_delete=offer_ids_to_delete)
@@ -79,6 +109,16 @@ def _build_offer_details_to_be_indexed(offer: Offer) -> dict:
     return {"name": offer.name, "dates": event_dates, "prices": prices}
 
 
+def _build_offer_details_from_object(object_to_index: dict) -> dict:
+    offer = object_to_index["offer"]
+    return {
+        "name": offer["name"],
+        "dates": offer["dates"],
+        "prices": [float(price) for price in offer["prices"]],
+        "digest": compute_object_digest(object_to_index),
+    }
+
+
 def _process_adding(pipeline: Pipeline, client: Redis, offer_ids: List[int], adding_objects: List[dict]) -> None:
     try:
         add_objects(objects=adding_objects)
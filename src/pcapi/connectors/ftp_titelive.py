@@ -1,7 +1,17 @@
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 import ftplib
-from io import BytesIO
+import tempfile
+from threading import Lock
+from typing import Callable
+from typing import IO
+from typing import Iterable
+from typing import Iterator
 from typing import List
+from typing import Optional
 from typing import Pattern
+from typing import Tuple
+from typing import TypeVar
 from zipfile import ZipFile
 
 from pcapi import settings
@@ -9,6 +19,16 @@ from pcapi.domain.titelive import put_today_file_at_end_of_list
 from pcapi.utils.logger import logger
 
 
+FTP_DOWNLOAD_BLOCK_SIZE = 1024 * 1024
+
+T = TypeVar("T")
+
+# A single logged-in session is shared by all downloads of the process and is
+# only reopened when the server dropped it, or once closed by close_ftp_session().
+_ftp_session = {"connection": None}
+_ftp_session_lock = Lock()
+
+
 def get_titelive_ftp():
     if settings.TITELIVE_FTP_URI is None:
         raise ValueError("URI du FTP Titelive non spécifiée.")
@@ -23,18 +43,56 @@ def connect_to_titelive_ftp():
     return ftp_titelive
 
 
-def get_zip_file_from_ftp(zip_file_name: str, folder_name: str) -> ZipFile:
-    data_file = BytesIO()
-    data_file.name = zip_file_name
-    file_path = "RETR " + folder_name + "/" + zip_file_name
+def download_file_from_ftp(file_name: str, folder_name: str) -> IO[bytes]:
+    data_file = tempfile.TemporaryFile()
+    file_path = "RETR " + folder_name + "/" + file_name
+
+    def retrieve(ftp_titelive: ftplib.FTP) -> None:
+        data_file.seek(0)
+        data_file.truncate()
+        ftp_titelive.retrbinary(file_path, data_file.write, blocksize=FTP_DOWNLOAD_BLOCK_SIZE)
+
     logger.info("Downloading file %s", file_path)
-    connect_to_titelive_ftp().retrbinary(file_path, data_file.write)
-    return ZipFile(data_file, "r")
+    _run_on_ftp_session(retrieve)
+    data_file.seek(0)
+    return data_file
+
+
+def get_zip_file_from_ftp(zip_file_name: str, folder_name: str) -> ZipFile:
+    # The archive members are read from the file spooled on disk, so that the
+    # whole archive is never held in memory.
+    return ZipFile(download_file_from_ftp(zip_file_name, folder_name), "r")
+
+
+def close_zip_file(zip_file: ZipFile) -> None:
+    # ZipFile does not close the spooled file it was given
+    spooled_file = zip_file.fp
+    zip_file.close()
+    if spooled_file is not None:
+        spooled_file.close()
+
+
+def iter_zip_files_from_ftp(zip_file_names: Iterable[str], folder_name: str) -> Iterator[Tuple[str, ZipFile]]:
+    """Yield the zip files downloaded from the FTP, which the caller must
+    close with close_zip_file() once read."""
+    return _iter_with_next_download_in_background(
+        zip_file_names, folder_name, get_zip_file_from_ftp, close=close_zip_file
+    )
+
+
+def close_ftp_session() -> None:
+    with _ftp_session_lock:
+        connection = _ftp_session["connection"]
+        _ftp_session["connection"] = None
+        if connection is not None:
+            try:
+                connection.quit()
+            except ftplib.all_errors:
+                connection.close()
 
 
 def get_files_to_process_from_titelive_ftp(titelive_folder_name: str, date_regexp: Pattern[str]) -> List[str]:
-    ftp_titelive = connect_to_titelive_ftp()
-    files_list = ftp_titelive.nlst(titelive_folder_name)
+    files_list = _run_on_ftp_session(lambda ftp_titelive: ftp_titelive.nlst(titelive_folder_name))
 
     files_list_matching_regex = [file_name for file_name in files_list if date_regexp.search(str(file_name))]
     sorted_files_list = sorted(files_list_matching_regex)
@@ -44,3 +102,62 @@ def get_files_to_process_from_titelive_ftp(titelive_folder_name: str, date_regex
     ordered_files_to_process = put_today_file_at_end_of_list(sorted_files_list, date_regexp)
 
     return ordered_files_to_process
+
+
+def _iter_with_next_download_in_background(
+    file_names: Iterable[str], folder_name: str, download: Callable[[str, str], T], close: Callable[[T], None]
+) -> Iterator[Tuple[str, T]]:
+    # While a file is being processed, the next one is downloaded by a
+    # background thread. A file downloaded in advance is closed if the
+    # iteration stops before it is yielded.
+    remaining_file_names = iter(file_names)
+
+    def close_unused_download(unused_download: Future) -> None:
+        if not unused_download.cancelled() and unused_download.exception() is None:
+            close(unused_download.result())
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+
+        def start_next_download() -> Optional[Tuple[str, Future]]:
+            file_name = next(remaining_file_names, None)
+            if file_name is None:
+                return None
+            return str(file_name), executor.submit(download, str(file_name), folder_name)
+
+        next_download = start_next_download()
+        try:
+            while next_download is not None:
+                file_name, downloaded_file = next_download
+                next_download = start_next_download()
+                yield file_name, downloaded_file.result()
+        finally:
+            if next_download is not None:
+                _, unused_download = next_download
+                unused_download.cancel()
+                unused_download.add_done_callback(close_unused_download)
+
+
+def _run_on_ftp_session(action: Callable[[ftplib.FTP], T]) -> T:
+    with _ftp_session_lock:
+        try:
+            return action(_get_ftp_session())
+        except ftplib.all_errors as error:
+            logger.warning("Titelive FTP session failed, reconnecting: %s", error)
+            _close_ftp_session()
+            return action(_get_ftp_session())
+
+
+def _get_ftp_session() -> ftplib.FTP:
+    if _ftp_session["connection"] is None:
+        _ftp_session["connection"] = connect_to_titelive_ftp()
+    return _ftp_session["connection"]
+
+
+def _close_ftp_session() -> None:
+    connection = _ftp_session["connection"]
+    _ftp_session["connection"] = None
+    if connection is not None:
+        try:
+            connection.close()
+        except ftplib.all_errors:
+            pass
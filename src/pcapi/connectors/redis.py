@@ -1,7 +1,9 @@
 from enum import Enum
 import json
+from time import time
 from typing import Dict
 from typing import List
+from typing import Optional
 
 import redis
 from redis import Redis
@@ -11,18 +13,30 @@ from pcapi import settings
 from pcapi.utils.logger import logger
 
 
+REDIS_HMGET_CHUNK_SIZE = 1000
+
+
 class RedisBucket(Enum):
-    REDIS_LIST_OFFER_IDS_NAME = "offer_ids"
+    REDIS_LIST_LEGACY_OFFER_IDS_NAME = "offer_ids"
+    REDIS_SORTED_SET_OFFER_IDS_NAME = "offer_ids_to_index"
     REDIS_LIST_OFFER_IDS_IN_ERROR_NAME = "offer_ids_in_error"
     REDIS_LIST_VENUE_IDS_NAME = "venue_ids"
     REDIS_LIST_VENUE_PROVIDERS_NAME = "venue_providers"
     REDIS_HASHMAP_INDEXED_OFFERS_NAME = "indexed_offers"
     REDIS_HASHMAP_VENUE_PROVIDERS_IN_SYNC_NAME = "venue_providers_in_sync"
+    REDIS_FULL_INDEXING_LAST_OFFER_ID_NAME = "full_indexing_last_offer_id"
+    REDIS_FEATURES_VERSION_NAME = "features_version"
+    REDIS_BOOKINGS_RECAP_COUNT_NAME = "bookings_recap_count"
+    REDIS_OFFER_RESPONSE_NAME = "offer_response"
+    REDIS_LIST_EMAILS_TO_SEND_NAME = "emails_to_send"
+    REDIS_EMAILS_DISPATCH_SCHEDULED_NAME = "emails_dispatch_scheduled"
 
 
 def add_offer_id(client: Redis, offer_id: int) -> None:
+    # Offer ids are scored by their first enqueuing time: an offer that is
+    # already waiting to be indexed keeps its place and is not duplicated.
     try:
-        client.rpush(RedisBucket.REDIS_LIST_OFFER_IDS_NAME.value, offer_id)
+        client.zadd(RedisBucket.REDIS_SORTED_SET_OFFER_IDS_NAME.value, {offer_id: time()}, nx=True)
     except redis.exceptions.RedisError as error:
         logger.exception("[REDIS] %s", error)
 
@@ -52,15 +66,47 @@ def _add_venue_provider(client: Redis, venue_provider) -> None:
         logger.exception("[REDIS] %s", error)
 
 
-def get_offer_ids(client: Redis) -> List[int]:
+def pop_offer_ids(client: Redis) -> List[int]:
     try:
-        offer_ids = client.lrange(RedisBucket.REDIS_LIST_OFFER_IDS_NAME.value, 0, settings.REDIS_OFFER_IDS_CHUNK_SIZE)
-        return offer_ids
+        offer_ids_with_scores = client.zpopmin(
+            RedisBucket.REDIS_SORTED_SET_OFFER_IDS_NAME.value, settings.REDIS_OFFER_IDS_CHUNK_SIZE
+        )
+        return [int(offer_id) for offer_id, _ in offer_ids_with_scores]
     except redis.exceptions.RedisError as error:
         logger.exception("[REDIS] %s", error)
         return []
 
 
+def requeue_offer_ids(client: Redis, offer_ids: List[int]) -> None:
+    # Offer ids queued again in the meantime keep their place
+    if not offer_ids:
+        return
+    try:
+        now = time()
+        client.zadd(
+            RedisBucket.REDIS_SORTED_SET_OFFER_IDS_NAME.value, {offer_id: now for offer_id in offer_ids}, nx=True
+        )
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+
+
+def move_legacy_offer_ids(client: Redis) -> int:
+    # Offer ids used to be queued in a list: the ids still waiting there are
+    # moved to the sorted set, so that they are indexed too.
+    pipeline = client.pipeline(transaction=True)
+    pipeline.lrange(RedisBucket.REDIS_LIST_LEGACY_OFFER_IDS_NAME.value, 0, -1)
+    pipeline.delete(RedisBucket.REDIS_LIST_LEGACY_OFFER_IDS_NAME.value)
+    legacy_offer_ids, _ = pipeline.execute()
+    if legacy_offer_ids:
+        now = time()
+        client.zadd(
+            RedisBucket.REDIS_SORTED_SET_OFFER_IDS_NAME.value,
+            {offer_id: now for offer_id in legacy_offer_ids},
+            nx=True,
+        )
+    return len(legacy_offer_ids)
+
+
 def get_venue_ids(client: Redis) -> List[int]:
     try:
         venue_ids = client.lrange(RedisBucket.REDIS_LIST_VENUE_IDS_NAME.value, 0, settings.REDIS_VENUE_IDS_CHUNK_SIZE)
@@ -81,13 +127,6 @@ def get_venue_providers(client: Redis) -> List[dict]:
         return []
 
 
-def delete_offer_ids(client: Redis) -> None:
-    try:
-        client.ltrim(RedisBucket.REDIS_LIST_OFFER_IDS_NAME.value, settings.REDIS_OFFER_IDS_CHUNK_SIZE, -1)
-    except redis.exceptions.RedisError as error:
-        logger.exception("[REDIS] %s", error)
-
-
 def delete_venue_ids(client: Redis) -> None:
     try:
         client.ltrim(RedisBucket.REDIS_LIST_VENUE_IDS_NAME.value, settings.REDIS_VENUE_IDS_CHUNK_SIZE, -1)
@@ -117,26 +156,28 @@ def delete_indexed_offers(client: Redis, offer_ids: List[int]) -> None:
         logger.exception("[REDIS] %s", error)
 
 
-def check_offer_exists(client: Redis, offer_id: int) -> bool:
-    try:
-        offer_exist = client.hexists(RedisBucket.REDIS_HASHMAP_INDEXED_OFFERS_NAME.value, offer_id)
-        return offer_exist
-    except redis.exceptions.RedisError as error:
-        logger.exception("[REDIS] %s", error)
-        return False
-
+def get_indexed_offers_details(client: Redis, offer_ids: List[int]) -> Dict[int, Dict]:
+    if not offer_ids:
+        return dict()
 
-def get_offer_details(client: Redis, offer_id: int) -> Dict:
     try:
-        offer_details = client.hget(RedisBucket.REDIS_HASHMAP_INDEXED_OFFERS_NAME.value, offer_id)
-
-        if offer_details:
-            return json.loads(offer_details)
-        return dict()
+        pipeline = client.pipeline(transaction=False)
+        for start in range(0, len(offer_ids), REDIS_HMGET_CHUNK_SIZE):
+            pipeline.hmget(
+                RedisBucket.REDIS_HASHMAP_INDEXED_OFFERS_NAME.value, offer_ids[start : start + REDIS_HMGET_CHUNK_SIZE]
+            )
+        offers_details_chunks = pipeline.execute()
     except redis.exceptions.RedisError as error:
         logger.exception("[REDIS] %s", error)
         return dict()
 
+    offers_details = [offer_details for chunk in offers_details_chunks for offer_details in chunk]
+    return {
+        offer_id: json.loads(offer_details)
+        for offer_id, offer_details in zip(offer_ids, offers_details)
+        if offer_details is not None
+    }
+
 
 def delete_all_indexed_offers(client: Redis) -> None:
     try:
@@ -193,3 +234,148 @@ def delete_offer_ids_in_error(client: Redis) -> None:
         )
     except redis.exceptions.RedisError as error:
         logger.exception("[REDIS] %s", error)
+
+
+def get_full_indexing_last_offer_id(client: Redis) -> int:
+    try:
+        last_offer_id = client.get(RedisBucket.REDIS_FULL_INDEXING_LAST_OFFER_ID_NAME.value)
+        return int(last_offer_id) if last_offer_id else 0
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+        return 0
+
+
+def set_full_indexing_last_offer_id(client: Redis, offer_id: int) -> None:
+    try:
+        client.set(RedisBucket.REDIS_FULL_INDEXING_LAST_OFFER_ID_NAME.value, offer_id)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+
+
+def delete_full_indexing_last_offer_id(client: Redis) -> None:
+    try:
+        client.delete(RedisBucket.REDIS_FULL_INDEXING_LAST_OFFER_ID_NAME.value)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+
+
+def get_features_version(client: Redis) -> Optional[str]:
+    try:
+        return client.get(RedisBucket.REDIS_FEATURES_VERSION_NAME.value)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+        return None
+
+
+def increment_features_version(client: Redis) -> None:
+    try:
+        client.incr(RedisBucket.REDIS_FEATURES_VERSION_NAME.value)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+
+
+def get_bookings_recap_count(client: Redis, user_id: int) -> Optional[int]:
+    try:
+        count = client.get(_get_bookings_recap_count_key(user_id))
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+        return None
+    return int(count) if count is not None else None
+
+
+def set_bookings_recap_count(client: Redis, user_id: int, count: int) -> None:
+    try:
+        client.set(_get_bookings_recap_count_key(user_id), count, ex=settings.BOOKINGS_RECAP_COUNT_CACHE_TTL)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+
+
+def _get_bookings_recap_count_key(user_id: int) -> str:
+    return "%s:%i" % (RedisBucket.REDIS_BOOKINGS_RECAP_COUNT_NAME.value, user_id)
+
+
+def get_offer_response(client: Redis, offer_id: int) -> Optional[str]:
+    try:
+        return client.get(_get_offer_response_key(offer_id))
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+        return None
+
+
+def set_offer_response(client: Redis, offer_id: int, response: str) -> None:
+    try:
+        client.set(_get_offer_response_key(offer_id), response, ex=settings.OFFER_RESPONSE_CACHE_TTL)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+
+
+def delete_offer_response(client: Redis, offer_id: int) -> None:
+    try:
+        client.delete(_get_offer_response_key(offer_id))
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+
+
+def _get_offer_response_key(offer_id: int) -> str:
+    return "%s:%s" % (RedisBucket.REDIS_OFFER_RESPONSE_NAME.value, offer_id)
+
+
+def add_email_to_send(client: Redis, email: dict) -> bool:
+    try:
+        client.rpush(RedisBucket.REDIS_LIST_EMAILS_TO_SEND_NAME.value, json.dumps(email))
+        return True
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+        return False
+
+
+def pop_emails_to_send(client: Redis, count: int) -> List[dict]:
+    # Reading and trimming the list in a transaction makes sure that two
+    # workers never send the same e-mail.
+    try:
+        pipeline = client.pipeline(transaction=True)
+        pipeline.lrange(RedisBucket.REDIS_LIST_EMAILS_TO_SEND_NAME.value, 0, count - 1)
+        pipeline.ltrim(RedisBucket.REDIS_LIST_EMAILS_TO_SEND_NAME.value, count, -1)
+        emails_as_string, _ = pipeline.execute()
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+        return []
+    return [json.loads(email) for email in emails_as_string]
+
+
+def requeue_emails_to_send(client: Redis, emails: List[dict]) -> None:
+    # E-mails are put back at the head of the queue, in the same order
+    if not emails:
+        return
+    try:
+        client.lpush(
+            RedisBucket.REDIS_LIST_EMAILS_TO_SEND_NAME.value, *[json.dumps(email) for email in reversed(emails)]
+        )
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+
+
+def schedule_emails_dispatch(client: Redis) -> bool:
+    # Returns whether a dispatch job must be enqueued, i.e. whether no job
+    # was already waiting to send the queued e-mails. The flag expires in
+    # case the job is lost, so that a later e-mail enqueues a new job. Until
+    # then, queued e-mails are sent by the periodic dispatch of the clock.
+    try:
+        return bool(
+            client.set(
+                RedisBucket.REDIS_EMAILS_DISPATCH_SCHEDULED_NAME.value,
+                1,
+                nx=True,
+                ex=settings.EMAILS_DISPATCH_SCHEDULED_TTL,
+            )
+        )
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+        return True
+
+
+def unschedule_emails_dispatch(client: Redis) -> None:
+    try:
+        client.delete(RedisBucket.REDIS_EMAILS_DISPATCH_SCHEDULED_NAME.value)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
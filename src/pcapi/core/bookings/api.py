@@ -68,6 +68,7 @@ def book_offer(
     booking.confirmationDate = compute_confirmation_date(stock.beginningDatetime, booking.dateCreated)
 
     repository.save(booking)
+    _clear_user_expenses_cache(beneficiary)
 
     try:
         user_emails.send_booking_recap_emails(booking)
@@ -78,6 +79,7 @@ def book_offer(
     except MailServiceException as error:
         logger.exception("Could not send booking=%s confirmation email to beneficiary: %s", booking.id, error)
 
+    redis.delete_offer_response(client=app.redis_client, offer_id=stock.offerId)
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
         redis.add_offer_id(client=app.redis_client, offer_id=stock.offerId)
 
@@ -92,12 +94,14 @@ def cancel_booking_by_beneficiary(user: User, booking: Booking) -> None:
     booking.isCancelled = True
     booking.cancellationReason = BookingCancellationReasons.BENEFICIARY
     repository.save(booking)
+    _clear_user_expenses_cache(user)
 
     try:
         user_emails.send_booking_cancellation_emails_to_user_and_offerer(booking, booking.cancellationReason)
     except MailServiceException as error:
         logger.exception("Could not send booking=%s cancellation emails to user and offerer: %s", booking.id, error)
 
+    redis.delete_offer_response(client=app.redis_client, offer_id=booking.stock.offerId)
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
         redis.add_offer_id(client=app.redis_client, offer_id=booking.stock.offerId)
 
@@ -107,7 +111,9 @@ def cancel_booking_by_offerer(booking: Booking) -> None:
     booking.isCancelled = True
     booking.cancellationReason = BookingCancellationReasons.OFFERER
     repository.save(booking)
+    _clear_user_expenses_cache(booking.user)
 
+    redis.delete_offer_response(client=app.redis_client, offer_id=booking.stock.offerId)
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
         redis.add_offer_id(client=app.redis_client, offer_id=booking.stock.offerId)
 
@@ -126,6 +132,12 @@ def mark_as_unused(booking: Booking) -> None:
     repository.save(booking)
 
 
+def _clear_user_expenses_cache(user: User) -> None:
+    from pcapi.core.users.api import clear_user_expenses_cache  # avoid import loop
+
+    clear_user_expenses_cache(user)
+
+
 def generate_qr_code(booking_token: str, offer_extra_data: typing.Dict) -> str:
     qr = qrcode.QRCode(
         version=QR_CODE_VERSION,
@@ -1,6 +1,12 @@
 import datetime
 from decimal import Decimal
 
+from sqlalchemy import and_
+from sqlalchemy import false
+from sqlalchemy import or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from pcapi.core.offers.models import Offer
 from pcapi.models.feature import FeatureToggle
 from pcapi.models.offer_type import ThingType
 from pcapi.repository import feature_queries
@@ -41,6 +47,25 @@ class BaseLimitConfiguration:
         )
     # fmt: on
 
+    # The clauses below are the SQL counterparts of the methods above, to
+    # filter offers (or their bookings) in queries.
+    def digital_cap_clause(self) -> ColumnElement:
+        if not self.DIGITAL_CAP:
+            return false()
+        return and_(
+            Offer.url.isnot(None),
+            Offer.url != "",
+            Offer.type.in_([str(type_) for type_ in self.DIGITAL_CAPPED_TYPES]),
+        )
+
+    def physical_cap_clause(self) -> ColumnElement:
+        if not self.PHYSICAL_CAP:
+            return false()
+        return and_(
+            or_(Offer.url.is_(None), Offer.url == ""),
+            Offer.type.in_([str(type_) for type_ in self.PHYSICAL_CAPPED_TYPES]),
+        )
+
 
 class LimitConfigurationV1(BaseLimitConfiguration):
     # For now this total cap duplicates what we store in `Deposit.amount`.
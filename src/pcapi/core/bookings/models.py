@@ -145,21 +145,12 @@ Booking.trig_ddl = """
         WHERE "userId"=user_id
         AND ("expirationDate" > now() OR "expirationDate" IS NULL);
 
-        CASE
-            only_used_bookings
-        WHEN true THEN
-            SELECT COALESCE(SUM(amount * quantity), 0)
-            INTO sum_bookings
-            FROM booking
-            WHERE "userId"=user_id AND NOT "isCancelled" AND "isUsed" = true;
-        WHEN false THEN
-            SELECT COALESCE(SUM(amount * quantity), 0)
-            INTO sum_bookings
-            FROM booking
-            WHERE "userId"=user_id AND NOT "isCancelled";
-        END CASE;
-
-        RETURN (sum_deposits - sum_bookings);
+        SELECT CASE only_used_bookings WHEN true THEN "usedAmount" ELSE "bookedAmount" END
+        INTO sum_bookings
+        FROM wallet_ledger
+        WHERE "userId"=user_id;
+
+        RETURN (sum_deposits - COALESCE(sum_bookings, 0));
     END; $$
     LANGUAGE plpgsql;
 
@@ -215,6 +206,52 @@ Booking.trig_ddl = """
     """
 event.listen(Booking.__table__, "after_create", DDL(Booking.trig_ddl))
 
+# Keeps the totals of `wallet_ledger` up to date. The trigger is named so
+# that it fires before `booking_update`, whose `check_booking()` reads the
+# wallet balance: triggers on the same event fire in alphabetical order.
+Booking.trig_wallet_ledger_ddl = """
+    CREATE OR REPLACE FUNCTION add_to_wallet_ledger(user_id BIGINT, booked_amount NUMERIC, used_amount NUMERIC)
+    RETURNS VOID AS $$
+    BEGIN
+        INSERT INTO wallet_ledger ("userId", "bookedAmount", "usedAmount")
+        VALUES (user_id, booked_amount, used_amount)
+        ON CONFLICT ("userId") DO UPDATE
+        SET "bookedAmount" = wallet_ledger."bookedAmount" + EXCLUDED."bookedAmount",
+            "usedAmount" = wallet_ledger."usedAmount" + EXCLUDED."usedAmount";
+    END; $$
+    LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION update_wallet_ledger()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') AND NOT OLD."isCancelled" THEN
+            PERFORM add_to_wallet_ledger(
+                OLD."userId",
+                -OLD.amount * OLD.quantity,
+                CASE WHEN OLD."isUsed" THEN -OLD.amount * OLD.quantity ELSE 0 END
+            );
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NOT NEW."isCancelled" THEN
+            PERFORM add_to_wallet_ledger(
+                NEW."userId",
+                NEW.amount * NEW.quantity,
+                CASE WHEN NEW."isUsed" THEN NEW.amount * NEW.quantity ELSE 0 END
+            );
+        END IF;
+        RETURN NULL;
+    END; $$
+    LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS booking_ledger_update ON booking;
+    CREATE TRIGGER booking_ledger_update
+    AFTER INSERT
+    OR UPDATE OF quantity, amount, "isCancelled", "isUsed", "userId"
+    OR DELETE
+    ON booking
+    FOR EACH ROW EXECUTE PROCEDURE update_wallet_ledger()
+    """
+event.listen(Booking.__table__, "after_create", DDL(Booking.trig_wallet_ledger_ddl))
+
 Booking.trig_update_cancellationDate_on_isCancelled_ddl = """
     CREATE OR REPLACE FUNCTION save_cancellation_date()
     RETURNS TRIGGER AS $$
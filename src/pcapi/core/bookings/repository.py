@@ -2,16 +2,26 @@ from datetime import date
 from datetime import datetime
 from datetime import time
 import math
+from typing import Iterator
 from typing import List
+from typing import Optional
+from typing import Tuple
 
 from dateutil import tz
+from flask import current_app
 from sqlalchemy import Date
 from sqlalchemy import cast
+from sqlalchemy import exists
 from sqlalchemy import func
+from sqlalchemy import literal_column
 from sqlalchemy import text
 from sqlalchemy.orm import Query
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.orm import joinedload
 from sqlalchemy.util._collections import AbstractKeyedTuple
 
+from pcapi import settings
+from pcapi.connectors import redis
 from pcapi.core.bookings import conf
 from pcapi.core.bookings.models import BookingCancellationReasons
 from pcapi.core.users.models import User
@@ -19,6 +29,7 @@ from pcapi.domain.booking_recap.booking_recap import BookBookingRecap
 from pcapi.domain.booking_recap.booking_recap import BookingRecap
 from pcapi.domain.booking_recap.booking_recap import EventBookingRecap
 from pcapi.domain.booking_recap.booking_recap import ThingBookingRecap
+from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapCursor
 from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapPaginated
 from pcapi.domain.postal_code.postal_code import PostalCode
 from pcapi.models import Booking
@@ -32,12 +43,15 @@ from pcapi.models.offer_type import ThingType
 from pcapi.models.offerer import Offerer
 from pcapi.models.payment import Payment
 from pcapi.models.payment_status import TransactionStatus
+from pcapi.models.product import Product
 from pcapi.utils.date import get_department_timezone
 from pcapi.utils.token import random_token
 
 
 DUO_QUANTITY = 2
 
+BOOKINGS_RECAP_ORDER = text('"bookingDate" DESC, "bookingId" DESC, "bookingDuplicateIndex" DESC')
+
 
 def find_by(token: str, email: str = None, offer_id: int = None) -> Booking:
     query = Booking.query.filter_by(token=token)
@@ -64,22 +78,79 @@ def find_by_pro_user_id(user_id: int, page: int = 1, per_page_limit: int = 1000)
     bookings_recap_query_with_duplicates = _duplicate_booking_when_quantity_is_two(bookings_recap_query)
 
     total_bookings_recap = bookings_recap_query_with_duplicates.count()
+    redis.set_bookings_recap_count(current_app.redis_client, user_id, total_bookings_recap)
 
     paginated_bookings = (
-        bookings_recap_query_with_duplicates.order_by(text('"bookingDate" DESC'))
+        bookings_recap_query_with_duplicates.order_by(BOOKINGS_RECAP_ORDER)
         .offset((page - 1) * per_page_limit)
         .limit(per_page_limit)
         .all()
     )
+    # The cursor of the last booking lets clients go on with the pagination
+    # by cursor from this page.
+    has_next_page = paginated_bookings and page * per_page_limit < total_bookings_recap
 
     return _paginated_bookings_sql_entities_to_bookings_recap(
         paginated_bookings=paginated_bookings,
         page=page,
         per_page_limit=per_page_limit,
         total_bookings_recap=total_bookings_recap,
+        next_cursor=_get_bookings_recap_cursor(paginated_bookings[-1]) if has_next_page else None,
+    )
+
+
+def find_by_pro_user_id_after_cursor(
+    user_id: int, cursor: Optional[BookingsRecapCursor], per_page_limit: int = 1000
+) -> BookingsRecapPaginated:
+    """Return the bookings recap that follow the cursor, or the first ones
+    when there is no cursor.
+
+    Unlike find_by_pro_user_id, the cost of a page does not depend on its
+    position in the list, and the total is only counted again once the
+    cached count has expired.
+    """
+    bookings_recap_query = _build_bookings_recap_query(user_id)
+    bookings_recap_query_with_duplicates = _duplicate_booking_when_quantity_is_two(bookings_recap_query)
+
+    total_bookings_recap = redis.get_bookings_recap_count(current_app.redis_client, user_id)
+    if total_bookings_recap is None:
+        total_bookings_recap = bookings_recap_query_with_duplicates.count()
+        redis.set_bookings_recap_count(current_app.redis_client, user_id, total_bookings_recap)
+
+    if cursor is not None:
+        bookings_recap_query_with_duplicates = bookings_recap_query_with_duplicates.filter(
+            text(
+                '("bookingDate", "bookingId", "bookingDuplicateIndex") '
+                "< (:booking_date, :booking_id, :duplicate_index)"
+            )
+        ).params(booking_date=cursor.booking_date, booking_id=cursor.booking_id, duplicate_index=cursor.duplicate_index)
+
+    # One more booking is fetched to know whether there is a next page
+    bookings = bookings_recap_query_with_duplicates.order_by(BOOKINGS_RECAP_ORDER).limit(per_page_limit + 1).all()
+    paginated_bookings = bookings[:per_page_limit]
+    has_next_page = len(bookings) > per_page_limit
+
+    return _paginated_bookings_sql_entities_to_bookings_recap(
+        paginated_bookings=paginated_bookings,
+        page=None,
+        per_page_limit=per_page_limit,
+        total_bookings_recap=total_bookings_recap,
+        next_cursor=_get_bookings_recap_cursor(paginated_bookings[-1]) if has_next_page else None,
     )
 
 
+def iter_bookings_recap_by_pro_user_id(
+    user_id: int, yield_per: int = settings.BOOKINGS_RECAP_EXPORT_YIELD_PER
+) -> Iterator[BookingRecap]:
+    bookings_recap_query = _build_bookings_recap_query(user_id)
+    bookings_recap_query_with_duplicates = _duplicate_booking_when_quantity_is_two(bookings_recap_query)
+
+    # Bookings are read from a server-side cursor, so that the whole list is
+    # never held in memory.
+    for booking in bookings_recap_query_with_duplicates.order_by(BOOKINGS_RECAP_ORDER).yield_per(yield_per):
+        yield _serialize_booking_recap(booking)
+
+
 def find_ongoing_bookings_by_stock(stock_id: int) -> List[Booking]:
     return Booking.query.filter_by(stockId=stock_id, isCancelled=False, isUsed=False).all()
 
@@ -99,6 +170,60 @@ def find_bookings_eligible_for_payment_for_venue(venue_id: int) -> List[Booking]
     )
 
 
+def find_bookings_eligible_for_payment(yield_per: int = 1000) -> Iterator[Tuple[Booking, bool]]:
+    # All venues are read at once through a server-side cursor, ordered by
+    # venue, with the offer data needed by the reimbursement rules and the
+    # bank information needed by the payments. Whether the booking already
+    # has a payment is returned along with it: a booking can have several
+    # payments, but must be returned only once.
+    is_paid = exists().where(Payment.bookingId == Booking.id).label("isPaid")
+    return (
+        _find_bookings_eligible_for_payment()
+        .reset_joinpoint()
+        .join(Product, Offer.productId == Product.id)
+        .join(Offerer, Venue.managingOffererId == Offerer.id)
+        .options(
+            contains_eager(Booking.stock).contains_eager(Stock.offer).contains_eager(Offer.product),
+            contains_eager(Booking.stock)
+            .contains_eager(Stock.offer)
+            .contains_eager(Offer.venue)
+            .joinedload(Venue.bankInformation),
+            contains_eager(Booking.stock)
+            .contains_eager(Stock.offer)
+            .contains_eager(Offer.venue)
+            .contains_eager(Venue.managingOfferer)
+            .joinedload(Offerer.bankInformation),
+        )
+        .add_columns(is_paid)
+        .order_by(Venue.id, is_paid.desc(), Booking.dateCreated.asc())
+        .yield_per(yield_per)
+    )
+
+
+def find_reimbursement_rows_of_bookings_eligible_for_payment() -> List[AbstractKeyedTuple]:
+    # Same bookings, in the same order, as find_bookings_eligible_for_payment(),
+    # as plain rows holding what the reimbursement rules need.
+    is_paid = exists().where(Payment.bookingId == Booking.id)
+    return (
+        _find_bookings_eligible_for_payment()
+        .reset_joinpoint()
+        .join(Product, Offer.productId == Product.id)
+        .with_entities(
+            Booking.id,
+            Booking.amount,
+            Booking.quantity,
+            Booking.dateCreated,
+            Offer.type.label("offerType"),
+            (Offer.url.isnot(None) & (Offer.url != "")).label("offerIsDigital"),
+            (Product.url.isnot(None) & (Product.url != "")).label("productIsDigital"),
+            Venue.id.label("venueId"),
+            is_paid.label("isPaid"),
+        )
+        .order_by(Venue.id, is_paid.desc(), Booking.dateCreated.asc())
+        .all()
+    )
+
+
 def token_exists(token: str) -> bool:
     return db.session.query(Booking.query.filter_by(token=token).exists()).scalar()
 
@@ -107,17 +232,37 @@ def find_not_used_and_not_cancelled() -> List[Booking]:
     return Booking.query.filter(Booking.isUsed.is_(False)).filter(Booking.isCancelled.is_(False)).all()
 
 
+def find_ids_of_bookings_to_mark_as_used(
+    events_begun_before: datetime, after_booking_id: int, batch_size: int
+) -> List[int]:
+    booking_ids = (
+        db.session.query(Booking.id)
+        .join(Stock)
+        .filter(Booking.isUsed.is_(False))
+        .filter(Booking.isCancelled.is_(False))
+        # Strict, like `not Stock.isEventDeletable`: an event that began
+        # exactly EVENT_AUTOMATIC_REFUND_DELAY ago can still be deleted.
+        .filter(Stock.beginningDatetime < events_begun_before)
+        .filter(Booking.id > after_booking_id)
+        .order_by(Booking.id)
+        .limit(batch_size)
+        .all()
+    )
+    return [booking_id for booking_id, in booking_ids]
+
+
 def find_used_by_token(token: str) -> Booking:
     return Booking.query.filter_by(token=token).filter_by(isUsed=True).first()
 
 
 def count_not_cancelled_bookings_quantity_by_stock_id(stock_id: int) -> int:
-    bookings = (
-        Booking.query.join(Stock).filter(Booking.isCancelled.is_(False)).filter(Booking.stockId == stock_id).all()
+    return (
+        Booking.query.filter(Booking.isCancelled.is_(False))
+        .filter(Booking.stockId == stock_id)
+        .with_entities(func.coalesce(func.sum(Booking.quantity), 0))
+        .scalar()
     )
 
-    return sum([booking.quantity for booking in bookings])
-
 
 def find_expiring_bookings() -> Query:
     booking_types_names_that_can_expire = [str(t) for t in ThingType if t.value.get("canExpire", False)]
@@ -199,7 +344,11 @@ def _query_keep_on_non_activation_offers() -> Query:
 
 
 def _duplicate_booking_when_quantity_is_two(bookings_recap_query: Query) -> Query:
-    return bookings_recap_query.union_all(bookings_recap_query.filter(Booking.quantity == 2))
+    return bookings_recap_query.add_columns(literal_column("1").label("bookingDuplicateIndex")).union_all(
+        bookings_recap_query.filter(Booking.quantity == 2).add_columns(
+            literal_column("2").label("bookingDuplicateIndex")
+        )
+    )
 
 
 def _build_bookings_recap_query(user_id: int) -> Query:
@@ -215,6 +364,7 @@ def _build_bookings_recap_query(user_id: int) -> Query:
         .filter(UserOfferer.userId == user_id)
         .filter(UserOfferer.validationToken.is_(None))
         .with_entities(
+            Booking.id.label("bookingId"),
             Booking.token.label("bookingToken"),
             Booking.dateCreated.label("bookingDate"),
             Booking.isCancelled.label("isCancelled"),
@@ -246,16 +396,27 @@ def _build_bookings_recap_query(user_id: int) -> Query:
 
 
 def _paginated_bookings_sql_entities_to_bookings_recap(
-    paginated_bookings: List[object], page: int, per_page_limit: int, total_bookings_recap: int
+    paginated_bookings: List[object],
+    page: Optional[int],
+    per_page_limit: int,
+    total_bookings_recap: int,
+    next_cursor: Optional[str] = None,
 ) -> BookingsRecapPaginated:
     return BookingsRecapPaginated(
         bookings_recap=[_serialize_booking_recap(booking) for booking in paginated_bookings],
         page=page,
         pages=int(math.ceil(total_bookings_recap / per_page_limit)),
         total=total_bookings_recap,
+        next_cursor=next_cursor,
     )
 
 
+def _get_bookings_recap_cursor(booking: AbstractKeyedTuple) -> str:
+    return BookingsRecapCursor(
+        booking_date=booking.bookingDate, booking_id=booking.bookingId, duplicate_index=booking.bookingDuplicateIndex
+    ).encode()
+
+
 def _apply_departement_timezone(naive_datetime: datetime, departement_code: str) -> datetime:
     return (
         naive_datetime.astimezone(tz.gettz(get_department_timezone(departement_code)))
@@ -1,9 +1,14 @@
 from datetime import date
 from typing import Iterable
+from typing import List
 
+from flask import current_app as app
 from requests import Response
 
 from pcapi import settings
+from pcapi.connectors import redis
+from pcapi.models.db import db
+from pcapi.utils.logger import logger
 from pcapi.utils.module_loading import import_string
 
 from . import models
@@ -15,28 +20,96 @@ class MailServiceException(Exception):
 
 def send(*, recipients: Iterable[str], data: dict) -> bool:
     """Try to send an e-mail and return whether it was successful."""
-    if isinstance(recipients, str):
-        if settings.IS_RUNNING_TESTS:
-            raise ValueError("Recipients should be a sequence, not a single string.")
-        recipients = [recipients]
+    recipients = _check_recipients(recipients)
     backend = import_string(settings.EMAIL_BACKEND)
     result = backend().send_mail(recipients=recipients, data=data)
     _save_email(result)
     return result.successful
 
 
-def _save_email(result: models.MailResult):
-    """Save email to the database with its status"""
-    email = models.Email(
+def send_later(*, recipients: Iterable[str], data: dict) -> None:
+    """Queue an e-mail that the worker sends in a batch with other e-mails.
+
+    The e-mail is sent right away when asynchronous dispatch is disabled,
+    or when it could not be queued.
+    """
+    recipients = _check_recipients(recipients)
+    if settings.EMAILS_DISPATCH_ASYNC:
+        if redis.add_email_to_send(app.redis_client, {"recipients": list(recipients), "data": data}):
+            if redis.schedule_emails_dispatch(app.redis_client):
+                # avoid import loop
+                from pcapi.workers.send_emails_job import send_emails_job
+
+                send_emails_job.delay()
+            return
+    send(recipients=recipients, data=data)
+
+
+def send_queued_emails() -> None:
+    """Send queued e-mails in batches, until the queue is empty.
+
+    E-mails that could not be sent are saved with the ERROR status. If a
+    batch cannot be saved, its e-mails that were not sent are queued again.
+    """
+    # The flag is cleared before the queue is drained, so that an e-mail
+    # queued while the last batch is being sent schedules another job.
+    redis.unschedule_emails_dispatch(app.redis_client)
+    backend = import_string(settings.EMAIL_BACKEND)()
+    while True:
+        emails = redis.pop_emails_to_send(app.redis_client, settings.EMAILS_DISPATCH_BATCH_SIZE)
+        if not emails:
+            break
+        try:
+            results = backend.send_mails([(email["recipients"], email["data"]) for email in emails])
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("Could not send %d queued e-mails: %s", len(emails), exc)
+            results = [
+                models.MailResult(sent_data=dict(email["data"], To=", ".join(email["recipients"])), successful=False)
+                for email in emails
+            ]
+        try:
+            _save_emails(results)
+        except Exception as exc:  # pylint: disable=broad-except
+            db.session.rollback()
+            unsent_emails = [email for email, result in zip(emails, results) if not result.successful]
+            logger.exception(
+                "Could not save %d e-mails, %d unsent ones queued again: %s", len(emails), len(unsent_emails), exc
+            )
+            redis.requeue_emails_to_send(app.redis_client, unsent_emails)
+            # The remaining e-mails are sent by the next dispatch
+            break
+
+
+def _check_recipients(recipients: Iterable[str]) -> Iterable[str]:
+    if isinstance(recipients, str):
+        if settings.IS_RUNNING_TESTS:
+            raise ValueError("Recipients should be a sequence, not a single string.")
+        recipients = [recipients]
+    return recipients
+
+
+def _build_email(result: models.MailResult) -> models.Email:
+    return models.Email(
         content=result.sent_data,
         status=models.EmailStatus.SENT if result.successful else models.EmailStatus.ERROR,
     )
+
+
+def _save_email(result: models.MailResult):
+    """Save email to the database with its status"""
+    email = _build_email(result)
     # FIXME (dbaty, 2020-02-08): avoid import loop. Again. Yes, it's on my todo list.
     from pcapi.repository import repository
 
     repository.save(email)
 
 
+def _save_emails(results: List[models.MailResult]) -> None:
+    """Save a batch of emails to the database in a single insert"""
+    db.session.bulk_save_objects([_build_email(result) for result in results])
+    db.session.commit()
+
+
 # FIXME (dbaty, 2020-02-02): returning a Response object is not very
 # friendly. Could we not return a boolean instead? Ditto for other
 # functions below.
@@ -1,5 +1,7 @@
 from datetime import date
 from typing import Iterable
+from typing import List
+from typing import Tuple
 
 from requests import Response
 
@@ -10,10 +12,21 @@ from ..models import MailResult
 
 class BaseBackend:
     def send_mail(self, recipients: Iterable[str], data: dict) -> MailResult:
+        recipients, data = self._prepare(recipients, data)
+        return self._send(recipients=recipients, data=data)
+
+    def send_mails(self, emails: Iterable[Tuple[Iterable[str], dict]]) -> List[MailResult]:
+        """Send several e-mails, in as few calls as the backend allows.
+
+        Results are returned in the order of the e-mails.
+        """
+        return [self.send_mail(recipients=recipients, data=data) for recipients, data in emails]
+
+    def _prepare(self, recipients: Iterable[str], data: dict) -> Tuple[Iterable[str], dict]:
         data.setdefault("FromEmail", settings.SUPPORT_EMAIL_ADDRESS)
         if "Vars" in data:
             data["Vars"].setdefault("env", "" if settings.IS_PROD else f"-{settings.ENV}")
-        return self._send(recipients=recipients, data=data)
+        return recipients, data
 
     def _send(self, recipients: Iterable, data: dict) -> MailResult:
         raise NotImplementedError()
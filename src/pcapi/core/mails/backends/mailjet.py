@@ -1,5 +1,8 @@
 import datetime
 from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
 
 import mailjet_rest
 from requests import Response
@@ -66,6 +69,43 @@ class MailjetBackend(BaseBackend):
             successful=successful,
         )
 
+    def send_mails(self, emails: Iterable[Tuple[Iterable[str], dict]]) -> List[MailResult]:
+        # All e-mails are posted in a single call to the multi-message send
+        # API. E-mails that already hold several messages are sent on their own.
+        emails = list(emails)
+        results: List[Optional[MailResult]] = [None] * len(emails)
+        messages_indexes = []
+        messages_data = []
+        for index, (recipients, data) in enumerate(emails):
+            if "Messages" in data:
+                results[index] = self.send_mail(recipients=recipients, data=data)
+                continue
+            recipients, data = self._prepare(recipients, data)
+            data["To"] = ", ".join(recipients)
+            if settings.MAILJET_TEMPLATE_DEBUGGING:
+                _add_template_debugging(data)
+            messages_indexes.append(index)
+            messages_data.append(data)
+
+        if not messages_data:
+            return results
+
+        try:
+            response = self.mailjet_client.send.create(
+                data={"Messages": messages_data}, timeout=settings.MAILJET_HTTP_TIMEOUT
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("Error trying to send %d e-mails with Mailjet: %s", len(messages_data), exc)
+            successful = False
+        else:
+            successful = response.status_code == 200
+            if not successful:
+                logger.warning("Got %d return code from Mailjet: content=%s", response.status_code, response.content)
+
+        for index, data in zip(messages_indexes, messages_data):
+            results[index] = MailResult(sent_data=data, successful=successful)
+        return results
+
     def create_contact(self, email: str) -> Response:
         data = {"Email": email}
         return self.mailjet_client.contact.create(data=data, timeout=settings.MAILJET_HTTP_TIMEOUT)
@@ -106,10 +146,10 @@ class ToDevMailjetBackend(MailjetBackend):
         )
         data["Html-part"] = notice + data["Html-part"]
 
-    def send_mail(self, recipients: Iterable[str], data: dict) -> MailResult:
+    def _prepare(self, recipients: Iterable[str], data: dict) -> Tuple[Iterable[str], dict]:
         self._inject_html_test_notice(recipients, data)
         recipients = [settings.DEV_EMAIL_ADDRESS]
-        return super().send_mail(recipients=recipients, data=data)
+        return super()._prepare(recipients, data)
 
     def create_contact(self, email: str) -> Response:
         email = settings.DEV_EMAIL_ADDRESS
@@ -1,4 +1,8 @@
+from functools import lru_cache
+import os
+
 from pcapi import settings
+from pcapi.core.object_storage.backends.base import BaseBackend
 from pcapi.models.db import Model
 from pcapi.utils.human_ids import humanize
 from pcapi.utils.inflect_engine import inflect_engine
@@ -52,16 +56,25 @@ def _get_backends() -> set:
     return backends_set
 
 
+@lru_cache(maxsize=None)
+def _get_backend(backend_path: str) -> BaseBackend:
+    # Backends are instantiated once per process so that their
+    # authenticated connections are reused between calls.
+    return import_string(backend_path)()
+
+
+# A forked process must not share the connections of its parent
+os.register_at_fork(after_in_child=_get_backend.cache_clear)
+
+
 def store_public_object(bucket: str, object_id: str, blob: bytes, content_type: str, symlink_path=None) -> None:
     for backend_path in _get_backends():
-        backend = import_string(backend_path)
-        backend().store_public_object(bucket, object_id, blob, content_type, symlink_path)
+        _get_backend(backend_path).store_public_object(bucket, object_id, blob, content_type, symlink_path)
 
 
 def delete_public_object(bucket: str, object_id: str) -> None:
     for backend_path in _get_backends():
-        backend = import_string(backend_path)
-        backend().delete_public_object(bucket, object_id)
+        _get_backend(backend_path).delete_public_object(bucket, object_id)
 
 
 def build_thumb_path(pc_object: Model, index: int) -> str:
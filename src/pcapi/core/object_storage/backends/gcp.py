@@ -1,3 +1,5 @@
+import threading
+
 from google.cloud.storage import Client
 from google.cloud.storage.bucket import Bucket
 from google.oauth2.service_account import Credentials
@@ -9,12 +11,19 @@ from .base import BaseBackend
 
 
 class GCPBackend(BaseBackend):
-    def get_gcp_storage_client_bucket(self) -> Bucket:
-        credentials = Credentials.from_service_account_info(settings.GCP_BUCKET_CREDENTIALS)
-        project_id = settings.GCP_BUCKET_CREDENTIALS.get("project_id")
-        storage_client = Client(credentials=credentials, project=project_id)
+    # The client, and the access token it holds, is created once per backend
+    def __init__(self):
+        self._bucket = None
+        self._bucket_lock = threading.Lock()
 
-        return storage_client.bucket(settings.GCP_BUCKET_NAME)
+    def get_gcp_storage_client_bucket(self) -> Bucket:
+        with self._bucket_lock:
+            if self._bucket is None:
+                credentials = Credentials.from_service_account_info(settings.GCP_BUCKET_CREDENTIALS)
+                project_id = settings.GCP_BUCKET_CREDENTIALS.get("project_id")
+                storage_client = Client(credentials=credentials, project=project_id)
+                self._bucket = storage_client.bucket(settings.GCP_BUCKET_NAME)
+            return self._bucket
 
     def store_public_object(
         self, bucket: str, object_id: str, blob: bytes, content_type: str, symlink_path: str = None
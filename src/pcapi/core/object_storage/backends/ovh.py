@@ -1,3 +1,7 @@
+import threading
+from typing import Optional
+from typing import Tuple
+
 import swiftclient
 
 from pcapi import settings
@@ -7,15 +11,41 @@ from .base import BaseBackend
 
 
 class OVHBackend(BaseBackend):
-    def swift_con(self):
-        return swiftclient.Connection(
-            user=settings.SWIFT_USER,
-            key=settings.SWIFT_KEY,
-            authurl=settings.SWIFT_AUTH_URL,
-            os_options={"region_name": settings.SWIFT_REGION_NAME},
-            tenant_name=settings.SWIFT_TENANT_NAME,
-            auth_version="3",
-        )
+    # swiftclient connections are not thread-safe: each thread gets its own
+    # connection, and they all start from the same Keystone token. When a
+    # connection authenticates again after a 401, its new token replaces the
+    # shared one, so that the other connections do not pay the same 401.
+    def __init__(self):
+        self._thread_local = threading.local()
+        self._auth_lock = threading.Lock()
+        self._auth: Optional[Tuple[str, str]] = None
+
+    def swift_con(self) -> swiftclient.Connection:
+        shared_auth = self._get_auth()
+        connection = getattr(self._thread_local, "connection", None)
+        if connection is None:
+            storage_url, token = shared_auth
+            connection = _build_swift_connection(preauthurl=storage_url, preauthtoken=token)
+            self._thread_local.connection = connection
+        elif self._thread_local.auth != shared_auth:
+            if connection.url != shared_auth[0]:
+                connection.http_conn = None
+            connection.url, connection.token = shared_auth
+        self._thread_local.auth = shared_auth
+        return connection
+
+    def _get_auth(self) -> Tuple[str, str]:
+        with self._auth_lock:
+            if self._auth is None:
+                self._auth = _build_swift_connection().get_auth()
+            return self._auth
+
+    def _share_auth(self, connection: swiftclient.Connection) -> None:
+        connection_auth = (connection.url, connection.token)
+        if connection.token is not None and connection_auth != self._thread_local.auth:
+            with self._auth_lock:
+                self._auth = connection_auth
+            self._thread_local.auth = connection_auth
 
     def store_public_object(
         self, bucket: str, object_id: str, blob: bytes, content_type: str, symlink_path: str = None
@@ -23,7 +53,11 @@ class OVHBackend(BaseBackend):
         container_name = settings.SWIFT_BUCKET_NAME
         try:
             storage_path = bucket + "/" + object_id
-            self.swift_con().put_object(container_name, storage_path, contents=blob, content_type=content_type)
+            connection = self.swift_con()
+            try:
+                connection.put_object(container_name, storage_path, contents=blob, content_type=content_type)
+            finally:
+                self._share_auth(connection)
         except Exception as exc:
             logger.exception("An error has occured while trying to upload file on OVH bucket: %s", exc)
             raise exc
@@ -32,7 +66,23 @@ class OVHBackend(BaseBackend):
         container_name = settings.SWIFT_BUCKET_NAME
         try:
             storage_path = bucket + "/" + object_id
-            self.swift_con().delete_object(container_name, storage_path)
+            connection = self.swift_con()
+            try:
+                connection.delete_object(container_name, storage_path)
+            finally:
+                self._share_auth(connection)
         except Exception as exc:
             logger.exception("An error has occured while trying to delete file on OVH bucket: %s", exc)
             raise exc
+
+
+def _build_swift_connection(**kwargs) -> swiftclient.Connection:
+    return swiftclient.Connection(
+        user=settings.SWIFT_USER,
+        key=settings.SWIFT_KEY,
+        authurl=settings.SWIFT_AUTH_URL,
+        os_options={"region_name": settings.SWIFT_REGION_NAME},
+        tenant_name=settings.SWIFT_TENANT_NAME,
+        auth_version="3",
+        **kwargs,
+    )
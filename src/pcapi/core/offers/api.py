@@ -179,6 +179,7 @@ def update_offer(  # pylint: disable=redefined-builtin
     if product_has_been_updated:
         repository.save(offer.product)
 
+    redis.delete_offer_response(client=app.redis_client, offer_id=offer.id)
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
         redis.add_offer_id(client=app.redis_client, offer_id=offer.id)
 
@@ -192,8 +193,10 @@ def update_offers_active_status(query, is_active):
     query_to_update.update({"isActive": is_active}, synchronize_session=False)
     db.session.commit()
 
+    offer_ids = {offer_id for offer_id, in query.with_entities(Offer.id)}
+    for offer_id in offer_ids:
+        redis.delete_offer_response(client=app.redis_client, offer_id=offer_id)
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
-        offer_ids = {offer_id for offer_id, in query.with_entities(Offer.id)}
         for offer_id in offer_ids:
             redis.add_offer_id(client=app.redis_client, offer_id=offer_id)
 
@@ -337,6 +340,7 @@ def upsert_stocks(
         previous_beginning = edited_stocks_previous_beginnings[stock.id]
         if stock.beginningDatetime != previous_beginning:
             _notify_beneficiaries_upon_stock_edit(stock)
+    redis.delete_offer_response(client=app.redis_client, offer_id=offer.id)
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
         redis.add_offer_id(client=app.redis_client, offer_id=offer.id)
 
@@ -373,6 +377,7 @@ def delete_stock(stock: Stock) -> None:
         except mailing.MailServiceException as exc:
             app.logger.exception("Could not notify offerer about deletion of stock=%s: %s", stock.id, exc)
 
+    redis.delete_offer_response(client=app.redis_client, offer_id=stock.offerId)
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
         redis.add_offer_id(client=app.redis_client, offer_id=stock.offerId)
 
@@ -399,6 +404,7 @@ def create_mediation(
     mediation.thumbCount = 1
     repository.save(mediation)
 
+    redis.delete_offer_response(client=app.redis_client, offer_id=offer.id)
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
         redis.add_offer_id(client=app.redis_client, offer_id=offer.id)
 
@@ -410,6 +416,7 @@ def update_mediation(mediation: Mediation, is_active: bool) -> Mediation:
     mediation.isActive = is_active
     repository.save(mediation)
 
+    redis.delete_offer_response(client=app.redis_client, offer_id=mediation.offerId)
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
         redis.add_offer_id(client=app.redis_client, offer_id=mediation.offerId)
 
@@ -463,6 +470,7 @@ def create_mediation_v2(
             else:
                 repository.delete(previous_mediation)
 
+        redis.delete_offer_response(client=app.redis_client, offer_id=offer.id)
         if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
             redis.add_offer_id(client=app.redis_client, offer_id=offer.id)
 
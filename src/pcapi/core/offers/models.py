@@ -19,6 +19,7 @@ from sqlalchemy import String
 from sqlalchemy import Text
 from sqlalchemy import event
 from sqlalchemy import false
+from sqlalchemy import text
 from sqlalchemy.event import listens_for
 from sqlalchemy.orm import relationship
 
@@ -82,6 +83,14 @@ class Stock(PcObject, Model, ProvidableMixin, SoftDeletableMixin, VersionedMixin
 
     bookingLimitDatetime = Column(DateTime, nullable=True)
 
+    __table_args__ = (
+        Index(
+            "idx_stock_bookingLimitDatetime_not_soft_deleted",
+            "bookingLimitDatetime",
+            postgresql_where=text('NOT "isSoftDeleted"'),
+        ),
+    )
+
     @property
     def isBookable(self):  # pylint: disable=too-many-return-statements
         if self.hasBookingLimitDatetimePassed:
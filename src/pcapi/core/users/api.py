@@ -2,16 +2,24 @@ from datetime import date
 from datetime import datetime
 from datetime import timedelta
 import secrets
+from typing import List
 from typing import Optional
 
+from flask import has_request_context
+from flask import request
 from jwt import DecodeError
 from jwt import ExpiredSignatureError
 from jwt import InvalidSignatureError
 from jwt import InvalidTokenError
+from sqlalchemy import case
+from sqlalchemy import func
 
 from pcapi import settings
 from pcapi.core import mails
 from pcapi.core.bookings.conf import LIMIT_CONFIGURATIONS
+from pcapi.core.bookings.models import Booking
+from pcapi.core.offers.models import Offer
+from pcapi.core.offers.models import Stock
 from pcapi.core.payments import api as payment_api
 from pcapi.core.users.models import Expense
 from pcapi.core.users.models import ExpenseDomain
@@ -248,31 +256,55 @@ def _build_link_for_email_change(current_email: str, new_email: str) -> str:
     return f"{settings.WEBAPP_URL}/email-change?token={token}&expiration_timestamp={int(expiration_date.timestamp())}"
 
 
-def user_expenses(user: User):
+def user_expenses(user: User) -> List[Expense]:
+    # Expenses are computed at most once per request, since booking
+    # validation and the serialization of the user both need them.
+    if not has_request_context():
+        return _compute_user_expenses(user)
+
+    if not hasattr(request, "_cached_expenses"):
+        setattr(request, "_cached_expenses", {})
+    if user.id not in request._cached_expenses:
+        request._cached_expenses[user.id] = _compute_user_expenses(user)
+    return request._cached_expenses[user.id]
+
+
+def clear_user_expenses_cache(user: User) -> None:
+    if has_request_context() and hasattr(request, "_cached_expenses"):
+        request._cached_expenses.pop(user.id, None)
+
+
+def _compute_user_expenses(user: User) -> List[Expense]:
     version = user.deposit_version
 
     if not version:
         return []
 
-    bookings = user.get_not_cancelled_bookings()
     config = LIMIT_CONFIGURATIONS[version]
+    total_amount = Booking.amount * Booking.quantity
+    all_bookings_total, digital_bookings_total, physical_bookings_total = (
+        db.session.query(
+            func.coalesce(func.sum(total_amount), 0),
+            func.coalesce(func.sum(case([(config.digital_cap_clause(), total_amount)], else_=0)), 0),
+            func.coalesce(func.sum(case([(config.physical_cap_clause(), total_amount)], else_=0)), 0),
+        )
+        .select_from(Booking)
+        .join(Stock)
+        .join(Offer)
+        .filter(Booking.userId == user.id, Booking.isCancelled.is_(False))
+        .one()
+    )
 
     limits = [
         Expense(
             domain=ExpenseDomain.ALL,
-            current=sum(booking.total_amount for booking in bookings),
+            current=all_bookings_total,
             limit=config.TOTAL_CAP,
         )
     ]
     if config.DIGITAL_CAP:
-        digital_bookings_total = sum(
-            [booking.total_amount for booking in bookings if config.digital_cap_applies(booking.stock.offer)]
-        )
         limits.append(Expense(domain=ExpenseDomain.DIGITAL, current=digital_bookings_total, limit=config.DIGITAL_CAP))
     if config.PHYSICAL_CAP:
-        physical_bookings_total = sum(
-            [booking.total_amount for booking in bookings if config.physical_cap_applies(booking.stock.offer)]
-        )
         limits.append(
             Expense(
                 domain=ExpenseDomain.PHYSICAL,
@@ -20,13 +20,10 @@ from sqlalchemy import String
 from sqlalchemy import Text
 from sqlalchemy import func
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import expression
 
 from pcapi import settings
-from pcapi.core.bookings.models import Booking
-from pcapi.core.offers.models import Stock
 from pcapi.core.users import constants
 from pcapi.models.db import Model
 from pcapi.models.db import db
@@ -214,15 +211,6 @@ class User(PcObject, Model, NeedsValidationMixin, VersionedMixin):
         self.resetPasswordToken = None
         self.resetPasswordTokenValidityLimit = None
 
-    def get_not_cancelled_bookings(self) -> Booking:
-        return (
-            db.session.query(Booking)
-            .with_parent(self)
-            .filter_by(isCancelled=False)
-            .options(joinedload(Booking.stock).joinedload(Stock.offer))
-            .all()
-        )
-
     def calculate_age(self) -> Optional[int]:
         if self.dateOfBirth is None:
             return None
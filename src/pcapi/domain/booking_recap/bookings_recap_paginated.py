@@ -1,17 +1,41 @@
+from base64 import urlsafe_b64decode
+from base64 import urlsafe_b64encode
+from datetime import datetime
 from typing import List
+from typing import NamedTuple
+from typing import Optional
 
 from pcapi.domain.booking_recap.booking_recap import BookingRecap
 
 
+class BookingsRecapCursor(NamedTuple):
+    booking_date: datetime
+    booking_id: int
+    # Duo bookings are listed twice: 1 for the first item, 2 for the second
+    duplicate_index: int
+
+    def encode(self) -> str:
+        cursor = "%s|%i|%i" % (self.booking_date.isoformat(), self.booking_id, self.duplicate_index)
+        return urlsafe_b64encode(cursor.encode()).decode()
+
+    @classmethod
+    def decode(cls, encoded_cursor: str) -> "BookingsRecapCursor":
+        # Raises ValueError when the cursor was not built by encode()
+        booking_date, booking_id, duplicate_index = urlsafe_b64decode(encoded_cursor.encode()).decode().split("|")
+        return cls(datetime.fromisoformat(booking_date), int(booking_id), int(duplicate_index))
+
+
 class BookingsRecapPaginated:
     def __init__(
         self,
         bookings_recap: List[BookingRecap],
-        page: int,
+        page: Optional[int],
         pages: int,
         total: int,
+        next_cursor: Optional[str] = None,
     ):
         self.bookings_recap = bookings_recap
         self.page = page
         self.pages = pages
         self.total = total
+        self.next_cursor = next_cursor
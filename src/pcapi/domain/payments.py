@@ -2,29 +2,44 @@ import csv
 from datetime import datetime
 from datetime import timedelta
 from decimal import Decimal
+from functools import lru_cache
 from hashlib import sha256
 from io import BytesIO
 from io import StringIO
 import itertools
+from pathlib import Path
 from typing import Dict
+from typing import IO
+from typing import Iterable
 from typing import List
+from typing import NamedTuple
 from typing import Set
 from typing import Tuple
+from typing import Union
 import uuid
 from uuid import UUID
 
-from flask import render_template
 from lxml import etree
 
+import pcapi
 from pcapi.domain.bank_account import format_raw_iban_and_bic
 from pcapi.domain.reimbursement import BookingReimbursement
 from pcapi.models import PaymentMessage
+from pcapi.models import Venue
 from pcapi.models.payment import Payment
 from pcapi.models.payment_status import TransactionStatus
 from pcapi.models.wallet_balance import WalletBalance
 from pcapi.utils.human_ids import humanize
 
 
+MISSING_BANK_INFORMATION_DETAIL = "IBAN et BIC manquants sur l'offreur"
+
+MESSAGE_FILE_NAMESPACE = "urn:iso:std:iso:20022:tech:xsd:pain.001.001.03"
+MESSAGE_FILE_SCHEMA_PATH = Path(pcapi.__path__[0]) / "templates" / "transactions" / "transaction_banque_de_france.xsd"
+MESSAGE_FILE_INDENTATION = "    "
+PASS_CULTURE_NAME = "pass Culture"
+
+
 class UnmatchedPayments(Exception):
     def __init__(self, payment_ids: Set[int]):
         super().__init__()
@@ -51,6 +66,23 @@ class Transaction:
         self.custom_message = custom_message
 
 
+class XmlNode(NamedTuple):
+    tag: str
+    # Either the text of the element or an iterable of XmlNode children
+    content: Union[str, Iterable]
+    attributes: Dict[str, str] = {}
+
+
+class _HashingWriter:
+    def __init__(self, output: IO[bytes]):
+        self.output = output
+        self.hash = sha256()
+
+    def write(self, data: bytes) -> int:
+        self.hash.update(data)
+        return self.output.write(data)
+
+
 class PaymentDetails:
     CSV_HEADER = [
         "ID de l'utilisateur",
@@ -127,26 +159,56 @@ def create_payment_for_booking(booking_reimbursement: BookingReimbursement) -> P
     payment.reimbursementRate = booking_reimbursement.reimbursement.value.rate
     payment.author = "batch"
     payment.transactionLabel = make_transaction_label(datetime.utcnow())
-
-    if venue.iban:
-        payment.iban = format_raw_iban_and_bic(venue.iban)
-        payment.bic = format_raw_iban_and_bic(venue.bic)
-    else:
-        offerer = venue.managingOfferer
-        payment.iban = format_raw_iban_and_bic(offerer.iban)
-        payment.bic = format_raw_iban_and_bic(offerer.bic)
-
+    payment.iban, payment.bic = _get_payment_iban_and_bic(venue)
     payment.recipientName = venue.managingOfferer.name
     payment.recipientSiren = venue.managingOfferer.siren
 
     if payment.iban:
         payment.setStatus(TransactionStatus.PENDING)
     else:
-        payment.setStatus(TransactionStatus.NOT_PROCESSABLE, detail="IBAN et BIC manquants sur l'offreur")
+        payment.setStatus(TransactionStatus.NOT_PROCESSABLE, detail=MISSING_BANK_INFORMATION_DETAIL)
 
     return payment
 
 
+def create_payment_rows_for_booking(
+    booking_reimbursement: BookingReimbursement, payment_id: int, transaction_label: str
+) -> Tuple[Dict, Dict]:
+    """Return the payment and payment status columns of
+    create_payment_for_booking(), to be bulk inserted.
+    """
+    venue = booking_reimbursement.booking.stock.offer.venue
+    iban, bic = _get_payment_iban_and_bic(venue)
+
+    payment_row = {
+        "id": payment_id,
+        "bookingId": booking_reimbursement.booking.id,
+        "amount": booking_reimbursement.reimbursed_amount,
+        "reimbursementRule": booking_reimbursement.reimbursement.value.description,
+        "reimbursementRate": booking_reimbursement.reimbursement.value.rate,
+        "author": "batch",
+        "transactionLabel": transaction_label,
+        "iban": iban,
+        "bic": bic,
+        "recipientName": venue.managingOfferer.name,
+        "recipientSiren": venue.managingOfferer.siren,
+    }
+    payment_status_row = {
+        "paymentId": payment_id,
+        "date": datetime.utcnow(),
+        "status": TransactionStatus.PENDING if iban else TransactionStatus.NOT_PROCESSABLE,
+        "detail": None if iban else MISSING_BANK_INFORMATION_DETAIL,
+    }
+    return payment_row, payment_status_row
+
+
+def _get_payment_iban_and_bic(venue: Venue) -> Tuple[str, str]:
+    if venue.iban:
+        return format_raw_iban_and_bic(venue.iban), format_raw_iban_and_bic(venue.bic)
+    offerer = venue.managingOfferer
+    return format_raw_iban_and_bic(offerer.iban), format_raw_iban_and_bic(offerer.bic)
+
+
 def filter_out_already_paid_for_bookings(
     booking_reimbursements: List[BookingReimbursement],
 ) -> List[BookingReimbursement]:
@@ -168,34 +230,93 @@ def keep_only_not_processable_payments(payments: List[Payment]) -> List[Payment]
 def generate_message_file(
     payments: List[Payment], pass_culture_iban: str, pass_culture_bic: str, message_name: str, remittance_code: str
 ) -> str:
+    message_file = BytesIO()
+    write_message_file(message_file, payments, pass_culture_iban, pass_culture_bic, message_name, remittance_code)
+    return message_file.getvalue().decode("utf-8")
+
+
+def write_message_file(
+    output: IO[bytes],
+    payments: List[Payment],
+    pass_culture_iban: str,
+    pass_culture_bic: str,
+    message_name: str,
+    remittance_code: str,
+) -> bytes:
+    """Write the SEPA credit transfer message of the payments to output, one
+    transaction at a time, and return the checksum of the written bytes.
+    """
     transactions = _group_payments_into_transactions(payments)
-    total_amount = sum([transaction.amount for transaction in transactions])
+    total_amount = str(sum([transaction.amount for transaction in transactions]))
+    number_of_transactions = str(len(transactions))
     now = datetime.utcnow()
 
-    return render_template(
-        "transactions/transaction_banque_de_france.xml",
-        message_name=message_name,
-        creation_datetime=now.isoformat(),
-        requested_execution_datetime=datetime.strftime(now + timedelta(days=7), "%Y-%m-%d"),
-        transactions=transactions,
-        number_of_transactions=len(transactions),
-        total_amount=total_amount,
-        pass_culture_iban=pass_culture_iban,
-        pass_culture_bic=pass_culture_bic,
-        initiating_party_id=remittance_code,
+    group_header = XmlNode(
+        "GrpHdr",
+        [
+            XmlNode("MsgId", message_name),
+            XmlNode("CreDtTm", now.isoformat()),
+            XmlNode("NbOfTxs", number_of_transactions),
+            XmlNode("CtrlSum", total_amount),
+            XmlNode(
+                "InitgPty",
+                [
+                    XmlNode("Nm", PASS_CULTURE_NAME),
+                    XmlNode("Id", [XmlNode("OrgId", [XmlNode("Othr", [XmlNode("Id", remittance_code)])])]),
+                ],
+            ),
+        ],
+    )
+    payment_information = XmlNode(
+        "PmtInf",
+        itertools.chain(
+            [
+                XmlNode("PmtInfId", message_name),
+                XmlNode("PmtMtd", "TRF"),
+                XmlNode("NbOfTxs", number_of_transactions),
+                XmlNode("CtrlSum", total_amount),
+                XmlNode(
+                    "PmtTpInf",
+                    [XmlNode("SvcLvl", [XmlNode("Cd", "SEPA")]), XmlNode("CtgyPurp", [XmlNode("Cd", "GOVT")])],
+                ),
+                XmlNode("ReqdExctnDt", datetime.strftime(now + timedelta(days=7), "%Y-%m-%d")),
+                XmlNode("Dbtr", [XmlNode("Nm", PASS_CULTURE_NAME)]),
+                XmlNode("DbtrAcct", [XmlNode("Id", [XmlNode("IBAN", pass_culture_iban)])]),
+                XmlNode("DbtrAgt", [XmlNode("FinInstnId", [XmlNode("BIC", pass_culture_bic)])]),
+                XmlNode("ChrgBr", "SLEV"),
+            ],
+            (_build_credit_transfer_node(transaction) for transaction in transactions),
+        ),
     )
 
-
-def validate_message_file_structure(transaction_file: str):
-    xsd = render_template("transactions/transaction_banque_de_france.xsd")
-    xsd_doc = etree.parse(BytesIO(xsd.encode()))
-    xsd_schema = etree.XMLSchema(xsd_doc)
-
-    encoded_file = transaction_file.encode("utf-8")
-    xml = BytesIO(encoded_file)
-    xml_doc = etree.parse(xml)
-
-    xsd_schema.assertValid(xml_doc)
+    hashing_output = _HashingWriter(output)
+    with etree.xmlfile(hashing_output, encoding="UTF-8") as message_file:
+        message_file.write_declaration()
+        with message_file.element(_qualify_tag("Document"), nsmap={None: MESSAGE_FILE_NAMESPACE}):
+            _write_xml_nodes(message_file, [XmlNode("CstmrCdtTrfInitn", [group_header, payment_information])], 1)
+            message_file.write("\n")
+    return hashing_output.hash.digest()
+
+
+def validate_message_file_structure(transaction_file: Union[str, IO[bytes]]) -> None:
+    if isinstance(transaction_file, str):
+        transaction_file = BytesIO(transaction_file.encode("utf-8"))
+    schema = _get_message_file_schema()
+    start_position = transaction_file.tell()
+
+    try:
+        # The file is validated while it is parsed, and transactions are
+        # dropped once parsed, so that the document is never loaded in memory.
+        for _, element in etree.iterparse(transaction_file, schema=schema, tag=_qualify_tag("CdtTrfTxInf")):
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    except etree.XMLSyntaxError:
+        # Errors raised while parsing do not tell the line of the invalid
+        # element: the file is parsed again to raise a detailed DocumentInvalid.
+        transaction_file.seek(start_position)
+        schema.assertValid(etree.parse(transaction_file))
+        raise
 
 
 def generate_file_checksum(file: str):
@@ -299,3 +420,48 @@ def _group_payments_into_transactions(payments: List[Payment]) -> List[Transacti
             )
         )
     return transactions
+
+
+def _build_credit_transfer_node(transaction: Transaction) -> XmlNode:
+    return XmlNode(
+        "CdtTrfTxInf",
+        [
+            XmlNode("PmtId", [XmlNode("EndToEndId", transaction.end_to_end_id.hex)]),
+            XmlNode("Amt", [XmlNode("InstdAmt", str(transaction.amount), {"Ccy": "EUR"})]),
+            XmlNode("UltmtDbtr", [XmlNode("Nm", PASS_CULTURE_NAME)]),
+            XmlNode("CdtrAgt", [XmlNode("FinInstnId", [XmlNode("BIC", str(transaction.creditor_bic))])]),
+            XmlNode(
+                "Cdtr",
+                [
+                    XmlNode("Nm", str(transaction.creditor_name)),
+                    XmlNode(
+                        "Id",
+                        [XmlNode("OrgId", [XmlNode("Othr", [XmlNode("Id", str(transaction.creditor_siren))])])],
+                    ),
+                ],
+            ),
+            XmlNode("CdtrAcct", [XmlNode("Id", [XmlNode("IBAN", str(transaction.creditor_iban))])]),
+            XmlNode("Purp", [XmlNode("Cd", "GOVT")]),
+            XmlNode("RmtInf", [XmlNode("Ustrd", str(transaction.custom_message))]),
+        ],
+    )
+
+
+def _write_xml_nodes(message_file: etree.xmlfile, nodes: Iterable[XmlNode], depth: int) -> None:
+    for node in nodes:
+        message_file.write("\n" + MESSAGE_FILE_INDENTATION * depth)
+        with message_file.element(_qualify_tag(node.tag), node.attributes):
+            if isinstance(node.content, str):
+                message_file.write(node.content)
+            else:
+                _write_xml_nodes(message_file, node.content, depth + 1)
+                message_file.write("\n" + MESSAGE_FILE_INDENTATION * depth)
+
+
+def _qualify_tag(tag: str) -> str:
+    return "{%s}%s" % (MESSAGE_FILE_NAMESPACE, tag)
+
+
+@lru_cache()
+def _get_message_file_schema() -> etree.XMLSchema:
+    return etree.XMLSchema(etree.parse(str(MESSAGE_FILE_SCHEMA_PATH)))
@@ -3,7 +3,11 @@ from abc import abstractmethod
 import datetime
 from decimal import Decimal
 from enum import Enum
+from typing import Dict
 from typing import List
+from typing import Sequence
+
+import numpy
 
 from pcapi.models import Booking
 from pcapi.models import ThingType
@@ -11,6 +15,7 @@ from pcapi.models import ThingType
 
 MIN_DATETIME = datetime.datetime(datetime.MINYEAR, 1, 1)
 MAX_DATETIME = datetime.datetime(datetime.MAXYEAR, 1, 1)
+CENTS_PER_EURO = 100
 
 
 class ReimbursementRule(ABC):
@@ -211,3 +216,137 @@ def _find_potential_rules(
             reimbursed_amount = rule.value.apply(booking)
             relevant_rules.append(AppliedReimbursement(rule, reimbursed_amount))
     return relevant_rules
+
+
+class BookingReimbursementColumns:
+    """Bookings to reimburse, stored as one array per attribute, in the order
+    in which they would be given to find_all_booking_reimbursements.
+
+    `bookings` are given back as is in the BookingReimbursement objects, so
+    that audits can build the columns from a plain query and pass booking ids
+    instead of Booking objects.
+    """
+
+    def __init__(
+        self,
+        bookings: Sequence,
+        amounts: Sequence[Decimal],
+        quantities: Sequence[int],
+        offer_types: Sequence[str],
+        offers_are_digital: Sequence[bool],
+        products_are_digital: Sequence[bool],
+        dates_created: Sequence[datetime.datetime],
+        venue_ids: Sequence[int],
+    ):
+        self.bookings = list(bookings)
+        self.amounts = numpy.array(amounts, dtype=object)
+        self.quantities = numpy.array(quantities, dtype=numpy.int64)
+        self.offer_types = numpy.array(offer_types, dtype=object)
+        self.offers_are_digital = numpy.array(offers_are_digital, dtype=bool)
+        self.products_are_digital = numpy.array(products_are_digital, dtype=bool)
+        self.years = numpy.array([date_created.year for date_created in dates_created], dtype=numpy.int64)
+        self.venue_ids = numpy.array(venue_ids, dtype=numpy.int64)
+
+    @classmethod
+    def from_bookings(cls, bookings: List[Booking]) -> "BookingReimbursementColumns":
+        offers = [booking.stock.offer for booking in bookings]
+        return cls(
+            bookings=bookings,
+            amounts=[booking.amount for booking in bookings],
+            quantities=[booking.quantity for booking in bookings],
+            offer_types=[offer.type for offer in offers],
+            offers_are_digital=[offer.isDigital for offer in offers],
+            products_are_digital=[offer.product.isDigital for offer in offers],
+            dates_created=[booking.dateCreated for booking in bookings],
+            venue_ids=[offer.venueId for offer in offers],
+        )
+
+
+def find_all_booking_reimbursements_in_batch(
+    columns: BookingReimbursementColumns, active_rules: List[ReimbursementRules]
+) -> List[BookingReimbursement]:
+    """Same as find_all_booking_reimbursements, with every rule evaluated on
+    all bookings at once.
+
+    Cumulative values are computed per venue and civil year, since payments
+    are generated by calling find_all_booking_reimbursements with the
+    bookings of one venue at a time. Like find_all_booking_reimbursements,
+    the validity dates of the rules are not taken into account.
+    """
+    if not columns.bookings:
+        return []
+
+    total_amounts = columns.amounts * columns.quantities
+    # Amounts have two decimal places, so that cumulative values can be
+    # computed and compared exactly in cents.
+    total_amounts_in_cents = (total_amounts * CENTS_PER_EURO).astype(numpy.int64)
+
+    relevant_bookings_by_rule = _find_relevant_bookings_by_rule(columns, total_amounts_in_cents)
+    is_relevant = numpy.array([relevant_bookings_by_rule[rule] for rule in active_rules], dtype=bool)
+    if not is_relevant.any(axis=0).all():
+        raise ValueError("No reimbursement rule is relevant for some bookings")
+
+    # The elected rule is the relevant rule with the lowest reimbursed amount,
+    # i.e. the lowest rate for positive amounts. Ties go to the first rule, as
+    # with min().
+    rates = numpy.array([float(rule.value.rate) for rule in active_rules])
+    amount_order = numpy.where(is_relevant, numpy.outer(rates, numpy.sign(total_amounts_in_cents)), numpy.inf)
+    elected_rule_indexes = numpy.argmin(amount_order, axis=0)
+    if ReimbursementRules.BOOK_REIMBURSEMENT in active_rules:
+        book_rule_index = active_rules.index(ReimbursementRules.BOOK_REIMBURSEMENT)
+        elected_rule_indexes = numpy.where(is_relevant[book_rule_index], book_rule_index, elected_rule_indexes)
+
+    elected_rules = numpy.array(active_rules, dtype=object)[elected_rule_indexes]
+    elected_rates = numpy.array([rule.value.rate for rule in active_rules], dtype=object)[elected_rule_indexes]
+    reimbursed_amounts = total_amounts * elected_rates
+
+    return [
+        BookingReimbursement(booking, rule, Decimal(reimbursed_amount))
+        for booking, rule, reimbursed_amount in zip(columns.bookings, elected_rules, reimbursed_amounts)
+    ]
+
+
+def _find_relevant_bookings_by_rule(
+    columns: BookingReimbursementColumns, total_amounts_in_cents: numpy.ndarray
+) -> Dict[ReimbursementRules, numpy.ndarray]:
+    book_offers = columns.offer_types == str(ThingType.LIVRE_EDITION)
+    cinema_card_offers = columns.offer_types == str(ThingType.CINEMA_CARD)
+    offers_are_an_exception = book_offers | cinema_card_offers
+    physical_offers = offers_are_an_exception | ~columns.offers_are_digital
+    non_digital_products = ~columns.products_are_digital
+
+    cumulative_values_in_cents = _cumulative_sum_by_group(
+        numpy.where(physical_offers, total_amounts_in_cents, 0), columns.venue_ids, columns.years
+    )
+    above_20000 = cumulative_values_in_cents > 20000 * CENTS_PER_EURO
+    above_40000 = cumulative_values_in_cents > 40000 * CENTS_PER_EURO
+    above_150000 = cumulative_values_in_cents > 150000 * CENTS_PER_EURO
+
+    return {
+        ReimbursementRules.DIGITAL_THINGS: columns.offers_are_digital & ~offers_are_an_exception,
+        ReimbursementRules.PHYSICAL_OFFERS: physical_offers,
+        ReimbursementRules.BETWEEN_20000_AND_40000_EUROS: non_digital_products & above_20000 & ~above_40000,
+        ReimbursementRules.BETWEEN_40000_AND_150000_EUROS: non_digital_products & above_40000 & ~above_150000,
+        ReimbursementRules.ABOVE_150000_EUROS: non_digital_products & above_150000,
+        ReimbursementRules.BOOK_REIMBURSEMENT: book_offers & above_20000,
+    }
+
+
+def _cumulative_sum_by_group(values: numpy.ndarray, *group_keys: numpy.ndarray) -> numpy.ndarray:
+    # lexsort is stable, so that the values of a group keep their order
+    order = numpy.lexsort(group_keys[::-1])
+    sorted_values = values[order]
+    sorted_keys = [group_key[order] for group_key in group_keys]
+
+    starts_group = numpy.zeros(len(values), dtype=bool)
+    starts_group[0] = True
+    for sorted_key in sorted_keys:
+        starts_group[1:] |= sorted_key[1:] != sorted_key[:-1]
+
+    sorted_sums = numpy.cumsum(sorted_values)
+    sums_before_groups = (sorted_sums - sorted_values)[starts_group]
+    group_indexes = numpy.cumsum(starts_group) - 1
+
+    cumulative_sums = numpy.empty_like(sorted_sums)
+    cumulative_sums[order] = sorted_sums - sums_before_groups[group_indexes]
+    return cumulative_sums
@@ -54,12 +54,12 @@ def send_booking_recap_emails(booking: Booking) -> None:
         recipients.append(booking_email)
 
     data = retrieve_data_for_offerer_booking_recap_email(booking)
-    mails.send(recipients=recipients, data=data)
+    mails.send_later(recipients=recipients, data=data)
 
 
 def send_booking_confirmation_email_to_beneficiary(booking: Booking) -> None:
     data = retrieve_data_for_beneficiary_booking_confirmation_email(booking)
-    mails.send(recipients=[booking.user.email], data=data)
+    mails.send_later(recipients=[booking.user.email], data=data)
 
 
 def send_beneficiary_booking_cancellation_email(booking: Booking) -> None:
@@ -39,6 +39,7 @@ ORIGINAL_VERSION_SUFFIX = "VO"
 class AllocineStocks(LocalProvider):
     name = "Allociné"
     can_create = True
+    line_state_attributes = ("movie_information", "filtered_movie_showtimes")
 
     def __init__(self, allocine_venue_provider: AllocineVenueProvider):
         super().__init__(allocine_venue_provider)
@@ -1,27 +1,42 @@
+from collections import defaultdict
 from typing import Dict
+from typing import Iterable
 from typing import Optional
 
 from pcapi.local_providers.providable_info import ProvidableInfo
 from pcapi.models.db import Model
-from pcapi.repository.providable_queries import get_existing_object
+from pcapi.repository.providable_queries import get_existing_objects
 from pcapi.repository.providable_queries import insert_chunk
 from pcapi.repository.providable_queries import update_chunk
+from pcapi.repository.providable_queries import upsert_chunk
 
 
 def get_existing_pc_obj(
-    providable_info: ProvidableInfo, chunk_to_insert: Dict, chunk_to_update: Dict
+    providable_info: ProvidableInfo, chunk_to_insert: Dict, chunk_to_update: Dict, existing_objects: Dict[str, Model]
 ) -> Optional[Model]:
     object_in_current_chunk = get_object_from_current_chunks(providable_info, chunk_to_insert, chunk_to_update)
     if object_in_current_chunk is None:
-        return get_existing_object(providable_info.type, providable_info.id_at_providers)
+        return existing_objects.get(_build_chunk_key(providable_info.id_at_providers, providable_info.type.__name__))
 
     return object_in_current_chunk
 
 
+def get_existing_objects_by_chunk_key(providable_infos: Iterable[ProvidableInfo]) -> Dict[str, Model]:
+    ids_at_providers_by_model = defaultdict(set)
+    for providable_info in providable_infos:
+        ids_at_providers_by_model[providable_info.type].add(providable_info.id_at_providers)
+
+    existing_objects = {}
+    for model_type, ids_at_providers in ids_at_providers_by_model.items():
+        for pc_object in get_existing_objects(model_type, list(ids_at_providers)):
+            existing_objects.setdefault(_build_chunk_key(pc_object.idAtProviders, model_type.__name__), pc_object)
+    return existing_objects
+
+
 def get_object_from_current_chunks(
     providable_info: ProvidableInfo, chunk_to_insert: Dict, chunk_to_update: Dict
 ) -> Optional[Model]:
-    chunk_key = f"{providable_info.id_at_providers}|{providable_info.type.__name__}"
+    chunk_key = _build_chunk_key(providable_info.id_at_providers, providable_info.type.__name__)
     pc_object = chunk_to_insert.get(chunk_key)
     if isinstance(pc_object, providable_info.type):
         return pc_object
@@ -31,9 +46,18 @@ def get_object_from_current_chunks(
     return None
 
 
-def save_chunks(chunk_to_insert: Dict[str, Model], chunk_to_update: Dict[str, Model]):
+def save_chunks(chunk_to_insert: Dict[str, Model], chunk_to_update: Dict[str, Model], with_copy: bool = False):
+    if with_copy:
+        if len(chunk_to_insert) + len(chunk_to_update) > 0:
+            upsert_chunk({**chunk_to_insert, **chunk_to_update})
+        return
+
     if len(chunk_to_insert) > 0:
         insert_chunk(chunk_to_insert)
 
     if len(chunk_to_update) > 0:
         update_chunk(chunk_to_update)
+
+
+def _build_chunk_key(id_at_providers: str, model_name: str) -> str:
+    return f"{id_at_providers}|{model_name}"
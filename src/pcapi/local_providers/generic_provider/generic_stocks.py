@@ -1,9 +1,13 @@
+from collections import deque
 from datetime import datetime
 from typing import List
 
 from sqlalchemy import Sequence
+from sqlalchemy import text
 
-from pcapi.core.bookings.repository import count_not_cancelled_bookings_quantity_by_stock_id
+from pcapi.core.offers.repository import get_offers_map_by_id_at_providers
+from pcapi.core.offers.repository import get_products_map_by_id_at_providers
+from pcapi.core.offers.repository import get_stocks_by_id_at_providers
 from pcapi.local_providers.local_provider import LocalProvider
 from pcapi.local_providers.providable_info import ProvidableInfo
 from pcapi.models import Offer
@@ -11,7 +15,6 @@ from pcapi.models import Stock
 from pcapi.models import VenueProvider
 from pcapi.models.db import Model
 from pcapi.models.db import db
-from pcapi.repository import product_queries
 
 
 class GenericStocks(LocalProvider):
@@ -21,6 +24,9 @@ class GenericStocks(LocalProvider):
     # The following attributes MAY be overriden by subclasses
     can_create = True
     price_divider_to_euro = None
+    # new_offer_ids is shared by the lines of a page: the ids allocated for a
+    # page are not used up by the lines of the previous one.
+    line_state_attributes = ("provider_stocks", "product", "stocks_by_id_at_providers", "new_offer_ids")
 
     def __init__(
         self,
@@ -35,18 +41,19 @@ class GenericStocks(LocalProvider):
         self.modified_since = venue_provider.lastSyncDate
         self.product = None
         self.offer_id = None
+        self.products_by_isbn = {}
+        self.stocks_by_id_at_providers = {}
+        self.new_offer_ids = deque()
 
     def __next__(self) -> List[ProvidableInfo]:
         try:
             self.provider_stocks = next(self.stock_data)
         except StopIteration:
-            self.stock_data = self.get_provider_stock_information(  # pylint: disable=not-callable
-                self.siret, self.last_processed_isbn, self.modified_since
-            )
+            self._fetch_next_page()
             self.provider_stocks = next(self.stock_data)
 
         self.last_processed_isbn = str(self.provider_stocks["ref"])
-        self.product = product_queries.find_active_book_product_by_isbn(self.provider_stocks["ref"])
+        self.product = self.products_by_isbn.get(self.last_processed_isbn)
         if not self.product:
             return []
 
@@ -59,6 +66,26 @@ class GenericStocks(LocalProvider):
 
         return [providable_info_offer, providable_info_stock]
 
+    def _fetch_next_page(self) -> None:
+        page = list(
+            self.get_provider_stock_information(  # pylint: disable=not-callable
+                self.siret, self.last_processed_isbn, self.modified_since
+            )
+        )
+        self.stock_data = iter(page)
+        if not page:
+            return
+
+        # Everything the page needs from the database is fetched at once:
+        # products, already booked quantities and ids of the offers to create.
+        isbns = [str(provider_stocks["ref"]) for provider_stocks in page]
+        self.products_by_isbn = get_products_map_by_id_at_providers(isbns)
+        ids_at_providers = [f"{isbn}@{self.siret}" for isbn in isbns if isbn in self.products_by_isbn]
+        self.stocks_by_id_at_providers = get_stocks_by_id_at_providers(ids_at_providers)
+        existing_offers_by_id_at_providers = get_offers_map_by_id_at_providers(ids_at_providers)
+        new_offers_count = len(set(ids_at_providers) - set(existing_offers_by_id_at_providers))
+        self.new_offer_ids = deque(self.get_next_offer_ids_from_sequence(new_offers_count))
+
     def fill_object_attributes(self, pc_object: Model) -> None:
         if isinstance(pc_object, Offer):
             self.fill_offer_attributes(pc_object)
@@ -76,13 +103,13 @@ class GenericStocks(LocalProvider):
 
         is_new_offer_to_create = not offer.id
         if is_new_offer_to_create:
-            next_id = self.get_next_offer_id_from_sequence()
-            offer.id = next_id
+            offer.id = self.new_offer_ids.popleft() if self.new_offer_ids else self.get_next_offer_id_from_sequence()
 
         self.offer_id = offer.id
 
     def fill_stock_attributes(self, stock: Stock) -> None:
-        bookings_quantity = count_not_cancelled_bookings_quantity_by_stock_id(stock.id)
+        stock_data = self.stocks_by_id_at_providers.get(stock.idAtProviders)
+        bookings_quantity = stock_data["booking_quantity"] if stock_data else 0
         stock.quantity = self.provider_stocks["available"] + bookings_quantity
         stock.bookingLimitDatetime = None
         stock.offerId = self.offer_id
@@ -97,3 +124,12 @@ class GenericStocks(LocalProvider):
     def get_next_offer_id_from_sequence():
         sequence = Sequence("offer_id_seq")
         return db.session.execute(sequence)
+
+    @staticmethod
+    def get_next_offer_ids_from_sequence(count: int) -> List[int]:
+        if count == 0:
+            return []
+        next_ids = db.session.execute(
+            text("SELECT nextval('offer_id_seq') FROM generate_series(1, :count)"), {"count": count}
+        )
+        return [next_id for (next_id,) in next_ids]
@@ -1,17 +1,24 @@
 from abc import abstractmethod
 from collections.abc import Iterator
 from datetime import datetime
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
 
 from flask import current_app as app
 
+from pcapi import settings
 from pcapi.connectors import redis
 from pcapi.connectors.redis import send_venue_provider_data_to_redis
 from pcapi.connectors.thumb_storage import create_thumb
 from pcapi.core.offers.models import Offer
 from pcapi.core.offers.models import Stock
+from pcapi.local_providers.chunk_manager import get_existing_objects_by_chunk_key
 from pcapi.local_providers.chunk_manager import get_existing_pc_obj
 from pcapi.local_providers.chunk_manager import save_chunks
 from pcapi.local_providers.providable_info import ProvidableInfo
+from pcapi.local_providers.thumb_pipeline import ThumbPipeline
 from pcapi.models import ApiErrors
 from pcapi.models.db import Model
 from pcapi.models.db import db
@@ -27,10 +34,19 @@ from pcapi.utils.logger import logger
 from pcapi.validation.models import entity_validator
 
 
+# Number of objects fetched, then saved, together
 CHUNK_MAX_SIZE = 1000
 
 
 class LocalProvider(Iterator):
+    # Write chunks with PostgreSQL COPY and INSERT ... ON CONFLICT instead
+    # of the ORM bulk operations, see providable_queries.upsert_chunk()
+    save_chunks_with_copy = False
+    # Attributes set by __next__() and read by fill_object_attributes() and
+    # the thumb methods. They are kept aside with each line read ahead, so
+    # __next__() must bind new objects to them rather than mutate them.
+    line_state_attributes: Tuple[str, ...] = ()
+
     def __init__(self, venue_provider=None, **options):
         self.venue_provider = venue_provider
         self.updatedObjects = 0
@@ -42,6 +58,10 @@ class LocalProvider(Iterator):
         self.checkedThumbs = 0
         self.erroredThumbs = 0
         self.provider = get_provider_by_local_class(self.__class__.__name__)
+        # Set during updateObjects(), thumbs are stored synchronously otherwise
+        self.thumb_pipeline = None
+        # Objects whose thumbs are being uploaded, with their created thumbs count
+        self.pending_created_thumbs: List[Tuple[Model, int]] = []
 
     @property
     @abstractmethod
@@ -84,8 +104,28 @@ class LocalProvider(Iterator):
         if not new_thumb:
             return
 
-        _save_same_thumb_from_thumb_count_to_index(pc_object, new_thumb_index, new_thumb)
-        self.createdThumbs += new_thumb_index
+        _save_same_thumb_from_thumb_count_to_index(pc_object, new_thumb_index, new_thumb, self.thumb_pipeline)
+        if self.thumb_pipeline is None:
+            self.createdThumbs += new_thumb_index
+        else:
+            # Counted once uploaded, see _wait_for_thumbs()
+            self.pending_created_thumbs.append((pc_object, new_thumb_index))
+
+    def _wait_for_thumbs(self) -> None:
+        failed_thumbs = self.thumb_pipeline.wait_for_uploads()
+        objects_with_failed_thumbs = {id(failed_thumb.pc_object) for failed_thumb in failed_thumbs}
+        for pc_object, created_thumbs_count in self.pending_created_thumbs:
+            if id(pc_object) not in objects_with_failed_thumbs:
+                self.createdThumbs += created_thumbs_count
+        self.pending_created_thumbs = []
+
+        for failed_thumb in failed_thumbs:
+            if failed_thumb.is_new_thumb:
+                # Thumbs are added in order, the ones after a failed one are not counted either
+                failed_thumb.pc_object.thumbCount = min(failed_thumb.pc_object.thumbCount, failed_thumb.thumb_index)
+            self.log_provider_event(LocalProviderEventType.SyncError, failed_thumb.error.__class__.__name__)
+            self.erroredThumbs += 1
+            logger.info("ERROR during handle thumb: %s", failed_thumb.error, exc_info=failed_thumb.error)
 
     def _create_object(self, providable_info: ProvidableInfo) -> Model:
         pc_object = providable_info.type()
@@ -151,27 +191,51 @@ class LocalProvider(Iterator):
             self.erroredThumbs,
         )
 
-    def updateObjects(self, limit=None):
+    def close_processed_files(self) -> None:
+        """Close the files whose lines have all been processed, called after
+        each chunk of lines."""
+
+    def close(self) -> None:
+        """Release the files and connections held by the provider, called
+        once the synchronization is over."""
+
+    def _read_lines(self, max_objects: int) -> Tuple[List[Tuple[List[ProvidableInfo], Tuple]], bool]:
+        """Read lines until they hold max_objects objects, and return them
+        with whether lines remain to be read.
+
+        Lines are read ahead so that their existing objects are fetched all
+        at once: the state of each line is kept aside until it is processed.
+        """
+        lines = []
+        objects_count = 0
+        while objects_count < max_objects:
+            try:
+                providable_infos = next(self)
+            except StopIteration:
+                return lines, False
+            lines.append((providable_infos, self._get_line_state()))
+            # Lines without objects are checked too, see _process_lines()
+            objects_count += max(len(providable_infos), 1)
+        return lines, True
+
+    def _get_line_state(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.line_state_attributes)
+
+    def _set_line_state(self, line_state: Tuple) -> None:
+        for name, value in zip(self.line_state_attributes, line_state):
+            setattr(self, name, value)
+
+    def _process_lines(
+        self, lines: List[Tuple[List[ProvidableInfo], Tuple]], limit: Optional[int]
+    ) -> Tuple[Dict[str, Model], Dict[str, Model]]:
         # pylint: disable=too-many-nested-blocks
-        if self.venue_provider and not self.venue_provider.isActive:
-            logger.info("Venue provider %s is inactive", self.venue_provider)
-            return
-
-        if not self.provider.isActive:
-            provider_name = self.__class__.__name__
-            logger.info("Provider %s is inactive", provider_name)
-            return
-
-        self.log_provider_event(LocalProviderEventType.SyncStart)
-
         chunk_to_insert = {}
         chunk_to_update = {}
-
-        reindex_whole_venue_provider_later = feature_queries.is_active(
-            FeatureToggle.ENABLE_WHOLE_VENUE_PROVIDER_ALGOLIA_INDEXATION
+        existing_objects = get_existing_objects_by_chunk_key(
+            providable_info for providable_infos, _ in lines for providable_info in providable_infos
         )
 
-        for providable_infos in self:
+        for providable_infos, line_state in lines:
             objects_limit_reached = limit and self.checkedObjects >= limit
             if objects_limit_reached:
                 break
@@ -181,9 +245,10 @@ class LocalProvider(Iterator):
                 self.checkedObjects += 1
                 continue
 
+            self._set_line_state(line_state)
             for providable_info in providable_infos:
                 chunk_key = providable_info.id_at_providers + "|" + str(providable_info.type.__name__)
-                pc_object = get_existing_pc_obj(providable_info, chunk_to_insert, chunk_to_update)
+                pc_object = get_existing_pc_obj(providable_info, chunk_to_insert, chunk_to_update, existing_objects)
 
                 if pc_object is None:
                     if not self.can_create:
@@ -230,17 +295,52 @@ class LocalProvider(Iterator):
 
                 self.checkedObjects += 1
 
-                if len(chunk_to_insert) + len(chunk_to_update) >= CHUNK_MAX_SIZE:
-                    save_chunks(chunk_to_insert, chunk_to_update)
+        # Resume reading from the state of the last line read
+        self._set_line_state(lines[-1][1])
+        return chunk_to_insert, chunk_to_update
+
+    def updateObjects(self, limit=None):
+        if self.venue_provider and not self.venue_provider.isActive:
+            logger.info("Venue provider %s is inactive", self.venue_provider)
+            return
+
+        if not self.provider.isActive:
+            provider_name = self.__class__.__name__
+            logger.info("Provider %s is inactive", provider_name)
+            return
+
+        self.log_provider_event(LocalProviderEventType.SyncStart)
+
+        reindex_whole_venue_provider_later = feature_queries.is_active(
+            FeatureToggle.ENABLE_WHOLE_VENUE_PROVIDER_ALGOLIA_INDEXATION
+        )
+
+        self.thumb_pipeline = ThumbPipeline(
+            conversion_workers=settings.PROVIDERS_THUMB_CONVERSION_WORKERS,
+            upload_workers=settings.PROVIDERS_THUMB_UPLOAD_WORKERS,
+        )
+        try:
+            has_remaining_lines = True
+            while has_remaining_lines:
+                objects_to_read = CHUNK_MAX_SIZE if not limit else min(CHUNK_MAX_SIZE, limit - self.checkedObjects)
+                if objects_to_read <= 0:
+                    break
+                lines, has_remaining_lines = self._read_lines(objects_to_read)
+                if not lines:
+                    break
+
+                chunk_to_insert, chunk_to_update = self._process_lines(lines, limit)
+                self.close_processed_files()
+                self._wait_for_thumbs()
+                if len(chunk_to_insert) + len(chunk_to_update) > 0:
+                    save_chunks(chunk_to_insert, chunk_to_update, with_copy=self.save_chunks_with_copy)
                     if not reindex_whole_venue_provider_later:
                         _reindex_offers(list(chunk_to_insert.values()) + list(chunk_to_update.values()))
-                    chunk_to_insert = {}
-                    chunk_to_update = {}
-
-        if len(chunk_to_insert) + len(chunk_to_update) > 0:
-            save_chunks(chunk_to_insert, chunk_to_update)
-            if not reindex_whole_venue_provider_later:
-                _reindex_offers(list(chunk_to_insert.values()) + list(chunk_to_update.values()))
+            self.thumb_pipeline.log_throughput()
+        finally:
+            self.thumb_pipeline.close()
+            self.thumb_pipeline = None
+            self.close()
 
         self._print_objects_summary()
         self.log_provider_event(LocalProviderEventType.SyncEnd)
@@ -254,27 +354,44 @@ class LocalProvider(Iterator):
                     send_venue_provider_data_to_redis(self.venue_provider)
 
 
-def _save_same_thumb_from_thumb_count_to_index(pc_object: Model, thumb_index: int, image_as_bytes: bytes):
+def _save_same_thumb_from_thumb_count_to_index(
+    pc_object: Model, thumb_index: int, image_as_bytes: bytes, thumb_pipeline: Optional[ThumbPipeline] = None
+):
     if pc_object.thumbCount is None:  # handle unsaved object
         pc_object.thumbCount = 0
     if thumb_index <= pc_object.thumbCount:
         # replace existing thumb
-        create_thumb(pc_object, image_as_bytes, thumb_index)
+        _store_thumb(pc_object, image_as_bytes, thumb_index, False, thumb_pipeline)
     else:
         # add new thumb
         for index in range(pc_object.thumbCount, thumb_index):
-            create_thumb(pc_object, image_as_bytes, index)
+            _store_thumb(pc_object, image_as_bytes, index, True, thumb_pipeline)
             pc_object.thumbCount += 1
 
 
+def _store_thumb(
+    pc_object: Model,
+    image_as_bytes: bytes,
+    thumb_index: int,
+    is_new_thumb: bool,
+    thumb_pipeline: Optional[ThumbPipeline],
+):
+    if thumb_pipeline is None:
+        create_thumb(pc_object, image_as_bytes, thumb_index)
+    else:
+        thumb_pipeline.submit(pc_object, image_as_bytes, thumb_index, is_new_thumb)
+
+
 def _reindex_offers(created_or_updated_objects):
-    if not feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
-        return
     offer_ids = set()
     for obj in created_or_updated_objects:
         if isinstance(obj, Stock):
             offer_ids.add(obj.offerId)
         elif isinstance(obj, Offer):
             offer_ids.add(obj.id)
+    for offer_id in offer_ids:
+        redis.delete_offer_response(client=app.redis_client, offer_id=offer_id)
+    if not feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
+        return
     for offer_id in offer_ids:
         redis.add_offer_id(client=app.redis_client, offer_id=offer_id)
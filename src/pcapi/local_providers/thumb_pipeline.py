@@ -0,0 +1,172 @@
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+import hashlib
+import multiprocessing
+from threading import Lock
+from time import time
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from pcapi.core import object_storage
+from pcapi.models.db import Model
+from pcapi.utils.image_conversion import standardize_image
+from pcapi.utils.logger import logger
+
+
+class PendingThumbUpload(NamedTuple):
+    upload: Future
+    pc_object: Model
+    thumb_index: int
+    is_new_thumb: bool
+    image_digest: str
+
+
+class FailedThumbUpload(NamedTuple):
+    pc_object: Model
+    thumb_index: int
+    is_new_thumb: bool
+    error: BaseException
+
+
+class StageStats:
+    def __init__(self):
+        self.processed_count = 0
+        self.busy_seconds = 0.0
+        self._lock = Lock()
+
+    def add(self, duration: float) -> None:
+        with self._lock:
+            self.processed_count += 1
+            self.busy_seconds += duration
+
+
+class ThumbPipeline:
+    """Standardize provider thumbs in a process pool and upload them in a
+    thread pool, while the provider keeps reading its lines.
+
+    Identical images are only converted once per chunk of lines, and an
+    image already being uploaded to the same storage id is not uploaded
+    again. wait_for_uploads() must be called before the thumb counts of the
+    objects are saved, so that the count of an object never includes a thumb
+    that could not be stored.
+    """
+
+    def __init__(self, conversion_workers: int, upload_workers: int):
+        self.conversion_pool = _create_conversion_pool(conversion_workers)
+        self.upload_pool = ThreadPoolExecutor(max_workers=upload_workers)
+        self.converted_images: Dict[str, Future] = {}
+        self.pending_uploads: Dict[str, PendingThumbUpload] = {}
+        self.deduplicated_conversions_count = 0
+        self.deduplicated_uploads_count = 0
+        self.conversion_stats = StageStats()
+        self.upload_stats = StageStats()
+        self.started_at = time()
+
+    def submit(self, pc_object: Model, image_as_bytes: bytes, thumb_index: int, is_new_thumb: bool) -> None:
+        # Raises for unsaved objects before anything is scheduled
+        object_id = pc_object.get_thumb_storage_id(thumb_index)
+        image_digest = hashlib.sha1(image_as_bytes).hexdigest()
+
+        previous_upload = self.pending_uploads.get(object_id)
+        if previous_upload and previous_upload.image_digest == image_digest:
+            self.deduplicated_uploads_count += 1
+            return
+
+        converted_image = self._convert(image_as_bytes, image_digest)
+        # Uploads of the same storage id are chained so that the last
+        # submitted image is the one that is eventually stored.
+        upload = self.upload_pool.submit(
+            self._upload, object_id, converted_image, previous_upload.upload if previous_upload else None
+        )
+        self.pending_uploads[object_id] = PendingThumbUpload(
+            upload=upload,
+            pc_object=pc_object,
+            thumb_index=thumb_index,
+            is_new_thumb=is_new_thumb,
+            image_digest=image_digest,
+        )
+
+    def wait_for_uploads(self) -> List[FailedThumbUpload]:
+        pending_uploads = list(self.pending_uploads.values())
+        wait([pending_upload.upload for pending_upload in pending_uploads])
+        self.pending_uploads = {}
+        self.converted_images = {}
+
+        return [
+            FailedThumbUpload(
+                pc_object=pending_upload.pc_object,
+                thumb_index=pending_upload.thumb_index,
+                is_new_thumb=pending_upload.is_new_thumb,
+                error=pending_upload.upload.exception(),
+            )
+            for pending_upload in pending_uploads
+            if pending_upload.upload.exception() is not None
+        ]
+
+    def log_throughput(self) -> None:
+        elapsed = time() - self.started_at
+        logger.info(
+            "[THUMBS] %i images converted (%i deduplicated, %.2fs busy, %.1f/s), "
+            "%i thumbs uploaded (%i deduplicated, %.2fs busy, %.1f/s)",
+            self.conversion_stats.processed_count,
+            self.deduplicated_conversions_count,
+            self.conversion_stats.busy_seconds,
+            self.conversion_stats.processed_count / elapsed if elapsed > 0 else 0.0,
+            self.upload_stats.processed_count,
+            self.deduplicated_uploads_count,
+            self.upload_stats.busy_seconds,
+            self.upload_stats.processed_count / elapsed if elapsed > 0 else 0.0,
+        )
+
+    def close(self) -> None:
+        self.upload_pool.shutdown()
+        self.conversion_pool.shutdown()
+
+    def _convert(self, image_as_bytes: bytes, image_digest: str) -> Future:
+        converted_image = self.converted_images.get(image_digest)
+        if converted_image is not None:
+            self.deduplicated_conversions_count += 1
+            return converted_image
+
+        converted_image = self.conversion_pool.submit(convert_image, image_as_bytes)
+        converted_image.add_done_callback(self._add_conversion_stats)
+        self.converted_images[image_digest] = converted_image
+        return converted_image
+
+    def _add_conversion_stats(self, converted_image: Future) -> None:
+        if converted_image.exception() is None:
+            self.conversion_stats.add(converted_image.result()[1])
+
+    def _upload(self, object_id: str, converted_image: Future, previous_upload: Optional[Future]) -> None:
+        if previous_upload is not None:
+            wait([previous_upload])
+        image_as_bytes, _ = converted_image.result()
+
+        started_at = time()
+        object_storage.store_public_object(
+            bucket="thumbs",
+            object_id=object_id,
+            blob=image_as_bytes,
+            content_type="image/jpeg",
+        )
+        self.upload_stats.add(time() - started_at)
+
+
+def convert_image(image_as_bytes: bytes) -> Tuple[bytes, float]:
+    started_at = time()
+    standard_image = standardize_image(image_as_bytes)
+    return standard_image, time() - started_at
+
+
+def _create_conversion_pool(conversion_workers: int) -> Executor:
+    if not conversion_workers:
+        return ThreadPoolExecutor(max_workers=1)
+    # Workers are spawned rather than forked: the provider runs other threads
+    # (FTP prefetch, uploads) whose locks must not be inherited.
+    return ProcessPoolExecutor(max_workers=conversion_workers, mp_context=multiprocessing.get_context("spawn"))
@@ -2,8 +2,10 @@ from pathlib import PurePath
 import re
 from typing import List
 
+from pcapi.connectors.ftp_titelive import close_ftp_session
+from pcapi.connectors.ftp_titelive import close_zip_file
 from pcapi.connectors.ftp_titelive import get_files_to_process_from_titelive_ftp
-from pcapi.connectors.ftp_titelive import get_zip_file_from_ftp
+from pcapi.connectors.ftp_titelive import iter_zip_files_from_ftp
 from pcapi.domain.titelive import get_date_from_filename
 from pcapi.domain.titelive import read_description_date
 from pcapi.local_providers.local_provider import LocalProvider
@@ -21,6 +23,7 @@ END_FILE_IDENTIFIER = "_p.txt"
 class TiteLiveThingDescriptions(LocalProvider):
     name = "TiteLive (Epagine / Place des libraires.com) Descriptions"
     can_create = False
+    line_state_attributes = ("description_zip_info", "zip_file")
 
     def __init__(self):
         super().__init__()
@@ -28,9 +31,13 @@ class TiteLiveThingDescriptions(LocalProvider):
         all_zips = get_files_to_process_from_titelive_ftp(DESCRIPTION_FOLDER_NAME_TITELIVE, DATE_REGEXP)
 
         self.zips = self.get_remaining_files_to_check(all_zips)
+        self.zip_files = iter_zip_files_from_ftp(self.zips, DESCRIPTION_FOLDER_NAME_TITELIVE)
         self.description_zip_infos = None
+        self.zip_file_name = None
         self.zip_file = None
         self.date_modified = None
+        # Zip files left for the next one, still read by the lines read ahead
+        self.processed_zip_files = []
 
     def __next__(self) -> List[ProvidableInfo]:
         if self.description_zip_infos is None:
@@ -54,11 +61,11 @@ class TiteLiveThingDescriptions(LocalProvider):
 
     def open_next_file(self):
         if self.zip_file:
-            current_file_date = get_date_from_filename(self.zip_file, DATE_REGEXP)
+            current_file_date = get_date_from_filename(self.zip_file_name, DATE_REGEXP)
             self.log_provider_event(LocalProviderEventType.SyncPartEnd, current_file_date)
-        next_zip_file_name = str(next(self.zips))
-        self.zip_file = get_zip_file_from_ftp(next_zip_file_name, DESCRIPTION_FOLDER_NAME_TITELIVE)
-        new_file_date = get_date_from_filename(self.zip_file, DATE_REGEXP)
+            self.processed_zip_files.append(self.zip_file)
+        self.zip_file_name, self.zip_file = next(self.zip_files)
+        new_file_date = get_date_from_filename(self.zip_file_name, DATE_REGEXP)
 
         self.log_provider_event(LocalProviderEventType.SyncPartStart, new_file_date)
 
@@ -66,6 +73,17 @@ class TiteLiveThingDescriptions(LocalProvider):
 
         self.date_modified = read_description_date(str(new_file_date))
 
+    def close_processed_files(self) -> None:
+        for processed_zip_file in self.processed_zip_files:
+            close_zip_file(processed_zip_file)
+        self.processed_zip_files = []
+
+    def close(self) -> None:
+        self.close_processed_files()
+        if self.zip_file:
+            close_zip_file(self.zip_file)
+        close_ftp_session()
+
     def get_remaining_files_to_check(self, all_zips) -> iter:
         latest_sync_part_end_event = local_provider_event_queries.find_latest_sync_part_end_event(self.provider)
 
@@ -3,8 +3,10 @@ from pathlib import PurePath
 import re
 from typing import List
 
+from pcapi.connectors.ftp_titelive import close_ftp_session
+from pcapi.connectors.ftp_titelive import close_zip_file
 from pcapi.connectors.ftp_titelive import get_files_to_process_from_titelive_ftp
-from pcapi.connectors.ftp_titelive import get_zip_file_from_ftp
+from pcapi.connectors.ftp_titelive import iter_zip_files_from_ftp
 from pcapi.domain.titelive import get_date_from_filename
 from pcapi.local_providers.local_provider import LocalProvider
 from pcapi.local_providers.providable_info import ProvidableInfo
@@ -21,6 +23,7 @@ SYNCHONISABLE_FILE_EXTENSION = "_75.jpg"
 class TiteLiveThingThumbs(LocalProvider):
     name = "TiteLive (Epagine / Place des libraires.com) Thumbs"
     can_create = False
+    line_state_attributes = ("thumb_zipinfo", "zip")
 
     def __init__(self):
         super().__init__()
@@ -28,8 +31,12 @@ class TiteLiveThingThumbs(LocalProvider):
         all_zips = get_files_to_process_from_titelive_ftp(THUMB_FOLDER_NAME_TITELIVE, DATE_REGEXP)
 
         self.zips = self.get_remaining_files_to_check(all_zips)
+        self.zip_files = iter_zip_files_from_ftp(self.zips, THUMB_FOLDER_NAME_TITELIVE)
         self.thumb_zipinfos = None
+        self.zip_file_name = None
         self.zip = None
+        # Zip files left for the next one, still read by the lines read ahead
+        self.processed_zips = []
 
     def __next__(self) -> List[ProvidableInfo]:
         if self.thumb_zipinfos is None:
@@ -51,13 +58,13 @@ class TiteLiveThingThumbs(LocalProvider):
 
     def open_next_file(self):
         if self.zip:
-            file_date = get_date_from_filename(self.zip, DATE_REGEXP)
+            file_date = get_date_from_filename(self.zip_file_name, DATE_REGEXP)
             self.log_provider_event(LocalProviderEventType.SyncPartEnd, file_date)
+            self.processed_zips.append(self.zip)
 
-        next_zip_file_name = str(next(self.zips))
-        file_date = get_date_from_filename(next_zip_file_name, DATE_REGEXP)
+        self.zip_file_name, self.zip = next(self.zip_files)
+        file_date = get_date_from_filename(self.zip_file_name, DATE_REGEXP)
 
-        self.zip = get_zip_file_from_ftp(next_zip_file_name, THUMB_FOLDER_NAME_TITELIVE)
         self.log_provider_event(LocalProviderEventType.SyncPartStart, file_date)
 
         self.thumb_zipinfos = iter(
@@ -67,6 +74,17 @@ class TiteLiveThingThumbs(LocalProvider):
             )
         )
 
+    def close_processed_files(self) -> None:
+        for processed_zip in self.processed_zips:
+            close_zip_file(processed_zip)
+        self.processed_zips = []
+
+    def close(self) -> None:
+        self.close_processed_files()
+        if self.zip:
+            close_zip_file(self.zip)
+        close_ftp_session()
+
     def get_object_thumb_index(self) -> int:
         return extract_thumb_index(self.thumb_zipinfo.filename)
 
@@ -1,11 +1,11 @@
-from io import BytesIO
 from io import TextIOWrapper
 import re
 from typing import Dict
 from typing import List
 from typing import Optional
 
-from pcapi.connectors.ftp_titelive import connect_to_titelive_ftp
+from pcapi.connectors.ftp_titelive import close_ftp_session
+from pcapi.connectors.ftp_titelive import download_file_from_ftp
 from pcapi.connectors.ftp_titelive import get_files_to_process_from_titelive_ftp
 from pcapi.domain.titelive import get_date_from_filename
 from pcapi.domain.titelive import read_things_date
@@ -80,6 +80,8 @@ SCHOOL_RELATED_CSR_CODE = [
 class TiteLiveThings(LocalProvider):
     name = "TiteLive (Epagine / Place des libraires.com)"
     can_create = True
+    save_chunks_with_copy = True
+    line_state_attributes = ("product_infos", "product_type", "product_extra_data")
 
     def __init__(self):
         super().__init__()
@@ -108,9 +110,11 @@ class TiteLiveThings(LocalProvider):
 
         self.product_infos = get_infos_from_data_line(elements)
 
-        self.product_type, self.product_extra_data["bookFormat"] = get_thing_type_and_extra_data_from_titelive_type(
+        # A new dict is built for each line, see LocalProvider.line_state_attributes
+        self.product_type, book_format = get_thing_type_and_extra_data_from_titelive_type(
             self.product_infos["code_support"]
         )
+        self.product_extra_data = {"bookFormat": book_format}
         book_unique_identifier = self.product_infos["ean13"]
 
         if self.product_is_not_eligible_for_offer_creation():
@@ -154,12 +158,20 @@ class TiteLiveThings(LocalProvider):
         if self.products_file:
             file_date = get_date_from_filename(self.products_file, DATE_REGEXP)
             self.log_provider_event(LocalProviderEventType.SyncPartEnd, file_date)
+        # Lines are parsed when read: the previous file is not needed any more
+        if self.data_lines is not None:
+            self.data_lines.close()
         self.products_file = next(self.thing_files)
         file_date = get_date_from_filename(self.products_file, DATE_REGEXP)
         self.log_provider_event(LocalProviderEventType.SyncPartStart, file_date)
 
         self.data_lines = get_lines_from_thing_file(str(self.products_file))
 
+    def close(self) -> None:
+        if self.data_lines is not None:
+            self.data_lines.close()
+        close_ftp_session()
+
     def get_remaining_files_to_check(self, ordered_thing_files: list) -> iter:
         latest_sync_part_end_event = local_provider_event_queries.find_latest_sync_part_end_event(self.provider)
         if latest_sync_part_end_event is None:
@@ -170,17 +182,11 @@ class TiteLiveThings(LocalProvider):
         return iter([])
 
 
-def get_lines_from_thing_file(thing_file: str):
-    data_file = BytesIO()
-    data_wrapper = TextIOWrapper(
-        data_file,
-        encoding="iso-8859-1",
-        line_buffering=True,
-    )
-    file_path = "RETR " + THINGS_FOLDER_NAME_TITELIVE + "/" + thing_file
-    connect_to_titelive_ftp().retrbinary(file_path, data_file.write)
-    data_wrapper.seek(0, 0)
-    return iter(data_wrapper.readlines())
+def get_lines_from_thing_file(thing_file: str) -> TextIOWrapper:
+    # Lines are read lazily from the file spooled on disk, instead of loading
+    # the whole file in memory. Closing the returned file closes the spooled one.
+    data_file = download_file_from_ftp(thing_file, THINGS_FOLDER_NAME_TITELIVE)
+    return TextIOWrapper(data_file, encoding="iso-8859-1")
 
 
 def get_thing_type_and_extra_data_from_titelive_type(titelive_type):
@@ -46,6 +46,7 @@ from pcapi.models.venue_label_sql_entity import VenueLabelSQLEntity
 from pcapi.models.venue_provider import VenueProvider
 from pcapi.models.venue_type import VenueType
 from pcapi.models.versioned_mixin import VersionedMixin
+from pcapi.models.wallet_ledger import WalletLedger
 
 
 # TODO: fix circular import
@@ -98,6 +99,7 @@ __all__ = (
     "Venue",
     "VenueType",
     "VenueLabelSQLEntity",
+    "WalletLedger",
 )
 
 # Order matters
@@ -125,6 +127,7 @@ models = (
     Feature,
     Stock,
     Booking,
+    WalletLedger,
     VenueProvider,
     AllocineVenueProvider,
     AllocineVenueProviderPriceRule,
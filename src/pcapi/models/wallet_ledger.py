@@ -0,0 +1,27 @@
+from sqlalchemy import BigInteger
+from sqlalchemy import Column
+from sqlalchemy import ForeignKey
+from sqlalchemy import Numeric
+from sqlalchemy.orm import relationship
+
+from pcapi.models.db import Model
+from pcapi.models.pc_object import PcObject
+
+
+class WalletLedger(PcObject, Model):
+    """Running totals of the bookings of a user, used to compute their
+    wallet balance without summing all their bookings.
+
+    Rows are only written by the `update_wallet_ledger` trigger on the
+    booking table (see `Booking.trig_wallet_ledger_ddl`).
+    """
+
+    userId = Column(BigInteger, ForeignKey("user.id", ondelete="CASCADE"), unique=True, nullable=False)
+
+    user = relationship("User", foreign_keys=[userId])
+
+    # Sum of the total amounts of the bookings that are not cancelled
+    bookedAmount = Column(Numeric(10, 2), nullable=False, default=0, server_default="0")
+
+    # Same as above, restricted to used bookings
+    usedAmount = Column(Numeric(10, 2), nullable=False, default=0, server_default="0")
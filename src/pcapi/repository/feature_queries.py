@@ -1,11 +1,26 @@
+from threading import Lock
+from time import time
+from typing import Dict
+
+from flask import current_app
 from flask import has_request_context
 from flask import request
 
+from pcapi import settings
+from pcapi.connectors import redis
 from pcapi.models.api_errors import ResourceNotFoundError
 from pcapi.models.feature import Feature
 from pcapi.models.feature import FeatureToggle
 
 
+# The whole feature table is cached by each process for at most
+# FEATURES_CACHE_TTL seconds. Toggling a feature increments a version key in
+# Redis, which is checked once per request, so that web processes see the
+# change on their next request.
+_features_cache = {"features": None, "version": None, "expires_at": 0.0}
+_features_cache_lock = Lock()
+
+
 def find_all():
     return Feature.query.all()
 
@@ -16,15 +31,40 @@ def is_active(feature_toggle: FeatureToggle) -> bool:
 
     if has_request_context():
         if not hasattr(request, "_cached_features"):
-            setattr(request, "_cached_features", {})
+            setattr(request, "_cached_features", _get_cached_features(check_version=True))
+        return request._cached_features[feature_toggle.name]
 
-        cached_value = request._cached_features.get(feature_toggle.name)
-        if cached_value is not None:
-            return cached_value
+    return _get_cached_features(check_version=False)[feature_toggle.name]
 
-    value = Feature.query.filter_by(name=feature_toggle.name).first().isActive
 
-    if has_request_context():
-        request._cached_features[feature_toggle.name] = value
+def invalidate_features_cache() -> None:
+    redis.increment_features_version(client=current_app.redis_client)
+    clear_features_cache()
+
+
+def clear_features_cache() -> None:
+    with _features_cache_lock:
+        _features_cache.update(features=None, version=None, expires_at=0.0)
+    if has_request_context() and hasattr(request, "_cached_features"):
+        delattr(request, "_cached_features")
+
+
+def _get_cached_features(check_version: bool) -> Dict[str, bool]:
+    with _features_cache_lock:
+        now = time()
+        is_expired = _features_cache["features"] is None or now >= _features_cache["expires_at"]
+        if is_expired or check_version:
+            # The version is read before the table so that a feature toggled
+            # in between triggers another reload on the next check.
+            version = redis.get_features_version(client=current_app.redis_client)
+            if is_expired or version != _features_cache["version"]:
+                _features_cache.update(
+                    features=_load_features(),
+                    version=version,
+                    expires_at=now + settings.FEATURES_CACHE_TTL,
+                )
+        return _features_cache["features"]
+
 
-    return value
+def _load_features() -> Dict[str, bool]:
+    return dict(Feature.query.with_entities(Feature.name, Feature.isActive).all())
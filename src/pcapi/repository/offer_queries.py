@@ -1,34 +1,48 @@
 from datetime import datetime
+from typing import Callable
+from typing import Iterator
 from typing import List
+from typing import Optional
+from typing import Tuple
 
+from sqlalchemy import case
 from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import aliased
 from sqlalchemy.orm import joinedload
 
 from pcapi.models import Booking
+from pcapi.models import Criterion
+from pcapi.models import Mediation
 from pcapi.models import Offer
+from pcapi.models import OfferCriterion
+from pcapi.models import Offerer
+from pcapi.models import Product
 from pcapi.models import Stock
+from pcapi.models import Venue
+from pcapi.utils.converter import from_tuple_to_int
 
 
-def _build_bookings_quantity_subquery():
+def _build_bookings_quantity_subquery(offer_ids: List[int] = None):
     stock_alias = aliased(Stock)
+    bookings_quantity = Booking.query.join(stock_alias).filter(Booking.isCancelled == False)
+    if offer_ids is not None:
+        bookings_quantity = bookings_quantity.filter(stock_alias.offerId.in_(offer_ids))
     bookings_quantity = (
-        Booking.query.join(stock_alias)
-        .filter(Booking.isCancelled == False)
-        .group_by(Booking.stockId)
+        bookings_quantity.group_by(Booking.stockId)
         .with_entities(func.sum(Booking.quantity).label("quantity"), Booking.stockId.label("stockId"))
         .subquery()
     )
     return bookings_quantity
 
 
-def filter_bookable_stocks_query(stocks_query):
+def filter_bookable_stocks_query(stocks_query, offer_ids: List[int] = None):
     beginning_date_is_in_the_future_predicate = Stock.beginningDatetime > datetime.utcnow()
     booking_limit_date_is_in_the_future_predicate = Stock.bookingLimitDatetime > datetime.utcnow()
     has_no_beginning_date_predicate = Stock.beginningDatetime.is_(None)
     has_no_booking_limit_date_predicate = Stock.bookingLimitDatetime.is_(None)
     is_not_soft_deleted_predicate = Stock.isSoftDeleted.is_(False)
-    bookings_quantity = _build_bookings_quantity_subquery()
+    bookings_quantity = _build_bookings_quantity_subquery(offer_ids=offer_ids)
     has_remaining_stock = (Stock.quantity.is_(None)) | (
         (Stock.quantity - func.coalesce(bookings_quantity.c.quantity, 0)) > 0
     )
@@ -57,59 +71,191 @@ def get_offers_by_ids(offer_ids: List[int]) -> List[Offer]:
     return Offer.query.filter(Offer.id.in_(offer_ids)).options(joinedload("stocks")).all()
 
 
-def get_paginated_active_offer_ids(limit: int, page: int) -> List[tuple]:
+def get_bookable_offers_data_for_indexing(offer_ids: List[int]) -> List[tuple]:
+    bookable_stocks = (
+        filter_bookable_stocks_query(Stock.query, offer_ids=offer_ids)
+        .filter(Stock.offerId.in_(offer_ids))
+        .group_by(Stock.offerId)
+        .with_entities(
+            Stock.offerId.label("offerId"),
+            func.array_agg(Stock.price).label("stocksPrices"),
+            func.array_agg(Stock.beginningDatetime).label("stocksBeginningDatetimes"),
+            func.array_agg(Stock.dateCreated).label("stocksDatesCreated"),
+        )
+        .subquery()
+    )
+    tags = (
+        Criterion.query.join(OfferCriterion, OfferCriterion.criterionId == Criterion.id)
+        .filter(OfferCriterion.offerId == Offer.id)
+        .with_entities(func.array_agg(aggregate_order_by(Criterion.name, Criterion.name)))
+        .correlate(Offer)
+        .as_scalar()
+    )
+    # Same choice as `Offer.activeMediation`: the most recent active
+    # mediation, returned only if it has a thumb.
+    active_mediation_with_thumb_id = (
+        Mediation.query.filter(Mediation.offerId == Offer.id)
+        .filter(Mediation.isActive == True)
+        .order_by(Mediation.dateCreated.desc())
+        .limit(1)
+        .with_entities(case([(Mediation.thumbCount > 0, Mediation.id)]))
+        .correlate(Offer)
+        .as_scalar()
+    )
+
+    return (
+        Offer.query.join(bookable_stocks, bookable_stocks.c.offerId == Offer.id)
+        .join(Venue, Offer.venueId == Venue.id)
+        .join(Offerer, Venue.managingOffererId == Offerer.id)
+        .join(Product, Offer.productId == Product.id)
+        .filter(Offer.id.in_(offer_ids))
+        .filter(Offer.isActive == True)
+        .filter(Venue.validationToken.is_(None))
+        .filter(Offerer.isActive == True)
+        .filter(Offerer.validationToken.is_(None))
+        .with_entities(
+            Offer.id,
+            Offer.dateCreated,
+            Offer.description,
+            Offer.extraData,
+            Offer.isDuo,
+            Offer.name,
+            Offer.type,
+            Offer.url,
+            Offer.withdrawalDetails,
+            Offerer.name.label("offererName"),
+            Venue.city.label("venueCity"),
+            Venue.departementCode.label("venueDepartementCode"),
+            Venue.latitude.label("venueLatitude"),
+            Venue.longitude.label("venueLongitude"),
+            Venue.name.label("venueName"),
+            Venue.publicName.label("venuePublicName"),
+            Product.id.label("productId"),
+            Product.thumbCount.label("productThumbCount"),
+            active_mediation_with_thumb_id.label("mediationId"),
+            tags.label("tags"),
+            bookable_stocks.c.stocksPrices,
+            bookable_stocks.c.stocksBeginningDatetimes,
+            bookable_stocks.c.stocksDatesCreated,
+        )
+        .all()
+    )
+
+
+def get_paginated_active_offer_ids(limit: int, last_offer_id: int = 0) -> List[tuple]:
     return (
         Offer.query.with_entities(Offer.id)
         .filter(Offer.isActive == True)
+        .filter(Offer.id > last_offer_id)
         .order_by(Offer.id)
-        .offset(page * limit)
         .limit(limit)
         .all()
     )
 
 
-def get_paginated_offer_ids_by_venue_id(venue_id: int, limit: int, page: int) -> List[tuple]:
+def get_active_offer_ids_bounds() -> Tuple[Optional[int], Optional[int]]:
+    return Offer.query.with_entities(func.min(Offer.id), func.max(Offer.id)).filter(Offer.isActive == True).one()
+
+
+def get_active_offer_ids_in_range(from_offer_id: int, to_offer_id: int) -> List[int]:
+    offer_ids = (
+        Offer.query.with_entities(Offer.id)
+        .filter(Offer.isActive == True)
+        .filter(Offer.id.between(from_offer_id, to_offer_id))
+        .order_by(Offer.id)
+        .all()
+    )
+    return from_tuple_to_int(offer_ids)
+
+
+def get_paginated_offer_ids_by_venue_id(venue_id: int, limit: int, last_offer_id: int = 0) -> List[tuple]:
     return (
         Offer.query.with_entities(Offer.id)
         .filter(Offer.venueId == venue_id)
+        .filter(Offer.id > last_offer_id)
         .order_by(Offer.id)
-        .offset(page * limit)
         .limit(limit)
         .all()
     )
 
 
 def get_paginated_offer_ids_by_venue_id_and_last_provider_id(
-    last_provider_id: str, limit: int, page: int, venue_id: int
+    last_provider_id: str, limit: int, venue_id: int, last_offer_id: int = 0
 ) -> List[tuple]:
     return (
         Offer.query.with_entities(Offer.id)
         .filter(Offer.lastProviderId == last_provider_id)  # pylint: disable=comparison-with-callable
         .filter(Offer.venueId == venue_id)
+        .filter(Offer.id > last_offer_id)
         .order_by(Offer.id)
-        .offset(page * limit)
         .limit(limit)
         .all()
     )
 
 
-def get_paginated_offer_ids_given_booking_limit_datetime_interval(
-    limit: int, page: int, from_date: datetime, to_date: datetime
-) -> List[tuple]:
-    start_limit = from_date <= func.max(Stock.bookingLimitDatetime)
-    end_limit = func.max(Stock.bookingLimitDatetime) <= to_date
+def get_active_offer_ids_by_chunk(chunk_size: int, last_offer_id: int = 0) -> Iterator[List[int]]:
+    return _get_offer_ids_by_chunk(
+        lambda last_id: get_paginated_active_offer_ids(limit=chunk_size, last_offer_id=last_id),
+        last_offer_id=last_offer_id,
+    )
 
-    return (
+
+def get_offer_ids_by_venue_id_by_chunk(venue_id: int, chunk_size: int) -> Iterator[List[int]]:
+    return _get_offer_ids_by_chunk(
+        lambda last_id: get_paginated_offer_ids_by_venue_id(venue_id=venue_id, limit=chunk_size, last_offer_id=last_id)
+    )
+
+
+def get_offer_ids_by_venue_id_and_last_provider_id_by_chunk(
+    last_provider_id: str, venue_id: int, chunk_size: int
+) -> Iterator[List[int]]:
+    return _get_offer_ids_by_chunk(
+        lambda last_id: get_paginated_offer_ids_by_venue_id_and_last_provider_id(
+            last_provider_id=last_provider_id, limit=chunk_size, venue_id=venue_id, last_offer_id=last_id
+        )
+    )
+
+
+def get_offer_ids_given_booking_limit_datetime_interval_by_chunk(
+    from_date: datetime, to_date: datetime, chunk_size: int
+) -> Iterator[List[int]]:
+    # The whole result set is read through a server-side cursor, so that
+    # the aggregate is computed once instead of once per page.
+    offer_ids_with_stocks_expired_in_interval = (
+        Stock.query.with_entities(Stock.offerId)
+        .filter(Stock.isSoftDeleted == False)
+        .filter(Stock.bookingLimitDatetime.between(from_date, to_date))
+    )
+    expired_offer_ids = (
         Offer.query.join(Stock)
         .with_entities(Offer.id)
         .filter(Offer.isActive == True)
+        .filter(Offer.id.in_(offer_ids_with_stocks_expired_in_interval))
         .filter(Stock.isSoftDeleted == False)
-        .filter(Stock.bookingLimitDatetime is not None)
-        .having(start_limit)
-        .having(end_limit)
         .group_by(Offer.id)
+        .having(func.max(Stock.bookingLimitDatetime).between(from_date, to_date))
         .order_by(Offer.id)
-        .offset(page * limit)
-        .limit(limit)
-        .all()
+        .yield_per(chunk_size)
     )
+
+    offer_ids = []
+    for (offer_id,) in expired_offer_ids:
+        offer_ids.append(offer_id)
+        if len(offer_ids) == chunk_size:
+            yield offer_ids
+            offer_ids = []
+    if offer_ids:
+        yield offer_ids
+
+
+def _get_offer_ids_by_chunk(
+    get_offer_ids_page: Callable[[int], List[tuple]], last_offer_id: int = 0
+) -> Iterator[List[int]]:
+    # Keyset pagination: each page starts right after the last id of the
+    # previous one, so that fetching a page never gets slower as we go.
+    while True:
+        offer_ids = from_tuple_to_int(get_offer_ids_page(last_offer_id))
+        if not offer_ids:
+            return
+        yield offer_ids
+        last_offer_id = offer_ids[-1]
@@ -39,6 +39,19 @@ def get_payments_by_message_id(payment_message_id: str) -> List[Payment]:
     return Payment.query.join(PaymentMessage).filter(PaymentMessage.name == payment_message_id).all()
 
 
+def find_by_ids(payment_ids: List[int]) -> List[Payment]:
+    return Payment.query.filter(Payment.id.in_(payment_ids)).all() if payment_ids else []
+
+
+def get_next_payment_ids_from_sequence(count: int) -> List[int]:
+    if count == 0:
+        return []
+    next_ids = db.session.execute(
+        text("SELECT nextval('payment_id_seq') FROM generate_series(1, :count)"), {"count": count}
+    )
+    return [next_id for (next_id,) in next_ids]
+
+
 def find_by_booking_id(booking_id: int) -> Optional[Payment]:
     return Payment.query.filter_by(bookingId=booking_id).first()
 
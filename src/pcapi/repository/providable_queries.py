@@ -1,7 +1,10 @@
 import datetime
+import io
 from typing import Dict
+from typing import Iterable
 from typing import List
-from typing import Optional
+
+from sqlalchemy import inspect
 
 from pcapi import models
 from pcapi.models.db import Model
@@ -25,6 +28,100 @@ def update_chunk(chunk_to_update: Dict):
     db.session.commit()
 
 
+def upsert_chunk(chunk_to_upsert: Dict):
+    """Insert or update the objects of a chunk with PostgreSQL COPY.
+
+    Rows are streamed into a temporary table, then applied with a single
+    INSERT ... ON CONFLICT ("idAtProviders") DO UPDATE per model and per set
+    of columns, parent tables first: only the attributes that were loaded or
+    set on an object are written, so that database defaults still apply to
+    new objects.
+    """
+    rows_by_model_and_columns = {}
+    for pc_object in chunk_to_upsert.values():
+        row = _get_upsert_row(pc_object)
+        key = (type(pc_object), tuple(row))
+        rows_by_model_and_columns.setdefault(key, []).append(tuple(row.values()))
+        if pc_object in db.session:
+            # The object is written below: it must not be flushed again by the ORM
+            db.session.expunge(pc_object)
+
+    table_order = {table: index for index, table in enumerate(db.metadata.sorted_tables)}
+    groups = sorted(rows_by_model_and_columns.items(), key=lambda group: table_order[group[0][0].__table__])
+    with db.session.connection().connection.cursor() as cursor:
+        for index, ((model, columns), rows) in enumerate(groups):
+            _copy_and_upsert_rows(cursor, model, columns, rows, temporary_table=f"tmp_upsert_{index}")
+    db.session.commit()
+
+
+def _get_upsert_row(pc_object: Model) -> Dict:
+    is_new_object = not inspect(pc_object).has_identity
+    row = {}
+    for column in pc_object.__table__.columns:
+        if column.key in pc_object.__dict__:
+            row[column.key] = pc_object.__dict__[column.key]
+        elif is_new_object and column.default is not None and column.default.is_scalar:
+            row[column.key] = column.default.arg
+        elif is_new_object and column.default is not None and column.default.is_callable:
+            row[column.key] = column.default.arg(None)
+    return row
+
+
+def _copy_and_upsert_rows(cursor, model: Model, columns: tuple, rows: List[tuple], temporary_table: str) -> None:
+    table = model.__table__.name
+    quoted_columns = ", ".join(f'"{column}"' for column in columns)
+    updated_columns = ", ".join(
+        f'"{column}" = EXCLUDED."{column}"' for column in columns if column not in ("id", "idAtProviders")
+    )
+    on_conflict = f"DO UPDATE SET {updated_columns}" if updated_columns else "DO NOTHING"
+    bind_processors = [model.__table__.columns[column].type.bind_processor(db.engine.dialect) for column in columns]
+
+    copy_buffer = io.StringIO()
+    for row in rows:
+        values = [
+            _format_copy_value(processor(value) if processor and value is not None else value)
+            for processor, value in zip(bind_processors, row)
+        ]
+        copy_buffer.write("\t".join(values) + "\n")
+    copy_buffer.seek(0)
+
+    cursor.execute(
+        f'CREATE TEMPORARY TABLE "{temporary_table}" ON COMMIT DROP AS '
+        f'SELECT {quoted_columns} FROM "{table}" WITH NO DATA'
+    )
+    cursor.copy_expert(f'COPY "{temporary_table}" ({quoted_columns}) FROM STDIN', copy_buffer)
+    cursor.execute(
+        f'INSERT INTO "{table}" ({quoted_columns}) SELECT {quoted_columns} FROM "{temporary_table}" '
+        f'ON CONFLICT ("idAtProviders") {on_conflict}'
+    )
+
+
+def _format_copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return _escape_copy_text(_format_array_literal(value))
+    return _escape_copy_text(str(value))
+
+
+def _format_array_literal(values: Iterable) -> str:
+    elements = []
+    for value in values:
+        if value is None:
+            elements.append("NULL")
+        else:
+            elements.append('"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"')
+    return "{" + ",".join(elements) + "}"
+
+
+def _escape_copy_text(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
 def _filter_matching_pc_object_in_chunk(model_in_chunk: Model, chunk_to_update: Dict) -> List[Model]:
     return list(
         filter(lambda item: _extract_model_name_from_chunk_key(item[0]) == model_in_chunk, chunk_to_update.items())
@@ -35,8 +132,8 @@ def _extract_dict_values_from_chunk(matching_tuples_in_chunk: List[Model]) -> Li
     return list(dictify_pc_object(pc_object_item) for pc_object_key, pc_object_item in matching_tuples_in_chunk)
 
 
-def get_existing_object(model_type: Model, id_at_providers: str) -> Optional[Dict]:
-    return model_type.query.filter_by(idAtProviders=id_at_providers).first()
+def get_existing_objects(model_type: Model, ids_at_providers: List[str]) -> List[Model]:
+    return model_type.query.filter(model_type.idAtProviders.in_(ids_at_providers)).all()
 
 
 def get_last_update_for_provider(provider_id: int, pc_obj: Model) -> datetime:
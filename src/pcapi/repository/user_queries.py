@@ -3,8 +3,10 @@ from datetime import datetime
 from typing import List
 
 from sqlalchemy import Column
+from sqlalchemy import case
 from sqlalchemy import func
 from sqlalchemy import not_
+from sqlalchemy import or_
 from sqlalchemy.orm import Query
 from sqlalchemy.sql.elements import BinaryExpression
 from sqlalchemy.sql.functions import Function
@@ -14,11 +16,13 @@ from pcapi.core.users.utils import format_email
 from pcapi.models import BeneficiaryImport
 from pcapi.models import BeneficiaryImportSources
 from pcapi.models import BeneficiaryImportStatus
+from pcapi.models import Deposit
 from pcapi.models import ImportStatus
 from pcapi.models import Offerer
 from pcapi.models import UserOfferer
 from pcapi.models.db import db
 from pcapi.models.wallet_balance import WalletBalance
+from pcapi.models.wallet_ledger import WalletLedger
 
 
 def count_users_by_email(email: str) -> int:
@@ -48,18 +52,32 @@ def find_user_by_reset_password_token(token: str) -> User:
 
 
 def get_all_users_wallet_balances() -> List[WalletBalance]:
-    """Return wallet balances.
+    """Return the wallet balances of all users that have a deposit.
 
-    WARNING: it ignores the expiration date of the deposits.
+    Balances are computed like `get_wallet_balance()`, but for all users
+    in a single query.
     """
+    deposit_amounts = (
+        db.session.query(
+            Deposit.userId.label("userId"),
+            func.sum(
+                case(
+                    [(or_(Deposit.expirationDate > func.now(), Deposit.expirationDate.is_(None)), Deposit.amount)],
+                    else_=0,
+                )
+            ).label("amount"),
+        )
+        .group_by(Deposit.userId)
+        .subquery()
+    )
     wallet_balances = (
         db.session.query(
-            User.id,
-            func.get_wallet_balance(User.id, False),
-            func.get_wallet_balance(User.id, True),
+            deposit_amounts.c.userId,
+            deposit_amounts.c.amount - func.coalesce(WalletLedger.bookedAmount, 0),
+            deposit_amounts.c.amount - func.coalesce(WalletLedger.usedAmount, 0),
         )
-        .filter(User.deposits != None)
-        .order_by(User.id)
+        .outerjoin(WalletLedger, WalletLedger.userId == deposit_amounts.c.userId)
+        .order_by(deposit_amounts.c.userId)
         .all()
     )
 
@@ -1,3 +1,9 @@
+from flask import Response
+from flask import current_app
+from flask import make_response
+from flask import request
+
+from pcapi.connectors import redis
 from pcapi.core.offers.models import Offer
 from pcapi.serialization.decorator import spectree_serialize
 
@@ -9,7 +15,18 @@ from .serialization import offers as serializers
 @spectree_serialize(
     response_model=serializers.OfferResponse, api=blueprint.api, on_error_statuses=[404]
 )  # type: ignore
-def get_offer(offer_id: str) -> serializers.OfferResponse:
-    offer = Offer.query.filter_by(id=offer_id).first_or_404()
+def get_offer(offer_id: str) -> Response:
+    # Popular offers are requested over and over by the app, so their
+    # serialized response is kept in Redis for OFFER_RESPONSE_CACHE_TTL
+    # seconds. It is deleted whenever the offer, its stocks,
+    # its mediations or its bookings change.
+    offer_response = redis.get_offer_response(client=current_app.redis_client, offer_id=offer_id)
+    if offer_response is None:
+        offer = Offer.query.filter_by(id=offer_id).first_or_404()
+        offer_response = serializers.OfferResponse.from_orm(offer).json(by_alias=True)
+        redis.set_offer_response(client=current_app.redis_client, offer_id=offer_id, response=offer_response)
 
-    return serializers.OfferResponse.from_orm(offer)
+    response = make_response(offer_response, 200)
+    response.mimetype = "application/json"
+    response.add_etag()
+    return response.make_conditional(request)
@@ -1,7 +1,9 @@
 from typing import Dict
 
+from flask import Response
 from flask import jsonify
 from flask import request
+from flask import stream_with_context
 from flask_login import current_user
 from flask_login import login_required
 
@@ -9,6 +11,7 @@ import pcapi.core.bookings.api as bookings_api
 from pcapi.core.bookings.models import Booking
 import pcapi.core.bookings.repository as booking_repository
 import pcapi.core.bookings.validation as bookings_validation
+from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapCursor
 from pcapi.domain.users import check_is_authorized_to_access_bookings_recap
 from pcapi.flask_app import private_api
 from pcapi.flask_app import public_api
@@ -18,11 +21,15 @@ from pcapi.models.offer_type import ProductType
 from pcapi.repository.api_key_queries import find_api_key_by_value
 from pcapi.routes.serialization import serialize
 from pcapi.routes.serialization import serialize_booking
+from pcapi.routes.serialization.bookings_recap_serialize import serialize_bookings_recap_as_csv
+from pcapi.routes.serialization.bookings_recap_serialize import serialize_bookings_recap_as_json
 from pcapi.routes.serialization.bookings_recap_serialize import serialize_bookings_recap_paginated
 from pcapi.utils.human_ids import dehumanize
 from pcapi.utils.human_ids import humanize
 from pcapi.utils.rest import check_user_has_access_to_offerer
+from pcapi.validation.routes.bookings import check_cursor_format
 from pcapi.validation.routes.bookings import check_email_and_offer_id_for_anonymous_user
+from pcapi.validation.routes.bookings import check_export_format
 from pcapi.validation.routes.bookings import check_page_format_is_number
 from pcapi.validation.routes.users_authentifications import check_user_is_logged_in_or_email_is_provided
 from pcapi.validation.routes.users_authentifications import login_or_api_key_required_v2
@@ -73,8 +80,14 @@ def patch_booking_by_token(token: str):
 @private_api.route("/bookings/pro", methods=["GET"])
 @login_required
 def get_all_bookings():
+    # A "cursor" argument, even empty, switches to the pagination by cursor,
+    # which is used to browse deep into the bookings of large offerers.
+    cursor = request.args.get("cursor")
     page = request.args.get("page", 1)
-    check_page_format_is_number(page)
+    if cursor is None:
+        check_page_format_is_number(page)
+    else:
+        check_cursor_format(cursor)
 
     check_is_authorized_to_access_bookings_recap(current_user)
 
@@ -82,11 +95,42 @@ def get_all_bookings():
     # a bare SQLAlchemy query, and the route should handle the
     # serialization so that we can get rid of BookingsRecapPaginated
     # that is only used here.
-    bookings_recap_paginated = booking_repository.find_by_pro_user_id(user_id=current_user.id, page=int(page))
+    if cursor is None:
+        bookings_recap_paginated = booking_repository.find_by_pro_user_id(user_id=current_user.id, page=int(page))
+    else:
+        bookings_recap_paginated = booking_repository.find_by_pro_user_id_after_cursor(
+            user_id=current_user.id, cursor=BookingsRecapCursor.decode(cursor) if cursor else None
+        )
 
     return serialize_bookings_recap_paginated(bookings_recap_paginated), 200
 
 
+# @debt api-migration
+@private_api.route("/bookings/pro/export", methods=["GET"])
+@login_required
+def export_all_bookings():
+    export_format = request.args.get("format", "csv")
+    check_export_format(export_format)
+
+    check_is_authorized_to_access_bookings_recap(current_user)
+
+    bookings_recap = booking_repository.iter_bookings_recap_by_pro_user_id(user_id=current_user.id)
+
+    if export_format == "json":
+        return Response(
+            stream_with_context(serialize_bookings_recap_as_json(bookings_recap)), 200, mimetype="application/json"
+        )
+
+    return Response(
+        stream_with_context(serialize_bookings_recap_as_csv(bookings_recap)),
+        200,
+        {
+            "Content-type": "text/csv; charset=utf-8;",
+            "Content-Disposition": "attachment; filename=reservations_pass_culture.csv",
+        },
+    )
+
+
 # @debt api-migration
 @public_api.route("/v2/bookings/token/<token>", methods=["GET"])
 @login_or_api_key_required_v2
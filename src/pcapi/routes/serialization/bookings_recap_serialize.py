@@ -1,8 +1,14 @@
+import csv
 from datetime import datetime
+from io import StringIO
 from typing import Any
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 
+from flask import json
+
 from pcapi.domain.booking_recap.booking_recap import BookBookingRecap
 from pcapi.domain.booking_recap.booking_recap import BookingRecap
 from pcapi.domain.booking_recap.booking_recap import BookingRecapStatus
@@ -17,6 +23,23 @@ from pcapi.utils.date import format_into_timezoned_date
 from pcapi.utils.human_ids import humanize
 
 
+BOOKINGS_RECAP_CSV_HEADER = [
+    "Lieu",
+    "Nom de l'offre",
+    "Date de l'évènement",
+    "ISBN",
+    "Nom et prénom du bénéficiaire",
+    "Email du bénéficiaire",
+    "Date et heure de réservation",
+    "Réservation duo",
+    "Contremarque",
+    "Prix de la réservation",
+    "Statut de la contremarque",
+]
+# Streamed responses are sent by chunks of about this number of characters
+STREAMING_CHUNK_SIZE = 64 * 1024
+
+
 def serialize_bookings_recap_paginated(bookings_recap_paginated: BookingsRecapPaginated) -> Dict[str, Any]:
     return {
         "bookings_recap": [
@@ -25,9 +48,64 @@ def serialize_bookings_recap_paginated(bookings_recap_paginated: BookingsRecapPa
         "page": bookings_recap_paginated.page,
         "pages": bookings_recap_paginated.pages,
         "total": bookings_recap_paginated.total,
+        "next_cursor": bookings_recap_paginated.next_cursor,
     }
 
 
+def serialize_bookings_recap_as_csv(bookings_recap: Iterable[BookingRecap]) -> Iterator[str]:
+    output = StringIO()
+    # The BOM lets spreadsheet softwares detect the encoding of the file
+    output.write("\ufeff")
+    writer = csv.writer(output, quoting=csv.QUOTE_NONNUMERIC)
+    writer.writerow(BOOKINGS_RECAP_CSV_HEADER)
+
+    for booking_recap in bookings_recap:
+        writer.writerow(_serialize_booking_recap_as_csv_row(booking_recap))
+        if output.tell() >= STREAMING_CHUNK_SIZE:
+            yield _flush(output)
+    yield _flush(output)
+
+
+def serialize_bookings_recap_as_json(bookings_recap: Iterable[BookingRecap]) -> Iterator[str]:
+    output = StringIO()
+    output.write("[")
+    separator = ""
+
+    for booking_recap in bookings_recap:
+        output.write(separator)
+        output.write(json.dumps(_serialize_booking_recap(booking_recap)))
+        separator = ","
+        if output.tell() >= STREAMING_CHUNK_SIZE:
+            yield _flush(output)
+    output.write("]")
+    yield _flush(output)
+
+
+def _serialize_booking_recap_as_csv_row(booking_recap: BookingRecap) -> List[Any]:
+    return [
+        booking_recap.venue_name,
+        booking_recap.offer_name,
+        format_into_timezoned_date(booking_recap.event_beginning_datetime)
+        if isinstance(booking_recap, EventBookingRecap)
+        else "",
+        booking_recap.offer_isbn if isinstance(booking_recap, BookBookingRecap) else "",
+        "%s %s" % (booking_recap.beneficiary_lastname, booking_recap.beneficiary_firstname),
+        booking_recap.beneficiary_email,
+        format_into_timezoned_date(booking_recap.booking_date),
+        "Oui" if booking_recap.booking_is_duo else "Non",
+        booking_recap.booking_token,
+        booking_recap.booking_amount,
+        booking_recap.booking_status.value,
+    ]
+
+
+def _flush(output: StringIO) -> str:
+    chunk = output.getvalue()
+    output.seek(0)
+    output.truncate()
+    return chunk
+
+
 def _serialize_booking_status_info(booking_status: BookingRecapStatus, booking_status_date: datetime) -> Dict[str, str]:
 
     serialized_booking_status_date = format_into_timezoned_date(booking_status_date) if booking_status_date else None
@@ -1,6 +1,7 @@
 from apscheduler.schedulers.blocking import BlockingScheduler
 
 from pcapi import settings
+from pcapi.core import mails
 from pcapi.local_providers.fnac.fnac_stocks_provider import synchronize_fnac_venues_stocks
 from pcapi.local_providers.provider_manager import synchronize_venue_providers_for_provider
 from pcapi.models.beneficiary_import import BeneficiaryImportSources
@@ -81,6 +82,12 @@ def pc_notify_soon_to_be_expired_bookings(app) -> None:
     notify_soon_to_be_expired_bookings()
 
 
+@log_cron
+@cron_context
+def pc_send_queued_emails(app) -> None:
+    mails.send_queued_emails()
+
+
 def main():
     from pcapi.flask_app import app
 
@@ -116,6 +123,9 @@ def main():
         minute="30",
     )
 
+    # Sends e-mails left in the queue, e.g. when a dispatch job was lost
+    scheduler.add_job(pc_send_queued_emails, "cron", [app], minute="*/5")
+
     scheduler.start()
 
 
@@ -47,4 +47,5 @@ def add_criterion_to_offers(
 
     logger.info("Reindexing %d offers after addition of criterion %s", len(offers), criterion_name)
     for offer in offers:
+        redis.delete_offer_response(client=app.redis_client, offer_id=offer.id)
         redis.add_offer_id(client=app.redis_client, offer_id=offer.id)
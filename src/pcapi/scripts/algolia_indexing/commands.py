@@ -1,15 +1,18 @@
+import os
 from time import time
 
 from flask import current_app as app
 
 from pcapi.algolia.infrastructure.api import clear_index
 from pcapi.connectors.redis import delete_all_indexed_offers
-from pcapi.scripts.algolia_indexing.indexing import _process_venue_provider
+from pcapi.connectors.redis import move_legacy_offer_ids
 from pcapi.scripts.algolia_indexing.indexing import batch_deleting_expired_offers_in_algolia
 from pcapi.scripts.algolia_indexing.indexing import batch_indexing_offers_in_algolia_by_offer
 from pcapi.scripts.algolia_indexing.indexing import batch_indexing_offers_in_algolia_by_venue
 from pcapi.scripts.algolia_indexing.indexing import batch_indexing_offers_in_algolia_by_venue_provider
 from pcapi.scripts.algolia_indexing.indexing import batch_indexing_offers_in_algolia_from_database
+from pcapi.scripts.algolia_indexing.indexing import process_venue_provider
+from pcapi.scripts.algolia_indexing.parallel_indexing import batch_indexing_offers_in_algolia_from_database_in_parallel
 from pcapi.utils.logger import logger
 
 
@@ -19,6 +22,13 @@ def process_offers():
         batch_indexing_offers_in_algolia_by_offer(client=app.redis_client)
 
 
+@app.manager.command
+def move_legacy_offer_ids_to_index():
+    with app.app_context():
+        moved_offer_ids_count = move_legacy_offer_ids(client=app.redis_client)
+        logger.info("[ALGOLIA] %i offer ids moved from the legacy list", moved_offer_ids_count)
+
+
 @app.manager.command
 def process_offers_by_venue():
     with app.app_context():
@@ -33,23 +43,48 @@ def process_offers_by_venue_provider():
 
 @app.manager.option("-ca", "--clear-algolia", help="Clear algolia index before indexing offers", type=bool)
 @app.manager.option("-cr", "--clear-redis", help="Clear redis indexed offers before indexing offers", type=bool)
-@app.manager.option("-ep", "--ending-page", help="Ending page for indexing offers", type=int)
-@app.manager.option("-l", "--limit", help="Number of offers per page", type=int)
-@app.manager.option("-sp", "--starting-page", help="Starting page for indexing offers", type=int)
+@app.manager.option("-l", "--limit", help="Number of offers per chunk", type=int)
+@app.manager.option(
+    "-r", "--resume", action="store_true", help="Resume indexing after the last offer processed by a previous run"
+)
 def process_offers_from_database(
     clear_algolia: bool = False,
     clear_redis: bool = False,
-    ending_page: int = None,
     limit: int = 10000,
-    starting_page: int = 0,
+    resume: bool = False,
+):
+    with app.app_context():
+        if clear_algolia:
+            clear_index()
+        # Indexed offers digests are meaningless once the Algolia index has been cleared
+        if clear_algolia or clear_redis:
+            delete_all_indexed_offers(client=app.redis_client)
+        batch_indexing_offers_in_algolia_from_database(client=app.redis_client, limit=limit, resume=resume)
+
+
+@app.manager.option("-ca", "--clear-algolia", help="Clear algolia index before indexing offers", type=bool)
+@app.manager.option("-cr", "--clear-redis", help="Clear redis indexed offers before indexing offers", type=bool)
+@app.manager.option("-b", "--builder-workers", help="Number of processes building objects to index", type=int)
+@app.manager.option("-u", "--uploader-workers", help="Number of threads sending objects to Algolia", type=int)
+@app.manager.option("-rs", "--range-size", help="Size of the offer id ranges processed by each worker", type=int)
+def process_offers_from_database_in_parallel(
+    clear_algolia: bool = False,
+    clear_redis: bool = False,
+    builder_workers: int = None,
+    uploader_workers: int = 4,
+    range_size: int = 10000,
 ):
     with app.app_context():
         if clear_algolia:
             clear_index()
-        if clear_redis:
+        # Indexed offers digests are meaningless once the Algolia index has been cleared
+        if clear_algolia or clear_redis:
             delete_all_indexed_offers(client=app.redis_client)
-        batch_indexing_offers_in_algolia_from_database(
-            client=app.redis_client, ending_page=ending_page, limit=limit, starting_page=starting_page
+        batch_indexing_offers_in_algolia_from_database_in_parallel(
+            client=app.redis_client,
+            builder_workers=builder_workers or os.cpu_count(),
+            uploader_workers=uploader_workers,
+            range_size=range_size,
         )
 
 
@@ -73,7 +108,7 @@ def process_venue_provider_offers_for_algolia(provider_id: str, venue_id: int, v
         venue_provider_id,
     )
 
-    _process_venue_provider(
+    process_venue_provider(
         client=app.redis_client, provider_id=provider_id, venue_id=venue_id, venue_provider_id=venue_provider_id
     )
 
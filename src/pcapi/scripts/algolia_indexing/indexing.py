@@ -6,27 +6,34 @@ from redis import Redis
 from pcapi import settings
 from pcapi.algolia.usecase.orchestrator import delete_expired_offers
 from pcapi.algolia.usecase.orchestrator import process_eligible_offers
-from pcapi.connectors.redis import delete_offer_ids
+from pcapi.algolia.usecase.orchestrator import process_offers_in_bulk
+from pcapi.connectors.redis import delete_full_indexing_last_offer_id
 from pcapi.connectors.redis import delete_offer_ids_in_error
 from pcapi.connectors.redis import delete_venue_ids
 from pcapi.connectors.redis import delete_venue_provider_currently_in_sync
 from pcapi.connectors.redis import delete_venue_providers
-from pcapi.connectors.redis import get_offer_ids
+from pcapi.connectors.redis import get_full_indexing_last_offer_id
 from pcapi.connectors.redis import get_offer_ids_in_error
 from pcapi.connectors.redis import get_venue_ids
 from pcapi.connectors.redis import get_venue_providers
+from pcapi.connectors.redis import pop_offer_ids
+from pcapi.connectors.redis import requeue_offer_ids
+from pcapi.connectors.redis import set_full_indexing_last_offer_id
 from pcapi.repository import offer_queries
-from pcapi.utils.converter import from_tuple_to_int
 from pcapi.utils.logger import logger
 
 
 def batch_indexing_offers_in_algolia_by_offer(client: Redis) -> None:
-    offer_ids = get_offer_ids(client=client)
+    offer_ids = pop_offer_ids(client=client)
 
     if len(offer_ids) > 0:
         logger.info("[ALGOLIA] processing %i offers...", len(offer_ids))
-        process_eligible_offers(client=client, offer_ids=offer_ids, from_provider_update=False)
-        delete_offer_ids(client=client)
+        try:
+            process_eligible_offers(client=client, offer_ids=offer_ids)
+        except Exception:
+            # Popped offer ids are queued again, to be processed by a later run
+            requeue_offer_ids(client=client, offer_ids=offer_ids)
+            raise
         logger.info("[ALGOLIA] %i offers processed!", len(offer_ids))
 
 
@@ -39,7 +46,7 @@ def batch_indexing_offers_in_algolia_by_venue_provider(client: Redis) -> None:
             venue_provider_id = venue_provider["id"]
             provider_id = venue_provider["providerId"]
             venue_id = int(venue_provider["venueId"])
-            _process_venue_provider(
+            process_venue_provider(
                 client=client, provider_id=provider_id, venue_id=venue_id, venue_provider_id=venue_provider_id
             )
 
@@ -49,117 +56,74 @@ def batch_indexing_offers_in_algolia_by_venue(client: Redis) -> None:
 
     if len(venue_ids) > 0:
         for venue_id in venue_ids:
-            page = 0
-            has_still_offers = True
-
-            while has_still_offers:
-                offer_ids_as_tuple = offer_queries.get_paginated_offer_ids_by_venue_id(
-                    limit=settings.ALGOLIA_OFFERS_BY_VENUE_CHUNK_SIZE, page=page, venue_id=venue_id
-                )
-                offer_ids_as_int = from_tuple_to_int(offer_ids_as_tuple)
-
-                if len(offer_ids_as_int) > 0:
-                    logger.info("[ALGOLIA] processing offers for venue %s from page %s...", venue_id, page)
-                    process_eligible_offers(client=client, offer_ids=offer_ids_as_int, from_provider_update=False)
-                    logger.info("[ALGOLIA] offers for venue %s from page %s processed!", venue_id, page)
-                else:
-                    has_still_offers = False
-                    logger.info("[ALGOLIA] processing of offers for venue %s finished!", venue_id)
-                page += 1
+            for offer_ids in offer_queries.get_offer_ids_by_venue_id_by_chunk(
+                venue_id=venue_id, chunk_size=settings.ALGOLIA_OFFERS_BY_VENUE_CHUNK_SIZE
+            ):
+                logger.info("[ALGOLIA] processing offers for venue %s from offer %s...", venue_id, offer_ids[0])
+                process_eligible_offers(client=client, offer_ids=offer_ids)
+                logger.info("[ALGOLIA] offers for venue %s up to offer %s processed!", venue_id, offer_ids[-1])
+            logger.info("[ALGOLIA] processing of offers for venue %s finished!", venue_id)
         delete_venue_ids(client=client)
 
 
-def batch_indexing_offers_in_algolia_from_database(
-    client: Redis, ending_page: int = None, limit: int = 10000, starting_page: int = 0
-) -> None:
-    page_number = starting_page
-    has_still_offers = True
+def batch_indexing_offers_in_algolia_from_database(client: Redis, limit: int = 10000, resume: bool = False) -> None:
+    last_offer_id = get_full_indexing_last_offer_id(client=client) if resume else 0
+    if last_offer_id:
+        logger.info("[ALGOLIA] resuming processing of offers from database after offer %s", last_offer_id)
 
-    while has_still_offers:
-        if ending_page:
-            if ending_page == page_number:
-                break
+    for offer_ids in offer_queries.get_active_offer_ids_by_chunk(chunk_size=limit, last_offer_id=last_offer_id):
+        logger.info("[ALGOLIA] processing offers of database from offer %s...", offer_ids[0])
+        process_offers_in_bulk(client=client, offer_ids=offer_ids)
+        set_full_indexing_last_offer_id(client=client, offer_id=offer_ids[-1])
+        logger.info("[ALGOLIA] offers of database up to offer %s processed!", offer_ids[-1])
 
-        offer_ids_as_tuple = offer_queries.get_paginated_active_offer_ids(limit=limit, page=page_number)
-        offer_ids_as_int = from_tuple_to_int(offer_ids=offer_ids_as_tuple)
-
-        if len(offer_ids_as_int) > 0:
-            logger.info("[ALGOLIA] processing offers of database from page %s...", page_number)
-            process_eligible_offers(client=client, offer_ids=offer_ids_as_int, from_provider_update=False)
-            logger.info("[ALGOLIA] offers of database from page %s processed!", page_number)
-        else:
-            has_still_offers = False
-            logger.info("[ALGOLIA] processing of offers from database finished!")
-        page_number += 1
+    delete_full_indexing_last_offer_id(client=client)
+    logger.info("[ALGOLIA] processing of offers from database finished!")
 
 
 def batch_deleting_expired_offers_in_algolia(client: Redis, process_all_expired: bool = False) -> None:
-    page = 0
-    has_still_offers = True
     one_day_before_now = datetime.utcnow() - timedelta(days=1)
     two_days_before_now = datetime.utcnow() - timedelta(days=2)
     arbitrary_oldest_date = datetime(2000, 1, 1)
     from_date = two_days_before_now if not process_all_expired else arbitrary_oldest_date
 
-    while has_still_offers:
-        expired_offer_ids_as_tuple = offer_queries.get_paginated_offer_ids_given_booking_limit_datetime_interval(
-            limit=settings.ALGOLIA_DELETING_OFFERS_CHUNK_SIZE,
-            page=page,
-            from_date=from_date,
-            to_date=one_day_before_now,
-        )
-        expired_offer_ids_as_int = from_tuple_to_int(offer_ids=expired_offer_ids_as_tuple)
-
-        if len(expired_offer_ids_as_int) > 0:
-            logger.info("[ALGOLIA] processing deletion of expired offers from page %s...", page)
-            delete_expired_offers(client=client, offer_ids=expired_offer_ids_as_int)
-            logger.info("[ALGOLIA] expired offers from page %s processed!", page)
-        else:
-            has_still_offers = False
-            logger.info("[ALGOLIA] deleting expired offers finished!")
-        page += 1
+    for expired_offer_ids in offer_queries.get_offer_ids_given_booking_limit_datetime_interval_by_chunk(
+        from_date=from_date, to_date=one_day_before_now, chunk_size=settings.ALGOLIA_DELETING_OFFERS_CHUNK_SIZE
+    ):
+        logger.info("[ALGOLIA] processing deletion of expired offers from offer %s...", expired_offer_ids[0])
+        delete_expired_offers(client=client, offer_ids=expired_offer_ids)
+        logger.info("[ALGOLIA] expired offers up to offer %s processed!", expired_offer_ids[-1])
+    logger.info("[ALGOLIA] deleting expired offers finished!")
 
 
 def batch_processing_offer_ids_in_error(client: Redis):
     offer_ids_in_error = get_offer_ids_in_error(client=client)
     if len(offer_ids_in_error) > 0:
-        process_eligible_offers(client=client, offer_ids=offer_ids_in_error, from_provider_update=False)
+        process_eligible_offers(client=client, offer_ids=offer_ids_in_error)
         delete_offer_ids_in_error(client=client)
 
 
-def _process_venue_provider(client: Redis, provider_id: str, venue_provider_id: int, venue_id: int) -> None:
-    has_still_offers = True
-    page = 0
+def process_venue_provider(client: Redis, provider_id: str, venue_provider_id: int, venue_id: int) -> None:
     try:
-        while has_still_offers is True:
-            offer_ids_as_tuple = offer_queries.get_paginated_offer_ids_by_venue_id_and_last_provider_id(
-                last_provider_id=provider_id,
-                limit=settings.ALGOLIA_OFFERS_BY_VENUE_PROVIDER_CHUNK_SIZE,
-                page=page,
-                venue_id=venue_id,
+        for offer_ids in offer_queries.get_offer_ids_by_venue_id_and_last_provider_id_by_chunk(
+            last_provider_id=provider_id,
+            venue_id=venue_id,
+            chunk_size=settings.ALGOLIA_OFFERS_BY_VENUE_PROVIDER_CHUNK_SIZE,
+        ):
+            logger.info(
+                "[ALGOLIA] processing offers for (venue %s / provider %s) from offer %s...",
+                venue_id,
+                provider_id,
+                offer_ids[0],
+            )
+            process_eligible_offers(client=client, offer_ids=offer_ids)
+            logger.info(
+                "[ALGOLIA] offers for (venue %s / provider %s) up to offer %s processed",
+                venue_id,
+                provider_id,
+                offer_ids[-1],
             )
-            offer_ids_as_int = from_tuple_to_int(offer_ids_as_tuple)
-
-            if len(offer_ids_as_tuple) > 0:
-                logger.info(
-                    "[ALGOLIA] processing offers for (venue %s / provider %s) from page %s...",
-                    venue_id,
-                    provider_id,
-                    page,
-                )
-                process_eligible_offers(client=client, offer_ids=offer_ids_as_int, from_provider_update=True)
-                logger.info(
-                    "[ALGOLIA] offers for (venue %s / provider %s) from page %s processed",
-                    venue_id,
-                    provider_id,
-                    page,
-                )
-                page += 1
-            else:
-                has_still_offers = False
-                logger.info(
-                    "[ALGOLIA] processing of offers for (venue %s / provider %s) finished!", venue_id, provider_id
-                )
+        logger.info("[ALGOLIA] processing of offers for (venue %s / provider %s) finished!", venue_id, provider_id)
     except Exception as error:  # pylint: disable=broad-except
         logger.exception(
             "[ALGOLIA] processing of offers for (venue %s / provider %s) failed! %s",
@@ -0,0 +1,192 @@
+from concurrent.futures import Executor
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+import multiprocessing
+from queue import Queue
+from threading import Lock
+from threading import Thread
+from time import time
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from redis import Redis
+
+from pcapi.algolia.infrastructure.builder import build_objects
+from pcapi.algolia.usecase.orchestrator import process_built_objects
+from pcapi.models.db import db
+from pcapi.repository import offer_queries
+from pcapi.utils.logger import logger
+
+
+OfferIdRange = Tuple[int, int]
+
+
+class IndexingProgress:
+    def __init__(self, ranges_count: int):
+        self.ranges_count = ranges_count
+        self.processed_ranges_count = 0
+        self.failed_ranges: List[OfferIdRange] = []
+        self.processed_offers_count = 0
+        self.built_objects_count = 0
+        self.started_at = time()
+        self._lock = Lock()
+
+    def add_processed_range(self, offers_count: int, built_objects_count: int) -> None:
+        with self._lock:
+            self.processed_ranges_count += 1
+            self.processed_offers_count += offers_count
+            self.built_objects_count += built_objects_count
+            logger.info(
+                "[ALGOLIA] %i/%i offer id ranges processed, %i offers processed, %i objects built (%.0f offers/s)",
+                self.processed_ranges_count,
+                self.ranges_count,
+                self.processed_offers_count,
+                self.built_objects_count,
+                self.throughput,
+            )
+
+    def add_failed_range(self, offer_id_range: OfferIdRange) -> None:
+        with self._lock:
+            self.failed_ranges.append(offer_id_range)
+
+    @property
+    def throughput(self) -> float:
+        elapsed = time() - self.started_at
+        return self.processed_offers_count / elapsed if elapsed > 0 else 0.0
+
+
+def split_offer_ids_into_ranges(min_offer_id: int, max_offer_id: int, range_size: int) -> List[OfferIdRange]:
+    return [
+        (from_offer_id, min(from_offer_id + range_size - 1, max_offer_id))
+        for from_offer_id in range(min_offer_id, max_offer_id + 1, range_size)
+    ]
+
+
+def batch_indexing_offers_in_algolia_from_database_in_parallel(
+    client: Redis, builder_workers: int, uploader_workers: int, range_size: int = 10000
+) -> None:
+    min_offer_id, max_offer_id = offer_queries.get_active_offer_ids_bounds()
+    if min_offer_id is None:
+        logger.info("[ALGOLIA] no active offers to index")
+        return
+
+    offer_id_ranges = split_offer_ids_into_ranges(min_offer_id, max_offer_id, range_size)
+    progress = IndexingProgress(ranges_count=len(offer_id_ranges))
+    logger.info(
+        "[ALGOLIA] indexing offers from %i to %i in %i ranges with %i builder processes and %i uploader threads",
+        min_offer_id,
+        max_offer_id,
+        len(offer_id_ranges),
+        builder_workers,
+        uploader_workers,
+    )
+
+    # Built objects wait in a bounded queue so that builders cannot get too far
+    # ahead of uploaders and fill the memory.
+    upload_queue = Queue(maxsize=uploader_workers * 2)
+    uploaders = [
+        Thread(target=_upload_built_objects, args=(client, upload_queue, progress), daemon=True)
+        for _ in range(uploader_workers)
+    ]
+    for uploader in uploaders:
+        uploader.start()
+
+    with _create_builder_pool(builder_workers) as builder_pool:
+        _build_offer_id_ranges(builder_pool, offer_id_ranges, upload_queue, progress, max_pending=builder_workers * 2)
+
+    for _ in uploaders:
+        upload_queue.put(None)
+    for uploader in uploaders:
+        uploader.join()
+
+    logger.info(
+        "[ALGOLIA] %i offers processed, %i objects built in %.2f seconds (%.0f offers/s)",
+        progress.processed_offers_count,
+        progress.built_objects_count,
+        time() - progress.started_at,
+        progress.throughput,
+    )
+    if progress.failed_ranges:
+        logger.error(
+            "[ALGOLIA] %i offer id ranges could not be processed: %s",
+            len(progress.failed_ranges),
+            sorted(progress.failed_ranges),
+        )
+
+
+def _create_builder_pool(builder_workers: int) -> Executor:
+    # Builders are spawned rather than forked: they would otherwise inherit
+    # the uploader threads, the locks of their queue and the database
+    # connections of this process.
+    return ProcessPoolExecutor(
+        max_workers=builder_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_builder_process,
+    )
+
+
+def _init_builder_process() -> None:
+    # avoid import loop
+    from pcapi.flask_app import app
+
+    app.app_context().push()
+
+
+def _build_offer_id_ranges(
+    builder_pool: Executor,
+    offer_id_ranges: List[OfferIdRange],
+    upload_queue: Queue,
+    progress: IndexingProgress,
+    max_pending: int,
+) -> None:
+    remaining_ranges = iter(offer_id_ranges)
+    pending: Dict[Future, OfferIdRange] = {}
+
+    while True:
+        while len(pending) < max_pending:
+            offer_id_range = next(remaining_ranges, None)
+            if offer_id_range is None:
+                break
+            pending[builder_pool.submit(build_objects_for_offer_id_range, offer_id_range)] = offer_id_range
+        if not pending:
+            return
+
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            offer_id_range = pending.pop(future)
+            try:
+                offer_ids, built_objects = future.result()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("[ALGOLIA] could not build objects for offers from %i to %i", *offer_id_range)
+                progress.add_failed_range(offer_id_range)
+                continue
+            upload_queue.put((offer_id_range, offer_ids, built_objects))
+
+
+def build_objects_for_offer_id_range(offer_id_range: OfferIdRange) -> Tuple[List[int], List[dict]]:
+    offer_ids = offer_queries.get_active_offer_ids_in_range(*offer_id_range)
+    built_objects = build_objects(offer_ids) if offer_ids else []
+    db.session.remove()
+    return offer_ids, built_objects
+
+
+def _upload_built_objects(client: Redis, upload_queue: Queue, progress: IndexingProgress) -> None:
+    while True:
+        item = upload_queue.get()
+        if item is None:
+            return
+
+        offer_id_range, offer_ids, built_objects = item
+        if not offer_ids:
+            progress.add_processed_range(offers_count=0, built_objects_count=0)
+            continue
+        try:
+            process_built_objects(client=client, offer_ids=offer_ids, built_objects=built_objects)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("[ALGOLIA] could not upload objects for offers from %i to %i", *offer_id_range)
+            progress.add_failed_range(offer_id_range)
+            continue
+        progress.add_processed_range(offers_count=len(offer_ids), built_objects_count=len(built_objects))
@@ -33,4 +33,5 @@ def create_booking_for_user_on_specific_stock_bypassing_capping_limits(user_id:
     booking.token = random_token()
     repository.save(booking)
 
+    redis.delete_offer_response(client=app.redis_client, offer_id=stock.offerId)
     redis.add_offer_id(client=app.redis_client, offer_id=stock.offerId)
@@ -14,4 +14,5 @@ def deactivate_inappropriate_offers(offer_ids: List[int]):
         o.product.isGcuCompatible = False
     repository.save(*offers)
     for o in offers:
+        redis.delete_offer_response(client=app.redis_client, offer_id=o.id)
         redis.add_offer_id(client=app.redis_client, offer_id=o.id)
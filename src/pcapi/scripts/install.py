@@ -6,6 +6,8 @@ def install_scripts():
     import pcapi.scripts.iris.commands
     import pcapi.scripts.payment.banishment_command
     import pcapi.scripts.payment.generate_payments
+    import pcapi.scripts.payment.reimbursement_simulation_command
     import pcapi.scripts.sandbox
     import pcapi.scripts.storage
     import pcapi.scripts.update_providables
+    import pcapi.scripts.wallet_ledger.commands
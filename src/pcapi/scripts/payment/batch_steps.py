@@ -1,4 +1,10 @@
 from datetime import datetime
+from decimal import Decimal
+from itertools import groupby
+from itertools import islice
+import tempfile
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -11,23 +17,20 @@ from pcapi.domain.admin_emails import send_payment_message_email
 from pcapi.domain.admin_emails import send_payments_report_emails
 from pcapi.domain.admin_emails import send_wallet_balances_email
 from pcapi.domain.payments import create_all_payments_details
-from pcapi.domain.payments import create_payment_for_booking
-from pcapi.domain.payments import filter_out_already_paid_for_bookings
-from pcapi.domain.payments import filter_out_bookings_without_cost
-from pcapi.domain.payments import generate_file_checksum
-from pcapi.domain.payments import generate_message_file
+from pcapi.domain.payments import create_payment_rows_for_booking
 from pcapi.domain.payments import generate_payment_details_csv
 from pcapi.domain.payments import generate_payment_message
 from pcapi.domain.payments import generate_wallet_balances_csv
 from pcapi.domain.payments import group_payments_by_status
-from pcapi.domain.payments import keep_only_not_processable_payments
-from pcapi.domain.payments import keep_only_pending_payments
+from pcapi.domain.payments import make_transaction_label
 from pcapi.domain.payments import validate_message_file_structure
+from pcapi.domain.payments import write_message_file
+from pcapi.domain.reimbursement import BookingReimbursement
 from pcapi.domain.reimbursement import RULES
 from pcapi.domain.reimbursement import find_all_booking_reimbursements
-from pcapi.models import Offerer
 from pcapi.models.db import db
 from pcapi.models.payment import Payment
+from pcapi.models.payment_status import PaymentStatus
 from pcapi.models.payment_status import TransactionStatus
 from pcapi.repository import payment_queries
 from pcapi.repository import repository
@@ -36,6 +39,9 @@ from pcapi.utils.logger import logger
 from pcapi.utils.mailing import MailServiceException
 
 
+PAYMENTS_INSERT_CHUNK_SIZE = 1000
+
+
 def concatenate_payments_with_errors_and_retries(payments: List[Payment]) -> List[Payment]:
     error_payments = payment_queries.find_error_payments()
     retry_payments = payment_queries.find_retry_payments()
@@ -49,33 +55,62 @@ def concatenate_payments_with_errors_and_retries(payments: List[Payment]) -> Lis
 
 
 def generate_new_payments() -> Tuple[List[Payment], List[Payment]]:
-    offerers = Offerer.query.all()
-    all_payments = []
+    transaction_label = make_transaction_label(datetime.utcnow())
+    pending_payment_ids = []
+    not_processable_payment_ids = []
+
+    for booking_reimbursements in _chunk(_find_booking_reimbursements_to_pay(), PAYMENTS_INSERT_CHUNK_SIZE):
+        payment_ids = payment_queries.get_next_payment_ids_from_sequence(len(booking_reimbursements))
+        payment_rows, payment_status_rows = zip(
+            *[
+                create_payment_rows_for_booking(booking_reimbursement, payment_id, transaction_label)
+                for booking_reimbursement, payment_id in zip(booking_reimbursements, payment_ids)
+            ]
+        )
+        # Rows are inserted in the transaction of the bookings cursor, which
+        # would be closed by a commit: everything is committed at the end.
+        db.session.bulk_insert_mappings(Payment, payment_rows)
+        db.session.bulk_insert_mappings(PaymentStatus, payment_status_rows)
+
+        for payment_status_row in payment_status_rows:
+            if payment_status_row["status"] == TransactionStatus.PENDING:
+                pending_payment_ids.append(payment_status_row["paymentId"])
+            else:
+                not_processable_payment_ids.append(payment_status_row["paymentId"])
+        logger.info("[BATCH][PAYMENTS] Saved %i payments", len(pending_payment_ids) + len(not_processable_payment_ids))
+    db.session.commit()
 
-    for offerer in offerers:
-        booking_reimbursements = []
-        for venue in offerer.managedVenues:
-            final_bookings = booking_repository.find_bookings_eligible_for_payment_for_venue(venue.id)
-            booking_reimbursements += find_all_booking_reimbursements(final_bookings, RULES)
+    logger.info(
+        "[BATCH][PAYMENTS] Generated %i payments in total", len(pending_payment_ids) + len(not_processable_payment_ids)
+    )
 
-        booking_reimbursements_to_pay = filter_out_already_paid_for_bookings(
-            filter_out_bookings_without_cost(booking_reimbursements)
-        )
+    pending_payments = payment_queries.find_by_ids(pending_payment_ids)
+    not_processable_payments = payment_queries.find_by_ids(not_processable_payment_ids)
+    logger.info("[BATCH][PAYMENTS] %s Payments in status PENDING to send", len(pending_payments))
+    return pending_payments, not_processable_payments
 
-        with db.session.no_autoflush:
-            payments = list(map(create_payment_for_booking, booking_reimbursements_to_pay))
 
-        if payments:
-            repository.save(*payments)
-            all_payments.extend(payments)
-        logger.info("[BATCH][PAYMENTS] Saved %i payments for offerer : %s", len(payments), offerer.name)
+def _find_booking_reimbursements_to_pay() -> Iterator[BookingReimbursement]:
+    # Bookings are streamed ordered by venue: reimbursement rules, whose
+    # cumulative amounts are computed by venue, are applied to one venue at
+    # a time.
+    bookings_with_is_paid = booking_repository.find_bookings_eligible_for_payment()
+    for _, venue_bookings_with_is_paid in groupby(
+        bookings_with_is_paid, key=lambda booking_with_is_paid: booking_with_is_paid[0].stock.offer.venueId
+    ):
+        venue_bookings, are_paid = zip(*venue_bookings_with_is_paid)
+        booking_reimbursements = find_all_booking_reimbursements(venue_bookings, RULES)
+        for booking_reimbursement, already_paid in zip(booking_reimbursements, are_paid):
+            if not already_paid and booking_reimbursement.reimbursed_amount > Decimal(0):
+                yield booking_reimbursement
 
-    logger.info("[BATCH][PAYMENTS] Generated %i payments for %i offerers in total", len(all_payments), len(offerers))
 
-    pending_payments = keep_only_pending_payments(all_payments)
-    not_processable_payments = keep_only_not_processable_payments(all_payments)
-    logger.info("[BATCH][PAYMENTS] %s Payments in status PENDING to send", len(pending_payments))
-    return pending_payments, not_processable_payments
+def _chunk(iterable: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
 
 
 def send_transactions(
@@ -93,21 +128,25 @@ def send_transactions(
         )
 
     message_name = "passCulture-SCT-%s" % datetime.strftime(datetime.utcnow(), "%Y%m%d-%H%M%S")
-    xml_file = generate_message_file(
-        payments, pass_culture_iban, pass_culture_bic, message_name, pass_culture_remittance_code
-    )
+    with tempfile.TemporaryFile() as message_file:
+        checksum = write_message_file(
+            message_file, payments, pass_culture_iban, pass_culture_bic, message_name, pass_culture_remittance_code
+        )
 
-    logger.info("[BATCH][PAYMENTS] Payment message name : %s", message_name)
+        logger.info("[BATCH][PAYMENTS] Payment message name : %s", message_name)
 
-    try:
-        validate_message_file_structure(xml_file)
-    except DocumentInvalid as exception:
-        for payment in payments:
-            payment.setStatus(TransactionStatus.NOT_PROCESSABLE, detail=str(exception))
-        repository.save(*payments)
-        raise
+        message_file.seek(0)
+        try:
+            validate_message_file_structure(message_file)
+        except DocumentInvalid as exception:
+            for payment in payments:
+                payment.setStatus(TransactionStatus.NOT_PROCESSABLE, detail=str(exception))
+            repository.save(*payments)
+            raise
+
+        message_file.seek(0)
+        xml_file = message_file.read().decode("utf-8")
 
-    checksum = generate_file_checksum(xml_file)
     message = generate_payment_message(message_name, checksum, payments)
 
     logger.info(
@@ -0,0 +1,38 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict
+
+import pcapi.core.bookings.repository as booking_repository
+from pcapi.domain.reimbursement import BookingReimbursementColumns
+from pcapi.domain.reimbursement import RULES
+from pcapi.domain.reimbursement import ReimbursementRules
+from pcapi.domain.reimbursement import find_all_booking_reimbursements_in_batch
+from pcapi.utils.logger import logger
+
+
+def simulate_reimbursements() -> Dict[ReimbursementRules, Decimal]:
+    """Return the amounts that the next payments batch would reimburse, by
+    rule, without creating any payment.
+    """
+    rows = booking_repository.find_reimbursement_rows_of_bookings_eligible_for_payment()
+    logger.info("[BATCH][PAYMENTS] Simulating the reimbursements of %i bookings", len(rows))
+    columns = BookingReimbursementColumns(
+        bookings=[row.id for row in rows],
+        amounts=[row.amount for row in rows],
+        quantities=[row.quantity for row in rows],
+        offer_types=[row.offerType for row in rows],
+        offers_are_digital=[row.offerIsDigital for row in rows],
+        products_are_digital=[row.productIsDigital for row in rows],
+        dates_created=[row.dateCreated for row in rows],
+        venue_ids=[row.venueId for row in rows],
+    )
+    booking_reimbursements = find_all_booking_reimbursements_in_batch(columns, RULES)
+
+    reimbursed_amounts_by_rule = defaultdict(Decimal)
+    for booking_reimbursement, row in zip(booking_reimbursements, rows):
+        if not row.isPaid:
+            reimbursed_amounts_by_rule[booking_reimbursement.reimbursement] += booking_reimbursement.reimbursed_amount
+
+    for rule, reimbursed_amount in reimbursed_amounts_by_rule.items():
+        logger.info("[BATCH][PAYMENTS] %s: %s €", rule.value.description, reimbursed_amount)
+    return dict(reimbursed_amounts_by_rule)
@@ -0,0 +1,8 @@
+from flask import current_app as app
+
+from pcapi.scripts.payment.reimbursement_simulation import simulate_reimbursements
+
+
+@app.manager.command
+def simulate_payments():
+    simulate_reimbursements()
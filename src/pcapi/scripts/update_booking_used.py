@@ -1,22 +1,97 @@
 from datetime import datetime
+from typing import List
+from typing import Set
 
+from flask import current_app as app
+
+from pcapi.connectors import redis
+from pcapi.core.bookings.models import Booking
 import pcapi.core.bookings.repository as booking_repository
-from pcapi.repository import repository
+from pcapi.core.offers.models import EVENT_AUTOMATIC_REFUND_DELAY
+from pcapi.core.offers.models import Stock
+from pcapi.models.db import db
+from pcapi.models.feature import FeatureToggle
+from pcapi.repository import feature_queries
+from pcapi.utils.logger import logger
+
+
+BATCH_SIZE = 1000
 
 
-def update_booking_used_after_stock_occurrence():
-    bookings_to_process = booking_repository.find_not_used_and_not_cancelled()
+def update_booking_used_after_stock_occurrence(batch_size: int = BATCH_SIZE) -> Set[int]:
+    """Mark as used the bookings of events that began more than
+    EVENT_AUTOMATIC_REFUND_DELAY ago, and return the ids of their offers.
+    """
+    logger.info("[update_booking_used_after_stock_occurrence] Start")
+    now = datetime.utcnow()
+    events_begun_before = now - EVENT_AUTOMATIC_REFUND_DELAY
+    offer_ids = set()
     bookings_id_errors = []
+    updated_total = 0
+    last_booking_id = 0
+
+    # we commit here to make sure there is no unexpected objects in SQLA cache before the updates
+    db.session.commit()
+
+    while True:
+        booking_ids = booking_repository.find_ids_of_bookings_to_mark_as_used(
+            events_begun_before, last_booking_id, batch_size
+        )
+        if not booking_ids:
+            break
+        last_booking_id = booking_ids[-1]
 
-    for booking in bookings_to_process:
-        if booking.stock.beginningDatetime:
-            now = datetime.utcnow()
-            if not booking.stock.isEventDeletable:
-                booking.isUsed = True
-                booking.dateUsed = now
+        try:
+            updated_offer_ids = _mark_bookings_as_used(booking_ids, events_begun_before, now)
+        except Exception:  # pylint: disable=broad-except
+            # A single booking rejected by the database triggers fails the
+            # whole batch: the batch is retried booking by booking.
+            db.session.rollback()
+            updated_offer_ids = []
+            for booking_id in booking_ids:
                 try:
-                    repository.save(booking)
+                    updated_offer_ids += _mark_bookings_as_used([booking_id], events_begun_before, now)
                 except Exception:  # pylint: disable=broad-except
-                    bookings_id_errors.append(booking.id)
+                    db.session.rollback()
+                    bookings_id_errors.append(booking_id)
+
+        updated_total += len(updated_offer_ids)
+        offer_ids.update(updated_offer_ids)
+        logger.info(
+            "[update_booking_used_after_stock_occurrence] %d Bookings marked as used up to id=%d",
+            len(updated_offer_ids),
+            last_booking_id,
+        )
+
+    for offer_id in offer_ids:
+        redis.delete_offer_response(client=app.redis_client, offer_id=offer_id)
+    if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
+        for offer_id in offer_ids:
+            redis.add_offer_id(client=app.redis_client, offer_id=offer_id)
+
+    logger.info(
+        "[update_booking_used_after_stock_occurrence] %d Bookings marked as used, bookings id in error %s",
+        updated_total,
+        bookings_id_errors,
+    )
+    return offer_ids
+
 
-    print("Bookings id in error %s" % bookings_id_errors)
+def _mark_bookings_as_used(booking_ids: List[int], events_begun_before: datetime, now: datetime) -> List[int]:
+    booking = Booking.__table__
+    stock = Stock.__table__
+    statement = (
+        booking.update()
+        .where(booking.c.stockId == stock.c.id)
+        .where(booking.c.id.in_(booking_ids))
+        # Checked again, in case the bookings changed since they were selected
+        .where(booking.c.isUsed.is_(False))
+        .where(booking.c.isCancelled.is_(False))
+        # Strict, see find_ids_of_bookings_to_mark_as_used()
+        .where(stock.c.beginningDatetime < events_begun_before)
+        .values(isUsed=True, dateUsed=now)
+        .returning(stock.c.offerId)
+    )
+    offer_ids = [offer_id for offer_id, in db.session.execute(statement)]
+    db.session.commit()
+    return offer_ids
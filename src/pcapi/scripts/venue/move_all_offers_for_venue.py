@@ -12,4 +12,5 @@ def move_all_offers_from_venue_to_other_venue(origin_venue_id: str, destination_
         o.venueId = destination_venue_id
     repository.save(*offers)
     for o in offers:
+        redis.delete_offer_response(client=app.redis_client, offer_id=o.id)
         redis.add_offer_id(client=app.redis_client, offer_id=o.id)
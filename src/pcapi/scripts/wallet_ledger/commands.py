@@ -0,0 +1,10 @@
+from flask import current_app as app
+
+from pcapi.scripts.wallet_ledger.verify import verify_wallet_ledger
+
+
+@app.manager.option(
+    "-f", "--fix", dest="fix", action="store_true", help="Recompute the wallet ledgers that differ from the bookings"
+)
+def verify_wallet_ledgers(fix: bool = False):
+    verify_wallet_ledger(fix=fix)
@@ -0,0 +1,95 @@
+from decimal import Decimal
+from typing import List
+from typing import NamedTuple
+
+from sqlalchemy import case
+from sqlalchemy import func
+from sqlalchemy import not_
+from sqlalchemy import or_
+from sqlalchemy import text
+from sqlalchemy.orm import Query
+
+from pcapi.models import Booking
+from pcapi.models.db import db
+from pcapi.models.wallet_ledger import WalletLedger
+from pcapi.utils.logger import logger
+
+
+class WalletLedgerDiscrepancy(NamedTuple):
+    user_id: int
+    expected_booked_amount: Decimal
+    ledger_booked_amount: Decimal
+    expected_used_amount: Decimal
+    ledger_used_amount: Decimal
+
+
+def find_wallet_ledger_discrepancies() -> List[WalletLedgerDiscrepancy]:
+    """Recompute the totals of all users from their bookings, like
+    `get_wallet_balance()` used to, and return those that differ from
+    `wallet_ledger`.
+    """
+    booking_totals = _booking_totals_query().subquery()
+    expected_booked_amount = func.coalesce(booking_totals.c.bookedAmount, 0)
+    ledger_booked_amount = func.coalesce(WalletLedger.bookedAmount, 0)
+    expected_used_amount = func.coalesce(booking_totals.c.usedAmount, 0)
+    ledger_used_amount = func.coalesce(WalletLedger.usedAmount, 0)
+    user_id = func.coalesce(booking_totals.c.userId, WalletLedger.userId)
+
+    discrepancies = (
+        db.session.query(
+            user_id, expected_booked_amount, ledger_booked_amount, expected_used_amount, ledger_used_amount
+        )
+        .select_from(booking_totals)
+        .outerjoin(WalletLedger, WalletLedger.userId == booking_totals.c.userId, full=True)
+        .filter(or_(expected_booked_amount != ledger_booked_amount, expected_used_amount != ledger_used_amount))
+        .order_by(user_id)
+        .all()
+    )
+
+    return [WalletLedgerDiscrepancy(*discrepancy) for discrepancy in discrepancies]
+
+
+def fix_wallet_ledger(user_id: int) -> None:
+    # The missing ledger row is created like the booking trigger does, so
+    # that both can run concurrently without hitting the unique constraint.
+    db.session.execute(text("SELECT add_to_wallet_ledger(:user_id, 0, 0)"), {"user_id": user_id})
+    # The ledger row is locked before the bookings are summed, so that a
+    # booking made meanwhile is added by its trigger once the fix is committed.
+    ledger = WalletLedger.query.filter_by(userId=user_id).with_for_update().one()
+    booking_totals = _booking_totals_query().filter(Booking.userId == user_id).one_or_none()
+    ledger.bookedAmount = booking_totals.bookedAmount if booking_totals else 0
+    ledger.usedAmount = booking_totals.usedAmount if booking_totals else 0
+    db.session.commit()
+
+
+def verify_wallet_ledger(fix: bool = False) -> List[WalletLedgerDiscrepancy]:
+    discrepancies = find_wallet_ledger_discrepancies()
+
+    for discrepancy in discrepancies:
+        logger.warning(
+            "Wallet ledger of user %s differs from their bookings: booked amount %s instead of %s, "
+            "used amount %s instead of %s",
+            discrepancy.user_id,
+            discrepancy.ledger_booked_amount,
+            discrepancy.expected_booked_amount,
+            discrepancy.ledger_used_amount,
+            discrepancy.expected_used_amount,
+        )
+        if fix:
+            fix_wallet_ledger(discrepancy.user_id)
+
+    logger.info("%i wallet ledgers differ from the bookings%s", len(discrepancies), " and were fixed" if fix else "")
+    return discrepancies
+
+
+def _booking_totals_query() -> Query:
+    total_amount = Booking.amount * Booking.quantity
+    return (
+        db.session.query(
+            Booking.userId.label("userId"),
+            func.sum(total_amount).label("bookedAmount"),
+            func.sum(case([(Booking.isUsed, total_amount)], else_=0)).label("usedAmount"),
+        )
+        .filter(not_(Booking.isCancelled))
+        .group_by(Booking.userId)
+    )
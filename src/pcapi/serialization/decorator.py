@@ -63,6 +63,9 @@ def spectree_serialize(  # pylint: disable=dangerous-default-value
         on_error_statuses (List[int], optional): list of possible error statuses. Defaults to [].
         api (SpecTree, optional): [description]. Defaults to default_api.
 
+    The route may also return a Response, e.g. an already serialized one,
+    which is then sent as is.
+
     Returns:
         Callable[[Any], Any]: [description]
     """
@@ -106,6 +109,8 @@ def spectree_serialize(  # pylint: disable=dangerous-default-value
                 kwargs["form"] = form_in_kwargs(**form)
 
             result = route(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
             return _make_json_response(
                 content=result, status_code=on_success_status, by_alias=response_by_alias, exclude_none=exclude_none
             )
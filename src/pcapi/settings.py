@@ -58,12 +58,26 @@ CORS_ALLOWED_ORIGIN = os.environ.get("CORS_ALLOWED_ORIGIN")
 
 # REDIS
 REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379")
+# Number of offer ids popped at once (LRANGE 0 N used to return one more id)
 REDIS_OFFER_IDS_CHUNK_SIZE = int(os.environ.get("REDIS_OFFER_IDS_CHUNK_SIZE", 1000))
 REDIS_OFFER_IDS_IN_ERROR_CHUNK_SIZE = int(os.environ.get("REDIS_OFFER_IDS_IN_ERROR_CHUNK_SIZE", 1000))
 REDIS_VENUE_IDS_CHUNK_SIZE = int(os.environ.get("REDIS_VENUE_IDS_CHUNK_SIZE", 1000))
 REDIS_VENUE_PROVIDERS_CHUNK_SIZE = int(os.environ.get("REDIS_VENUE_PROVIDERS_LRANGE_END", 1))
 
 
+# FEATURES
+FEATURES_CACHE_TTL = int(os.environ.get("FEATURES_CACHE_TTL", 60))
+
+
+# BOOKINGS
+BOOKINGS_RECAP_COUNT_CACHE_TTL = int(os.environ.get("BOOKINGS_RECAP_COUNT_CACHE_TTL", 300))
+BOOKINGS_RECAP_EXPORT_YIELD_PER = int(os.environ.get("BOOKINGS_RECAP_EXPORT_YIELD_PER", 1000))
+
+
+# OFFERS
+OFFER_RESPONSE_CACHE_TTL = int(os.environ.get("OFFER_RESPONSE_CACHE_TTL", 30))
+
+
 # SENTRY
 SENTRY_DSN = os.environ.get("SENTRY_DSN", "https://0470142cf8d44893be88ecded2a14e42@logs.passculture.app/5")
 SENTRY_SAMPLE_RATE = float(os.environ.get("SENTRY_SAMPLE_RATE", 0))
@@ -80,6 +94,10 @@ elif IS_DEV:
 else:
     raise RuntimeError("Unknown environment")
 EMAIL_BACKEND = os.environ.get("EMAIL_BACKEND", _default_email_backend)
+# Transactional e-mails of the booking flows are sent in batches by the worker
+EMAILS_DISPATCH_ASYNC = bool(int(os.environ.get("EMAILS_DISPATCH_ASYNC", int(not IS_DEV and not IS_RUNNING_TESTS))))
+EMAILS_DISPATCH_BATCH_SIZE = int(os.environ.get("EMAILS_DISPATCH_BATCH_SIZE", 50))
+EMAILS_DISPATCH_SCHEDULED_TTL = int(os.environ.get("EMAILS_DISPATCH_SCHEDULED_TTL", 60))
 SUPPORT_EMAIL_ADDRESS = os.environ.get("SUPPORT_EMAIL_ADDRESS")
 ADMINISTRATION_EMAIL_ADDRESS = os.environ.get("ADMINISTRATION_EMAIL_ADDRESS")
 DEV_EMAIL_ADDRESS = os.environ.get("DEV_EMAIL_ADDRESS")
@@ -109,6 +127,15 @@ ALGOLIA_DELETING_OFFERS_CHUNK_SIZE = int(os.environ.get("ALGOLIA_DELETING_OFFERS
 ALGOLIA_OFFERS_BY_VENUE_CHUNK_SIZE = int(os.environ.get("ALGOLIA_OFFERS_BY_VENUE_CHUNK_SIZE", 10000))
 ALGOLIA_OFFERS_BY_VENUE_PROVIDER_CHUNK_SIZE = int(os.environ.get("ALGOLIA_OFFERS_BY_VENUE_PROVIDER_CHUNK_SIZE", 10000))
 ALGOLIA_SYNC_WORKERS_POOL_SIZE = int(os.environ.get("ALGOLIA_SYNC_WORKERS_POOL_SIZE", 10))
+ALGOLIA_SYNC_WORKERS_IN_PROCESS = bool(int(os.environ.get("ALGOLIA_SYNC_WORKERS_IN_PROCESS", "0")))
+if IS_RUNNING_TESTS:
+    _default_algolia_backend = "pcapi.algolia.infrastructure.backends.testing.TestingBackend"
+else:
+    _default_algolia_backend = "pcapi.algolia.infrastructure.backends.algolia.AlgoliaBackend"
+ALGOLIA_BACKEND = os.environ.get("ALGOLIA_BACKEND", _default_algolia_backend)
+ALGOLIA_SAVE_OBJECTS_BATCH_SIZE = int(os.environ.get("ALGOLIA_SAVE_OBJECTS_BATCH_SIZE", 1000))
+ALGOLIA_SAVE_OBJECTS_BATCH_MAX_BYTES = int(os.environ.get("ALGOLIA_SAVE_OBJECTS_BATCH_MAX_BYTES", 5 * 1024 * 1024))
+ALGOLIA_SAVE_OBJECTS_CONCURRENCY = int(os.environ.get("ALGOLIA_SAVE_OBJECTS_CONCURRENCY", 4))
 
 
 # SCALINGO
@@ -162,6 +189,10 @@ ALLOCINE_API_KEY = os.environ.get("ALLOCINE_API_KEY")
 FNAC_API_TOKEN = os.environ.get("PROVIDER_FNAC_BASIC_AUTHENTICATION_TOKEN")
 FNAC_API_URL = "https://passculture-fr.ws.fnac.com/api/v1/pass-culture/stocks"
 PROVIDERS_SYNC_WORKERS_POOL_SIZE = int(os.environ.get("SYNC_WORKERS_POOL_SIZE", 5))
+PROVIDERS_THUMB_CONVERSION_WORKERS = int(
+    os.environ.get("PROVIDERS_THUMB_CONVERSION_WORKERS", 0 if IS_RUNNING_TESTS else 2)
+)
+PROVIDERS_THUMB_UPLOAD_WORKERS = int(os.environ.get("PROVIDERS_THUMB_UPLOAD_WORKERS", 4))
 
 
 # DEMARCHES SIMPLIFIEES
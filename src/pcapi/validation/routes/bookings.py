@@ -1,8 +1,12 @@
 from typing import Union
 
+from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapCursor
 from pcapi.models import ApiErrors
 
 
+BOOKINGS_RECAP_EXPORT_FORMATS = ("csv", "json")
+
+
 def check_email_and_offer_id_for_anonymous_user(email: str, offer_id: int) -> None:
     api_errors = ApiErrors()
     if not email:
@@ -22,3 +26,21 @@ def check_page_format_is_number(page: Union[int, str]):
         api_errors = ApiErrors()
         api_errors.add_error("global", f"L'argument 'page' {page} n'est pas valide")
         raise api_errors
+
+
+def check_cursor_format(cursor: str) -> None:
+    if not cursor:
+        return
+    try:
+        BookingsRecapCursor.decode(cursor)
+    except ValueError:
+        api_errors = ApiErrors()
+        api_errors.add_error("global", f"L'argument 'cursor' {cursor} n'est pas valide")
+        raise api_errors
+
+
+def check_export_format(export_format: str) -> None:
+    if export_format not in BOOKINGS_RECAP_EXPORT_FORMATS:
+        api_errors = ApiErrors()
+        api_errors.add_error("global", f"L'argument 'format' {export_format} n'est pas valide")
+        raise api_errors
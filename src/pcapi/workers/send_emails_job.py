@@ -0,0 +1,13 @@
+from rq.decorators import job
+
+from pcapi.core import mails
+from pcapi.workers import worker
+from pcapi.workers.decorators import job_context
+from pcapi.workers.decorators import log_job
+
+
+@job(worker.default_queue, connection=worker.conn)
+@job_context
+@log_job
+def send_emails_job() -> None:
+    mails.send_queued_emails()
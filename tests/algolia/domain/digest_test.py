@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+from pcapi.algolia.domain.digest import compute_object_digest
+from pcapi.algolia.domain.digest import has_object_changed
+
+
+class ComputeObjectDigestTest:
+    def test_should_not_depend_on_keys_order(self):
+        # Given
+        object1 = {"objectID": "AE", "offer": {"name": "super offre", "prices": [Decimal("10.00")]}}
+        object2 = {"offer": {"prices": [Decimal("10.00")], "name": "super offre"}, "objectID": "AE"}
+
+        # Then
+        assert compute_object_digest(object1) == compute_object_digest(object2)
+
+    def test_should_change_when_any_field_changes(self):
+        # Given
+        object1 = {"objectID": "AE", "offer": {"name": "super offre", "withdrawalDetails": None}}
+        object2 = {"objectID": "AE", "offer": {"name": "super offre", "withdrawalDetails": "Au guichet"}}
+
+        # Then
+        assert compute_object_digest(object1) != compute_object_digest(object2)
+
+
+class HasObjectChangedTest:
+    def test_should_return_false_when_digest_is_the_same(self):
+        assert not has_object_changed("abc", {"name": "super offre", "digest": "abc"})
+
+    def test_should_return_true_when_digest_is_different(self):
+        assert has_object_changed("abc", {"name": "super offre", "digest": "def"})
+
+    def test_should_return_true_when_offer_was_indexed_without_digest(self):
+        assert has_object_changed("abc", {"name": "super offre", "dates": [], "prices": [10.0]})
@@ -0,0 +1,111 @@
+from unittest.mock import call
+from unittest.mock import patch
+
+import pytest
+
+from pcapi.algolia.infrastructure import api
+from pcapi.algolia.infrastructure.backends.algolia import AlgoliaBackend
+from pcapi.algolia.infrastructure.backends.algolia import split_into_batches
+import pcapi.algolia.infrastructure.testing as algolia_testing
+
+
+class TestingBackendTest:
+    def test_add_objects_should_store_objects_by_object_id(self):
+        # When
+        api.add_objects([{"objectID": "AE", "offer": {"name": "Livre"}}, {"objectID": "A9"}])
+
+        # Then
+        assert algolia_testing.indexed_objects == {
+            "AE": {"objectID": "AE", "offer": {"name": "Livre"}},
+            "A9": {"objectID": "A9"},
+        }
+
+    def test_delete_objects_should_remove_given_objects_only(self):
+        # Given
+        api.add_objects([{"objectID": "AE"}, {"objectID": "A9"}])
+
+        # When
+        api.delete_objects(["AE", "AM"])
+
+        # Then
+        assert algolia_testing.indexed_objects == {"A9": {"objectID": "A9"}}
+
+    def test_clear_index_should_remove_all_objects(self):
+        # Given
+        api.add_objects([{"objectID": "AE"}, {"objectID": "A9"}])
+
+        # When
+        api.clear_index()
+
+        # Then
+        assert algolia_testing.indexed_objects == {}
+
+
+class GetBackendTest:
+    def test_should_instantiate_backend_once_per_process(self):
+        # When
+        backend1 = api._get_backend("pcapi.algolia.infrastructure.backends.testing.TestingBackend")
+        backend2 = api._get_backend("pcapi.algolia.infrastructure.backends.testing.TestingBackend")
+
+        # Then
+        assert backend1 is backend2
+
+
+class SplitIntoBatchesTest:
+    def test_should_split_objects_by_count(self):
+        # Given
+        objects = [{"objectID": str(i)} for i in range(5)]
+
+        # When
+        batches = list(split_into_batches(objects, max_objects=2, max_bytes=10000))
+
+        # Then
+        assert batches == [objects[0:2], objects[2:4], objects[4:5]]
+
+    def test_should_split_objects_by_payload_size(self):
+        # Given
+        objects = [{"objectID": str(i), "description": "x" * 100} for i in range(3)]
+
+        # When
+        batches = list(split_into_batches(objects, max_objects=1000, max_bytes=300))
+
+        # Then
+        assert batches == [objects[0:2], objects[2:3]]
+
+    def test_should_not_return_any_batch_when_no_objects(self):
+        assert list(split_into_batches([], max_objects=2, max_bytes=10000)) == []
+
+
+@patch("pcapi.algolia.infrastructure.backends.algolia.SearchClient")
+class AlgoliaBackendTest:
+    def test_should_create_client_once(self, mock_search_client):
+        # Given
+        backend = AlgoliaBackend()
+
+        # When
+        backend.save_objects([{"objectID": "AE"}])
+        backend.delete_objects(["AE"])
+
+        # Then
+        mock_search_client.create.assert_called_once()
+
+    @pytest.mark.parametrize("concurrency", [1, 4])
+    @patch("pcapi.algolia.infrastructure.backends.algolia.settings.ALGOLIA_SAVE_OBJECTS_BATCH_SIZE", 2)
+    def test_should_save_objects_by_batch(self, mock_search_client, concurrency):
+        # Given
+        backend = AlgoliaBackend()
+        index = mock_search_client.create.return_value.init_index.return_value
+        objects = [{"objectID": str(i)} for i in range(5)]
+
+        # When
+        with patch(
+            "pcapi.algolia.infrastructure.backends.algolia.settings.ALGOLIA_SAVE_OBJECTS_CONCURRENCY", concurrency
+        ):
+            backend.save_objects(objects)
+
+        # Then
+        assert sorted(index.save_objects.call_args_list, key=lambda c: c[0][0][0]["objectID"]) == [
+            call(objects[0:2]),
+            call(objects[2:4]),
+            call(objects[4:5]),
+        ]
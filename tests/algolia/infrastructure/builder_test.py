@@ -5,7 +5,11 @@ from decimal import Decimal
 from freezegun import freeze_time
 import pytest
 
+from pcapi.algolia.domain.digest import compute_object_digest
 from pcapi.algolia.infrastructure.builder import build_object
+from pcapi.algolia.infrastructure.builder import build_objects
+import pcapi.core.bookings.factories as bookings_factories
+import pcapi.core.offers.factories as offers_factories
 from pcapi.model_creators.generic_creators import create_criterion
 from pcapi.model_creators.generic_creators import create_offerer
 from pcapi.model_creators.generic_creators import create_stock
@@ -565,7 +569,7 @@ class BuildObjectTest:
                 "stageDirector": None,
                 "stocksDateCreated": [1607166000.0],
                 "thumbUrl": f"http://localhost/storage/thumbs/products/{humanized_product_id}",
-                "tags": ["Mon tag associé", "Iron Man mon super héros"],
+                "tags": ["Iron Man mon super héros", "Mon tag associé"],
                 "times": [32400],
                 "type": "Écouter",
                 "visa": None,
@@ -581,3 +585,63 @@ class BuildObjectTest:
             },
             "_geoloc": {"lat": 48.86387, "lng": 2.33802},
         }
+
+    @pytest.mark.usefixtures("db_session")
+    def test_should_build_objects_with_the_same_digest_whatever_the_criteria_order(self, app):
+        # Given
+        first_criterion = offers_factories.CriterionFactory(name="Mon tag associé")
+        second_criterion = offers_factories.CriterionFactory(name="Iron Man mon super héros")
+        offer = offers_factories.EventOfferFactory(criteria=[first_criterion, second_criterion])
+        offers_factories.EventStockFactory(offer=offer)
+        offers_factories.EventStockFactory(offer=offer)
+        digest = compute_object_digest(build_object(offer))
+
+        # When
+        offer.criteria = [second_criterion, first_criterion]
+        repository.save(offer)
+
+        # Then
+        assert compute_object_digest(build_object(offer)) == digest
+        assert compute_object_digest(build_objects([offer.id])[0]) == digest
+
+
+class BuildObjectsTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_should_build_the_same_objects_as_build_object(self, app):
+        # Given
+        event_offer = offers_factories.EventOfferFactory(extraData={"performer": "Someone"})
+        offers_factories.EventStockFactory(offer=event_offer, price=20)
+        offers_factories.EventStockFactory(offer=event_offer, price=10)
+        offers_factories.EventStockFactory(offer=event_offer, price=5, isSoftDeleted=True)
+        offers_factories.MediationFactory(offer=event_offer, thumbCount=1)
+        thing_offer = offers_factories.ThingOfferFactory()
+        offers_factories.ThingStockFactory(offer=thing_offer, price=12)
+        thing_offer.criteria = [offers_factories.CriterionFactory(name="Tag")]
+        repository.save(thing_offer)
+
+        # When
+        result = build_objects([event_offer.id, thing_offer.id])
+
+        # Then
+        assert sorted(result, key=lambda object_to_index: object_to_index["objectID"]) == sorted(
+            [build_object(event_offer), build_object(thing_offer)],
+            key=lambda object_to_index: object_to_index["objectID"],
+        )
+
+    @pytest.mark.usefixtures("db_session")
+    def test_should_not_build_offers_without_bookable_stock(self, app):
+        # Given
+        offer_without_stock = offers_factories.ThingOfferFactory()
+        inactive_offer = offers_factories.ThingOfferFactory(isActive=False)
+        offers_factories.ThingStockFactory(offer=inactive_offer)
+        sold_out_offer = offers_factories.ThingOfferFactory()
+        sold_out_stock = offers_factories.ThingStockFactory(offer=sold_out_offer, quantity=1)
+        bookings_factories.BookingFactory(stock=sold_out_stock)
+        bookable_offer = offers_factories.ThingOfferFactory()
+        offers_factories.ThingStockFactory(offer=bookable_offer)
+
+        # When
+        result = build_objects([offer_without_stock.id, inactive_offer.id, sold_out_offer.id, bookable_offer.id])
+
+        # Then
+        assert [object_to_index["objectID"] for object_to_index in result] == [humanize(bookable_offer.id)]
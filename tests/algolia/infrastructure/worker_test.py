@@ -1,7 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock
 from unittest.mock import call
 from unittest.mock import patch
 
+from pcapi.algolia.infrastructure.worker import _index_venue_provider
 from pcapi.algolia.infrastructure.worker import _run_indexing
 from pcapi.algolia.infrastructure.worker import process_multi_indexing
 
@@ -105,3 +107,90 @@ class RunIndexingTest:
         mock_add_venue_provider_currently_in_sync.assert_called_once_with(
             client=client, container_id="azerty123", venue_provider_id=venue_provider["id"]
         )
+
+
+@patch("pcapi.settings.ALGOLIA_SYNC_WORKERS_IN_PROCESS", True)
+@patch("pcapi.algolia.infrastructure.worker._create_indexing_pool")
+@patch("pcapi.algolia.infrastructure.worker._index_venue_provider")
+@patch("pcapi.algolia.infrastructure.worker.delete_venue_providers")
+@patch("pcapi.algolia.infrastructure.worker.get_venue_providers")
+class ProcessMultiIndexingInProcessPoolTest:
+    @patch("pcapi.algolia.infrastructure.worker.sleep")
+    @patch("pcapi.algolia.infrastructure.worker._run_indexing")
+    def test_should_index_every_venue_provider_in_process_pool(
+        self,
+        mock_run_indexing,
+        mock_sleep,
+        mock_get_venue_providers,
+        mock_delete_venue_providers,
+        mock_index_venue_provider,
+        mock_create_indexing_pool,
+    ):
+        # Given
+        client = MagicMock()
+        venue_provider1 = {"id": 1, "providerId": 1, "venueId": 1}
+        venue_provider2 = {"id": 2, "providerId": 2, "venueId": 2}
+        mock_get_venue_providers.return_value = [venue_provider1, venue_provider2]
+        mock_create_indexing_pool.return_value = ThreadPoolExecutor(max_workers=1)
+
+        # When
+        process_multi_indexing(client=client)
+
+        # Then
+        assert mock_index_venue_provider.call_args_list == [call(venue_provider1), call(venue_provider2)]
+        mock_delete_venue_providers.assert_called_once_with(client=client)
+        mock_run_indexing.assert_not_called()
+        mock_sleep.assert_not_called()
+
+    def test_should_not_create_process_pool_when_no_venue_provider(
+        self,
+        mock_get_venue_providers,
+        mock_delete_venue_providers,
+        mock_index_venue_provider,
+        mock_create_indexing_pool,
+    ):
+        # Given
+        mock_get_venue_providers.return_value = []
+
+        # When
+        process_multi_indexing(client=MagicMock())
+
+        # Then
+        mock_create_indexing_pool.assert_not_called()
+        mock_index_venue_provider.assert_not_called()
+
+    @patch("pcapi.algolia.infrastructure.worker.logger")
+    def test_should_log_venue_providers_whose_indexing_failed(
+        self,
+        mock_logger,
+        mock_get_venue_providers,
+        mock_delete_venue_providers,
+        mock_index_venue_provider,
+        mock_create_indexing_pool,
+    ):
+        # Given
+        venue_provider1 = {"id": 1, "providerId": 1, "venueId": 1}
+        venue_provider2 = {"id": 2, "providerId": 2, "venueId": 2}
+        mock_get_venue_providers.return_value = [venue_provider1, venue_provider2]
+        mock_create_indexing_pool.return_value = ThreadPoolExecutor(max_workers=1)
+        mock_index_venue_provider.side_effect = [ValueError("boom"), None]
+
+        # When
+        process_multi_indexing(client=MagicMock())
+
+        # Then
+        assert mock_index_venue_provider.call_args_list == [call(venue_provider1), call(venue_provider2)]
+        mock_logger.error.assert_called_once()
+        assert mock_logger.error.call_args[0][1] == 1
+
+
+class IndexVenueProviderTest:
+    @patch("pcapi.algolia.infrastructure.worker.process_venue_provider")
+    def test_should_process_venue_provider_offers(self, mock_process_venue_provider, app):
+        # When
+        _index_venue_provider({"id": 1, "providerId": "2", "venueId": 3})
+
+        # Then
+        mock_process_venue_provider.assert_called_once_with(
+            client=app.redis_client, provider_id="2", venue_provider_id=1, venue_id=3
+        )
@@ -1,5 +1,6 @@
 from datetime import datetime
 from datetime import timedelta
+from decimal import Decimal
 from unittest.mock import MagicMock
 from unittest.mock import call
 from unittest.mock import patch
@@ -8,9 +9,11 @@ from algoliasearch.exceptions import AlgoliaException
 from freezegun import freeze_time
 import pytest
 
+from pcapi.algolia.domain.digest import compute_object_digest
 from pcapi.algolia.usecase.orchestrator import _build_offer_details_to_be_indexed
 from pcapi.algolia.usecase.orchestrator import delete_expired_offers
 from pcapi.algolia.usecase.orchestrator import process_eligible_offers
+from pcapi.algolia.usecase.orchestrator import process_offers_in_bulk
 from pcapi.core.offers import factories as offers_factories
 from pcapi.model_creators.generic_creators import create_offerer
 from pcapi.model_creators.generic_creators import create_stock
@@ -31,12 +34,12 @@ class ProcessEligibleOffersTest:
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.build_object", return_value={"fake": "test"})
     def test_should_add_objects_when_objects_are_eligible_and_not_already_indexed(
         self,
         mock_build_object,
-        mock_check_offer_exists,
+        mock_get_indexed_offers_details,
         mock_add_objects,
         mock_delete_objects,
         mock_add_to_indexed_offers,
@@ -60,10 +63,10 @@ class ProcessEligibleOffersTest:
         offer3 = create_offer_with_thing_product(venue=venue, is_active=False)
         stock3 = create_stock(booking_limit_datetime=TOMORROW, offer=offer3, quantity=10)
         repository.save(stock1, stock2, stock3)
-        mock_check_offer_exists.side_effect = [False, False, False]
+        mock_get_indexed_offers_details.return_value = {}
 
         # When
-        process_eligible_offers(client=client, offer_ids=[offer1.id, offer2.id], from_provider_update=False)
+        process_eligible_offers(client=client, offer_ids=[offer1.id, offer2.id])
 
         # Then
         assert mock_build_object.call_count == 2
@@ -72,12 +75,22 @@ class ProcessEligibleOffersTest:
         assert mock_add_to_indexed_offers.call_args_list == [
             call(
                 pipeline=mock_pipeline,
-                offer_details={"name": "Test Book", "dates": [], "prices": [10.0]},
+                offer_details={
+                    "name": "Test Book",
+                    "dates": [],
+                    "prices": [10.0],
+                    "digest": compute_object_digest({"fake": "test"}),
+                },
                 offer_id=offer1.id,
             ),
             call(
                 pipeline=mock_pipeline,
-                offer_details={"name": "Test Book", "dates": [], "prices": [10.0]},
+                offer_details={
+                    "name": "Test Book",
+                    "dates": [],
+                    "prices": [10.0],
+                    "digest": compute_object_digest({"fake": "test"}),
+                },
                 offer_id=offer2.id,
             ),
         ]
@@ -110,7 +123,7 @@ class ProcessEligibleOffersTest:
     @pytest.mark.usefixtures("db_session")
     @patch("pcapi.algolia.usecase.orchestrator.add_offer_ids_in_error")
     @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
@@ -121,7 +134,7 @@ class ProcessEligibleOffersTest:
         mock_add_objects,
         mock_delete_objects,
         mock_add_to_indexed_offers,
-        mock_check_offer_exists,
+        mock_get_indexed_offers_details,
         mock_delete_indexed_offers,
         mock_add_offer_ids_in_error,
         app,
@@ -140,10 +153,10 @@ class ProcessEligibleOffersTest:
         offer2 = create_offer_with_thing_product(venue=venue, is_active=True)
         stock2 = create_stock(booking_limit_datetime=TOMORROW, offer=offer2, quantity=0)
         repository.save(stock1, stock2)
-        mock_check_offer_exists.side_effect = [True, True]
+        mock_get_indexed_offers_details.return_value = {offer1.id: {}, offer2.id: {}}
 
         # When
-        process_eligible_offers(client=client, offer_ids=[offer1.id, offer2.id], from_provider_update=False)
+        process_eligible_offers(client=client, offer_ids=[offer1.id, offer2.id])
 
         # Then
         mock_build_object.assert_not_called()
@@ -159,7 +172,7 @@ class ProcessEligibleOffersTest:
 
     @pytest.mark.usefixtures("db_session")
     @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
@@ -170,7 +183,7 @@ class ProcessEligibleOffersTest:
         mock_add_objects,
         mock_delete_objects,
         mock_add_to_indexed_offers,
-        mock_check_offer_exists,
+        mock_get_indexed_offers_details,
         mock_delete_indexed_offers,
         app,
     ):
@@ -188,10 +201,10 @@ class ProcessEligibleOffersTest:
         offer2 = create_offer_with_thing_product(venue=venue, is_active=True)
         stock2 = create_stock(booking_limit_datetime=TOMORROW, offer=offer2, quantity=0)
         repository.save(stock1, stock2)
-        mock_check_offer_exists.side_effect = [False, False]
+        mock_get_indexed_offers_details.return_value = {}
 
         # When
-        process_eligible_offers(client=client, offer_ids=[offer1.id, offer2.id], from_provider_update=False)
+        process_eligible_offers(client=client, offer_ids=[offer1.id, offer2.id])
 
         # Then
         mock_build_object.assert_not_called()
@@ -205,7 +218,7 @@ class ProcessEligibleOffersTest:
     @pytest.mark.usefixtures("db_session")
     @patch("pcapi.algolia.usecase.orchestrator.add_offer_ids_in_error")
     @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
@@ -216,7 +229,7 @@ class ProcessEligibleOffersTest:
         mock_add_objects,
         mock_delete_objects,
         mock_add_to_indexed_offers,
-        mock_check_offer_exists,
+        mock_get_indexed_offers_details,
         mock_delete_indexed_offers,
         mock_add_offer_ids_in_error,
         app,
@@ -235,11 +248,11 @@ class ProcessEligibleOffersTest:
         offer2 = create_offer_with_thing_product(venue=venue, is_active=True)
         stock2 = create_stock(booking_limit_datetime=TOMORROW, offer=offer2, quantity=0)
         repository.save(stock1, stock2)
-        mock_check_offer_exists.side_effect = [True, True]
+        mock_get_indexed_offers_details.return_value = {offer1.id: {}, offer2.id: {}}
         mock_delete_objects.side_effect = [AlgoliaException]
 
         # When
-        process_eligible_offers(client=client, offer_ids=[offer1.id, offer2.id], from_provider_update=False)
+        process_eligible_offers(client=client, offer_ids=[offer1.id, offer2.id])
 
         # Then
         mock_build_object.assert_not_called()
@@ -253,8 +266,7 @@ class ProcessEligibleOffersTest:
         mock_pipeline.reset.assert_not_called()
 
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.get_offer_details")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.build_object")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
@@ -264,8 +276,7 @@ class ProcessEligibleOffersTest:
         mock_add_objects,
         mock_build_object,
         mock_delete_objects,
-        mock_check_offer_exists,
-        mock_get_offer_details,
+        mock_get_indexed_offers_details,
         mock_add_to_indexed_offers,
         app,
     ):
@@ -291,29 +302,43 @@ class ProcessEligibleOffersTest:
             {"fake": "object"},
             {"fake": "object"},
         ]
-        mock_check_offer_exists.side_effect = [False, False, False]
+        mock_get_indexed_offers_details.return_value = {}
 
         # When
-        process_eligible_offers(client=client, offer_ids=offer_ids, from_provider_update=True)
+        process_eligible_offers(client=client, offer_ids=offer_ids)
 
         # Then
-        assert mock_check_offer_exists.call_count == 3
-        assert mock_get_offer_details.call_count == 0
+        assert mock_get_indexed_offers_details.call_count == 1
         assert mock_add_to_indexed_offers.call_count == 3
         assert mock_add_to_indexed_offers.call_args_list == [
             call(
                 pipeline=mock_pipeline,
-                offer_details={"name": "super offre 1", "dates": [], "prices": [10.0]},
+                offer_details={
+                    "name": "super offre 1",
+                    "dates": [],
+                    "prices": [10.0],
+                    "digest": compute_object_digest({"fake": "object"}),
+                },
                 offer_id=offer1.id,
             ),
             call(
                 pipeline=mock_pipeline,
-                offer_details={"name": "super offre 2", "dates": [], "prices": [10.0]},
+                offer_details={
+                    "name": "super offre 2",
+                    "dates": [],
+                    "prices": [10.0],
+                    "digest": compute_object_digest({"fake": "object"}),
+                },
                 offer_id=offer2.id,
             ),
             call(
                 pipeline=mock_pipeline,
-                offer_details={"name": "super offre 3", "dates": [], "prices": [10.0]},
+                offer_details={
+                    "name": "super offre 3",
+                    "dates": [],
+                    "prices": [10.0],
+                    "digest": compute_object_digest({"fake": "object"}),
+                },
                 offer_id=offer3.id,
             ),
         ]
@@ -327,8 +352,7 @@ class ProcessEligibleOffersTest:
 
     @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.get_offer_details")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.build_object")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
@@ -338,8 +362,7 @@ class ProcessEligibleOffersTest:
         mock_add_objects,
         mock_build_object,
         mock_delete_objects,
-        mock_check_offer_exists,
-        mock_get_offer_details,
+        mock_get_indexed_offers_details,
         mock_add_to_indexed_offers,
         mock_delete_indexed_offers,
         app,
@@ -361,16 +384,15 @@ class ProcessEligibleOffersTest:
         stock3 = create_stock(booking_limit_datetime=TOMORROW, offer=offer3, quantity=1)
         repository.save(stock1, stock2, stock3)
         offer_ids = [offer1.id, offer2.id, offer3.id]
-        mock_check_offer_exists.side_effect = [True, True, True]
+        mock_get_indexed_offers_details.return_value = {offer1.id: {}, offer2.id: {}, offer3.id: {}}
 
         # When
-        process_eligible_offers(client=client, offer_ids=offer_ids, from_provider_update=True)
+        process_eligible_offers(client=client, offer_ids=offer_ids)
 
         # Then
-        assert mock_check_offer_exists.call_count == 3
+        assert mock_get_indexed_offers_details.call_count == 1
         assert mock_build_object.call_count == 0
         assert mock_add_objects.call_count == 0
-        assert mock_get_offer_details.call_count == 0
         assert mock_add_to_indexed_offers.call_count == 0
         assert mock_delete_objects.call_count == 1
         assert mock_delete_objects.call_args_list == [
@@ -384,11 +406,11 @@ class ProcessEligibleOffersTest:
         assert mock_pipeline.reset.call_count == 0
 
     @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @pytest.mark.usefixtures("db_session")
     def test_should_not_delete_offers_that_are_not_already_indexed(
-        self, mock_delete_objects, mock_check_offer_exists, mock_delete_indexed_offers, app
+        self, mock_delete_objects, mock_get_indexed_offers_details, mock_delete_indexed_offers, app
     ):
         # Given
         client = MagicMock()
@@ -405,30 +427,28 @@ class ProcessEligibleOffersTest:
         stock2 = create_stock(booking_limit_datetime=TOMORROW, offer=offer2, quantity=1)
         repository.save(stock1, stock2)
         offer_ids = [offer1.id, offer2.id]
-        mock_check_offer_exists.side_effect = [False, False]
+        mock_get_indexed_offers_details.return_value = {}
 
         # When
-        process_eligible_offers(client=client, offer_ids=offer_ids, from_provider_update=True)
+        process_eligible_offers(client=client, offer_ids=offer_ids)
 
         # Then
-        assert mock_check_offer_exists.call_count == 2
+        assert mock_get_indexed_offers_details.call_count == 1
         assert mock_delete_objects.call_count == 0
         assert mock_delete_indexed_offers.call_count == 0
 
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.get_offer_details")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.build_object")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
     @pytest.mark.usefixtures("db_session")
-    def test_should_reindex_offers_that_are_already_indexed_only_if_offer_name_changed(
+    def test_should_reindex_offers_that_are_already_indexed_when_object_digest_has_changed(
         self,
         mock_add_objects,
         mock_build_object,
         mock_delete_objects,
-        mock_check_offer_exists,
-        mock_get_offer_details,
+        mock_get_indexed_offers_details,
         mock_add_to_indexed_offers,
         app,
     ):
@@ -448,20 +468,25 @@ class ProcessEligibleOffersTest:
         mock_build_object.side_effect = [
             {"fake": "object"},
         ]
-        mock_check_offer_exists.return_value = True
-        mock_get_offer_details.return_value = {"name": "une autre super offre", "dates": [], "prices": [11.0]}
+        mock_get_indexed_offers_details.return_value = {
+            offer1.id: {"name": "super offre 1", "dates": [], "prices": [10.0], "digest": "outdated"}
+        }
 
         # When
-        process_eligible_offers(client=client, offer_ids=offer_ids, from_provider_update=True)
+        process_eligible_offers(client=client, offer_ids=offer_ids)
 
         # Then
-        assert mock_check_offer_exists.call_count == 1
-        assert mock_get_offer_details.call_count == 1
+        assert mock_get_indexed_offers_details.call_count == 1
         assert mock_add_to_indexed_offers.call_count == 1
         assert mock_add_to_indexed_offers.call_args_list == [
             call(
                 pipeline=mock_pipeline,
-                offer_details={"name": "super offre 1", "dates": [], "prices": [10.0]},
+                offer_details={
+                    "name": "super offre 1",
+                    "dates": [],
+                    "prices": [10.0],
+                    "digest": compute_object_digest({"fake": "object"}),
+                },
                 offer_id=offer1.id,
             ),
         ]
@@ -472,19 +497,17 @@ class ProcessEligibleOffersTest:
         assert mock_delete_objects.call_count == 0
 
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.get_offer_details")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.build_object")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
     @pytest.mark.usefixtures("db_session")
-    def test_should_not_reindex_offers_that_are_already_indexed_if_offer_name_has_not_changed(
+    def test_should_not_reindex_offers_that_are_already_indexed_when_object_digest_has_not_changed(
         self,
         mock_add_objects,
         mock_build_object,
         mock_delete_objects,
-        mock_check_offer_exists,
-        mock_get_offer_details,
+        mock_get_indexed_offers_details,
         mock_add_to_indexed_offers,
         app,
     ):
@@ -504,15 +527,20 @@ class ProcessEligibleOffersTest:
         mock_build_object.side_effect = [
             {"fake": "object"},
         ]
-        mock_check_offer_exists.return_value = True
-        mock_get_offer_details.return_value = {"name": "super offre 1", "dates": [], "prices": [10.0]}
+        mock_get_indexed_offers_details.return_value = {
+            offer1.id: {
+                "name": "une autre super offre",
+                "dates": [],
+                "prices": [11.0],
+                "digest": compute_object_digest({"fake": "object"}),
+            }
+        }
 
         # When
-        process_eligible_offers(client=client, offer_ids=offer_ids, from_provider_update=True)
+        process_eligible_offers(client=client, offer_ids=offer_ids)
 
         # Then
-        assert mock_check_offer_exists.call_count == 1
-        assert mock_get_offer_details.call_count == 1
+        assert mock_get_indexed_offers_details.call_count == 1
         assert mock_add_to_indexed_offers.call_count == 0
         assert mock_add_objects.call_count == 0
         assert mock_pipeline.execute.call_count == 0
@@ -520,20 +548,18 @@ class ProcessEligibleOffersTest:
         assert mock_delete_objects.call_count == 0
 
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.get_offer_details")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.build_object")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
     @pytest.mark.usefixtures("db_session")
     @freeze_time("2019-01-01 12:00:00")
-    def test_should_reindex_offers_only_when_stocks_beginning_datetime_have_changed(
+    def test_should_reindex_offers_that_were_indexed_without_object_digest(
         self,
         mock_add_objects,
         mock_build_object,
         mock_delete_objects,
-        mock_check_offer_exists,
-        mock_get_offer_details,
+        mock_get_indexed_offers_details,
         mock_add_to_indexed_offers,
         app,
     ):
@@ -560,20 +586,25 @@ class ProcessEligibleOffersTest:
         mock_build_object.side_effect = [
             {"fake": "object"},
         ]
-        mock_check_offer_exists.return_value = True
-        mock_get_offer_details.return_value = {"name": "super offre 1", "dates": [1515542400.0], "prices": [10.0]}
+        mock_get_indexed_offers_details.return_value = {
+            offer.id: {"name": "super offre 1", "dates": [1515542400.0], "prices": [10.0]}
+        }
 
         # When
-        process_eligible_offers(client=client, offer_ids=offer_ids, from_provider_update=True)
+        process_eligible_offers(client=client, offer_ids=offer_ids)
 
         # Then
-        assert mock_check_offer_exists.call_count == 1
-        assert mock_get_offer_details.call_count == 1
+        assert mock_get_indexed_offers_details.call_count == 1
         assert mock_add_to_indexed_offers.call_count == 1
         assert mock_add_to_indexed_offers.call_args_list == [
             call(
                 pipeline=mock_pipeline,
-                offer_details={"name": "super offre 1", "dates": [1546646400.0], "prices": [10.0]},
+                offer_details={
+                    "name": "super offre 1",
+                    "dates": [1546646400.0],
+                    "prices": [10.0],
+                    "digest": compute_object_digest({"fake": "object"}),
+                },
                 offer_id=offer.id,
             ),
         ]
@@ -589,12 +620,12 @@ class ProcessEligibleOffersTest:
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.build_object", return_value={"fake": "test"})
     def test_should_add_offer_ids_in_error_when_adding_objects_failed(
         self,
         mock_build_object,
-        mock_check_offer_exists,
+        mock_get_indexed_offers_details,
         mock_add_objects,
         mock_delete_objects,
         mock_add_to_indexed_offers,
@@ -616,11 +647,11 @@ class ProcessEligibleOffersTest:
         offer2 = create_offer_with_thing_product(venue=venue, is_active=True)
         stock2 = create_stock(booking_limit_datetime=TOMORROW, offer=offer2, quantity=10)
         repository.save(stock1, stock2)
-        mock_check_offer_exists.side_effect = [False, False]
+        mock_get_indexed_offers_details.return_value = {}
         mock_add_objects.side_effect = [AlgoliaException]
 
         # When
-        process_eligible_offers(client=client, offer_ids=[offer1.id, offer2.id], from_provider_update=False)
+        process_eligible_offers(client=client, offer_ids=[offer1.id, offer2.id])
 
         # Then
         assert mock_build_object.call_count == 2
@@ -629,12 +660,22 @@ class ProcessEligibleOffersTest:
         assert mock_add_to_indexed_offers.call_args_list == [
             call(
                 pipeline=mock_pipeline,
-                offer_details={"name": "Test Book", "dates": [], "prices": [10.0]},
+                offer_details={
+                    "name": "Test Book",
+                    "dates": [],
+                    "prices": [10.0],
+                    "digest": compute_object_digest({"fake": "test"}),
+                },
                 offer_id=offer1.id,
             ),
             call(
                 pipeline=mock_pipeline,
-                offer_details={"name": "Test Book", "dates": [], "prices": [10.0]},
+                offer_details={
+                    "name": "Test Book",
+                    "dates": [],
+                    "prices": [10.0],
+                    "digest": compute_object_digest({"fake": "test"}),
+                },
                 offer_id=offer2.id,
             ),
         ]
@@ -645,16 +686,120 @@ class ProcessEligibleOffersTest:
         assert mock_add_offer_ids_in_error.call_args_list == [call(client=client, offer_ids=[offer1.id, offer2.id])]
 
 
+class ProcessOffersInBulkTest:
+    @patch("pcapi.algolia.usecase.orchestrator.add_offer_ids_in_error")
+    @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
+    @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
+    @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
+    @patch("pcapi.algolia.usecase.orchestrator.add_objects")
+    @patch("pcapi.algolia.usecase.orchestrator.build_objects")
+    def test_should_add_built_objects_and_delete_indexed_offers_that_were_not_built(
+        self,
+        mock_build_objects,
+        mock_add_objects,
+        mock_delete_objects,
+        mock_add_to_indexed_offers,
+        mock_get_indexed_offers_details,
+        mock_delete_indexed_offers,
+        mock_add_offer_ids_in_error,
+        app,
+    ):
+        # Given
+        client = MagicMock()
+        mock_pipeline = client.pipeline()
+        object_to_index = {
+            "objectID": "AE",
+            "offer": {"name": "super offre", "dates": [], "prices": [Decimal("10.00")]},
+        }
+        mock_build_objects.return_value = [object_to_index]
+        mock_get_indexed_offers_details.return_value = {2: {}}
+
+        # When
+        process_offers_in_bulk(client=client, offer_ids=[1, 2, 3])
+
+        # Then
+        mock_build_objects.assert_called_once_with([1, 2, 3])
+        mock_add_objects.assert_called_once_with(objects=[object_to_index])
+        mock_add_to_indexed_offers.assert_called_once_with(
+            pipeline=mock_pipeline,
+            offer_id=1,
+            offer_details={
+                "name": "super offre",
+                "dates": [],
+                "prices": [10.0],
+                "digest": compute_object_digest(object_to_index),
+            },
+        )
+        mock_pipeline.execute.assert_called_once()
+        mock_get_indexed_offers_details.assert_called_once_with(client=client, offer_ids=[1, 2, 3])
+        mock_delete_objects.assert_called_once_with(object_ids=["A9"])
+        mock_delete_indexed_offers.assert_called_once_with(client=client, offer_ids=[2])
+        mock_add_offer_ids_in_error.assert_not_called()
+
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
+    @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
+    @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
+    @patch("pcapi.algolia.usecase.orchestrator.add_objects")
+    @patch("pcapi.algolia.usecase.orchestrator.build_objects")
+    def test_should_not_add_objects_whose_digest_has_not_changed(
+        self,
+        mock_build_objects,
+        mock_add_objects,
+        mock_delete_objects,
+        mock_add_to_indexed_offers,
+        mock_get_indexed_offers_details,
+        app,
+    ):
+        # Given
+        client = MagicMock()
+        unchanged_object = {"objectID": "AE", "offer": {"name": "offre", "dates": [], "prices": [Decimal("10.00")]}}
+        changed_object = {"objectID": "A9", "offer": {"name": "offre", "dates": [], "prices": [Decimal("12.00")]}}
+        mock_build_objects.return_value = [unchanged_object, changed_object]
+        mock_get_indexed_offers_details.return_value = {
+            1: {"digest": compute_object_digest(unchanged_object)},
+            2: {"digest": compute_object_digest({**changed_object, "offer": {"prices": [Decimal("10.00")]}})},
+        }
+
+        # When
+        process_offers_in_bulk(client=client, offer_ids=[1, 2])
+
+        # Then
+        mock_add_objects.assert_called_once_with(objects=[changed_object])
+        assert mock_add_to_indexed_offers.call_count == 1
+        assert mock_add_to_indexed_offers.call_args[1]["offer_id"] == 2
+        mock_delete_objects.assert_not_called()
+
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
+    @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
+    @patch("pcapi.algolia.usecase.orchestrator.add_objects")
+    @patch("pcapi.algolia.usecase.orchestrator.build_objects")
+    def test_should_neither_add_nor_delete_when_no_object_built_and_none_indexed(
+        self, mock_build_objects, mock_add_objects, mock_delete_objects, mock_get_indexed_offers_details, app
+    ):
+        # Given
+        client = MagicMock()
+        mock_build_objects.return_value = []
+        mock_get_indexed_offers_details.return_value = {}
+
+        # When
+        process_offers_in_bulk(client=client, offer_ids=[1, 2])
+
+        # Then
+        mock_add_objects.assert_not_called()
+        mock_delete_objects.assert_not_called()
+
+
 class DeleteExpiredOffersTest:
     @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     def test_should_delete_expired_offers_from_algolia_when_at_least_one_offer_id_and_offers_were_indexed(
-        self, mock_delete_objects, mock_check_offer_exists, mock_delete_indexed_offers, app
+        self, mock_delete_objects, mock_get_indexed_offers_details, mock_delete_indexed_offers, app
     ):
         # Given
         client = MagicMock()
-        mock_check_offer_exists.side_effect = [True, True, True]
+        mock_get_indexed_offers_details.return_value = {1: {}, 2: {}, 3: {}}
 
         # When
         delete_expired_offers(client=client, offer_ids=[1, 2, 3])
@@ -681,14 +826,14 @@ class DeleteExpiredOffersTest:
         assert mock_delete_indexed_offers.call_count == 0
 
     @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_indexed_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     def test_should_not_delete_expired_offers_from_algolia_when_at_least_one_offer_id_but_offers_were_not_indexed(
-        self, mock_delete_objects, mock_check_offer_exists, mock_delete_indexed_offers, app
+        self, mock_delete_objects, mock_get_indexed_offers_details, mock_delete_indexed_offers, app
     ):
         # Given
         client = MagicMock()
-        mock_check_offer_exists.side_effect = [False, False, False]
+        mock_get_indexed_offers_details.return_value = {}
 
         # When
         delete_expired_offers(client=client, offer_ids=[])
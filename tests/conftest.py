@@ -16,6 +16,7 @@ from requests.auth import _basic_auth_str
 import pcapi
 from pcapi import settings
 from pcapi.admin.install import install_admin_views
+import pcapi.algolia.infrastructure.testing as algolia_testing
 import pcapi.core.mails.testing as mails_testing
 import pcapi.core.testing
 from pcapi.flask_app import admin
@@ -24,6 +25,7 @@ from pcapi.local_providers.install import install_local_providers
 from pcapi.model_creators.generic_creators import PLAIN_DEFAULT_TESTING_PASSWORD
 from pcapi.models.db import db
 from pcapi.models.install import install_activity
+from pcapi.repository import feature_queries
 from pcapi.repository.clean_database import clean_all_database
 from pcapi.routes import install_routes
 from pcapi.routes.native.v1.blueprint import native_v1
@@ -88,6 +90,23 @@ def clear_mail_outbox():
         mails_testing.reset_outbox()
 
 
+@pytest.fixture(autouse=True)
+def clear_algolia_indexed_objects():
+    try:
+        yield
+    finally:
+        algolia_testing.reset_indexed_objects()
+
+
+@pytest.fixture(autouse=True)
+def clear_features_cache():
+    # Features are modified in transactions that are rolled back after each test
+    try:
+        yield
+    finally:
+        feature_queries.clear_features_cache()
+
+
 def clean_database(f: object) -> object:
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -0,0 +1,162 @@
+import ftplib
+from io import BytesIO
+from unittest.mock import MagicMock
+from unittest.mock import patch
+from zipfile import ZipFile
+
+import pytest
+
+from pcapi.connectors import ftp_titelive
+from pcapi.connectors.ftp_titelive import close_ftp_session
+from pcapi.connectors.ftp_titelive import close_zip_file
+from pcapi.connectors.ftp_titelive import download_file_from_ftp
+from pcapi.connectors.ftp_titelive import iter_zip_files_from_ftp
+
+
+@pytest.fixture(autouse=True)
+def reset_ftp_session():
+    ftp_titelive._ftp_session["connection"] = None
+    yield
+    ftp_titelive._ftp_session["connection"] = None
+
+
+def _build_ftp_session(files_content: dict) -> MagicMock:
+    def retrbinary(command, callback, blocksize):
+        file_path = command.split(" ", 1)[1]
+        callback(files_content[file_path])
+
+    session = MagicMock()
+    session.retrbinary.side_effect = retrbinary
+    return session
+
+
+def _build_zip_content(file_name: str, content: bytes) -> bytes:
+    zip_content = BytesIO()
+    with ZipFile(zip_content, "w") as zip_file:
+        zip_file.writestr(file_name, content)
+    return zip_content.getvalue()
+
+
+@patch("pcapi.connectors.ftp_titelive.connect_to_titelive_ftp")
+class DownloadFileFromFtpTest:
+    def test_should_spool_file_content_and_reuse_ftp_session(self, mock_connect_to_titelive_ftp):
+        # Given
+        mock_connect_to_titelive_ftp.return_value = _build_ftp_session(
+            {"Quotidien/Quotidien01.tit": b"line1\nline2\n", "Quotidien/Quotidien02.tit": b"line3\n"}
+        )
+
+        # When
+        first_file = download_file_from_ftp("Quotidien01.tit", "Quotidien")
+        second_file = download_file_from_ftp("Quotidien02.tit", "Quotidien")
+
+        # Then
+        assert first_file.read() == b"line1\nline2\n"
+        assert second_file.read() == b"line3\n"
+        mock_connect_to_titelive_ftp.assert_called_once()
+
+    def test_should_reconnect_when_ftp_session_was_dropped(self, mock_connect_to_titelive_ftp):
+        # Given
+        dropped_session = MagicMock()
+        dropped_session.retrbinary.side_effect = ftplib.error_temp("421 Timeout")
+        mock_connect_to_titelive_ftp.side_effect = [
+            dropped_session,
+            _build_ftp_session({"Quotidien/Quotidien01.tit": b"line1\n"}),
+        ]
+
+        # When
+        data_file = download_file_from_ftp("Quotidien01.tit", "Quotidien")
+
+        # Then
+        assert data_file.read() == b"line1\n"
+        assert mock_connect_to_titelive_ftp.call_count == 2
+        dropped_session.close.assert_called_once()
+
+
+@patch("pcapi.connectors.ftp_titelive.connect_to_titelive_ftp")
+class IterZipFilesFromFtpTest:
+    def test_should_yield_zip_files_in_order(self, mock_connect_to_titelive_ftp):
+        # Given
+        mock_connect_to_titelive_ftp.return_value = _build_ftp_session(
+            {
+                "Atoo/livres_tl20191104.zip": _build_zip_content("9780847858903_1_75.jpg", b"first"),
+                "Atoo/livres_tl20191105.zip": _build_zip_content("9782016261903_1_75.jpg", b"second"),
+            }
+        )
+
+        # When
+        zip_files = list(iter_zip_files_from_ftp(["livres_tl20191104.zip", "livres_tl20191105.zip"], "Atoo"))
+
+        # Then
+        assert [zip_file_name for zip_file_name, _ in zip_files] == ["livres_tl20191104.zip", "livres_tl20191105.zip"]
+        assert zip_files[0][1].read("9780847858903_1_75.jpg") == b"first"
+        assert zip_files[1][1].read("9782016261903_1_75.jpg") == b"second"
+
+    def test_should_not_download_anything_when_no_file(self, mock_connect_to_titelive_ftp):
+        # When
+        zip_files = list(iter_zip_files_from_ftp([], "Atoo"))
+
+        # Then
+        assert zip_files == []
+        mock_connect_to_titelive_ftp.assert_not_called()
+
+    def test_should_close_zip_file_downloaded_in_advance_when_iteration_stops(self, mock_connect_to_titelive_ftp):
+        # Given
+        downloaded_files = []
+
+        def download(file_name, folder_name):
+            downloaded_files.append(MagicMock(name=file_name))
+            return downloaded_files[-1]
+
+        close = MagicMock()
+        files = ftp_titelive._iter_with_next_download_in_background(
+            ["livres_tl20191104.zip", "livres_tl20191105.zip"], "Atoo", download, close
+        )
+        next(files)
+
+        # When
+        files.close()
+
+        # Then
+        # The download started in advance is either cancelled or closed
+        assert [call.args[0] for call in close.call_args_list] == downloaded_files[1:]
+
+
+class CloseZipFileTest:
+    def test_should_close_zip_file_and_its_spooled_file(self):
+        # Given
+        spooled_file = BytesIO(_build_zip_content("9780847858903_1_75.jpg", b"first"))
+        zip_file = ZipFile(spooled_file, "r")
+
+        # When
+        close_zip_file(zip_file)
+
+        # Then
+        assert zip_file.fp is None
+        assert spooled_file.closed
+
+
+class CloseFtpSessionTest:
+    def test_should_quit_ftp_session(self):
+        # Given
+        session = MagicMock()
+        ftp_titelive._ftp_session["connection"] = session
+
+        # When
+        close_ftp_session()
+
+        # Then
+        session.quit.assert_called_once()
+        assert ftp_titelive._ftp_session["connection"] is None
+
+    def test_should_close_ftp_session_when_quit_fails(self):
+        # Given
+        session = MagicMock()
+        session.quit.side_effect = ftplib.error_temp("421 Timeout")
+        ftp_titelive._ftp_session["connection"] = session
+
+        # When
+        close_ftp_session()
+
+        # Then
+        session.close.assert_called_once()
+        assert ftp_titelive._ftp_session["connection"] is None
@@ -1,4 +1,5 @@
 from unittest.mock import MagicMock
+from unittest.mock import call
 from unittest.mock import patch
 
 import pytest
@@ -6,26 +7,38 @@ import redis
 
 from pcapi import settings
 from pcapi.connectors.redis import _add_venue_provider
+from pcapi.connectors.redis import add_email_to_send
 from pcapi.connectors.redis import add_offer_id
 from pcapi.connectors.redis import add_offer_ids_in_error
 from pcapi.connectors.redis import add_to_indexed_offers
 from pcapi.connectors.redis import add_venue_id
 from pcapi.connectors.redis import add_venue_provider_currently_in_sync
-from pcapi.connectors.redis import check_offer_exists
 from pcapi.connectors.redis import delete_all_indexed_offers
+from pcapi.connectors.redis import delete_full_indexing_last_offer_id
 from pcapi.connectors.redis import delete_indexed_offers
-from pcapi.connectors.redis import delete_offer_ids
 from pcapi.connectors.redis import delete_offer_ids_in_error
+from pcapi.connectors.redis import delete_offer_response
 from pcapi.connectors.redis import delete_venue_ids
 from pcapi.connectors.redis import delete_venue_provider_currently_in_sync
 from pcapi.connectors.redis import delete_venue_providers
+from pcapi.connectors.redis import get_features_version
+from pcapi.connectors.redis import get_full_indexing_last_offer_id
+from pcapi.connectors.redis import get_indexed_offers_details
 from pcapi.connectors.redis import get_number_of_venue_providers_currently_in_sync
-from pcapi.connectors.redis import get_offer_details
-from pcapi.connectors.redis import get_offer_ids
 from pcapi.connectors.redis import get_offer_ids_in_error
+from pcapi.connectors.redis import get_offer_response
 from pcapi.connectors.redis import get_venue_ids
 from pcapi.connectors.redis import get_venue_providers
+from pcapi.connectors.redis import increment_features_version
+from pcapi.connectors.redis import move_legacy_offer_ids
+from pcapi.connectors.redis import pop_emails_to_send
+from pcapi.connectors.redis import pop_offer_ids
+from pcapi.connectors.redis import requeue_emails_to_send
+from pcapi.connectors.redis import requeue_offer_ids
+from pcapi.connectors.redis import schedule_emails_dispatch
 from pcapi.connectors.redis import send_venue_provider_data_to_redis
+from pcapi.connectors.redis import set_full_indexing_last_offer_id
+from pcapi.connectors.redis import set_offer_response
 from pcapi.model_creators.generic_creators import create_offerer
 from pcapi.model_creators.generic_creators import create_provider
 from pcapi.model_creators.generic_creators import create_user
@@ -51,55 +64,128 @@ class RedisTest:
 
 
 class AddOfferIdTest:
-    def test_should_add_offer_id(self):
+    @patch("pcapi.connectors.redis.time", return_value=1602752400.0)
+    def test_should_add_offer_id_only_if_not_already_waiting(self, mock_time):
         # Given
         client = MagicMock()
-        client.rpush = MagicMock()
+        client.zadd = MagicMock()
 
         # When
         add_offer_id(client=client, offer_id=1)
 
         # Then
-        client.rpush.assert_called_once_with("offer_ids", 1)
+        client.zadd.assert_called_once_with("offer_ids_to_index", {1: 1602752400.0}, nx=True)
 
+    def test_should_not_delete_cached_offer_response(self):
+        # Given
+        client = MagicMock()
 
-class GetOfferIdsTest:
-    @patch("pcapi.settings.REDIS_OFFER_IDS_CHUNK_SIZE", return_value=1000)
-    def test_should_return_offer_ids_from_list(self, mock_redis_lrange_end):
+        # When
+        add_offer_id(client=client, offer_id=1)
+
+        # Then
+        client.delete.assert_not_called()
+
+
+class DeleteOfferResponseTest:
+    def test_should_delete_cached_offer_response(self):
         # Given
         client = MagicMock()
-        client.lrange = MagicMock()
 
         # When
-        get_offer_ids(client=client)
+        delete_offer_response(client=client, offer_id=1)
+
+        # Then
+        client.delete.assert_called_once_with("offer_response:1")
+
+    def test_should_not_raise_when_exception(self):
+        # Given
+        client = MagicMock()
+        client.delete.side_effect = redis.exceptions.RedisError
+
+        # When
+        delete_offer_response(client=client, offer_id=1)
+
+
+class PopOfferIdsTest:
+    @patch("pcapi.settings.REDIS_OFFER_IDS_CHUNK_SIZE", 2)
+    def test_should_pop_oldest_offer_ids(self):
+        # Given
+        client = MagicMock()
+        client.zpopmin = MagicMock(return_value=[("3", 1602752400.0), ("1", 1602752401.0)])
+
+        # When
+        result = pop_offer_ids(client=client)
 
         # Then
-        client.lrange.assert_called_once_with("offer_ids", 0, mock_redis_lrange_end)
+        client.zpopmin.assert_called_once_with("offer_ids_to_index", 2)
+        client.zadd.assert_not_called()
+        assert result == [3, 1]
 
     def test_should_return_empty_array_when_exception(self):
         # Given
         client = MagicMock()
-        client.lrange = MagicMock()
-        client.lrange.side_effect = redis.exceptions.RedisError
+        client.zpopmin = MagicMock()
+        client.zpopmin.side_effect = redis.exceptions.RedisError
 
         # When
-        result = get_offer_ids(client=client)
+        result = pop_offer_ids(client=client)
 
         # Then
         assert result == []
 
 
-class DeleteOfferIdsTest:
-    def test_should_delete_given_range_of_offer_ids_from_redis(self):
+class RequeueOfferIdsTest:
+    @patch("pcapi.connectors.redis.time", return_value=1602752400.0)
+    def test_should_add_offer_ids_not_queued_again_yet(self, mock_time):
         # Given
         client = MagicMock()
-        client.ltrim = MagicMock()
 
         # When
-        delete_offer_ids(client=client)
+        requeue_offer_ids(client=client, offer_ids=[3, 1])
 
         # Then
-        client.ltrim.assert_called_once_with("offer_ids", 10000, -1)
+        client.zadd.assert_called_once_with("offer_ids_to_index", {3: 1602752400.0, 1: 1602752400.0}, nx=True)
+
+    def test_should_not_call_redis_when_no_offer_id(self):
+        # Given
+        client = MagicMock()
+
+        # When
+        requeue_offer_ids(client=client, offer_ids=[])
+
+        # Then
+        client.zadd.assert_not_called()
+
+
+class MoveLegacyOfferIdsTest:
+    @patch("pcapi.connectors.redis.time", return_value=1602752400.0)
+    def test_should_move_offer_ids_of_legacy_list(self, mock_time):
+        # Given
+        client = MagicMock()
+        pipeline = client.pipeline.return_value
+        pipeline.execute.return_value = [["4", "5"], 1]
+
+        # When
+        result = move_legacy_offer_ids(client=client)
+
+        # Then
+        pipeline.lrange.assert_called_once_with("offer_ids", 0, -1)
+        pipeline.delete.assert_called_once_with("offer_ids")
+        client.zadd.assert_called_once_with("offer_ids_to_index", {"4": 1602752400.0, "5": 1602752400.0}, nx=True)
+        assert result == 2
+
+    def test_should_not_add_anything_when_legacy_list_is_empty(self):
+        # Given
+        client = MagicMock()
+        client.pipeline.return_value.execute.return_value = [[], 0]
+
+        # When
+        result = move_legacy_offer_ids(client=client)
+
+        # Then
+        client.zadd.assert_not_called()
+        assert result == 0
 
 
 class AddVenueIdTest:
@@ -275,83 +361,54 @@ class DeleteIndexedOffersTest:
         client.hdel.assert_called_once_with("indexed_offers", *offer_ids)
 
 
-class CheckOfferExistsTest:
-    def test_should_return_true_when_offer_exists(self):
-        # Given
-        client = MagicMock()
-        client.hexists = MagicMock()
-        client.hexists.return_value = True
-
-        # When
-        result = check_offer_exists(client=client, offer_id=1)
-
-        # Then
-        client.hexists.assert_called_once_with("indexed_offers", 1)
-        assert result
-
-    def test_should_return_false_when_offer_not_exists(self):
+class GetIndexedOffersDetailsTest:
+    def test_should_return_details_of_indexed_offers_only(self):
         # Given
         client = MagicMock()
-        client.hexists = MagicMock()
-        client.hexists.return_value = False
+        pipeline = client.pipeline.return_value
+        pipeline.execute.return_value = [['{"name": "super offre", "dates": [], "prices": [10.0]}', None]]
 
         # When
-        result = check_offer_exists(client=client, offer_id=1)
+        result = get_indexed_offers_details(client=client, offer_ids=[1, 2])
 
         # Then
-        client.hexists.assert_called_once_with("indexed_offers", 1)
-        assert result is False
-
-    def test_should_return_false_when_exception(self):
-        # Given
-        client = MagicMock()
-        client.hexists = MagicMock()
-        client.hexists.side_effect = redis.exceptions.RedisError
-
-        # When
-        result = check_offer_exists(client=client, offer_id=1)
-
-        # Then
-        assert result is False
-
+        pipeline.hmget.assert_called_once_with("indexed_offers", [1, 2])
+        pipeline.execute.assert_called_once()
+        assert result == {1: {"name": "super offre", "dates": [], "prices": [10.0]}}
 
-class GetOfferDetailsTest:
-    def test_should_return_offer_details_when_offer_exists(self):
+    @patch("pcapi.connectors.redis.REDIS_HMGET_CHUNK_SIZE", 2)
+    def test_should_send_one_hmget_per_chunk_in_a_single_pipeline(self):
         # Given
         client = MagicMock()
-        client.hget = MagicMock()
-        client.hget.return_value = (
-            '{"dateRange": ["2020-01-01 10:00:00", "2020-01-06 12:00:00"], "name": "super offre"}'
-        )
+        pipeline = client.pipeline.return_value
+        pipeline.execute.return_value = [["{}", None], ["{}"]]
 
         # When
-        result = get_offer_details(client=client, offer_id=1)
+        result = get_indexed_offers_details(client=client, offer_ids=[1, 2, 3])
 
         # Then
-        client.hget.assert_called_once_with("indexed_offers", 1)
-        assert result == {"dateRange": ["2020-01-01 10:00:00", "2020-01-06 12:00:00"], "name": "super offre"}
+        assert pipeline.hmget.call_args_list == [call("indexed_offers", [1, 2]), call("indexed_offers", [3])]
+        pipeline.execute.assert_called_once()
+        assert result == {1: {}, 3: {}}
 
-    def test_should_return_empty_dict_when_offer_does_exists(self):
+    def test_should_not_query_redis_when_no_offer_ids(self):
         # Given
         client = MagicMock()
-        client.hget = MagicMock()
-        client.hget.return_value = None
 
         # When
-        result = get_offer_details(client=client, offer_id=1)
+        result = get_indexed_offers_details(client=client, offer_ids=[])
 
         # Then
-        client.hget.assert_called_once_with("indexed_offers", 1)
+        client.pipeline.assert_not_called()
         assert result == {}
 
     def test_should_return_empty_dict_when_exception(self):
         # Given
         client = MagicMock()
-        client.hget = MagicMock()
-        client.hget.side_effect = redis.exceptions.RedisError
+        client.pipeline.return_value.execute.side_effect = redis.exceptions.RedisError
 
         # When
-        result = get_offer_details(client=client, offer_id=1)
+        result = get_indexed_offers_details(client=client, offer_ids=[1, 2])
 
         # Then
         assert result == {}
@@ -486,3 +543,219 @@ class DeleteOfferIdsInErrorTest:
 
         # Then
         client.ltrim.assert_called_once_with("offer_ids_in_error", 10000, -1)
+
+
+class FullIndexingLastOfferIdTest:
+    def test_should_return_last_offer_id_when_set(self):
+        # Given
+        client = MagicMock()
+        client.get.return_value = "42"
+
+        # When
+        last_offer_id = get_full_indexing_last_offer_id(client=client)
+
+        # Then
+        client.get.assert_called_once_with("full_indexing_last_offer_id")
+        assert last_offer_id == 42
+
+    def test_should_return_zero_when_not_set(self):
+        # Given
+        client = MagicMock()
+        client.get.return_value = None
+
+        # When
+        last_offer_id = get_full_indexing_last_offer_id(client=client)
+
+        # Then
+        assert last_offer_id == 0
+
+    def test_should_set_last_offer_id(self):
+        # Given
+        client = MagicMock()
+
+        # When
+        set_full_indexing_last_offer_id(client=client, offer_id=42)
+
+        # Then
+        client.set.assert_called_once_with("full_indexing_last_offer_id", 42)
+
+    def test_should_delete_last_offer_id(self):
+        # Given
+        client = MagicMock()
+
+        # When
+        delete_full_indexing_last_offer_id(client=client)
+
+        # Then
+        client.delete.assert_called_once_with("full_indexing_last_offer_id")
+
+
+class FeaturesVersionTest:
+    def test_should_return_features_version(self):
+        # Given
+        client = MagicMock()
+        client.get.return_value = "3"
+
+        # When
+        version = get_features_version(client=client)
+
+        # Then
+        client.get.assert_called_once_with("features_version")
+        assert version == "3"
+
+    def test_should_return_none_when_redis_is_unavailable(self):
+        # Given
+        client = MagicMock()
+        client.get.side_effect = redis.exceptions.ConnectionError
+
+        # When
+        version = get_features_version(client=client)
+
+        # Then
+        assert version is None
+
+    def test_should_increment_features_version(self):
+        # Given
+        client = MagicMock()
+
+        # When
+        increment_features_version(client=client)
+
+        # Then
+        client.incr.assert_called_once_with("features_version")
+
+
+class OfferResponseTest:
+    def test_should_return_cached_offer_response(self):
+        # Given
+        client = MagicMock()
+        client.get.return_value = '{"id": 1}'
+
+        # When
+        offer_response = get_offer_response(client=client, offer_id=1)
+
+        # Then
+        client.get.assert_called_once_with("offer_response:1")
+        assert offer_response == '{"id": 1}'
+
+    def test_should_return_none_when_redis_is_unavailable(self):
+        # Given
+        client = MagicMock()
+        client.get.side_effect = redis.exceptions.ConnectionError
+
+        # When
+        offer_response = get_offer_response(client=client, offer_id=1)
+
+        # Then
+        assert offer_response is None
+
+    @patch("pcapi.connectors.redis.settings.OFFER_RESPONSE_CACHE_TTL", 30)
+    def test_should_cache_offer_response_for_a_few_seconds(self):
+        # Given
+        client = MagicMock()
+
+        # When
+        set_offer_response(client=client, offer_id=1, response='{"id": 1}')
+
+        # Then
+        client.set.assert_called_once_with("offer_response:1", '{"id": 1}', ex=30)
+
+
+class AddEmailToSendTest:
+    def test_should_queue_email(self):
+        # Given
+        client = MagicMock()
+
+        # When
+        result = add_email_to_send(client=client, email={"recipients": ["a@example.com"], "data": {"key": "value"}})
+
+        # Then
+        client.rpush.assert_called_once_with(
+            "emails_to_send", '{"recipients": ["a@example.com"], "data": {"key": "value"}}'
+        )
+        assert result
+
+    def test_should_return_false_when_exception(self):
+        # Given
+        client = MagicMock()
+        client.rpush.side_effect = redis.exceptions.RedisError
+
+        # When
+        result = add_email_to_send(client=client, email={"recipients": [], "data": {}})
+
+        # Then
+        assert not result
+
+
+class PopEmailsToSendTest:
+    def test_should_pop_oldest_emails(self):
+        # Given
+        client = MagicMock()
+        pipeline = client.pipeline.return_value
+        pipeline.execute.return_value = [['{"recipients": ["a@example.com"], "data": {}}'], True]
+
+        # When
+        result = pop_emails_to_send(client=client, count=2)
+
+        # Then
+        pipeline.lrange.assert_called_once_with("emails_to_send", 0, 1)
+        pipeline.ltrim.assert_called_once_with("emails_to_send", 2, -1)
+        assert result == [{"recipients": ["a@example.com"], "data": {}}]
+
+    def test_should_return_empty_array_when_exception(self):
+        # Given
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = redis.exceptions.RedisError
+
+        # When
+        result = pop_emails_to_send(client=client, count=2)
+
+        # Then
+        assert result == []
+
+
+class RequeueEmailsToSendTest:
+    def test_should_put_emails_back_at_the_head_of_the_queue_in_order(self):
+        # Given
+        client = MagicMock()
+
+        # When
+        requeue_emails_to_send(client=client, emails=[{"data": 1}, {"data": 2}])
+
+        # Then
+        client.lpush.assert_called_once_with("emails_to_send", '{"data": 2}', '{"data": 1}')
+
+    def test_should_not_call_redis_when_no_email(self):
+        # Given
+        client = MagicMock()
+
+        # When
+        requeue_emails_to_send(client=client, emails=[])
+
+        # Then
+        client.lpush.assert_not_called()
+
+
+class ScheduleEmailsDispatchTest:
+    def test_should_return_whether_dispatch_was_not_scheduled_yet(self):
+        # Given
+        client = MagicMock()
+        client.set.side_effect = [True, None]
+
+        # When
+        results = [schedule_emails_dispatch(client=client), schedule_emails_dispatch(client=client)]
+
+        # Then
+        assert results == [True, False]
+        client.set.assert_called_with("emails_dispatch_scheduled", 1, nx=True, ex=60)
+
+    def test_should_schedule_dispatch_when_exception(self):
+        # Given
+        client = MagicMock()
+        client.set.side_effect = redis.exceptions.RedisError
+
+        # When
+        result = schedule_emails_dispatch(client=client)
+
+        # Then
+        assert result
@@ -68,6 +68,16 @@ class BookOfferTest:
         api.book_offer(beneficiary=user, stock=stock, quantity=1)
         mocked_add_offer_id.assert_not_called()
 
+    @override_features(SYNCHRONIZE_ALGOLIA=False)
+    @mock.patch("pcapi.connectors.redis.delete_offer_response")
+    def test_delete_cached_offer_response_even_if_algolia_feature_is_disabled(self, mocked_delete_offer_response):
+        user = users_factories.UserFactory()
+        stock = offers_factories.StockFactory()
+
+        api.book_offer(beneficiary=user, stock=stock, quantity=1)
+
+        mocked_delete_offer_response.assert_called_once_with(client=app.redis_client, offer_id=stock.offerId)
+
     def test_raise_if_is_admin(self):
         user = users_factories.UserFactory(isAdmin=True)
         stock = offers_factories.StockFactory()
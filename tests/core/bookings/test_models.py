@@ -10,6 +10,7 @@ import pcapi.core.users.factories as users_factories
 from pcapi.models import ApiErrors
 from pcapi.models import EventType
 from pcapi.models import ThingType
+from pcapi.models import WalletLedger
 from pcapi.models import db
 from pcapi.repository import repository
 from pcapi.utils.human_ids import humanize
@@ -43,6 +44,32 @@ def test_save_cancellation_date_postgresql_function():
     assert booking.cancellationDate is None
 
 
+@pytest.mark.usefixtures("db_session")
+def test_update_wallet_ledger_postgresql_function():
+    booking = factories.BookingFactory(amount=10, quantity=2, user__deposit__version=1)
+    other_booking = factories.BookingFactory(amount=5, user=booking.user)
+    ledger = WalletLedger.query.filter_by(userId=booking.userId).one()
+    assert (ledger.bookedAmount, ledger.usedAmount) == (25, 0)
+    assert booking.user.wallet_balance == 500 - 25
+
+    booking.isUsed = True
+    db.session.commit()
+    db.session.refresh(ledger)
+    assert (ledger.bookedAmount, ledger.usedAmount) == (25, 20)
+    assert booking.user.real_wallet_balance == 500 - 20
+
+    booking.isCancelled = True
+    db.session.commit()
+    db.session.refresh(ledger)
+    assert (ledger.bookedAmount, ledger.usedAmount) == (5, 0)
+
+    db.session.delete(other_booking)
+    db.session.commit()
+    db.session.refresh(ledger)
+    assert (ledger.bookedAmount, ledger.usedAmount) == (0, 0)
+    assert booking.user.wallet_balance == 500
+
+
 @pytest.mark.usefixtures("db_session")
 def test_booking_completed_url_gets_normalized():
     booking = factories.BookingFactory(
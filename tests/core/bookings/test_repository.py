@@ -2,6 +2,7 @@ from datetime import date
 from datetime import datetime
 from datetime import time
 from datetime import timedelta
+from unittest.mock import patch
 
 from dateutil import tz
 import pytest
@@ -10,10 +11,13 @@ from pytest import fixture
 from pcapi.core.bookings import factories
 import pcapi.core.bookings.repository as booking_repository
 from pcapi.core.bookings.repository import find_by_pro_user_id
+from pcapi.core.bookings.repository import find_by_pro_user_id_after_cursor
+from pcapi.core.bookings.repository import iter_bookings_recap_by_pro_user_id
 import pcapi.core.users.factories as users_factories
 from pcapi.domain.booking_recap.booking_recap import BookBookingRecap
 from pcapi.domain.booking_recap.booking_recap import EventBookingRecap
 from pcapi.domain.booking_recap.booking_recap_history import BookingRecapHistory
+from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapCursor
 from pcapi.model_creators.generic_creators import create_booking
 from pcapi.model_creators.generic_creators import create_offerer
 from pcapi.model_creators.generic_creators import create_payment
@@ -127,6 +131,51 @@ class FindPaymentEligibleBookingsForVenueTest:
         assert future_event_booking not in bookings
 
 
+class FindBookingsEligibleForPaymentTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_returns_used_bookings_of_all_venues_ordered_by_venue_with_whether_they_are_paid(self, app: fixture):
+        # Given
+        beneficiary = create_user()
+        offerer = create_offerer()
+        venue = create_venue(offerer)
+        repository.save(venue)
+        another_venue = create_venue(offerer, siret=f"{offerer.siren}54321")
+        paid_booking = create_booking(user=beneficiary, is_used=True, venue=another_venue)
+        payment = create_payment(paid_booking, offerer, 10)
+        thing_booking = create_booking(user=beneficiary, is_used=True, venue=venue)
+        unused_booking = create_booking(user=beneficiary, is_used=False, venue=venue)
+        another_thing_booking = create_booking(user=beneficiary, is_used=True, venue=another_venue)
+        repository.save(payment, thing_booking, unused_booking, another_thing_booking)
+
+        # When
+        bookings_with_is_paid = list(booking_repository.find_bookings_eligible_for_payment())
+
+        # Then
+        assert bookings_with_is_paid == [
+            (thing_booking, False),
+            (paid_booking, True),
+            (another_thing_booking, False),
+        ]
+        assert bookings_with_is_paid[0][0].stock.offer.venue.managingOfferer == offerer
+
+    @pytest.mark.usefixtures("db_session")
+    def test_returns_booking_with_several_payments_once(self, app: fixture):
+        # Given
+        beneficiary = create_user()
+        offerer = create_offerer()
+        venue = create_venue(offerer)
+        paid_booking = create_booking(user=beneficiary, is_used=True, venue=venue)
+        payment = create_payment(paid_booking, offerer, 10)
+        another_payment = create_payment(paid_booking, offerer, 10)
+        repository.save(payment, another_payment)
+
+        # When
+        bookings_with_is_paid = list(booking_repository.find_bookings_eligible_for_payment())
+
+        # Then
+        assert bookings_with_is_paid == [(paid_booking, True)]
+
+
 class FindByTest:
     class ByTokenTest:
         @pytest.mark.usefixtures("db_session")
@@ -336,6 +385,30 @@ class FindAllNotUsedAndNotCancelledTest:
         assert bookings == [booking]
 
 
+class FindIdsOfBookingsToMarkAsUsedTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_find_bookings_of_events_begun_before_date_in_id_order(self):
+        # Given
+        event_date = datetime(2019, 10, 9, 10, 20, 0)
+        first_booking = factories.BookingFactory(stock__beginningDatetime=event_date)
+        second_booking = factories.BookingFactory(stock__beginningDatetime=event_date)
+        third_booking = factories.BookingFactory(stock__beginningDatetime=event_date)
+        factories.BookingFactory(stock__beginningDatetime=event_date, isCancelled=True)
+        factories.BookingFactory(stock__beginningDatetime=event_date, isUsed=True)
+        factories.BookingFactory(stock__beginningDatetime=datetime(2019, 10, 12))
+        factories.BookingFactory()
+
+        # When
+        first_batch = booking_repository.find_ids_of_bookings_to_mark_as_used(datetime(2019, 10, 11), 0, 2)
+        second_batch = booking_repository.find_ids_of_bookings_to_mark_as_used(
+            datetime(2019, 10, 11), first_batch[-1], 2
+        )
+
+        # Then
+        assert first_batch == [first_booking.id, second_booking.id]
+        assert second_batch == [third_booking.id]
+
+
 class FindByTokenTest:
     @pytest.mark.usefixtures("db_session")
     def test_should_return_a_booking_when_valid_token_is_given(self, app: fixture):
@@ -985,6 +1058,96 @@ class FindByProUserIdTest:
         assert bookings_recap_paginated.bookings_recap[2].venue_name == venue_for_thing.publicName
 
 
+def create_bookings_of_pro_user():
+    beneficiary = users_factories.UserFactory()
+    user = users_factories.UserFactory()
+    offerer = create_offerer()
+    user_offerer = create_user_offerer(user, offerer)
+    venue = create_venue(offerer)
+    offer = create_offer_with_event_product(venue, is_duo=True)
+    stock = create_stock(beginning_datetime=datetime.utcnow(), offer=offer, price=0)
+    oldest_booking = create_booking(user=beneficiary, stock=stock, token="ABCD", date_created=THREE_DAYS_AGO)
+    duo_booking = create_booking(user=beneficiary, stock=stock, token="FGHI", date_created=TWO_DAYS_AGO, quantity=2)
+    latest_booking = create_booking(user=beneficiary, stock=stock, token="JKLM", date_created=NOW)
+    repository.save(user_offerer, oldest_booking, duo_booking, latest_booking)
+    return user
+
+
+@patch("pcapi.core.bookings.repository.redis.get_bookings_recap_count", return_value=None)
+class FindByProUserIdAfterCursorTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_should_return_first_bookings_and_cursor_of_next_page_when_no_cursor(self, mock_get_count, app):
+        # Given
+        user = create_bookings_of_pro_user()
+
+        # When
+        bookings_recap_paginated = find_by_pro_user_id_after_cursor(user_id=user.id, cursor=None, per_page_limit=2)
+
+        # Then
+        assert [booking.booking_token for booking in bookings_recap_paginated.bookings_recap] == ["JKLM", "FGHI"]
+        assert bookings_recap_paginated.page is None
+        assert bookings_recap_paginated.pages == 2
+        assert bookings_recap_paginated.total == 4
+        assert bookings_recap_paginated.next_cursor is not None
+
+    @pytest.mark.usefixtures("db_session")
+    def test_should_return_bookings_following_cursor(self, mock_get_count, app):
+        # Given
+        user = create_bookings_of_pro_user()
+        first_page = find_by_pro_user_id_after_cursor(user_id=user.id, cursor=None, per_page_limit=2)
+
+        # When
+        second_page = find_by_pro_user_id_after_cursor(
+            user_id=user.id, cursor=BookingsRecapCursor.decode(first_page.next_cursor), per_page_limit=2
+        )
+
+        # Then
+        assert [booking.booking_token for booking in second_page.bookings_recap] == ["FGHI", "ABCD"]
+        assert second_page.next_cursor is None
+
+    @pytest.mark.usefixtures("db_session")
+    def test_should_go_on_from_cursor_of_a_page(self, mock_get_count, app):
+        # Given
+        user = create_bookings_of_pro_user()
+        first_page = find_by_pro_user_id(user_id=user.id, page=1, per_page_limit=3)
+
+        # When
+        second_page = find_by_pro_user_id_after_cursor(
+            user_id=user.id, cursor=BookingsRecapCursor.decode(first_page.next_cursor), per_page_limit=3
+        )
+
+        # Then
+        assert [booking.booking_token for booking in first_page.bookings_recap] == ["JKLM", "FGHI", "FGHI"]
+        assert [booking.booking_token for booking in second_page.bookings_recap] == ["ABCD"]
+
+    @pytest.mark.usefixtures("db_session")
+    def test_should_return_cached_total(self, mock_get_count, app):
+        # Given
+        user = create_bookings_of_pro_user()
+        mock_get_count.return_value = 10
+
+        # When
+        bookings_recap_paginated = find_by_pro_user_id_after_cursor(user_id=user.id, cursor=None, per_page_limit=2)
+
+        # Then
+        assert bookings_recap_paginated.total == 10
+        assert bookings_recap_paginated.pages == 5
+        mock_get_count.assert_called_once_with(app.redis_client, user.id)
+
+
+class IterBookingsRecapByProUserIdTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_should_return_all_bookings_recap_by_date_with_duo_bookings_twice(self, app):
+        # Given
+        user = create_bookings_of_pro_user()
+
+        # When
+        bookings_recap = iter_bookings_recap_by_pro_user_id(user_id=user.id, yield_per=1)
+
+        # Then
+        assert [booking.booking_token for booking in bookings_recap] == ["JKLM", "FGHI", "FGHI", "ABCD"]
+
+
 class FindSoonToBeExpiredBookingsTest:
     @pytest.mark.usefixtures("db_session")
     def test_should_return_only_soon_to_be_expired_bookings(self, app: fixture):
@@ -10,6 +10,7 @@ from pcapi.core import mails
 import pcapi.core.mails.backends.mailjet
 from pcapi.core.mails.models import Email
 from pcapi.core.mails.models import EmailStatus
+import pcapi.core.mails.testing as mails_testing
 from pcapi.core.testing import override_settings
 
 
@@ -57,6 +58,119 @@ class SendTest:
         assert successful
 
 
+@pytest.mark.usefixtures("db_session")
+class SendLaterTest:
+    recipients = ["recipient@example.com"]
+
+    def test_send_right_away_when_dispatch_is_not_async(self):
+        mails.send_later(recipients=self.recipients, data={"key": "value"})
+
+        assert mails_testing.outbox[0].sent_data["To"] == "recipient@example.com"
+        assert Email.query.one().status == EmailStatus.SENT
+
+    @override_settings(EMAILS_DISPATCH_ASYNC=True)
+    @patch("pcapi.workers.send_emails_job.send_emails_job.delay")
+    @patch("pcapi.core.mails.redis.schedule_emails_dispatch", return_value=True)
+    @patch("pcapi.core.mails.redis.add_email_to_send", return_value=True)
+    def test_queue_email_and_schedule_dispatch(self, mocked_add_email_to_send, mocked_schedule, mocked_delay):
+        mails.send_later(recipients=self.recipients, data={"key": "value"})
+
+        assert mocked_add_email_to_send.call_args[0][1] == {"recipients": self.recipients, "data": {"key": "value"}}
+        mocked_delay.assert_called_once_with()
+        assert mails_testing.outbox == []
+        assert Email.query.count() == 0
+
+    @override_settings(EMAILS_DISPATCH_ASYNC=True)
+    @patch("pcapi.workers.send_emails_job.send_emails_job.delay")
+    @patch("pcapi.core.mails.redis.schedule_emails_dispatch", return_value=False)
+    @patch("pcapi.core.mails.redis.add_email_to_send", return_value=True)
+    def test_do_not_schedule_dispatch_twice(self, mocked_add_email_to_send, mocked_schedule, mocked_delay):
+        mails.send_later(recipients=self.recipients, data={"key": "value"})
+
+        mocked_delay.assert_not_called()
+
+    @override_settings(EMAILS_DISPATCH_ASYNC=True)
+    @patch("pcapi.workers.send_emails_job.send_emails_job.delay")
+    @patch("pcapi.core.mails.redis.add_email_to_send", return_value=False)
+    def test_send_right_away_when_email_could_not_be_queued(self, mocked_add_email_to_send, mocked_delay):
+        mails.send_later(recipients=self.recipients, data={"key": "value"})
+
+        mocked_delay.assert_not_called()
+        assert len(mails_testing.outbox) == 1
+
+
+@pytest.mark.usefixtures("db_session")
+class SendQueuedEmailsTest:
+    @override_settings(EMAILS_DISPATCH_BATCH_SIZE=2)
+    @patch("pcapi.core.mails.redis.unschedule_emails_dispatch")
+    @patch("pcapi.core.mails.redis.pop_emails_to_send")
+    def test_send_emails_in_batches(self, mocked_pop_emails_to_send, mocked_unschedule):
+        mocked_pop_emails_to_send.side_effect = [
+            [
+                {"recipients": ["recipient1@example.com"], "data": {"key": "value1"}},
+                {"recipients": ["recipient2@example.com"], "data": {"key": "value2"}},
+            ],
+            [{"recipients": ["recipient3@example.com"], "data": {"key": "value3"}}],
+            [],
+        ]
+
+        mails.send_queued_emails()
+
+        mocked_unschedule.assert_called_once()
+        assert mocked_pop_emails_to_send.call_args[0][1] == 2
+        assert [result.sent_data["To"] for result in mails_testing.outbox] == [
+            "recipient1@example.com",
+            "recipient2@example.com",
+            "recipient3@example.com",
+        ]
+        emails = Email.query.order_by(Email.id).all()
+        assert [email.content["key"] for email in emails] == ["value1", "value2", "value3"]
+        assert {email.status for email in emails} == {EmailStatus.SENT}
+
+    @patch("pcapi.core.mails.backends.testing.TestingBackend.send_mails", side_effect=ConnectionError)
+    @patch("pcapi.core.mails.redis.unschedule_emails_dispatch")
+    @patch("pcapi.core.mails.redis.pop_emails_to_send")
+    def test_save_emails_with_error_status_when_batch_could_not_be_sent(
+        self, mocked_pop_emails_to_send, mocked_unschedule, mocked_send_mails
+    ):
+        mocked_pop_emails_to_send.side_effect = [
+            [{"recipients": ["recipient1@example.com"], "data": {"key": "value1"}}],
+            [],
+        ]
+
+        mails.send_queued_emails()
+
+        email = Email.query.one()
+        assert email.status == EmailStatus.ERROR
+        assert email.content == {"key": "value1", "To": "recipient1@example.com"}
+
+    @patch("pcapi.core.mails._save_emails", side_effect=ConnectionError)
+    @patch("pcapi.core.mails.redis.requeue_emails_to_send")
+    @patch("pcapi.core.mails.redis.unschedule_emails_dispatch")
+    @patch("pcapi.core.mails.redis.pop_emails_to_send")
+    def test_requeue_unsent_emails_when_batch_could_not_be_saved(
+        self, mocked_pop_emails_to_send, mocked_unschedule, mocked_requeue, mocked_save_emails
+    ):
+        unsent_email = {"recipients": ["recipient2@example.com"], "data": {"key": "value2"}}
+        mocked_pop_emails_to_send.side_effect = [
+            [{"recipients": ["recipient1@example.com"], "data": {"key": "value1"}}, unsent_email],
+            [{"recipients": ["recipient3@example.com"], "data": {"key": "value3"}}],
+        ]
+
+        with patch(
+            "pcapi.core.mails.backends.testing.TestingBackend.send_mails",
+            return_value=[
+                mails.models.MailResult(sent_data={"key": "value1"}, successful=True),
+                mails.models.MailResult(sent_data={"key": "value2"}, successful=False),
+            ],
+        ):
+            mails.send_queued_emails()
+
+        mocked_requeue.assert_called_once()
+        assert mocked_requeue.call_args[0][1] == [unsent_email]
+        assert mocked_pop_emails_to_send.call_count == 1
+
+
 class MailingListFunctionsTest:
     @override_settings(EMAIL_BACKEND="pcapi.core.mails.backends.mailjet.MailjetBackend")
     def test_create_contact_with_mailjet(self):
@@ -140,6 +254,45 @@ class MailjetBackendTest:
             result = backend.send_mail(recipients=self.recipients, data=self.data)
         assert not result.successful
 
+    def test_send_mails(self):
+        backend = self._get_backend()
+        emails = [(["recipient1@example.com"], {"key": "value1"}), (["recipient2@example.com"], {"key": "value2"})]
+        with requests_mock.Mocker() as mock:
+            posted = mock.post("https://api.eu.mailjet.com/v3/send")
+            results = backend.send_mails(emails)
+
+        assert mock.call_count == 1
+        messages = posted.last_request.json()["Messages"]
+        assert [(message["To"], message["key"]) for message in messages] == [
+            ("recipient1@example.com", "value1"),
+            ("recipient2@example.com", "value2"),
+        ]
+        assert messages[0]["FromEmail"] == "support@example.com"
+        assert messages[0]["TemplateErrorReporting"]["Email"] == "dev@example.com"
+        assert [result.successful for result in results] == [True, True]
+
+    def test_send_mails_with_error_response(self):
+        backend = self._get_backend()
+        emails = [(["recipient1@example.com"], {"key": "value1"}), (["recipient2@example.com"], {"key": "value2"})]
+        with requests_mock.Mocker() as mock:
+            mock.post("https://api.eu.mailjet.com/v3/send", status_code=400)
+            results = backend.send_mails(emails)
+
+        assert [result.successful for result in results] == [False, False]
+
+    def test_send_mails_returns_results_in_order_of_emails(self):
+        backend = self._get_backend()
+        emails = [
+            (["recipient1@example.com"], {"key": "value1"}),
+            (["recipient2@example.com"], {"Messages": [{"key": "value2"}]}),
+        ]
+        with requests_mock.Mocker() as mock:
+            mock.post("https://api.eu.mailjet.com/v3/send")
+            results = backend.send_mails(emails)
+
+        assert results[0].sent_data["key"] == "value1"
+        assert "Messages" in results[1].sent_data
+
     def test_create_contact(self):
         backend = self._get_backend()
         with requests_mock.Mocker() as mock:
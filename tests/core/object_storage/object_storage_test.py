@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 import pytest
@@ -5,9 +6,11 @@ import pytest
 from pcapi.core.object_storage import BACKENDS_MAPPING
 from pcapi.core.object_storage import _check_backend_setting
 from pcapi.core.object_storage import _check_backends_module_paths
+from pcapi.core.object_storage import _get_backend
 from pcapi.core.object_storage import build_thumb_path
 from pcapi.core.object_storage import delete_public_object
 from pcapi.core.object_storage import store_public_object
+from pcapi.core.object_storage.backends.ovh import OVHBackend
 from pcapi.core.offers.models import Mediation
 from pcapi.core.testing import override_settings
 from pcapi.models.product import Product
@@ -41,6 +44,89 @@ class StorePublicObjectTest:
         mock_gcp_store_public_object.assert_called_once_with("bucket", "object_id", b"mouette", "image/jpeg", None)
 
 
+class GetBackendTest:
+    def test_should_instantiate_backend_once_per_process(self):
+        # When
+        backend1 = _get_backend("pcapi.core.object_storage.backends.local.LocalBackend")
+        backend2 = _get_backend("pcapi.core.object_storage.backends.local.LocalBackend")
+
+        # Then
+        assert backend1 is backend2
+
+
+def _mock_swift_connection(mock_connection, storage_url, token):
+    # swiftclient connections keep the storage URL and token they use
+    mock_connection.return_value.get_auth.return_value = (storage_url, token)
+    mock_connection.return_value.url = storage_url
+    mock_connection.return_value.token = token
+
+
+@patch("pcapi.core.object_storage.backends.ovh.swiftclient.Connection")
+class OVHBackendTest:
+    def test_should_authenticate_once_and_reuse_connection(self, mock_connection):
+        # Given
+        _mock_swift_connection(mock_connection, "https://storage.url", "token")
+        backend = OVHBackend()
+
+        # When
+        backend.store_public_object("bucket", "object_id_1", b"mouette", "image/jpeg")
+        backend.store_public_object("bucket", "object_id_2", b"goeland", "image/jpeg")
+
+        # Then
+        mock_connection.return_value.get_auth.assert_called_once()
+        assert mock_connection.call_count == 2
+        assert mock_connection.call_args[1]["preauthurl"] == "https://storage.url"
+        assert mock_connection.call_args[1]["preauthtoken"] == "token"
+
+    def test_should_reuse_token_for_the_connection_of_another_thread(self, mock_connection):
+        # Given
+        _mock_swift_connection(mock_connection, "https://storage.url", "token")
+        backend = OVHBackend()
+        backend.store_public_object("bucket", "object_id_1", b"mouette", "image/jpeg")
+
+        # When
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(backend.store_public_object, "bucket", "object_id_2", b"goeland", "image/jpeg").result()
+
+        # Then
+        mock_connection.return_value.get_auth.assert_called_once()
+        assert mock_connection.call_count == 3
+        assert mock_connection.call_args[1]["preauthtoken"] == "token"
+
+    def test_should_share_token_renewed_after_expiry_with_other_threads(self, mock_connection):
+        # Given
+        _mock_swift_connection(mock_connection, "https://storage.url", "expired_token")
+
+        def put_object_after_reauthentication(*args, **kwargs):
+            mock_connection.return_value.token = "new_token"
+
+        mock_connection.return_value.put_object.side_effect = put_object_after_reauthentication
+        backend = OVHBackend()
+        backend.store_public_object("bucket", "object_id_1", b"mouette", "image/jpeg")
+
+        # When
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(backend.store_public_object, "bucket", "object_id_2", b"goeland", "image/jpeg").result()
+
+        # Then
+        mock_connection.return_value.get_auth.assert_called_once()
+        assert mock_connection.call_args[1]["preauthtoken"] == "new_token"
+
+    def test_should_switch_connection_to_token_renewed_by_another_thread(self, mock_connection):
+        # Given
+        _mock_swift_connection(mock_connection, "https://storage.url", "expired_token")
+        backend = OVHBackend()
+        connection = backend.swift_con()
+        backend._auth = ("https://storage.url", "new_token")
+
+        # When
+        backend.delete_public_object("bucket", "object_id")
+
+        # Then
+        assert connection.token == "new_token"
+        connection.delete_object.assert_called_once()
+
+
 class CheckBackendSettingTest:
     @override_settings(OBJECT_STORAGE_PROVIDER="")
     def test_empty_setting(self):
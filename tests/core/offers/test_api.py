@@ -180,6 +180,23 @@ class UpsertStocksTest:
         # Then
         mocked_add_offer_id.assert_not_called()
 
+    @override_features(SYNCHRONIZE_ALGOLIA=False)
+    @mock.patch("pcapi.domain.user_emails.send_batch_stock_postponement_emails_to_users")
+    @mock.patch("pcapi.connectors.redis.delete_offer_response")
+    def test_delete_cached_offer_response_even_if_algolia_feature_is_disabled(
+        self, mocked_delete_offer_response, mock_update_confirmation_dates
+    ):
+        # Given
+        offer = factories.ThingOfferFactory()
+        created_stock_data = StockCreationBodyModel(price=10)
+
+        # When
+        api.upsert_stocks(offer_id=offer.id, stock_data_list=[created_stock_data])
+
+        # Then
+        mocked_delete_offer_response.assert_called_once()
+        assert mocked_delete_offer_response.call_args[1]["offer_id"] == offer.id
+
     @mock.patch("pcapi.domain.user_emails.send_batch_stock_postponement_emails_to_users")
     def test_does_not_allow_edition_of_stock_of_another_offer_than_given(self, mock_update_confirmation_dates):
         # Given
@@ -1,8 +1,12 @@
 from decimal import Decimal
+from unittest.mock import patch
 
 import pytest
 
+import pcapi.core.bookings.api as bookings_api
 from pcapi.core.bookings.factories import BookingFactory
+from pcapi.core.offers.factories import StockFactory
+import pcapi.core.users.api as users_api
 from pcapi.core.users.factories import UserFactory
 from pcapi.core.users.models import Expense
 from pcapi.core.users.models import ExpenseDomain
@@ -578,3 +582,39 @@ class ExpensesTest:
                     Expense(domain=ExpenseDomain.DIGITAL, current=Decimal(0.0), limit=Decimal(200)),
                     Expense(domain=ExpenseDomain.PHYSICAL, current=Decimal(0.0), limit=Decimal(200)),
                 ]
+
+
+@pytest.mark.usefixtures("db_session")
+class ExpensesCacheTest:
+    def test_expenses_are_computed_once_per_request(self, app):
+        # Given
+        booking = BookingFactory(amount=50)
+        user = booking.user
+
+        with app.test_request_context():
+            with patch(
+                "pcapi.core.users.api._compute_user_expenses", wraps=users_api._compute_user_expenses
+            ) as compute:
+                # when
+                first_expenses = user.expenses
+                second_expenses = user.expenses
+
+        # Then
+        assert first_expenses == second_expenses
+        assert first_expenses[0] == Expense(domain=ExpenseDomain.ALL, current=Decimal(50), limit=Decimal(500))
+        compute.assert_called_once_with(user)
+
+    def test_expenses_are_computed_again_after_a_booking(self, app):
+        # Given
+        user = UserFactory()
+        stock = StockFactory(price=20)
+
+        with app.test_request_context():
+            # when
+            expenses_before_booking = user.expenses
+            bookings_api.book_offer(beneficiary=user, stock=stock, quantity=1)
+            expenses_after_booking = user.expenses
+
+        # Then
+        assert expenses_before_booking[0].current == 0
+        assert expenses_after_booking[0].current == 20
@@ -10,6 +10,7 @@ from pcapi.domain.payments import apply_banishment
 from pcapi.domain.payments import create_all_payments_details
 from pcapi.domain.payments import create_payment_details
 from pcapi.domain.payments import create_payment_for_booking
+from pcapi.domain.payments import create_payment_rows_for_booking
 from pcapi.domain.payments import filter_out_already_paid_for_bookings
 from pcapi.domain.payments import filter_out_bookings_without_cost
 from pcapi.domain.payments import group_payments_by_status
@@ -178,6 +179,66 @@ def test_create_payment_for_booking_with_pending_status(app):
     assert payment.statuses[0].date == datetime(2018, 10, 15, 9, 21, 34)
 
 
+@freeze_time("2018-10-15 09:21:34")
+def test_create_payment_rows_for_booking_with_pending_status(app):
+    # given
+    user = create_user()
+    stock = create_stock(price=10, quantity=5)
+    booking = create_booking(user=user, quantity=1, stock=stock, idx=12)
+    offerer = create_offerer(name="Test Offerer", siren="123456789")
+    venue = create_venue(offerer, name="Test Venue")
+    create_bank_information(bic="LokiJU76", iban="KD98765RFGHZ788", venue=venue)
+    booking.stock.offer = Offer()
+    booking.stock.offer.venue = venue
+    booking_reimbursement = BookingReimbursement(booking, ReimbursementRules.PHYSICAL_OFFERS, Decimal(10))
+
+    # when
+    payment_row, payment_status_row = create_payment_rows_for_booking(
+        booking_reimbursement, 34, "pass Culture Pro - remboursement 2nde quinzaine 10-2018"
+    )
+
+    # then
+    assert payment_row == {
+        "id": 34,
+        "bookingId": 12,
+        "amount": Decimal(10),
+        "reimbursementRule": ReimbursementRules.PHYSICAL_OFFERS.value.description,
+        "reimbursementRate": ReimbursementRules.PHYSICAL_OFFERS.value.rate,
+        "author": "batch",
+        "transactionLabel": "pass Culture Pro - remboursement 2nde quinzaine 10-2018",
+        "iban": "KD98765RFGHZ788",
+        "bic": "LOKIJU76",
+        "recipientName": "Test Offerer",
+        "recipientSiren": "123456789",
+    }
+    assert payment_status_row == {
+        "paymentId": 34,
+        "date": datetime(2018, 10, 15, 9, 21, 34),
+        "status": TransactionStatus.PENDING,
+        "detail": None,
+    }
+
+
+def test_create_payment_rows_for_booking_with_not_processable_status_when_no_bank_information():
+    # given
+    user = create_user()
+    stock = create_stock(price=10, quantity=5)
+    booking = create_booking(user=user, quantity=1, stock=stock)
+    booking.stock.offer = Offer()
+    booking.stock.offer.venue = Venue()
+    booking.stock.offer.venue.managingOfferer = create_offerer(name="Test Offerer")
+    booking_reimbursement = BookingReimbursement(booking, ReimbursementRules.PHYSICAL_OFFERS, Decimal(10))
+
+    # when
+    payment_row, payment_status_row = create_payment_rows_for_booking(booking_reimbursement, 34, "label")
+
+    # then
+    assert payment_row["iban"] is None
+    assert payment_row["bic"] is None
+    assert payment_status_row["status"] == TransactionStatus.NOT_PROCESSABLE
+    assert payment_status_row["detail"] == "IBAN et BIC manquants sur l'offreur"
+
+
 class FilterOutAlreadyPaidForBookingsTest:
     def test_it_returns_reimbursements_on_bookings_with_no_existing_payments(self):
         # Given
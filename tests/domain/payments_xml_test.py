@@ -11,6 +11,7 @@ import pytest
 from pcapi.domain.payments import generate_file_checksum
 from pcapi.domain.payments import generate_message_file
 from pcapi.domain.payments import validate_message_file_structure
+from pcapi.domain.payments import write_message_file
 from pcapi.model_creators.generic_creators import create_booking
 from pcapi.model_creators.generic_creators import create_offerer
 from pcapi.model_creators.generic_creators import create_payment
@@ -644,7 +645,63 @@ def test_generate_file_checksum_returns_a_checksum_of_the_file(mocked_uuid, app)
     checksum = generate_file_checksum(xml)
 
     # then
-    assert checksum == b"\x16\x91\x0c\x11~Hs\xc5\x1a\xa3W1\x13\xbf!jq@\xea  <h&\xef\x1f\xaf\xfc\x7fO\xc8\x82"
+    assert checksum == b"\x86U\x07\x8c\xe6v\x0fdON~\xf5\x94P\xb7\x05$ (\x1ez\xc0\x96A\x0c\xa5\xf6\x81\x9dE\x9cu"
+
+
+def test_write_message_file_returns_the_checksum_of_the_written_file(app):
+    # given
+    offerer = create_offerer()
+    venue = create_venue(offerer)
+    stock = create_stock_from_offer(create_offer_with_thing_product(venue))
+    booking = create_booking(user=create_user(), stock=stock)
+    payments = [create_payment(booking, offerer, Decimal(10), iban="CF13QSDFGH456789", bic="QSDFGH8Z555")]
+    message_file = BytesIO()
+
+    # when
+    checksum = write_message_file(message_file, payments, "BD12AZERTY123456", "AZERTY9Q666", MESSAGE_ID, "0000")
+
+    # then
+    assert checksum == generate_file_checksum(message_file.getvalue().decode("utf-8"))
+    assert find_node("//ns:CdtTrfTxInf/ns:CdtrAcct/ns:Id/ns:IBAN", message_file.getvalue().decode()) == (
+        "CF13QSDFGH456789"
+    )
+
+
+def test_validate_message_file_structure_validates_a_written_message_file(app):
+    # given
+    offerer = create_offerer()
+    venue = create_venue(offerer)
+    stock = create_stock_from_offer(create_offer_with_thing_product(venue))
+    booking = create_booking(user=create_user(), stock=stock)
+    payments = [create_payment(booking, offerer, Decimal(10), iban="CF13QSDFGH456789", bic="QSDFGH8Z555")]
+    message_file = BytesIO()
+    write_message_file(message_file, payments, "BD12AZERTY123456", "AZERTY9Q666", MESSAGE_ID, "0000")
+    message_file.seek(0)
+
+    # when
+    validate_message_file_structure(message_file)
+
+
+def test_validate_message_file_structure_raises_a_document_invalid_exception_with_line_of_invalid_element(app):
+    # given
+    offerer = create_offerer()
+    venue = create_venue(offerer)
+    stock = create_stock_from_offer(create_offer_with_thing_product(venue))
+    booking = create_booking(user=create_user(), stock=stock)
+    payments = [create_payment(booking, offerer, Decimal(10), iban="CF13 QSDF", bic="QSDFGH8Z555")]
+    message_file = BytesIO()
+    write_message_file(message_file, payments, "BD12AZERTY123456", "AZERTY9Q666", MESSAGE_ID, "0000")
+    message_file.seek(0)
+
+    # when
+    with pytest.raises(DocumentInvalid) as e:
+        validate_message_file_structure(message_file)
+
+    # then
+    assert str(e.value) == (
+        "Element '{urn:iso:std:iso:20022:tech:xsd:pain.001.001.03}IBAN': [facet 'pattern'] "
+        "The value 'CF13 QSDF' is not accepted by the pattern '[A-Z]{2,2}[0-9]{2,2}[a-zA-Z0-9]{1,30}'., line 75"
+    )
 
 
 def test_validate_message_file_structure_raises_a_document_invalid_exception_with_specific_error_when_xml_is_invalid(
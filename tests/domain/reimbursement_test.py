@@ -7,10 +7,12 @@ import pytest
 import pcapi.core.bookings.factories as bookings_factories
 import pcapi.core.offers.factories as offers_factories
 import pcapi.core.users.factories as users_factories
+from pcapi.domain.reimbursement import BookingReimbursementColumns
 from pcapi.domain.reimbursement import RULES
 from pcapi.domain.reimbursement import ReimbursementRule
 from pcapi.domain.reimbursement import ReimbursementRules
 from pcapi.domain.reimbursement import find_all_booking_reimbursements
+from pcapi.domain.reimbursement import find_all_booking_reimbursements_in_batch
 from pcapi.models import Booking
 from pcapi.models import ThingType
 from pcapi.repository import repository
@@ -713,6 +715,96 @@ class FindAllBookingsReimbursementsTest:
         assert_degressive_reimbursement(booking_reimbursements[2], booking3, 27000)
 
 
+def build_columns(bookings):
+    return BookingReimbursementColumns(
+        bookings=[booking["id"] for booking in bookings],
+        amounts=[booking["amount"] for booking in bookings],
+        quantities=[booking.get("quantity", 1) for booking in bookings],
+        offer_types=[booking.get("offer_type", str(ThingType.AUDIOVISUEL)) for booking in bookings],
+        offers_are_digital=[booking.get("is_digital", False) for booking in bookings],
+        products_are_digital=[booking.get("is_digital", False) for booking in bookings],
+        dates_created=[booking.get("date_created", datetime(2019, 1, 1)) for booking in bookings],
+        venue_ids=[booking.get("venue_id", 1) for booking in bookings],
+    )
+
+
+class FindAllBookingReimbursementsInBatchTest:
+    def test_returns_nothing_when_no_bookings(self):
+        # when
+        booking_reimbursements = find_all_booking_reimbursements_in_batch(build_columns([]), RULES)
+
+        # then
+        assert booking_reimbursements == []
+
+    def test_applies_degressive_rates_on_cumulative_value_of_each_venue_and_civil_year(self):
+        # given
+        columns = build_columns(
+            [
+                {"id": 1, "amount": Decimal("19990")},
+                {"id": 2, "amount": Decimal("50"), "is_digital": True},
+                {"id": 3, "amount": Decimal("20"), "venue_id": 2},
+                {"id": 4, "amount": Decimal("20")},
+                {"id": 5, "amount": Decimal("10000"), "quantity": 2},
+                {"id": 6, "amount": Decimal("20"), "date_created": datetime(2020, 1, 1)},
+                {"id": 7, "amount": Decimal("200000"), "offer_type": str(ThingType.LIVRE_EDITION)},
+            ]
+        )
+
+        # when
+        booking_reimbursements = find_all_booking_reimbursements_in_batch(columns, RULES)
+
+        # then
+        assert [(r.booking, r.reimbursement, r.reimbursed_amount) for r in booking_reimbursements] == [
+            (1, ReimbursementRules.PHYSICAL_OFFERS, Decimal("19990")),
+            (2, ReimbursementRules.DIGITAL_THINGS, Decimal("0")),
+            (3, ReimbursementRules.PHYSICAL_OFFERS, Decimal("20")),
+            (4, ReimbursementRules.BETWEEN_20000_AND_40000_EUROS, Decimal("20") * Decimal(0.95)),
+            (5, ReimbursementRules.BETWEEN_40000_AND_150000_EUROS, Decimal("20000") * Decimal(0.85)),
+            (6, ReimbursementRules.PHYSICAL_OFFERS, Decimal("20")),
+            (7, ReimbursementRules.BOOK_REIMBURSEMENT, Decimal("200000") * Decimal(0.95)),
+        ]
+
+    def test_raises_when_no_rule_is_relevant(self):
+        # given
+        columns = build_columns([{"id": 1, "amount": Decimal("10"), "is_digital": True}])
+
+        # when
+        with pytest.raises(ValueError):
+            find_all_booking_reimbursements_in_batch(columns, [ReimbursementRules.PHYSICAL_OFFERS])
+
+    @pytest.mark.usefixtures("db_session")
+    def test_returns_same_reimbursements_as_find_all_booking_reimbursements_for_bookings_of_a_venue(self):
+        # given
+        user = create_rich_user(300000)
+        venue = offers_factories.VenueFactory()
+        bookings = [
+            bookings_factories.BookingFactory(
+                user=user,
+                quantity=quantity,
+                stock__price=price,
+                stock__offer=offers_factories.ThingOfferFactory(venue=venue, product=product),
+            )
+            for quantity, price, product in [
+                (1, 19000, offers_factories.ThingProductFactory()),
+                (3, 50, offers_factories.DigitalProductFactory()),
+                (1, 2000, offers_factories.ThingProductFactory(type=str(ThingType.LIVRE_EDITION))),
+                (20, 1000, offers_factories.ThingProductFactory()),
+                (100, 1500, offers_factories.ThingProductFactory()),
+            ]
+        ]
+
+        # when
+        booking_reimbursements = find_all_booking_reimbursements_in_batch(
+            BookingReimbursementColumns.from_bookings(bookings), RULES
+        )
+
+        # then
+        expected_reimbursements = find_all_booking_reimbursements(bookings, RULES)
+        assert [(r.booking, r.reimbursement, r.reimbursed_amount) for r in booking_reimbursements] == [
+            (r.booking, r.reimbursement, r.reimbursed_amount) for r in expected_reimbursements
+        ]
+
+
 def assert_total_reimbursement(booking_reimbursement, booking):
     assert booking_reimbursement.booking == booking
     assert booking_reimbursement.reimbursement == ReimbursementRules.PHYSICAL_OFFERS
@@ -1,10 +1,14 @@
 import pytest
 from sqlalchemy import Sequence
 
+import pcapi.core.offers.factories as offers_factories
+from pcapi.local_providers.chunk_manager import get_existing_objects_by_chunk_key
+from pcapi.local_providers.chunk_manager import get_existing_pc_obj
 from pcapi.local_providers.chunk_manager import save_chunks
 from pcapi.model_creators.generic_creators import create_offerer
 from pcapi.model_creators.generic_creators import create_stock
 from pcapi.model_creators.generic_creators import create_venue
+from pcapi.model_creators.provider_creators import create_providable_info
 from pcapi.model_creators.specific_creators import create_offer_with_thing_product
 from pcapi.model_creators.specific_creators import create_product_with_thing_type
 from pcapi.models import Offer
@@ -127,3 +131,59 @@ class SaveChunksTest:
         assert len(offers) == 2
         assert any(offer.isDuo for offer in offers)
         assert Stock.query.count() == 1
+
+
+@pytest.mark.usefixtures("db_session")
+class GetExistingObjectsByChunkKeyTest:
+    def test_should_fetch_existing_objects_of_each_model_in_one_query(self, assert_num_queries):
+        # Given
+        offer = offers_factories.OfferFactory(idAtProviders="123@456")
+        stock = offers_factories.StockFactory(offer=offer, idAtProviders="123@456")
+        offers_factories.OfferFactory(idAtProviders="789@456")
+        providable_infos = [
+            create_providable_info(model_name=Offer, id_at_providers="123@456"),
+            create_providable_info(model_name=Stock, id_at_providers="123@456"),
+            create_providable_info(model_name=Offer, id_at_providers="unknown"),
+        ]
+
+        # When
+        with assert_num_queries(2):
+            existing_objects = get_existing_objects_by_chunk_key(providable_infos)
+
+        # Then
+        assert existing_objects == {"123@456|Offer": offer, "123@456|Stock": stock}
+
+
+class GetExistingPcObjTest:
+    def test_should_return_object_from_current_chunks_first(self):
+        # Given
+        providable_info = create_providable_info(model_name=Offer, id_at_providers="1")
+        offer_in_chunk = Offer()
+        existing_offer = Offer()
+
+        # When
+        pc_object = get_existing_pc_obj(providable_info, {"1|Offer": offer_in_chunk}, {}, {"1|Offer": existing_offer})
+
+        # Then
+        assert pc_object is offer_in_chunk
+
+    def test_should_return_existing_object(self):
+        # Given
+        providable_info = create_providable_info(model_name=Offer, id_at_providers="1")
+        existing_offer = Offer()
+
+        # When
+        pc_object = get_existing_pc_obj(providable_info, {}, {}, {"1|Offer": existing_offer})
+
+        # Then
+        assert pc_object is existing_offer
+
+    def test_should_return_none_when_object_does_not_exist(self):
+        # Given
+        providable_info = create_providable_info(model_name=Offer, id_at_providers="1")
+
+        # When
+        pc_object = get_existing_pc_obj(providable_info, {}, {}, {"1|Stock": Stock()})
+
+        # Then
+        assert pc_object is None
@@ -1,4 +1,5 @@
 from datetime import datetime
+from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
@@ -171,6 +172,108 @@ class UpdateObjectsTest:
         assert new_product.name == "New Product"
         assert new_product.type == str(ThingType.LIVRE_EDITION)
 
+    @patch("pcapi.local_providers.local_provider.CHUNK_MAX_SIZE", 2)
+    def test_fills_objects_with_the_state_of_their_own_line(self):
+        # Given
+        offerers_factories.ProviderFactory(localClass="TestLocalProviderWithLineState")
+        local_provider = provider_test_utils.TestLocalProviderWithLineState(["Livre 1", "Livre 2", "Livre 3"])
+
+        # When
+        local_provider.updateObjects()
+
+        # Then
+        products = Product.query.order_by(Product.idAtProviders).all()
+        assert [(product.idAtProviders, product.name) for product in products] == [
+            ("Livre 1", "Livre 1"),
+            ("Livre 2", "Livre 2"),
+            ("Livre 3", "Livre 3"),
+        ]
+        assert local_provider.checkedObjects == 3
+
+    def test_keeps_aside_only_the_line_state_attributes(self):
+        # Given
+        offerers_factories.ProviderFactory(localClass="TestLocalProviderWithLineState")
+        local_provider = provider_test_utils.TestLocalProviderWithLineState(["Livre 1", "Livre 2"])
+        thumb_pipeline = MagicMock()
+        local_provider.thumb_pipeline = thumb_pipeline
+
+        # When
+        lines, _ = local_provider._read_lines(2)
+        local_provider._set_line_state(lines[0][1])
+
+        # Then
+        assert [line_state for _, line_state in lines] == [("Livre 1",), ("Livre 2",)]
+        assert local_provider.product_name == "Livre 1"
+        assert local_provider.thumb_pipeline is thumb_pipeline
+
+    @patch("tests.local_providers.provider_test_utils.TestLocalProvider.__next__")
+    def test_reads_lines_ahead_until_they_hold_enough_objects(self, next_function):
+        # Given
+        offerers_factories.ProviderFactory(localClass="TestLocalProvider")
+        first_line = [create_providable_info(id_at_providers="1"), create_providable_info(id_at_providers="2")]
+        next_function.side_effect = [first_line, [create_providable_info(id_at_providers="3")]]
+        local_provider = provider_test_utils.TestLocalProvider()
+
+        # When
+        lines, has_remaining_lines = local_provider._read_lines(2)
+
+        # Then
+        assert [providable_infos for providable_infos, _ in lines] == [first_line]
+        assert has_remaining_lines
+
+    @patch("pcapi.local_providers.local_provider.CHUNK_MAX_SIZE", 2)
+    def test_updates_existing_objects_read_ahead(self):
+        # Given
+        provider = offerers_factories.ProviderFactory(localClass="TestLocalProviderWithLineState")
+        for name in ["Livre 1", "Livre 3"]:
+            offers_factories.ThingProductFactory(
+                dateModifiedAtLastProvider=datetime(2000, 1, 1),
+                lastProvider=provider,
+                idAtProviders=name,
+                name="Old product name",
+            )
+        local_provider = provider_test_utils.TestLocalProviderWithLineState(["Livre 1", "Livre 2", "Livre 3"])
+
+        # When
+        local_provider.updateObjects()
+
+        # Then
+        assert Product.query.count() == 3
+        assert Product.query.filter_by(name="Old product name").count() == 0
+        assert local_provider.createdObjects == 1
+        assert local_provider.updatedObjects == 2
+
+    @patch("pcapi.local_providers.thumb_pipeline.object_storage.store_public_object")
+    @patch("tests.local_providers.provider_test_utils.TestLocalProviderWithThumbIndexAt4.__next__")
+    def test_does_not_count_thumbs_from_the_first_one_that_could_not_be_stored(
+        self, next_function, mock_store_public_object
+    ):
+        # Given
+        provider = offerers_factories.ProviderFactory(localClass="TestLocalProviderWithThumbIndexAt4")
+        providable_info = create_providable_info()
+        product = offers_factories.ThingProductFactory(
+            idAtProviders=providable_info.id_at_providers,
+            lastProvider=provider,
+            thumbCount=0,
+        )
+        local_provider = provider_test_utils.TestLocalProviderWithThumbIndexAt4()
+        next_function.side_effect = [[providable_info]]
+
+        def store_public_object(bucket, object_id, blob, content_type):
+            if object_id.endswith("_2"):
+                raise ConnectionError()
+
+        mock_store_public_object.side_effect = store_public_object
+
+        # When
+        local_provider.updateObjects()
+
+        # Then
+        assert mock_store_public_object.call_count == 4
+        assert Product.query.get(product.id).thumbCount == 2
+        assert local_provider.erroredThumbs == 1
+        assert local_provider.createdThumbs == 0
+
 
 @pytest.mark.usefixtures("db_session")
 class CreateObjectTest:
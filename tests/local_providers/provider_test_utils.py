@@ -1,6 +1,8 @@
 from pathlib import Path
+from typing import List
 
 from pcapi.local_providers.local_provider import LocalProvider
+from pcapi.model_creators.provider_creators import create_providable_info
 from pcapi.models import ThingType
 from pcapi.models import VenueProvider
 from pcapi.models.db import Model
@@ -23,6 +25,25 @@ class TestLocalProvider(LocalProvider):
         pass
 
 
+class TestLocalProviderWithLineState(LocalProvider):
+    name = "LocalProvider Test With Line State"
+    can_create = True
+    line_state_attributes = ("product_name",)
+
+    def __init__(self, product_names: List[str]):
+        super().__init__()
+        self.product_names = iter(product_names)
+        self.product_name = None
+
+    def fill_object_attributes(self, obj):
+        obj.name = self.product_name
+        obj.type = str(ThingType.LIVRE_EDITION)
+
+    def __next__(self):
+        self.product_name = next(self.product_names)
+        return [create_providable_info(id_at_providers=self.product_name)]
+
+
 class TestLocalProviderWithApiErrors(LocalProvider):
     name = "LocalProvider Test"
     can_create = True
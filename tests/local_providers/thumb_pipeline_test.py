@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock
+from unittest.mock import call
+from unittest.mock import patch
+
+from pcapi.local_providers.thumb_pipeline import ThumbPipeline
+
+
+def _build_product(humanized_id: str) -> MagicMock:
+    product = MagicMock()
+    product.get_thumb_storage_id.side_effect = lambda index: "products/%s_%i" % (humanized_id, index)
+    return product
+
+
+@patch("pcapi.local_providers.thumb_pipeline.object_storage.store_public_object")
+@patch("pcapi.local_providers.thumb_pipeline.standardize_image")
+class ThumbPipelineTest:
+    def test_should_convert_identical_images_once_and_upload_them_for_each_index(
+        self, mock_standardize_image, mock_store_public_object
+    ):
+        # Given
+        mock_standardize_image.return_value = b"standard image"
+        pipeline = ThumbPipeline(conversion_workers=0, upload_workers=2)
+        product = _build_product("AE")
+
+        # When
+        for index in range(3):
+            pipeline.submit(product, b"raw image", index, is_new_thumb=True)
+        failed_thumbs = pipeline.wait_for_uploads()
+        pipeline.close()
+
+        # Then
+        assert failed_thumbs == []
+        mock_standardize_image.assert_called_once_with(b"raw image")
+        assert sorted(mock_store_public_object.call_args_list, key=lambda c: c[1]["object_id"]) == [
+            call(bucket="thumbs", object_id="products/AE_0", blob=b"standard image", content_type="image/jpeg"),
+            call(bucket="thumbs", object_id="products/AE_1", blob=b"standard image", content_type="image/jpeg"),
+            call(bucket="thumbs", object_id="products/AE_2", blob=b"standard image", content_type="image/jpeg"),
+        ]
+
+    def test_should_not_upload_the_same_image_twice_to_the_same_storage_id(
+        self, mock_standardize_image, mock_store_public_object
+    ):
+        # Given
+        mock_standardize_image.return_value = b"standard image"
+        pipeline = ThumbPipeline(conversion_workers=0, upload_workers=2)
+        product = _build_product("AE")
+
+        # When
+        pipeline.submit(product, b"raw image", 1, is_new_thumb=False)
+        pipeline.submit(product, b"raw image", 1, is_new_thumb=False)
+        pipeline.wait_for_uploads()
+        pipeline.close()
+
+        # Then
+        mock_store_public_object.assert_called_once()
+        assert pipeline.deduplicated_uploads_count == 1
+
+    def test_should_store_the_last_image_submitted_for_a_storage_id(
+        self, mock_standardize_image, mock_store_public_object
+    ):
+        # Given
+        mock_standardize_image.side_effect = lambda image: image.replace(b"raw", b"standard")
+        pipeline = ThumbPipeline(conversion_workers=0, upload_workers=2)
+        product = _build_product("AE")
+
+        # When
+        pipeline.submit(product, b"raw image 1", 1, is_new_thumb=False)
+        pipeline.submit(product, b"raw image 2", 1, is_new_thumb=False)
+        pipeline.wait_for_uploads()
+        pipeline.close()
+
+        # Then
+        assert [c[1]["blob"] for c in mock_store_public_object.call_args_list] == [
+            b"standard image 1",
+            b"standard image 2",
+        ]
+
+    def test_should_return_thumbs_that_could_not_be_stored(self, mock_standardize_image, mock_store_public_object):
+        # Given
+        mock_standardize_image.return_value = b"standard image"
+        mock_store_public_object.side_effect = ConnectionError()
+        pipeline = ThumbPipeline(conversion_workers=0, upload_workers=2)
+        product = _build_product("AE")
+
+        # When
+        pipeline.submit(product, b"raw image", 0, is_new_thumb=True)
+        failed_thumbs = pipeline.wait_for_uploads()
+        pipeline.close()
+
+        # Then
+        assert len(failed_thumbs) == 1
+        assert failed_thumbs[0].pc_object == product
+        assert failed_thumbs[0].thumb_index == 0
+        assert failed_thumbs[0].is_new_thumb
+        assert isinstance(failed_thumbs[0].error, ConnectionError)
@@ -33,19 +33,21 @@ class TiteLiveThingDescriptionsTest:
         @patch(
             "pcapi.local_providers.titelive_thing_descriptions.titelive_thing_descriptions.get_files_to_process_from_titelive_ftp"
         )
-        @patch("pcapi.local_providers.titelive_thing_descriptions.titelive_thing_descriptions.get_zip_file_from_ftp")
+        @patch("pcapi.local_providers.titelive_thing_descriptions.titelive_thing_descriptions.iter_zip_files_from_ftp")
         @patch("pcapi.local_providers.titelive_thing_descriptions.titelive_thing_descriptions.get_date_from_filename")
         @pytest.mark.usefixtures("db_session")
         def test_should_iterate_over_2_zip_files(
-            self, mock_get_date_from_filename, mock_get_zip_file_from_ftp, mock_get_files_to_process_from_titelive
+            self, mock_get_date_from_filename, mock_iter_zip_files_from_ftp, mock_get_files_to_process_from_titelive
         ):
             # Given
             titelive_description_provider = get_provider_by_local_class("TiteLiveThingDescriptions")
             mock_get_files_to_process_from_titelive.return_value = ["Resume191012.zip", "Resume191013.zip"]
-            mock_get_zip_file_from_ftp.side_effect = [
-                MockZipFile(filename="Resume191012.zip"),
-                MockZipFile(filename="Resume191013.zip"),
-            ]
+            mock_iter_zip_files_from_ftp.return_value = iter(
+                [
+                    ("Resume191012.zip", MockZipFile(filename="Resume191012.zip")),
+                    ("Resume191013.zip", MockZipFile(filename="Resume191013.zip")),
+                ]
+            )
             mock_get_date_from_filename.side_effect = {"191012", "191013"}
 
             repository.save(titelive_description_provider)
@@ -59,7 +61,8 @@ class TiteLiveThingDescriptionsTest:
             mock_get_files_to_process_from_titelive.assert_called_once_with(
                 "ResumesLivres", re.compile(r"Resume(\d{6}).zip")
             )
-            assert mock_get_zip_file_from_ftp.call_count == 2
+            mock_iter_zip_files_from_ftp.assert_called_once()
+            assert list(mock_iter_zip_files_from_ftp.return_value) == []
             assert mock_get_date_from_filename.call_count == 3
 
 
@@ -8,6 +8,7 @@ from unittest.mock import patch
 from freezegun import freeze_time
 import pytest
 
+from pcapi.core.offers.repository import get_products_map_by_id_at_providers
 from pcapi.core.testing import override_features
 from pcapi.local_providers import TiteLiveStocks
 from pcapi.model_creators.generic_creators import create_booking
@@ -518,3 +519,48 @@ class TiteliveStocksTest:
             # Then
             stock = Stock.query.one()
             assert stock.quantity == 67
+
+        @pytest.mark.usefixtures("db_session")
+        @patch("pcapi.local_providers.titelive_stocks.titelive_stocks.TiteLiveStocks.get_provider_stock_information")
+        def test_titelive_stock_provider_fetches_products_and_offer_ids_once_per_page(
+            self, stub_get_stocks_information, app
+        ):
+            # Given
+            stub_get_stocks_information.return_value = iter(
+                [
+                    {"ref": "0002730757438", "available": 10, "price": 4500, "validUntil": "2019-10-31T15:10:27Z"},
+                    {"ref": "0002736409898", "available": 2, "price": 100, "validUntil": "2019-10-31T15:10:27Z"},
+                    {"ref": "0000000000000", "available": 2, "price": 100, "validUntil": "2019-10-31T15:10:27Z"},
+                ]
+            )
+
+            offerer = create_offerer()
+            venue = create_venue(offerer, siret="77567146400110")
+            titelive_stocks_provider = activate_provider("TiteLiveStocks")
+            venue_provider = create_venue_provider(
+                venue, titelive_stocks_provider, is_active=True, venue_id_at_offer_provider="77567146400110"
+            )
+            product1 = create_product_with_thing_type(id_at_providers="0002730757438")
+            product2 = create_product_with_thing_type(id_at_providers="0002736409898")
+            repository.save(product1, product2, venue_provider)
+
+            titelive_stocks = TiteLiveStocks(venue_provider)
+
+            # When
+            with patch(
+                "pcapi.local_providers.generic_provider.generic_stocks.get_products_map_by_id_at_providers",
+                wraps=get_products_map_by_id_at_providers,
+            ) as spy_get_products_map, patch.object(
+                TiteLiveStocks, "get_next_offer_id_from_sequence"
+            ) as mock_get_next_offer_id_from_sequence:
+                titelive_stocks.updateObjects()
+
+            # Then
+            spy_get_products_map.assert_called_once_with(["0002730757438", "0002736409898", "0000000000000"])
+            mock_get_next_offer_id_from_sequence.assert_not_called()
+            offers = Offer.query.order_by(Offer.id).all()
+            assert [offer.idAtProviders for offer in offers] == [
+                "0002730757438@77567146400110",
+                "0002736409898@77567146400110",
+            ]
+            assert Stock.query.count() == 2
@@ -1,4 +1,5 @@
 from datetime import datetime
+import io
 from unittest.mock import patch
 
 import pytest
@@ -81,7 +82,7 @@ class TiteliveThingsTest:
             "~3694440"
             "~"
         )
-        get_lines_from_thing_file.return_value = iter([data_line])
+        get_lines_from_thing_file.return_value = io.StringIO(data_line)
 
         activate_provider("TiteLiveThings")
         titelive_things = TiteLiveThings()
@@ -154,7 +155,7 @@ class TiteliveThingsTest:
             "~3694440"
             "~"
         )
-        get_lines_from_thing_file.return_value = iter([data_line])
+        get_lines_from_thing_file.return_value = io.StringIO(data_line)
 
         activate_provider("TiteLiveThings")
         titelive_things = TiteLiveThings()
@@ -225,7 +226,7 @@ class TiteliveThingsTest:
             "~3694440"
             "~"
         )
-        get_lines_from_thing_file.return_value = iter([data_line])
+        get_lines_from_thing_file.return_value = io.StringIO(data_line)
 
         titelive_things_provider = get_provider_by_local_class("TiteLiveThings")
 
@@ -277,7 +278,7 @@ class TiteliveThingsTest:
 
         data_line = "9782895026310"
 
-        get_lines_from_thing_file.return_value = iter([data_line])
+        get_lines_from_thing_file.return_value = io.StringIO(data_line)
 
         activate_provider("TiteLiveThings")
         titelive_things = TiteLiveThings()
@@ -352,7 +353,7 @@ class TiteliveThingsTest:
             "~Test Data"
             "~Other Test Data"
         )
-        get_lines_from_thing_file.return_value = iter([data_line])
+        get_lines_from_thing_file.return_value = io.StringIO(data_line)
 
         activate_provider("TiteLiveThings")
         titelive_things = TiteLiveThings()
@@ -423,7 +424,7 @@ class TiteliveThingsTest:
             "~3694440"
             "~"
         )
-        get_lines_from_thing_file.return_value = iter([data_line])
+        get_lines_from_thing_file.return_value = io.StringIO(data_line)
 
         activate_provider("TiteLiveThings")
         titelive_things = TiteLiveThings()
@@ -495,7 +496,7 @@ class TiteliveThingsTest:
             "~"
         )
 
-        get_lines_from_thing_file.return_value = iter([data_line])
+        get_lines_from_thing_file.return_value = io.StringIO(data_line)
 
         titelive_provider = activate_provider("TiteLiveThings")
         repository.save(titelive_provider)
@@ -576,7 +577,7 @@ class TiteliveThingsTest:
             "~"
         )
 
-        get_lines_from_thing_file.return_value = iter([data_line])
+        get_lines_from_thing_file.return_value = io.StringIO(data_line)
 
         titelive_provider = activate_provider("TiteLiveThings")
         product = create_product_with_thing_type(
@@ -655,7 +656,7 @@ class TiteliveThingsTest:
             "~"
         )
 
-        get_lines_from_thing_file.return_value = iter([data_line])
+        get_lines_from_thing_file.return_value = io.StringIO(data_line)
 
         user = create_user()
         offerer = create_offerer(siren="775671464")
@@ -792,7 +793,7 @@ class TiteliveThingsTest:
             "~"
         )
 
-        get_lines_from_thing_file.return_value = iter([data_line_1, data_line_2])
+        get_lines_from_thing_file.return_value = io.StringIO(data_line_1 + "\n" + data_line_2)
 
         activate_provider("TiteLiveThings")
         titelive_things = TiteLiveThings()
@@ -867,7 +868,7 @@ class TiteliveThingsTest:
 
         get_files_to_process_from_titelive_ftp.return_value = files_list
 
-        get_lines_from_thing_file.return_value = iter([data_line])
+        get_lines_from_thing_file.return_value = io.StringIO(data_line)
 
         titelive_provider = activate_provider("TiteLiveThings")
         repository.save(titelive_provider)
@@ -948,7 +949,7 @@ class TiteliveThingsTest:
 
         get_files_to_process_from_titelive_ftp.return_value = files_list
 
-        get_lines_from_thing_file.return_value = iter([data_line])
+        get_lines_from_thing_file.return_value = io.StringIO(data_line)
 
         titelive_provider = activate_provider("TiteLiveThings")
         repository.save(titelive_provider)
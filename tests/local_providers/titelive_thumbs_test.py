@@ -39,9 +39,9 @@ class TiteliveThingThumbsTest:
 
     @pytest.mark.usefixtures("db_session")
     @patch("pcapi.local_providers.titelive_thing_thumbs.titelive_thing_thumbs.get_files_to_process_from_titelive_ftp")
-    @patch("pcapi.local_providers.titelive_thing_thumbs.titelive_thing_thumbs.get_zip_file_from_ftp")
+    @patch("pcapi.local_providers.titelive_thing_thumbs.titelive_thing_thumbs.iter_zip_files_from_ftp")
     def test_compute_first_thumb_dominant_color_even_if_not_first_file(
-        self, get_thumbs_zip_file_from_ftp, get_ordered_thumbs_zip_files, app
+        self, iter_thumbs_zip_files_from_ftp, get_ordered_thumbs_zip_files, app
     ):
         # given
         product1 = create_product_with_thing_type(id_at_providers="9780847858903", thumb_count=0)
@@ -49,7 +49,9 @@ class TiteliveThingThumbsTest:
         repository.save(product1, product2)
         zip_thumb_file = get_zip_with_2_usable_thumb_files()
         get_ordered_thumbs_zip_files.return_value = [zip_thumb_file]
-        get_thumbs_zip_file_from_ftp.side_effect = [get_zip_file_from_sandbox(zip_thumb_file)]
+        iter_thumbs_zip_files_from_ftp.return_value = iter(
+            [(zip_thumb_file.name, get_zip_file_from_sandbox(zip_thumb_file))]
+        )
 
         # Import thumbs for existing things
         provider_test(
@@ -69,16 +71,18 @@ class TiteliveThingThumbsTest:
 
     @pytest.mark.usefixtures("db_session")
     @patch("pcapi.local_providers.titelive_thing_thumbs.titelive_thing_thumbs.get_files_to_process_from_titelive_ftp")
-    @patch("pcapi.local_providers.titelive_thing_thumbs.titelive_thing_thumbs.get_zip_file_from_ftp")
+    @patch("pcapi.local_providers.titelive_thing_thumbs.titelive_thing_thumbs.iter_zip_files_from_ftp")
     def test_updates_thumb_count_for_product_when_new_thumbs_added(
-        self, get_thumbs_zip_file_from_ftp, get_ordered_thumbs_zip_files, app
+        self, iter_thumbs_zip_files_from_ftp, get_ordered_thumbs_zip_files, app
     ):
         # Given
         product1 = create_product_with_thing_type(id_at_providers="9780847858903", thumb_count=0)
         repository.save(product1)
         zip_thumb_file = get_zip_with_1_usable_thumb_file()
         get_ordered_thumbs_zip_files.return_value = [zip_thumb_file]
-        get_thumbs_zip_file_from_ftp.side_effect = [get_zip_file_from_sandbox(zip_thumb_file)]
+        iter_thumbs_zip_files_from_ftp.return_value = iter(
+            [(zip_thumb_file.name, get_zip_file_from_sandbox(zip_thumb_file))]
+        )
 
         provider_object = TiteLiveThingThumbs()
         provider_object.provider.isActive = True
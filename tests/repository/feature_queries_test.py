@@ -1,11 +1,15 @@
+from unittest.mock import patch
+
 import flask
 import pytest
 
 from pcapi.core.testing import assert_num_queries
+from pcapi.core.testing import override_settings
 from pcapi.models.api_errors import ResourceNotFoundError
 from pcapi.models.feature import Feature
 from pcapi.models.feature import FeatureToggle
 from pcapi.repository import repository
+from pcapi.repository.feature_queries import invalidate_features_cache
 from pcapi.repository.feature_queries import is_active
 
 
@@ -50,11 +54,49 @@ class FeatureToggleTest:
         repository.save(feature)
         context = flask._request_ctx_stack.pop()
 
-        # we don't cache yet outside the scope of a request so it'll be 3 DB queries
+        # the whole feature table is cached by the process
         try:
-            with assert_num_queries(3):
-                is_active(FeatureToggle.WEBAPP_SIGNUP)
+            with assert_num_queries(1):
                 is_active(FeatureToggle.WEBAPP_SIGNUP)
                 is_active(FeatureToggle.WEBAPP_SIGNUP)
+                is_active(FeatureToggle.QR_CODE)
+        finally:
+            flask._request_ctx_stack.push(context)
+
+    def test_is_active_reloads_features_when_cache_has_expired(self, app):
+        feature = Feature.query.filter_by(name=FeatureToggle.WEBAPP_SIGNUP.name).first()
+        feature.isActive = True
+        repository.save(feature)
+        context = flask._request_ctx_stack.pop()
+
+        try:
+            with override_settings(FEATURES_CACHE_TTL=0):
+                with assert_num_queries(2):
+                    is_active(FeatureToggle.WEBAPP_SIGNUP)
+                    is_active(FeatureToggle.WEBAPP_SIGNUP)
         finally:
             flask._request_ctx_stack.push(context)
+
+    @patch("pcapi.repository.feature_queries.redis.get_features_version")
+    def test_is_active_reloads_features_when_version_has_changed(self, mock_get_features_version):
+        # Given
+        feature = Feature.query.filter_by(name=FeatureToggle.WEBAPP_SIGNUP.name).first()
+        feature.isActive = True
+        repository.save(feature)
+        mock_get_features_version.return_value = "1"
+        is_active(FeatureToggle.WEBAPP_SIGNUP)
+        delattr(flask.request, "_cached_features")
+
+        feature.isActive = False
+        repository.save(feature)
+        mock_get_features_version.return_value = "2"
+
+        # When / Then
+        assert not is_active(FeatureToggle.WEBAPP_SIGNUP)
+
+    def test_invalidate_features_cache_increments_version(self, app):
+        # When
+        invalidate_features_cache()
+
+        # Then
+        app.redis_client.incr.assert_called_with("features_version")
@@ -20,13 +20,15 @@ from pcapi.models import Offer
 from pcapi.models import Stock
 from pcapi.repository import repository
 from pcapi.repository.offer_queries import _build_bookings_quantity_subquery
+from pcapi.repository.offer_queries import get_active_offer_ids_bounds
+from pcapi.repository.offer_queries import get_active_offer_ids_by_chunk
+from pcapi.repository.offer_queries import get_active_offer_ids_in_range
+from pcapi.repository.offer_queries import get_offer_ids_given_booking_limit_datetime_interval_by_chunk
 from pcapi.repository.offer_queries import get_offers_by_ids
 from pcapi.repository.offer_queries import get_offers_by_venue_id
 from pcapi.repository.offer_queries import get_paginated_active_offer_ids
 from pcapi.repository.offer_queries import get_paginated_offer_ids_by_venue_id
 from pcapi.repository.offer_queries import get_paginated_offer_ids_by_venue_id_and_last_provider_id
-from pcapi.repository.offer_queries import get_paginated_offer_ids_given_booking_limit_datetime_interval
-from pcapi.utils.converter import from_tuple_to_int
 
 
 class FindOffersTest:
@@ -229,7 +231,7 @@ class GetPaginatedActiveOfferIdsTest:
         repository.save(offer1, offer2)
 
         # When
-        offer_ids = get_paginated_active_offer_ids(limit=2, page=0)
+        offer_ids = get_paginated_active_offer_ids(limit=2)
 
         # Then
         assert len(offer_ids) == 2
@@ -250,7 +252,7 @@ class GetPaginatedActiveOfferIdsTest:
         repository.save(offer1, offer2)
 
         # When
-        offer_ids = get_paginated_active_offer_ids(limit=1, page=1)
+        offer_ids = get_paginated_active_offer_ids(limit=1, last_offer_id=offer1.id)
 
         # Then
         assert len(offer_ids) == 1
@@ -271,7 +273,7 @@ class GetPaginatedActiveOfferIdsTest:
         repository.save(offer1, offer2)
 
         # When
-        offer_ids = get_paginated_active_offer_ids(limit=1, page=2)
+        offer_ids = get_paginated_active_offer_ids(limit=1, last_offer_id=offer3.id)
 
         # Then
         assert len(offer_ids) == 1
@@ -281,6 +283,79 @@ class GetPaginatedActiveOfferIdsTest:
         assert (offer3.id,) not in offer_ids
 
 
+class GetActiveOfferIdsByChunkTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_should_return_active_offer_ids_chunk_by_chunk(self, app):
+        # Given
+        offer1 = offers_factories.OfferFactory()
+        offers_factories.OfferFactory(isActive=False)
+        offer3 = offers_factories.OfferFactory()
+        offer4 = offers_factories.OfferFactory()
+
+        # When
+        chunks = list(get_active_offer_ids_by_chunk(chunk_size=2))
+
+        # Then
+        assert chunks == [[offer1.id, offer3.id], [offer4.id]]
+
+    @pytest.mark.usefixtures("db_session")
+    def test_should_start_after_given_offer_id(self, app):
+        # Given
+        offer1 = offers_factories.OfferFactory()
+        offer2 = offers_factories.OfferFactory()
+
+        # When
+        chunks = list(get_active_offer_ids_by_chunk(chunk_size=2, last_offer_id=offer1.id))
+
+        # Then
+        assert chunks == [[offer2.id]]
+
+
+class GetActiveOfferIdsBoundsTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_should_return_lowest_and_highest_active_offer_ids(self, app):
+        # Given
+        offers_factories.OfferFactory(isActive=False)
+        offer2 = offers_factories.OfferFactory()
+        offer3 = offers_factories.OfferFactory()
+        offers_factories.OfferFactory(isActive=False)
+
+        # When
+        bounds = get_active_offer_ids_bounds()
+
+        # Then
+        assert bounds == (offer2.id, offer3.id)
+
+    @pytest.mark.usefixtures("db_session")
+    def test_should_return_none_when_no_active_offer(self, app):
+        # Given
+        offers_factories.OfferFactory(isActive=False)
+
+        # When
+        bounds = get_active_offer_ids_bounds()
+
+        # Then
+        assert bounds == (None, None)
+
+
+class GetActiveOfferIdsInRangeTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_should_return_active_offer_ids_within_inclusive_range(self, app):
+        # Given
+        offer1 = offers_factories.OfferFactory()
+        offer2 = offers_factories.OfferFactory()
+        offers_factories.OfferFactory(isActive=False)
+        offer4 = offers_factories.OfferFactory()
+        offers_factories.OfferFactory()
+
+        # When
+        offer_ids = get_active_offer_ids_in_range(offer2.id, offer4.id)
+
+        # Then
+        assert offer1.id not in offer_ids
+        assert offer_ids == [offer2.id, offer4.id]
+
+
 class GetPaginatedOfferIdsByVenueIdTest:
     @pytest.mark.usefixtures("db_session")
     def test_should_return_one_offer_id_in_two_offers_from_first_page_when_limit_is_one(self, app):
@@ -292,7 +367,7 @@ class GetPaginatedOfferIdsByVenueIdTest:
         repository.save(offer1, offer2)
 
         # When
-        offer_ids = get_paginated_offer_ids_by_venue_id(venue_id=venue.id, limit=1, page=0)
+        offer_ids = get_paginated_offer_ids_by_venue_id(venue_id=venue.id, limit=1)
 
         # Then
         assert len(offer_ids) == 1
@@ -309,7 +384,7 @@ class GetPaginatedOfferIdsByVenueIdTest:
         repository.save(offer1, offer2)
 
         # When
-        offer_ids = get_paginated_offer_ids_by_venue_id(venue_id=venue.id, limit=1, page=1)
+        offer_ids = get_paginated_offer_ids_by_venue_id(venue_id=venue.id, limit=1, last_offer_id=offer1.id)
 
         # Then
         assert len(offer_ids) == 1
@@ -331,7 +406,7 @@ class GetPaginatedOfferIdsByVenueIdAndLastProviderIdTest:
 
         # When
         offer_ids = get_paginated_offer_ids_by_venue_id_and_last_provider_id(
-            last_provider_id=provider1.id, limit=2, page=0, venue_id=venue.id
+            last_provider_id=provider1.id, limit=2, venue_id=venue.id
         )
 
         # Then
@@ -352,7 +427,7 @@ class GetPaginatedOfferIdsByVenueIdAndLastProviderIdTest:
 
         # When
         offer_ids = get_paginated_offer_ids_by_venue_id_and_last_provider_id(
-            last_provider_id=provider1.id, limit=1, page=0, venue_id=venue.id
+            last_provider_id=provider1.id, limit=1, venue_id=venue.id
         )
 
         # Then
@@ -373,7 +448,7 @@ class GetPaginatedOfferIdsByVenueIdAndLastProviderIdTest:
 
         # When
         offer_ids = get_paginated_offer_ids_by_venue_id_and_last_provider_id(
-            last_provider_id=provider1.id, limit=1, page=1, venue_id=venue.id
+            last_provider_id=provider1.id, limit=1, venue_id=venue.id, last_offer_id=offer1.id
         )
 
         # Then
@@ -392,9 +467,7 @@ class GetPaginatedOfferIdsByVenueIdAndLastProviderIdTest:
         repository.save(provider1, provider2, offer1, offer2)
 
         # When
-        offer_ids = get_paginated_offer_ids_by_venue_id_and_last_provider_id(
-            last_provider_id="3", limit=2, page=0, venue_id=10
-        )
+        offer_ids = get_paginated_offer_ids_by_venue_id_and_last_provider_id(last_provider_id="3", limit=2, venue_id=10)
 
         # Then
         assert len(offer_ids) == 0
@@ -412,7 +485,7 @@ class GetPaginatedOfferIdsByVenueIdAndLastProviderIdTest:
 
         # When
         offer_ids = get_paginated_offer_ids_by_venue_id_and_last_provider_id(
-            last_provider_id="3", limit=2, page=0, venue_id=venue.id
+            last_provider_id="3", limit=2, venue_id=venue.id
         )
 
         # Then
@@ -431,16 +504,16 @@ class GetPaginatedOfferIdsByVenueIdAndLastProviderIdTest:
 
         # When
         offer_ids = get_paginated_offer_ids_by_venue_id_and_last_provider_id(
-            last_provider_id=provider1.id, limit=2, page=0, venue_id=10
+            last_provider_id=provider1.id, limit=2, venue_id=10
         )
 
         # Then
         assert len(offer_ids) == 0
 
 
-class GetPaginatedOfferIdsGivenBookingLimitDatetimeIntervalTest:
+class GetOfferIdsGivenBookingLimitDatetimeIntervalByChunkTest:
     @pytest.mark.usefixtures("db_session")
-    def test_should_return_one_offer_id_from_first_page_when_active_and_booking_limit_datetime_is_expired(self, app):
+    def test_should_return_one_offer_id_when_active_and_booking_limit_datetime_is_expired(self, app):
         # Given
         offerer = create_offerer()
         venue = create_venue(offerer=offerer)
@@ -455,19 +528,17 @@ class GetPaginatedOfferIdsGivenBookingLimitDatetimeIntervalTest:
         repository.save(stock1, stock2, stock3, stock4)
 
         # When
-        results = get_paginated_offer_ids_given_booking_limit_datetime_interval(
-            limit=1, page=0, from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0)
+        chunks = list(
+            get_offer_ids_given_booking_limit_datetime_interval_by_chunk(
+                from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0), chunk_size=1
+            )
         )
 
         # Then
-        assert len(results) == 1
-        assert (offer1.id,) in results
-        assert (offer2.id,) not in results
-        assert (offer3.id,) not in results
-        assert (offer4.id,) not in results
+        assert chunks == [[offer1.id]]
 
     @pytest.mark.usefixtures("db_session")
-    def test_should_return_two_offer_ids_from_second_page_when_active_and_booking_limit_datetime_is_expired(self, app):
+    def test_should_return_expired_offer_ids_chunk_by_chunk(self, app):
         # Given
         offerer = create_offerer()
         venue = create_venue(offerer=offerer)
@@ -475,23 +546,23 @@ class GetPaginatedOfferIdsGivenBookingLimitDatetimeIntervalTest:
         offer2 = create_offer_with_event_product(is_active=True, venue=venue)
         offer3 = create_offer_with_thing_product(is_active=True, venue=venue)
         offer4 = create_offer_with_thing_product(is_active=True, venue=venue)
+        offer5 = create_offer_with_thing_product(is_active=True, venue=venue)
         stock1 = create_stock_from_offer(offer=offer1, booking_limit_datetime=datetime(2019, 12, 31, 0, 0, 0))
         stock2 = create_stock_from_offer(offer=offer2, booking_limit_datetime=datetime(2019, 12, 31, 0, 0, 0))
         stock3 = create_stock_from_offer(offer=offer3, booking_limit_datetime=datetime(2019, 12, 31, 0, 0, 0))
         stock4 = create_stock_from_offer(offer=offer4, booking_limit_datetime=datetime(2019, 12, 31, 0, 0, 0))
-        repository.save(stock1, stock2, stock3, stock4)
+        stock5 = create_stock_from_offer(offer=offer5, booking_limit_datetime=datetime(2019, 12, 31, 0, 0, 0))
+        repository.save(stock1, stock2, stock3, stock4, stock5)
 
         # When
-        results = get_paginated_offer_ids_given_booking_limit_datetime_interval(
-            limit=2, page=1, from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0)
+        chunks = list(
+            get_offer_ids_given_booking_limit_datetime_interval_by_chunk(
+                from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0), chunk_size=2
+            )
         )
 
         # Then
-        assert len(results) == 2
-        assert (offer1.id,) not in results
-        assert (offer2.id,) not in results
-        assert (offer3.id,) in results
-        assert (offer4.id,) in results
+        assert chunks == [[offer1.id, offer2.id], [offer3.id, offer4.id], [offer5.id]]
 
     @pytest.mark.usefixtures("db_session")
     def test_should_not_return_offer_ids_when_not_active_and_booking_limit_datetime_is_expired(self, app):
@@ -499,22 +570,20 @@ class GetPaginatedOfferIdsGivenBookingLimitDatetimeIntervalTest:
         offerer = create_offerer()
         venue = create_venue(offerer=offerer)
         offer1 = create_offer_with_event_product(is_active=False, venue=venue)
-        offer2 = create_offer_with_event_product(is_active=False, venue=venue)
-        offer3 = create_offer_with_thing_product(is_active=False, venue=venue)
-        offer4 = create_offer_with_thing_product(is_active=False, venue=venue)
-        stock1 = create_stock_from_offer(offer=offer1, booking_limit_datetime=datetime(2019, 12, 21, 0, 0, 0))
-        stock2 = create_stock_from_offer(offer=offer2, booking_limit_datetime=datetime(2019, 12, 22, 0, 0, 0))
-        stock3 = create_stock_from_offer(offer=offer3, booking_limit_datetime=datetime(2019, 12, 23, 0, 0, 0))
-        stock4 = create_stock_from_offer(offer=offer4, booking_limit_datetime=datetime(2019, 12, 24, 0, 0, 0))
-        repository.save(stock1, stock2, stock3, stock4)
+        offer2 = create_offer_with_thing_product(is_active=False, venue=venue)
+        stock1 = create_stock_from_offer(offer=offer1, booking_limit_datetime=datetime(2019, 12, 31, 0, 0, 0))
+        stock2 = create_stock_from_offer(offer=offer2, booking_limit_datetime=datetime(2019, 12, 31, 0, 0, 0))
+        repository.save(stock1, stock2)
 
         # When
-        results = get_paginated_offer_ids_given_booking_limit_datetime_interval(
-            limit=4, page=0, from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0)
+        chunks = list(
+            get_offer_ids_given_booking_limit_datetime_interval_by_chunk(
+                from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0), chunk_size=4
+            )
         )
 
         # Then
-        assert len(results) == 0
+        assert chunks == []
 
     @pytest.mark.usefixtures("db_session")
     def test_should_not_return_offer_ids_when_active_and_booking_limit_datetime_is_not_expired(self, app):
@@ -522,171 +591,75 @@ class GetPaginatedOfferIdsGivenBookingLimitDatetimeIntervalTest:
         offerer = create_offerer()
         venue = create_venue(offerer=offerer)
         offer1 = create_offer_with_event_product(is_active=True, venue=venue)
-        offer2 = create_offer_with_event_product(is_active=True, venue=venue)
-        offer3 = create_offer_with_thing_product(is_active=True, venue=venue)
-        offer4 = create_offer_with_thing_product(is_active=True, venue=venue)
+        offer2 = create_offer_with_thing_product(is_active=True, venue=venue)
         stock1 = create_stock_from_offer(offer=offer1, booking_limit_datetime=datetime(2020, 1, 2, 0, 0, 0))
         stock2 = create_stock_from_offer(offer=offer2, booking_limit_datetime=datetime(2020, 1, 2, 0, 0, 0))
-        stock3 = create_stock_from_offer(offer=offer3, booking_limit_datetime=datetime(2020, 1, 2, 0, 0, 0))
-        stock4 = create_stock_from_offer(offer=offer4, booking_limit_datetime=datetime(2020, 1, 2, 0, 0, 0))
-        repository.save(stock1, stock2, stock3, stock4)
+        repository.save(stock1, stock2)
 
         # When
-        results = get_paginated_offer_ids_given_booking_limit_datetime_interval(
-            limit=4, page=0, from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0)
+        chunks = list(
+            get_offer_ids_given_booking_limit_datetime_interval_by_chunk(
+                from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0), chunk_size=4
+            )
         )
 
         # Then
-        assert len(results) == 0
+        assert chunks == []
 
     @pytest.mark.usefixtures("db_session")
-    def test_should_return_one_offer_id_from_first_page_when_active_and_beginning_datetime_is_null(self, app):
+    def test_should_return_one_offer_id_when_active_and_beginning_datetime_is_null(self, app):
         # Given
         offerer = create_offerer()
         venue = create_venue(offerer=offerer)
-        offer1 = create_offer_with_event_product(is_active=True, venue=venue)
-        offer2 = create_offer_with_event_product(is_active=True, venue=venue)
-        offer3 = create_offer_with_thing_product(is_active=True, venue=venue)
-        offer4 = create_offer_with_thing_product(is_active=True, venue=venue)
-        stock1 = create_stock_from_offer(offer=offer1, booking_limit_datetime=datetime(2019, 12, 31, 0, 0, 0))
-        stock2 = create_stock_from_offer(offer=offer2, booking_limit_datetime=datetime(2019, 12, 30, 0, 0, 0))
-        stock3 = create_stock_from_offer(
-            offer=offer3, booking_limit_datetime=datetime(2020, 1, 2, 0, 0, 0), beginning_datetime=None
+        offer1 = create_offer_with_thing_product(is_active=True, venue=venue)
+        offer2 = create_offer_with_thing_product(is_active=True, venue=venue)
+        stock1 = create_stock_from_offer(
+            offer=offer1, booking_limit_datetime=datetime(2019, 12, 31, 0, 0, 0), beginning_datetime=None
         )
-        stock4 = create_stock_from_offer(
-            offer=offer4, booking_limit_datetime=datetime(2020, 1, 3, 0, 0, 0), beginning_datetime=None
+        stock2 = create_stock_from_offer(
+            offer=offer2, booking_limit_datetime=datetime(2020, 1, 2, 0, 0, 0), beginning_datetime=None
         )
-        repository.save(stock1, stock2, stock3, stock4)
+        repository.save(stock1, stock2)
 
         # When
-        results = get_paginated_offer_ids_given_booking_limit_datetime_interval(
-            limit=1, page=0, from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0)
+        chunks = list(
+            get_offer_ids_given_booking_limit_datetime_interval_by_chunk(
+                from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0), chunk_size=2
+            )
         )
 
         # Then
-        assert len(results) == 1
-        assert (offer1.id,) in results
-        assert (offer2.id,) not in results
-        assert (offer3.id,) not in results
-        assert (offer4.id,) not in results
+        assert chunks == [[offer1.id]]
 
     @pytest.mark.usefixtures("db_session")
-    def test_should_return_one_offer_id_when_two_offers_are_expired_and_the_second_one_is_out_of_range(self, app):
+    @pytest.mark.parametrize(
+        "booking_limit_datetime,is_expired_in_interval",
+        [
+            (datetime(2019, 12, 1, 0, 0, 0), False),
+            (datetime(2019, 12, 30, 9, 59, 59), False),
+            (datetime(2019, 12, 30, 10, 0, 0), True),
+            (datetime(2019, 12, 30, 10, 1, 0), True),
+            (datetime(2019, 12, 31, 10, 0, 0), True),
+            (datetime(2019, 12, 31, 10, 0, 1), False),
+        ],
+    )
+    def test_should_include_interval_bounds(self, app, booking_limit_datetime, is_expired_in_interval):
         # Given
-        offerer = create_offerer()
-        venue = create_venue(offerer=offerer)
-        offer1 = create_offer_with_event_product(is_active=True, venue=venue)
-        offer2 = create_offer_with_event_product(is_active=True, venue=venue)
-        in_range_stock = create_stock_from_offer(offer=offer1, booking_limit_datetime=datetime(2019, 12, 31, 0, 0, 0))
-        out_of_range_stock = create_stock_from_offer(
-            offer=offer2, booking_limit_datetime=datetime(2019, 12, 1, 0, 0, 0)
-        )
-        repository.save(in_range_stock, out_of_range_stock)
-
-        # When
-        results = get_paginated_offer_ids_given_booking_limit_datetime_interval(
-            limit=2, page=0, from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0)
-        )
-
-        # Then
-        assert len(results) == 1
-        assert (offer1.id,) in results
-        assert (offer2.id,) not in results
-
-    @pytest.mark.usefixtures("db_session")
-    def test_should_return_no_offer_ids_when_offers_are_expired_since_more_than_two_days(self, app):
-        # Given
-        offerer = create_offerer()
-        venue = create_venue(offerer=offerer)
-        offer1 = create_offer_with_event_product(is_active=True, venue=venue)
-        offer2 = create_offer_with_event_product(is_active=True, venue=venue)
-        out_of_range_stock1 = create_stock_from_offer(
-            offer=offer1, booking_limit_datetime=datetime(2019, 12, 30, 9, 59, 0)
-        )
-        out_of_range_stock2 = create_stock_from_offer(
-            offer=offer2, booking_limit_datetime=datetime(2019, 12, 29, 0, 0, 0)
-        )
-        repository.save(out_of_range_stock1, out_of_range_stock2)
-
-        # When
-        results = get_paginated_offer_ids_given_booking_limit_datetime_interval(
-            limit=2, page=0, from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0)
-        )
-
-        # Then
-        assert len(results) == 0
-
-    @pytest.mark.usefixtures("db_session")
-    def test_should_return_one_offer_id_when_offers_are_expired_since_more_than_two_days_and_one_second(self, app):
-        # Given
-        offerer = create_offerer()
-        venue = create_venue(offerer=offerer)
-        offer1 = create_offer_with_event_product(is_active=True, venue=venue)
-        offer2 = create_offer_with_event_product(is_active=True, venue=venue)
-        in_range_stock = create_stock_from_offer(offer=offer1, booking_limit_datetime=datetime(2019, 12, 30, 10, 1, 0))
-        out_of_range_stock = create_stock_from_offer(
-            offer=offer2, booking_limit_datetime=datetime(2019, 12, 30, 9, 59, 59)
-        )
-        repository.save(in_range_stock, out_of_range_stock)
-
-        # When
-        results = get_paginated_offer_ids_given_booking_limit_datetime_interval(
-            limit=2, page=0, from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0)
-        )
-
-        # Then
-        assert len(results) == 1
-        assert offer1 in results
-        assert offer2 not in results
-
-    @pytest.mark.usefixtures("db_session")
-    def test_should_return_one_offer_id_when_offers_are_expired_exactly_since_two_days(self, app):
-        # Given
-        offerer = create_offerer()
-        venue = create_venue(offerer=offerer)
-        offer1 = create_offer_with_event_product(is_active=True, venue=venue)
-        offer2 = create_offer_with_event_product(is_active=True, venue=venue)
-        in_range_stock = create_stock_from_offer(offer=offer1, booking_limit_datetime=datetime(2019, 12, 30, 10, 0, 0))
-        out_of_range_stock = create_stock_from_offer(
-            offer=offer2, booking_limit_datetime=datetime(2019, 12, 30, 9, 59, 59)
-        )
-        repository.save(in_range_stock, out_of_range_stock)
-
-        # When
-        results = get_paginated_offer_ids_given_booking_limit_datetime_interval(
-            limit=2, page=0, from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0)
-        )
-
-        # Then
-        assert len(results) == 1
-        assert offer1 in results
-        assert offer2 not in results
-
-    @pytest.mark.usefixtures("db_session")
-    def test_should_return_one_offer_id_when_offers_are_expired_exactly_since_one_day(self, app):
-        # Given
-        offerer = create_offerer()
-        venue = create_venue(offerer=offerer)
-        offer1 = create_offer_with_event_product(is_active=True, venue=venue)
-        offer2 = create_offer_with_event_product(is_active=True, venue=venue)
-        in_range_stock = create_stock_from_offer(offer=offer1, booking_limit_datetime=datetime(2019, 12, 31, 10, 0, 0))
-        out_of_range_stock = create_stock_from_offer(
-            offer=offer2, booking_limit_datetime=datetime(2019, 12, 30, 9, 59, 59)
-        )
-        repository.save(in_range_stock, out_of_range_stock)
+        offer = offers_factories.OfferFactory()
+        offers_factories.StockFactory(offer=offer, bookingLimitDatetime=booking_limit_datetime)
 
         # When
-        results = get_paginated_offer_ids_given_booking_limit_datetime_interval(
-            limit=2, page=0, from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0)
+        chunks = list(
+            get_offer_ids_given_booking_limit_datetime_interval_by_chunk(
+                from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0), chunk_size=2
+            )
         )
 
         # Then
-        assert len(results) == 1
-        assert offer1 in results
-        assert offer2 not in results
+        assert chunks == ([[offer.id]] if is_expired_in_interval else [])
 
     @pytest.mark.usefixtures("db_session")
-    def should_not_get_offer_with_valid_stocks(self, app):
+    def test_should_not_get_offer_with_valid_stocks(self, app):
         # Given
         offerer = create_offerer()
         venue = create_venue(offerer=offerer)
@@ -696,15 +669,18 @@ class GetPaginatedOfferIdsGivenBookingLimitDatetimeIntervalTest:
         repository.save(expired_stock, valid_stock)
 
         # When
-        results = get_paginated_offer_ids_given_booking_limit_datetime_interval(
-            limit=2, page=0, from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0)
+        chunks = list(
+            get_offer_ids_given_booking_limit_datetime_interval_by_chunk(
+                from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0), chunk_size=2
+            )
         )
 
         # Then
-        assert results == []
+        assert chunks == []
 
     @pytest.mark.usefixtures("db_session")
-    def should_ignore_soft_deleted_stocks(self, app):
+    def test_should_ignore_soft_deleted_stocks(self, app):
+        # Given
         offer = offers_factories.OfferFactory()
         offers_factories.StockFactory(
             offer=offer,
@@ -716,10 +692,12 @@ class GetPaginatedOfferIdsGivenBookingLimitDatetimeIntervalTest:
             isSoftDeleted=True,
         )
 
-        expired_offer_ids = get_paginated_offer_ids_given_booking_limit_datetime_interval(
-            limit=1, page=0, from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0)
+        # When
+        chunks = list(
+            get_offer_ids_given_booking_limit_datetime_interval_by_chunk(
+                from_date=datetime(2019, 12, 30, 10, 0, 0), to_date=datetime(2019, 12, 31, 10, 0, 0), chunk_size=1
+            )
         )
 
         # Then
-        expired_offer_ids = from_tuple_to_int(expired_offer_ids)
-        assert expired_offer_ids == [offer.id]
+        assert chunks == [[offer.id]]
@@ -1,7 +1,18 @@
 from datetime import datetime
 
+import pytest
+from sqlalchemy import Sequence
+
+import pcapi.core.offerers.factories as offerers_factories
+import pcapi.core.offers.factories as offers_factories
+from pcapi.models import Offer
+from pcapi.models import Product
 from pcapi.models import Stock
+from pcapi.models import ThingType
+from pcapi.models.db import db
+from pcapi.repository.providable_queries import _format_copy_value
 from pcapi.repository.providable_queries import get_last_update_for_provider
+from pcapi.repository.providable_queries import upsert_chunk
 
 
 def test_get_last_update_for_provider_should_return_date_modified_at_last_provider_when_provided():
@@ -46,3 +57,101 @@ def test_get_last_update_for_provider_should_return_none_when_last_provider_id_m
 
     # Then
     assert date_modified_at_last_provider is None
+
+
+@pytest.mark.usefixtures("db_session")
+class UpsertChunkTest:
+    def test_should_insert_new_objects_with_their_defaults(self):
+        # Given
+        provider = offerers_factories.ProviderFactory()
+        product = Product()
+        product.idAtProviders = "9782123456789"
+        product.lastProviderId = provider.id
+        product.name = "Tab\tand\nnew line"
+        product.type = str(ThingType.LIVRE_EDITION)
+        product.extraData = {"author": 'Jean "JJ" Dupont'}
+        product.mediaUrls = ["http://example.com/a,b.pdf"]
+
+        # When
+        upsert_chunk({"9782123456789|Product": product})
+
+        # Then
+        saved_product = Product.query.one()
+        assert saved_product.name == "Tab\tand\nnew line"
+        assert saved_product.extraData == {"author": 'Jean "JJ" Dupont'}
+        assert saved_product.mediaUrls == ["http://example.com/a,b.pdf"]
+        assert saved_product.thumbCount == 0
+        assert saved_product.isGcuCompatible
+        assert saved_product.fieldsUpdated == []
+
+    def test_should_update_existing_objects(self):
+        # Given
+        offer = offers_factories.OfferFactory(idAtProviders="123@456")
+        stock = offers_factories.StockFactory(offer=offer, idAtProviders="123@456", quantity=2)
+        stock.quantity = 10
+        new_stock = Stock()
+        new_stock.idAtProviders = "789@456"
+        new_stock.offerId = offer.id
+        new_stock.price = 12
+        new_stock.quantity = 3
+
+        # When
+        upsert_chunk({"123@456|Stock": stock, "789@456|Stock": new_stock})
+
+        # Then
+        assert Stock.query.count() == 2
+        assert Stock.query.filter_by(idAtProviders="123@456").one().quantity == 10
+        assert Stock.query.filter_by(idAtProviders="789@456").one().quantity == 3
+
+    def test_should_write_new_offers_before_their_new_stocks(self):
+        # Given
+        offer = offers_factories.OfferFactory(idAtProviders="123@456")
+        offer.name = "Offre mise à jour"
+        stock = Stock()
+        stock.idAtProviders = "123@456"
+        stock.offerId = offer.id
+        stock.price = 10
+        stock.quantity = 2
+        new_offer = Offer()
+        new_offer.id = db.session.execute(Sequence("offer_id_seq"))
+        new_offer.idAtProviders = "789@456"
+        new_offer.name = "Nouvelle offre"
+        new_offer.type = offer.type
+        new_offer.productId = offer.productId
+        new_offer.venueId = offer.venueId
+        new_stock = Stock()
+        new_stock.idAtProviders = "789@456"
+        new_stock.offerId = new_offer.id
+        new_stock.price = 12
+        new_stock.quantity = 3
+
+        # When
+        upsert_chunk(
+            {
+                "123@456|Offer": offer,
+                "123@456|Stock": stock,
+                "789@456|Offer": new_offer,
+                "789@456|Stock": new_stock,
+            }
+        )
+
+        # Then
+        assert Offer.query.filter_by(idAtProviders="123@456").one().name == "Offre mise à jour"
+        assert Offer.query.filter_by(idAtProviders="789@456").one().name == "Nouvelle offre"
+        assert Stock.query.filter_by(idAtProviders="789@456").one().offerId == new_offer.id
+        assert Stock.query.count() == 2
+
+
+class FormatCopyValueTest:
+    def test_should_format_null(self):
+        assert _format_copy_value(None) == "\\N"
+
+    def test_should_format_booleans(self):
+        assert _format_copy_value(True) == "t"
+        assert _format_copy_value(False) == "f"
+
+    def test_should_escape_special_characters(self):
+        assert _format_copy_value("a\\b\tc\nd\re") == "a\\\\b\\tc\\nd\\re"
+
+    def test_should_format_arrays(self):
+        assert _format_copy_value(["a", 'b"c', None]) == '{"a","b\\\\"c",NULL}'
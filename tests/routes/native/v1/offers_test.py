@@ -1,5 +1,6 @@
 from datetime import datetime
 from datetime import timedelta
+from unittest.mock import patch
 
 from freezegun import freeze_time
 import pytest
@@ -17,6 +18,12 @@ from tests.conftest import TestClient
 pytestmark = pytest.mark.usefixtures("db_session")
 
 
+@pytest.fixture(name="get_offer_response", autouse=True)
+def get_offer_response_fixture():
+    with patch("pcapi.connectors.redis.get_offer_response", return_value=None) as get_offer_response:
+        yield get_offer_response
+
+
 class OffersTest:
     @freeze_time("2020-01-01")
     def test_get_event_offer(self, app):
@@ -139,3 +146,32 @@ class OffersTest:
         response = TestClient(app.test_client()).get("/native/v1/offer/1")
 
         assert response.status_code == 404
+
+    @patch("pcapi.connectors.redis.set_offer_response")
+    def test_get_offer_caches_serialized_response(self, set_offer_response, app):
+        offer = OfferFactory()
+
+        response = TestClient(app.test_client()).get(f"/native/v1/offer/{offer.id}")
+
+        assert response.status_code == 200
+        set_offer_response.assert_called_once_with(
+            client=app.redis_client, offer_id=offer.id, response=response.data.decode()
+        )
+
+    def test_get_offer_returns_cached_response(self, get_offer_response, app):
+        get_offer_response.return_value = '{"id": 1, "name": "offre en cache"}'
+
+        response = TestClient(app.test_client()).get("/native/v1/offer/1")
+
+        assert response.status_code == 200
+        assert response.json == {"id": 1, "name": "offre en cache"}
+
+    def test_get_offer_not_modified(self, app):
+        offer = OfferFactory()
+        client = app.test_client()
+        etag = client.get(f"/native/v1/offer/{offer.id}").headers["ETag"]
+
+        response = client.get(f"/native/v1/offer/{offer.id}", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.data == b""
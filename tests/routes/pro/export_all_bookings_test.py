@@ -0,0 +1,73 @@
+from datetime import datetime
+import json
+
+import pytest
+
+import pcapi.core.bookings.factories as bookings_factories
+import pcapi.core.offers.factories as offers_factories
+import pcapi.core.users.factories as users_factories
+
+from tests.conftest import TestClient
+
+
+@pytest.mark.usefixtures("db_session")
+class GetTest:
+    class Returns200Test:
+        def when_bookings_are_exported_as_csv(self, app):
+            booking = bookings_factories.BookingFactory(
+                dateCreated=datetime(2020, 4, 3, 12, 0, 0),
+                token="ABCDEF",
+                user__email="beneficiary@example.com",
+                user__firstName="Hermione",
+                user__lastName="Granger",
+            )
+            pro_user = users_factories.UserFactory(email="pro@example.com")
+            offerer = booking.stock.offer.venue.managingOfferer
+            offers_factories.UserOffererFactory(user=pro_user, offerer=offerer)
+
+            client = TestClient(app.test_client()).with_auth(pro_user.email)
+            response = client.get("/bookings/pro/export")
+
+            assert response.status_code == 200
+            assert response.headers["Content-Disposition"] == "attachment; filename=reservations_pass_culture.csv"
+            lines = response.data.decode("utf-8-sig").splitlines()
+            assert len(lines) == 2
+            assert lines[0].startswith('"Lieu","Nom de l\'offre"')
+            assert '"Granger Hermione","beneficiary@example.com"' in lines[1]
+            assert lines[1].endswith('"booked"')
+            assert '"ABCDEF"' in lines[1]
+
+        def when_bookings_are_exported_as_json(self, app):
+            booking = bookings_factories.BookingFactory(token="ABCDEF")
+            pro_user = users_factories.UserFactory(email="pro@example.com")
+            offerer = booking.stock.offer.venue.managingOfferer
+            offers_factories.UserOffererFactory(user=pro_user, offerer=offerer)
+
+            client = TestClient(app.test_client()).with_auth(pro_user.email)
+            response = client.get("/bookings/pro/export?format=json")
+
+            assert response.status_code == 200
+            bookings_recap = json.loads(response.data)
+            assert [booking_recap["booking_token"] for booking_recap in bookings_recap] == ["ABCDEF"]
+
+    class Returns400Test:
+        def when_format_is_not_valid(self, app):
+            user = users_factories.UserFactory()
+
+            client = TestClient(app.test_client()).with_auth(user.email)
+            response = client.get("/bookings/pro/export?format=xls")
+
+            assert response.status_code == 400
+            assert response.json["global"] == ["L'argument 'format' xls n'est pas valide"]
+
+    class Returns401Test:
+        def when_user_is_admin(self, app):
+            user = users_factories.UserFactory(isAdmin=True)
+
+            client = TestClient(app.test_client()).with_auth(user.email)
+            response = client.get("/bookings/pro/export")
+
+            assert response.status_code == 401
+            assert response.json == {
+                "global": ["Le statut d'administrateur ne permet pas d'accéder au suivi des réservations"]
+            }
@@ -7,6 +7,7 @@ import pytest
 import pcapi.core.bookings.factories as bookings_factories
 import pcapi.core.offers.factories as offers_factories
 import pcapi.core.users.factories as users_factories
+from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapCursor
 from pcapi.utils.date import format_into_timezoned_date
 from pcapi.utils.human_ids import humanize
 
@@ -28,6 +29,22 @@ class GetAllBookingsTest:
         find_by_pro_user_id.assert_called_once_with(user_id=user.id, page=1)
 
 
+@patch("pcapi.core.bookings.repository.find_by_pro_user_id_after_cursor")
+class GetAllBookingsAfterCursorTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_call_repository_with_user_and_cursor(self, find_by_pro_user_id_after_cursor, app):
+        user = users_factories.UserFactory()
+        cursor = BookingsRecapCursor(booking_date=datetime(2020, 4, 3, 12, 0, 0), booking_id=12, duplicate_index=1)
+        TestClient(app.test_client()).with_auth(user.email).get(f"/bookings/pro?cursor={cursor.encode()}")
+        find_by_pro_user_id_after_cursor.assert_called_once_with(user_id=user.id, cursor=cursor)
+
+    @pytest.mark.usefixtures("db_session")
+    def test_call_repository_without_cursor_when_cursor_is_empty(self, find_by_pro_user_id_after_cursor, app):
+        user = users_factories.UserFactory()
+        TestClient(app.test_client()).with_auth(user.email).get("/bookings/pro?cursor=")
+        find_by_pro_user_id_after_cursor.assert_called_once_with(user_id=user.id, cursor=None)
+
+
 @pytest.mark.usefixtures("db_session")
 class GetTest:
     class Returns200Test:
@@ -96,6 +113,7 @@ class GetTest:
             assert response.json["page"] == 1
             assert response.json["pages"] == 1
             assert response.json["total"] == 1
+            assert response.json["next_cursor"] is None
 
     class Returns400Test:
         def when_page_number_is_not_a_number(self, app):
@@ -107,6 +125,15 @@ class GetTest:
             assert response.status_code == 400
             assert response.json["global"] == ["L'argument 'page' not-a-number n'est pas valide"]
 
+        def when_cursor_is_not_valid(self, app):
+            user = users_factories.UserFactory()
+
+            client = TestClient(app.test_client()).with_auth(user.email)
+            response = client.get("/bookings/pro?cursor=not-a-cursor")
+
+            assert response.status_code == 400
+            assert response.json["global"] == ["L'argument 'cursor' not-a-cursor n'est pas valide"]
+
     class Returns401Test:
         def when_user_is_admin(self, app):
             user = users_factories.UserFactory(isAdmin=True)
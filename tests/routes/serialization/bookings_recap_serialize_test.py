@@ -1,9 +1,13 @@
 from datetime import datetime
 from datetime import timedelta
+import json
 
 from pytest import fixture
 
 from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapPaginated
+from pcapi.routes.serialization import bookings_recap_serialize
+from pcapi.routes.serialization.bookings_recap_serialize import serialize_bookings_recap_as_csv
+from pcapi.routes.serialization.bookings_recap_serialize import serialize_bookings_recap_as_json
 from pcapi.routes.serialization.bookings_recap_serialize import serialize_bookings_recap_paginated
 from pcapi.utils.date import format_into_timezoned_date
 from pcapi.utils.human_ids import humanize
@@ -406,3 +410,65 @@ class SerializeBookingRecapHistoryTest:
             },
         ]
         assert results["bookings_recap"][0]["booking_status_history"] == expected_booking_recap_history
+
+
+class SerializeBookingsRecapAsCsvTest:
+    def test_should_stream_header_and_one_row_per_booking(self, app: fixture):
+        # Given
+        bookings_recap = [
+            create_domain_thing_booking_recap(
+                offer_name="Fondation",
+                offer_isbn="9782070360536",
+                beneficiary_firstname="Hari",
+                beneficiary_lastname="Seldon",
+                beneficiary_email="hari.seldon@example.com",
+                booking_date=datetime(2020, 1, 1, 10, 0, 0),
+                booking_token="FOND",
+                booking_amount=18,
+                booking_is_duo=True,
+            )
+        ]
+
+        # When
+        lines = "".join(serialize_bookings_recap_as_csv(bookings_recap)).splitlines()
+
+        # Then
+        assert lines == [
+            "\ufeff" + ",".join('"%s"' % column for column in bookings_recap_serialize.BOOKINGS_RECAP_CSV_HEADER),
+            '"Librairie Kléber","Fondation","","9782070360536","Seldon Hari","hari.seldon@example.com",'
+            '"2020-01-01T10:00:00","Oui","FOND",18,"booked"',
+        ]
+
+    def test_should_stream_rows_by_chunks(self, app: fixture, monkeypatch):
+        # Given
+        monkeypatch.setattr(bookings_recap_serialize, "STREAMING_CHUNK_SIZE", 1)
+        bookings_recap = [create_domain_thing_booking_recap(booking_token=token) for token in ("FOND", "LUNE")]
+
+        # When
+        chunks = list(serialize_bookings_recap_as_csv(bookings_recap))
+
+        # Then
+        assert len(chunks) == 3
+        assert "FOND" in chunks[0]
+        assert "LUNE" in chunks[1]
+        assert chunks[2] == ""
+
+
+class SerializeBookingsRecapAsJsonTest:
+    def test_should_stream_a_json_array_of_bookings_recap(self, app: fixture):
+        # Given
+        bookings_recap = [create_domain_thing_booking_recap(booking_token=token) for token in ("FOND", "LUNE")]
+
+        # When
+        results = json.loads("".join(serialize_bookings_recap_as_json(bookings_recap)))
+
+        # Then
+        assert [result["booking_token"] for result in results] == ["FOND", "LUNE"]
+        assert results[0]["stock"]["offer_name"] == "Le livre de la jungle"
+
+    def test_should_stream_an_empty_array_when_no_booking(self, app: fixture):
+        # When
+        results = "".join(serialize_bookings_recap_as_json([]))
+
+        # Then
+        assert results == "[]"
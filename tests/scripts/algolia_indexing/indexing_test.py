@@ -4,55 +4,64 @@ from unittest.mock import call
 from unittest.mock import patch
 
 from freezegun import freeze_time
+import pytest
 
-from pcapi.scripts.algolia_indexing.indexing import _process_venue_provider
 from pcapi.scripts.algolia_indexing.indexing import batch_deleting_expired_offers_in_algolia
 from pcapi.scripts.algolia_indexing.indexing import batch_indexing_offers_in_algolia_by_offer
 from pcapi.scripts.algolia_indexing.indexing import batch_indexing_offers_in_algolia_by_venue
 from pcapi.scripts.algolia_indexing.indexing import batch_indexing_offers_in_algolia_by_venue_provider
 from pcapi.scripts.algolia_indexing.indexing import batch_indexing_offers_in_algolia_from_database
 from pcapi.scripts.algolia_indexing.indexing import batch_processing_offer_ids_in_error
+from pcapi.scripts.algolia_indexing.indexing import process_venue_provider
 
 
 class BatchIndexingOffersInAlgoliaByOfferTest:
     @patch("pcapi.scripts.algolia_indexing.indexing.process_eligible_offers")
-    @patch("pcapi.scripts.algolia_indexing.indexing.delete_offer_ids")
-    @patch("pcapi.scripts.algolia_indexing.indexing.get_offer_ids")
-    def test_should_index_offers_when_at_least_one_offer_id(
-        self, mock_get_offer_ids, mock_delete_offer_ids, mock_process_eligible_offers
-    ):
+    @patch("pcapi.scripts.algolia_indexing.indexing.pop_offer_ids")
+    def test_should_index_offers_when_at_least_one_offer_id(self, mock_pop_offer_ids, mock_process_eligible_offers):
         # Given
         client = MagicMock()
-        mock_get_offer_ids.return_value = [1]
+        mock_pop_offer_ids.return_value = [1]
 
         # When
         batch_indexing_offers_in_algolia_by_offer(client=client)
 
         # Then
-        mock_get_offer_ids.assert_called_once()
-        mock_delete_offer_ids.assert_called_once()
-        assert mock_process_eligible_offers.call_args_list == [
-            call(client=client, offer_ids=[1], from_provider_update=False)
-        ]
+        mock_pop_offer_ids.assert_called_once_with(client=client)
+        assert mock_process_eligible_offers.call_args_list == [call(client=client, offer_ids=[1])]
 
     @patch("pcapi.scripts.algolia_indexing.indexing.process_eligible_offers")
-    @patch("pcapi.scripts.algolia_indexing.indexing.delete_offer_ids")
-    @patch("pcapi.scripts.algolia_indexing.indexing.get_offer_ids")
-    def test_should_not_trigger_indexing_when_no_offer_id(
-        self, mock_get_offer_ids, mock_delete_offer_ids, mock_process_eligible_offers
-    ):
+    @patch("pcapi.scripts.algolia_indexing.indexing.pop_offer_ids")
+    def test_should_not_trigger_indexing_when_no_offer_id(self, mock_pop_offer_ids, mock_process_eligible_offers):
         # Given
         client = MagicMock()
-        mock_get_offer_ids.return_value = []
+        mock_pop_offer_ids.return_value = []
 
         # When
         batch_indexing_offers_in_algolia_by_offer(client=client)
 
         # Then
-        mock_get_offer_ids.assert_called_once()
-        mock_delete_offer_ids.assert_not_called()
+        mock_pop_offer_ids.assert_called_once_with(client=client)
         mock_process_eligible_offers.assert_not_called()
 
+    @patch("pcapi.scripts.algolia_indexing.indexing.requeue_offer_ids")
+    @patch("pcapi.scripts.algolia_indexing.indexing.process_eligible_offers")
+    @patch("pcapi.scripts.algolia_indexing.indexing.pop_offer_ids")
+    def test_should_requeue_offer_ids_when_processing_fails(
+        self, mock_pop_offer_ids, mock_process_eligible_offers, mock_requeue_offer_ids
+    ):
+        # Given
+        client = MagicMock()
+        mock_pop_offer_ids.return_value = [1, 2]
+        mock_process_eligible_offers.side_effect = ValueError
+
+        # When
+        with pytest.raises(ValueError):
+            batch_indexing_offers_in_algolia_by_offer(client=client)
+
+        # Then
+        mock_requeue_offer_ids.assert_called_once_with(client=client, offer_ids=[1, 2])
+
 
 class BatchIndexingOffersInAlgoliaByVenueProviderTest:
     @patch("pcapi.settings.ALGOLIA_OFFERS_BY_VENUE_PROVIDER_CHUNK_SIZE", 3)
@@ -86,10 +95,10 @@ class BatchIndexingOffersInAlgoliaByVenueProviderTest:
         assert mock_get_paginated_offer_ids.call_count == 6
         assert mock_process_eligible_offers.call_count == 4
         assert mock_process_eligible_offers.call_args_list == [
-            call(client=client, from_provider_update=True, offer_ids=[1, 2, 3]),
-            call(client=client, from_provider_update=True, offer_ids=[4]),
-            call(client=client, from_provider_update=True, offer_ids=[5, 6, 7]),
-            call(client=client, from_provider_update=True, offer_ids=[8]),
+            call(client=client, offer_ids=[1, 2, 3]),
+            call(client=client, offer_ids=[4]),
+            call(client=client, offer_ids=[5, 6, 7]),
+            call(client=client, offer_ids=[8]),
         ]
 
     @patch("pcapi.settings.ALGOLIA_OFFERS_BY_VENUE_PROVIDER_CHUNK_SIZE", 3)
@@ -145,9 +154,7 @@ class BatchIndexingOffersInAlgoliaByVenueTest:
         # Then
         assert mock_get_paginated_offer_ids_by_venue_id.call_count == 2
         assert mock_process_eligible_offers.call_count == 1
-        assert mock_process_eligible_offers.call_args_list == [
-            call(client=client, offer_ids=[1, 2], from_provider_update=False)
-        ]
+        assert mock_process_eligible_offers.call_args_list == [call(client=client, offer_ids=[1, 2])]
         assert mock_delete_venue_ids.call_count == 1
 
     @patch("pcapi.settings.ALGOLIA_OFFERS_BY_VENUE_CHUNK_SIZE", 1)
@@ -177,63 +184,117 @@ class BatchIndexingOffersInAlgoliaByVenueTest:
 
 
 class BatchIndexingOffersInAlgoliaFromDatabaseTest:
+    @patch("pcapi.scripts.algolia_indexing.indexing.delete_full_indexing_last_offer_id")
+    @patch("pcapi.scripts.algolia_indexing.indexing.set_full_indexing_last_offer_id")
     @patch("pcapi.scripts.algolia_indexing.indexing.offer_queries.get_paginated_active_offer_ids")
-    @patch("pcapi.scripts.algolia_indexing.indexing.process_eligible_offers")
+    @patch("pcapi.scripts.algolia_indexing.indexing.process_offers_in_bulk")
     def test_should_index_offers_once_when_offers_per_page_is_one_and_only_one_page(
-        self, mock_process_eligible_offers, mock_get_paginated_active_offer_ids, app
+        self,
+        mock_process_offers_in_bulk,
+        mock_get_paginated_active_offer_ids,
+        mock_set_full_indexing_last_offer_id,
+        mock_delete_full_indexing_last_offer_id,
+        app,
     ):
         # Given
         client = MagicMock()
         mock_get_paginated_active_offer_ids.side_effect = [[(1,)], []]
 
         # When
-        batch_indexing_offers_in_algolia_from_database(client=client, ending_page=None, limit=1, starting_page=0)
+        batch_indexing_offers_in_algolia_from_database(client=client, limit=1)
 
         # Then
         assert mock_get_paginated_active_offer_ids.call_count == 2
-        assert mock_process_eligible_offers.call_count == 1
-        assert mock_process_eligible_offers.call_args_list == [
-            call(client=client, offer_ids=[1], from_provider_update=False)
-        ]
+        assert mock_process_offers_in_bulk.call_count == 1
+        assert mock_process_offers_in_bulk.call_args_list == [call(client=client, offer_ids=[1])]
+        mock_set_full_indexing_last_offer_id.assert_called_once_with(client=client, offer_id=1)
+        mock_delete_full_indexing_last_offer_id.assert_called_once_with(client=client)
 
+    @patch("pcapi.scripts.algolia_indexing.indexing.delete_full_indexing_last_offer_id")
+    @patch("pcapi.scripts.algolia_indexing.indexing.set_full_indexing_last_offer_id")
     @patch("pcapi.scripts.algolia_indexing.indexing.offer_queries.get_paginated_active_offer_ids")
-    @patch("pcapi.scripts.algolia_indexing.indexing.process_eligible_offers")
+    @patch("pcapi.scripts.algolia_indexing.indexing.process_offers_in_bulk")
     def test_should_index_offers_twice_when_offers_per_page_is_one_and_two_pages(
-        self, mock_process_eligible_offers, mock_get_paginated_active_offer_ids, app
+        self,
+        mock_process_offers_in_bulk,
+        mock_get_paginated_active_offer_ids,
+        mock_set_full_indexing_last_offer_id,
+        mock_delete_full_indexing_last_offer_id,
+        app,
     ):
         # Given
         client = MagicMock()
         mock_get_paginated_active_offer_ids.side_effect = [[(1,)], [(2,)], []]
 
         # When
-        batch_indexing_offers_in_algolia_from_database(client=client, ending_page=None, limit=1, starting_page=0)
+        batch_indexing_offers_in_algolia_from_database(client=client, limit=1)
 
         # Then
-        assert mock_get_paginated_active_offer_ids.call_count == 3
-        assert mock_process_eligible_offers.call_count == 2
-        assert mock_process_eligible_offers.call_args_list == [
-            call(client=client, offer_ids=[1], from_provider_update=False),
-            call(client=client, offer_ids=[2], from_provider_update=False),
+        assert mock_get_paginated_active_offer_ids.call_args_list == [
+            call(limit=1, last_offer_id=0),
+            call(limit=1, last_offer_id=1),
+            call(limit=1, last_offer_id=2),
+        ]
+        assert mock_process_offers_in_bulk.call_args_list == [
+            call(client=client, offer_ids=[1]),
+            call(client=client, offer_ids=[2]),
+        ]
+        assert mock_set_full_indexing_last_offer_id.call_args_list == [
+            call(client=client, offer_id=1),
+            call(client=client, offer_id=2),
         ]
+        mock_delete_full_indexing_last_offer_id.assert_called_once_with(client=client)
 
+    @patch("pcapi.scripts.algolia_indexing.indexing.delete_full_indexing_last_offer_id")
+    @patch("pcapi.scripts.algolia_indexing.indexing.set_full_indexing_last_offer_id")
+    @patch("pcapi.scripts.algolia_indexing.indexing.get_full_indexing_last_offer_id", return_value=5)
     @patch("pcapi.scripts.algolia_indexing.indexing.offer_queries.get_paginated_active_offer_ids")
-    @patch("pcapi.scripts.algolia_indexing.indexing.process_eligible_offers")
-    def test_should_index_offers_from_first_page_only_when_ending_page_is_provided(
-        self, mock_process_eligible_offers, mock_get_paginated_active_offer_ids, app
+    @patch("pcapi.scripts.algolia_indexing.indexing.process_offers_in_bulk")
+    def test_should_resume_indexing_after_last_processed_offer(
+        self,
+        mock_process_offers_in_bulk,
+        mock_get_paginated_active_offer_ids,
+        mock_get_full_indexing_last_offer_id,
+        mock_set_full_indexing_last_offer_id,
+        mock_delete_full_indexing_last_offer_id,
+        app,
+    ):
+        # Given
+        client = MagicMock()
+        mock_get_paginated_active_offer_ids.side_effect = [[(6,)], []]
+
+        # When
+        batch_indexing_offers_in_algolia_from_database(client=client, limit=1, resume=True)
+
+        # Then
+        mock_get_full_indexing_last_offer_id.assert_called_once_with(client=client)
+        assert mock_get_paginated_active_offer_ids.call_args_list[0] == call(limit=1, last_offer_id=5)
+        assert mock_process_offers_in_bulk.call_args_list == [call(client=client, offer_ids=[6])]
+
+    @patch("pcapi.scripts.algolia_indexing.indexing.delete_full_indexing_last_offer_id")
+    @patch("pcapi.scripts.algolia_indexing.indexing.set_full_indexing_last_offer_id")
+    @patch("pcapi.scripts.algolia_indexing.indexing.offer_queries.get_paginated_active_offer_ids")
+    @patch("pcapi.scripts.algolia_indexing.indexing.process_offers_in_bulk")
+    def test_should_keep_checkpoint_when_indexing_fails(
+        self,
+        mock_process_offers_in_bulk,
+        mock_get_paginated_active_offer_ids,
+        mock_set_full_indexing_last_offer_id,
+        mock_delete_full_indexing_last_offer_id,
+        app,
     ):
         # Given
         client = MagicMock()
         mock_get_paginated_active_offer_ids.side_effect = [[(1,)], [(2,)], []]
+        mock_process_offers_in_bulk.side_effect = [None, Exception]
 
         # When
-        batch_indexing_offers_in_algolia_from_database(client=client, ending_page=1, limit=1, starting_page=0)
+        with pytest.raises(Exception):
+            batch_indexing_offers_in_algolia_from_database(client=client, limit=1)
 
         # Then
-        assert mock_get_paginated_active_offer_ids.call_count == 1
-        assert mock_process_eligible_offers.call_count == 1
-        assert mock_process_eligible_offers.call_args_list == [
-            call(client=client, offer_ids=[1], from_provider_update=False),
-        ]
+        mock_set_full_indexing_last_offer_id.assert_called_once_with(client=client, offer_id=1)
+        mock_delete_full_indexing_last_offer_id.assert_not_called()
 
 
 @freeze_time("2020-01-01 10:00:00")
@@ -241,67 +302,73 @@ class BatchDeletingExpiredOffersInAlgoliaTest:
     @patch("pcapi.settings.ALGOLIA_DELETING_OFFERS_CHUNK_SIZE", 1)
     @patch(
         "pcapi.scripts.algolia_indexing.indexing.offer_queries."
-        "get_paginated_offer_ids_given_booking_limit_datetime_interval"
+        "get_offer_ids_given_booking_limit_datetime_interval_by_chunk"
     )
     @patch("pcapi.scripts.algolia_indexing.indexing.delete_expired_offers")
     def test_should_retrieve_expired_offers_in_two_days_interval_by_default(
-        self, mock_delete_expired_offers, mock_get_paginated_offer_ids_given_booking_limit_datetime_interval, app
+        self, mock_delete_expired_offers, mock_get_offer_ids_given_booking_limit_datetime_interval_by_chunk, app
     ):
         # Given
         client = MagicMock()
+        mock_get_offer_ids_given_booking_limit_datetime_interval_by_chunk.return_value = iter([])
 
         # When
         batch_deleting_expired_offers_in_algolia(client=client)
 
         # Then
-        assert mock_get_paginated_offer_ids_given_booking_limit_datetime_interval.call_count == 1
-        assert mock_get_paginated_offer_ids_given_booking_limit_datetime_interval.call_args_list == [
-            call(from_date=datetime(2019, 12, 30, 10, 0, 0), limit=1, page=0, to_date=datetime(2019, 12, 31, 10, 0, 0)),
+        assert mock_get_offer_ids_given_booking_limit_datetime_interval_by_chunk.call_args_list == [
+            call(
+                from_date=datetime(2019, 12, 30, 10, 0, 0),
+                to_date=datetime(2019, 12, 31, 10, 0, 0),
+                chunk_size=1,
+            ),
         ]
 
     @patch("pcapi.settings.ALGOLIA_DELETING_OFFERS_CHUNK_SIZE", 1)
     @patch(
         "pcapi.scripts.algolia_indexing.indexing.offer_queries."
-        "get_paginated_offer_ids_given_booking_limit_datetime_interval"
+        "get_offer_ids_given_booking_limit_datetime_interval_by_chunk"
     )
     @patch("pcapi.scripts.algolia_indexing.indexing.delete_expired_offers")
     def test_should_retrieve_all_expired_offers_if_requested(
-        self, mock_delete_expired_offers, mock_get_paginated_offer_ids_given_booking_limit_datetime_interval, app
+        self, mock_delete_expired_offers, mock_get_offer_ids_given_booking_limit_datetime_interval_by_chunk, app
     ):
         # Given
         client = MagicMock()
+        mock_get_offer_ids_given_booking_limit_datetime_interval_by_chunk.return_value = iter([])
 
         # When
         batch_deleting_expired_offers_in_algolia(client=client, process_all_expired=True)
 
         # Then
-        assert mock_get_paginated_offer_ids_given_booking_limit_datetime_interval.call_count == 1
-        assert mock_get_paginated_offer_ids_given_booking_limit_datetime_interval.call_args_list == [
-            call(from_date=datetime(2000, 1, 1, 0, 0, 0), limit=1, page=0, to_date=datetime(2019, 12, 31, 10, 0, 0)),
+        assert mock_get_offer_ids_given_booking_limit_datetime_interval_by_chunk.call_args_list == [
+            call(
+                from_date=datetime(2000, 1, 1, 0, 0, 0),
+                to_date=datetime(2019, 12, 31, 10, 0, 0),
+                chunk_size=1,
+            ),
         ]
 
-    @patch("pcapi.settings.ALGOLIA_DELETING_OFFERS_CHUNK_SIZE", 1)
     @patch(
         "pcapi.scripts.algolia_indexing.indexing.offer_queries."
-        "get_paginated_offer_ids_given_booking_limit_datetime_interval"
+        "get_offer_ids_given_booking_limit_datetime_interval_by_chunk"
     )
     @patch("pcapi.scripts.algolia_indexing.indexing.delete_expired_offers")
-    def test_should_delete_expired_offers_in_a_paginated_way(
-        self, mock_delete_expired_offers, mock_get_paginated_offer_ids_given_booking_limit_datetime_interval, app
+    def test_should_delete_expired_offers_chunk_by_chunk(
+        self, mock_delete_expired_offers, mock_get_offer_ids_given_booking_limit_datetime_interval_by_chunk, app
     ):
         # Given
         client = MagicMock()
-        mock_get_paginated_offer_ids_given_booking_limit_datetime_interval.side_effect = [
-            [(1,)],
-            [(2,)],
-            [],
-        ]
+        mock_get_offer_ids_given_booking_limit_datetime_interval_by_chunk.return_value = iter([[1, 2], [3]])
 
         # When
         batch_deleting_expired_offers_in_algolia(client=client)
 
         # Then
-        assert mock_delete_expired_offers.call_count == 2
+        assert mock_delete_expired_offers.call_args_list == [
+            call(client=client, offer_ids=[1, 2]),
+            call(client=client, offer_ids=[3]),
+        ]
 
 
 class BatchProcessingOfferIdsInErrorTest:
@@ -332,7 +399,7 @@ class BatchProcessingOfferIdsInErrorTest:
 
         # Then
         mock_get_offer_ids_in_error.assert_called_once_with(client=client)
-        mock_process_eligible_offers.assert_called_once_with(client=client, offer_ids=[1], from_provider_update=False)
+        mock_process_eligible_offers.assert_called_once_with(client=client, offer_ids=[1])
         mock_delete_offer_ids_in_error.assert_called_once_with(client=client)
 
     @patch("pcapi.scripts.algolia_indexing.indexing.delete_offer_ids_in_error")
@@ -373,14 +440,14 @@ class ProcessVenueProviderTest:
         ]
 
         # When
-        _process_venue_provider(client=client, venue_provider_id=1, provider_id="2", venue_id=5)
+        process_venue_provider(client=client, venue_provider_id=1, provider_id="2", venue_id=5)
 
         # Then
         assert mock_get_paginated_offer_ids.call_count == 3
         assert mock_process_eligible_offers.call_count == 2
         assert mock_process_eligible_offers.call_args_list == [
-            call(client=client, offer_ids=[1, 2, 3], from_provider_update=True),
-            call(client=client, offer_ids=[4], from_provider_update=True),
+            call(client=client, offer_ids=[1, 2, 3]),
+            call(client=client, offer_ids=[4]),
         ]
         mock_delete_venue_provider_currently_in_sync.assert_called_once_with(client=client, venue_provider_id=1)
 
@@ -398,7 +465,7 @@ class ProcessVenueProviderTest:
         client = MagicMock()
 
         # When
-        _process_venue_provider(client=client, venue_provider_id=1, provider_id="2", venue_id=5)
+        process_venue_provider(client=client, venue_provider_id=1, provider_id="2", venue_id=5)
 
         # Then
         assert mock_get_paginated_offer_ids.call_count == 1
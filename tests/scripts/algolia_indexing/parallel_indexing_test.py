@@ -0,0 +1,117 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+from unittest.mock import call
+from unittest.mock import patch
+
+from pcapi.scripts.algolia_indexing.parallel_indexing import batch_indexing_offers_in_algolia_from_database_in_parallel
+from pcapi.scripts.algolia_indexing.parallel_indexing import split_offer_ids_into_ranges
+
+
+class SplitOfferIdsIntoRangesTest:
+    def test_should_split_offer_ids_into_contiguous_ranges(self):
+        assert split_offer_ids_into_ranges(1, 25, 10) == [(1, 10), (11, 20), (21, 25)]
+
+    def test_should_return_a_single_range_when_bounds_are_equal(self):
+        assert split_offer_ids_into_ranges(7, 7, 10) == [(7, 7)]
+
+
+@patch("pcapi.scripts.algolia_indexing.parallel_indexing.db")
+@patch("pcapi.scripts.algolia_indexing.parallel_indexing._create_builder_pool")
+@patch("pcapi.scripts.algolia_indexing.parallel_indexing.process_built_objects")
+@patch("pcapi.scripts.algolia_indexing.parallel_indexing.build_objects_for_offer_id_range")
+@patch("pcapi.scripts.algolia_indexing.parallel_indexing.offer_queries.get_active_offer_ids_bounds")
+class BatchIndexingOffersInAlgoliaFromDatabaseInParallelTest:
+    def test_should_build_every_range_and_upload_built_objects(
+        self,
+        mock_get_active_offer_ids_bounds,
+        mock_build_objects_for_offer_id_range,
+        mock_process_built_objects,
+        mock_create_builder_pool,
+        mock_db,
+    ):
+        # Given
+        client = MagicMock()
+        mock_get_active_offer_ids_bounds.return_value = (1, 4)
+        mock_create_builder_pool.return_value = ThreadPoolExecutor(max_workers=1)
+        mock_build_objects_for_offer_id_range.side_effect = [
+            ([1, 2], [{"objectID": "AE"}]),
+            ([3], [{"objectID": "AM"}]),
+        ]
+
+        # When
+        batch_indexing_offers_in_algolia_from_database_in_parallel(
+            client=client, builder_workers=1, uploader_workers=1, range_size=2
+        )
+
+        # Then
+        assert mock_build_objects_for_offer_id_range.call_args_list == [call((1, 2)), call((3, 4))]
+        assert mock_process_built_objects.call_args_list == [
+            call(client=client, offer_ids=[1, 2], built_objects=[{"objectID": "AE"}]),
+            call(client=client, offer_ids=[3], built_objects=[{"objectID": "AM"}]),
+        ]
+
+    def test_should_not_upload_anything_when_range_has_no_active_offer(
+        self,
+        mock_get_active_offer_ids_bounds,
+        mock_build_objects_for_offer_id_range,
+        mock_process_built_objects,
+        mock_create_builder_pool,
+        mock_db,
+    ):
+        # Given
+        client = MagicMock()
+        mock_get_active_offer_ids_bounds.return_value = (1, 2)
+        mock_create_builder_pool.return_value = ThreadPoolExecutor(max_workers=1)
+        mock_build_objects_for_offer_id_range.return_value = ([], [])
+
+        # When
+        batch_indexing_offers_in_algolia_from_database_in_parallel(
+            client=client, builder_workers=1, uploader_workers=1, range_size=2
+        )
+
+        # Then
+        mock_process_built_objects.assert_not_called()
+
+    def test_should_keep_processing_other_ranges_when_building_a_range_fails(
+        self,
+        mock_get_active_offer_ids_bounds,
+        mock_build_objects_for_offer_id_range,
+        mock_process_built_objects,
+        mock_create_builder_pool,
+        mock_db,
+    ):
+        # Given
+        client = MagicMock()
+        mock_get_active_offer_ids_bounds.return_value = (1, 4)
+        mock_create_builder_pool.return_value = ThreadPoolExecutor(max_workers=1)
+        mock_build_objects_for_offer_id_range.side_effect = [Exception(), ([3], [{"objectID": "AM"}])]
+
+        # When
+        batch_indexing_offers_in_algolia_from_database_in_parallel(
+            client=client, builder_workers=1, uploader_workers=1, range_size=2
+        )
+
+        # Then
+        assert mock_process_built_objects.call_args_list == [
+            call(client=client, offer_ids=[3], built_objects=[{"objectID": "AM"}]),
+        ]
+
+    def test_should_not_start_builders_when_no_active_offer(
+        self,
+        mock_get_active_offer_ids_bounds,
+        mock_build_objects_for_offer_id_range,
+        mock_process_built_objects,
+        mock_create_builder_pool,
+        mock_db,
+    ):
+        # Given
+        mock_get_active_offer_ids_bounds.return_value = (None, None)
+
+        # When
+        batch_indexing_offers_in_algolia_from_database_in_parallel(
+            client=MagicMock(), builder_workers=1, uploader_workers=1
+        )
+
+        # Then
+        mock_create_builder_pool.assert_not_called()
+        mock_process_built_objects.assert_not_called()
@@ -35,4 +35,5 @@ class CreateBookingForUserOnSpecificStockBypassingCappingLimitsTest:
 
         # Then
         assert Booking.query.filter_by(stockId=stock2.id).one() is not None
+        mocked_redis.delete_offer_response.assert_called_once_with(client=app.redis_client, offer_id=stock2.offer.id)
         mocked_redis.add_offer_id.assert_called_once_with(client=app.redis_client, offer_id=stock2.offer.id)
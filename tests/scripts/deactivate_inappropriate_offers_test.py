@@ -41,4 +41,5 @@ class DeactivateInappropriateOffersTest:
         assert not first_offer.isActive
         assert not second_offer.isActive
         for o in offers:
+            mocked_redis.delete_offer_response.assert_any_call(client=app.redis_client, offer_id=o.id)
             mocked_redis.add_offer_id.assert_any_call(client=app.redis_client, offer_id=o.id)
@@ -104,6 +104,36 @@ class GenerateNewPaymentsTest:
         assert len(not_processable) == 0
         assert sum(p.amount for p in pending) == 30000
 
+    @pytest.mark.usefixtures("db_session")
+    def test_counts_booking_with_several_payments_once_in_venue_cumulative_amount(self, app):
+        # Given
+        offerer = create_offerer(siren="123456789")
+        repository.save(offerer)
+        bank_information = create_bank_information(
+            bic="BDFEFR2LCCB", iban="FR7630006000011234567890189", offerer=offerer
+        )
+        venue = create_venue(offerer, siret="12345678912345")
+        offer = create_offer_with_thing_product(venue)
+        paid_stock = create_stock_from_offer(offer, price=8000)
+        paying_stock = create_stock_from_offer(offer, price=10000)
+        user = users_factories.UserFactory()
+        user.deposit.amount = 50000
+        repository.save(user.deposit)
+        paid_booking = create_booking(user=user, stock=paid_stock, venue=venue, is_used=True, quantity=1)
+        booking = create_booking(user=user, stock=paying_stock, venue=venue, is_used=True, quantity=1)
+        payment = create_payment(paid_booking, offerer, 8000, payment_message_name="ABCD123")
+        retried_payment = create_payment(paid_booking, offerer, 8000, payment_message_name="ABCD456")
+        repository.save(payment, retried_payment, booking, bank_information)
+
+        # When
+        pending, not_processable = generate_new_payments()
+
+        # Then
+        assert len(pending) == 1
+        assert len(not_processable) == 0
+        assert pending[0].booking == booking
+        assert pending[0].amount == 10000
+
     @pytest.mark.usefixtures("db_session")
     def test_reimburses_offerer_with_degressive_rate_for_venues_with_bookings_exceeding_20000_euros(self, app):
         # Given
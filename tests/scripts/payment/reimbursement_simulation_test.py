@@ -0,0 +1,47 @@
+from decimal import Decimal
+
+import pytest
+
+import pcapi.core.users.factories as users_factories
+from pcapi.domain.reimbursement import ReimbursementRules
+from pcapi.model_creators.generic_creators import create_booking
+from pcapi.model_creators.generic_creators import create_offerer
+from pcapi.model_creators.generic_creators import create_payment
+from pcapi.model_creators.generic_creators import create_venue
+from pcapi.model_creators.specific_creators import create_offer_with_thing_product
+from pcapi.model_creators.specific_creators import create_stock_from_offer
+from pcapi.models.payment import Payment
+from pcapi.repository import repository
+from pcapi.scripts.payment.reimbursement_simulation import simulate_reimbursements
+
+
+class SimulateReimbursementsTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_returns_amounts_to_reimburse_by_rule_without_creating_payments(self, app):
+        # Given
+        offerer = create_offerer()
+        venue = create_venue(offerer)
+        physical_offer = create_offer_with_thing_product(venue)
+        digital_offer = create_offer_with_thing_product(venue, is_digital=True, url="https://example.com")
+        physical_stock = create_stock_from_offer(physical_offer, price=10)
+        digital_stock = create_stock_from_offer(digital_offer, price=5)
+        user = users_factories.UserFactory()
+        paid_booking = create_booking(user=user, stock=physical_stock, venue=venue, is_used=True)
+        booking = create_booking(user=user, stock=physical_stock, venue=venue, is_used=True)
+        digital_booking = create_booking(user=user, stock=digital_stock, venue=venue, is_used=True)
+        payment = create_payment(paid_booking, offerer, 10)
+        repository.save(payment, booking, digital_booking)
+
+        # When
+        reimbursed_amounts_by_rule = simulate_reimbursements()
+
+        # Then
+        assert reimbursed_amounts_by_rule == {
+            ReimbursementRules.PHYSICAL_OFFERS: Decimal(10),
+            ReimbursementRules.DIGITAL_THINGS: Decimal(0),
+        }
+        assert Payment.query.count() == 1
+
+    @pytest.mark.usefixtures("db_session")
+    def test_returns_nothing_when_no_booking_is_eligible_for_payment(self, app):
+        assert simulate_reimbursements() == {}
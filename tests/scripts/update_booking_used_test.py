@@ -1,10 +1,12 @@
 from datetime import datetime
+from unittest.mock import patch
 
 from freezegun import freeze_time
 import pytest
 
 import pcapi.core.bookings.factories as bookings_factories
 import pcapi.core.offers.factories as offers_factories
+from pcapi.core.testing import override_features
 from pcapi.models import Booking
 from pcapi.scripts.update_booking_used import update_booking_used_after_stock_occurrence
 
@@ -72,3 +74,56 @@ class UpdateBookingUsedTest:
         booking = Booking.query.first()
         assert not booking.isUsed
         assert booking.dateUsed is None
+
+    @freeze_time("2019-10-11 10:20:00")
+    @pytest.mark.usefixtures("db_session")
+    def test_does_not_update_booking_when_event_began_exactly_refund_delay_ago(self):
+        # Given
+        beginning = datetime(2019, 10, 9, 10, 20, 0)
+        stock = offers_factories.EventStockFactory(beginningDatetime=beginning)
+        bookings_factories.BookingFactory(stock=stock)
+
+        # When
+        update_booking_used_after_stock_occurrence()
+
+        # Then
+        booking = Booking.query.first()
+        assert stock.isEventDeletable
+        assert not booking.isUsed
+
+    @freeze_time("2019-10-13")
+    @pytest.mark.usefixtures("db_session")
+    def test_update_bookings_in_batches_and_return_their_offer_ids(self):
+        # Given
+        beginning = datetime(2019, 10, 9, 10, 20, 0)
+        stock = offers_factories.EventStockFactory(beginningDatetime=beginning)
+        other_stock = offers_factories.EventStockFactory(beginningDatetime=beginning)
+        bookings_factories.BookingFactory(stock=stock)
+        bookings_factories.BookingFactory(stock=stock)
+        bookings_factories.BookingFactory(stock=other_stock)
+        bookings_factories.BookingFactory(stock=other_stock, isCancelled=True)
+
+        # When
+        offer_ids = update_booking_used_after_stock_occurrence(batch_size=2)
+
+        # Then
+        assert offer_ids == {stock.offerId, other_stock.offerId}
+        assert Booking.query.filter_by(isUsed=True).count() == 3
+        assert Booking.query.filter_by(isCancelled=True).one().isUsed is False
+
+    @freeze_time("2019-10-13")
+    @pytest.mark.usefixtures("db_session")
+    @override_features(SYNCHRONIZE_ALGOLIA=True)
+    @patch("pcapi.scripts.update_booking_used.redis.add_offer_id")
+    def test_add_offers_of_updated_bookings_to_indexing_queue(self, mocked_add_offer_id):
+        # Given
+        stock = offers_factories.EventStockFactory(beginningDatetime=datetime(2019, 10, 9, 10, 20, 0))
+        bookings_factories.BookingFactory(stock=stock)
+        bookings_factories.BookingFactory(stock=stock)
+
+        # When
+        update_booking_used_after_stock_occurrence()
+
+        # Then
+        mocked_add_offer_id.assert_called_once()
+        assert mocked_add_offer_id.call_args[1]["offer_id"] == stock.offerId
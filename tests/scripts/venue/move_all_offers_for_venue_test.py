@@ -28,4 +28,5 @@ class MoveAllOffersFromVenueToOtherVenueTest:
         db.session.refresh(destination_venue)
         assert set(destination_venue.offers) == set(offers)
         for o in offers:
+            mocked_redis.delete_offer_response.assert_any_call(client=app.redis_client, offer_id=o.id)
             mocked_redis.add_offer_id.assert_any_call(client=app.redis_client, offer_id=o.id)
@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+import pytest
+
+import pcapi.core.bookings.factories as bookings_factories
+import pcapi.core.users.factories as users_factories
+from pcapi.models import WalletLedger
+from pcapi.models.db import db
+from pcapi.scripts.wallet_ledger.verify import WalletLedgerDiscrepancy
+from pcapi.scripts.wallet_ledger.verify import find_wallet_ledger_discrepancies
+from pcapi.scripts.wallet_ledger.verify import verify_wallet_ledger
+
+
+class FindWalletLedgerDiscrepanciesTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_should_return_nothing_when_ledgers_match_bookings(self):
+        # Given
+        bookings_factories.BookingFactory(amount=10, quantity=2)
+        bookings_factories.BookingFactory(amount=20, isUsed=True)
+        bookings_factories.BookingFactory(amount=30, isCancelled=True)
+
+        # When
+        discrepancies = find_wallet_ledger_discrepancies()
+
+        # Then
+        assert discrepancies == []
+
+    @pytest.mark.usefixtures("db_session")
+    def test_should_return_ledgers_that_differ_from_bookings(self):
+        # Given
+        booking = bookings_factories.BookingFactory(amount=10, isUsed=True)
+        user_without_booking = users_factories.UserFactory()
+        db.session.add(WalletLedger(userId=user_without_booking.id, bookedAmount=5, usedAmount=0))
+        WalletLedger.query.filter_by(userId=booking.userId).update({"usedAmount": 0})
+
+        # When
+        discrepancies = find_wallet_ledger_discrepancies()
+
+        # Then
+        assert discrepancies == [
+            WalletLedgerDiscrepancy(booking.userId, Decimal(10), Decimal(10), Decimal(10), Decimal(0)),
+            WalletLedgerDiscrepancy(user_without_booking.id, Decimal(0), Decimal(5), Decimal(0), Decimal(0)),
+        ]
+
+
+class VerifyWalletLedgerTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_should_not_fix_ledgers_by_default(self):
+        # Given
+        booking = bookings_factories.BookingFactory(amount=10)
+        WalletLedger.query.filter_by(userId=booking.userId).delete()
+
+        # When
+        discrepancies = verify_wallet_ledger()
+
+        # Then
+        assert len(discrepancies) == 1
+        assert WalletLedger.query.filter_by(userId=booking.userId).count() == 0
+
+    @pytest.mark.usefixtures("db_session")
+    def test_should_fix_ledgers_that_differ_from_bookings(self):
+        # Given
+        booking = bookings_factories.BookingFactory(amount=10, isUsed=True)
+        WalletLedger.query.filter_by(userId=booking.userId).delete()
+        user_without_booking = users_factories.UserFactory()
+        db.session.add(WalletLedger(userId=user_without_booking.id, bookedAmount=5, usedAmount=0))
+
+        # When
+        verify_wallet_ledger(fix=True)
+
+        # Then
+        assert find_wallet_ledger_discrepancies() == []
+        ledger = WalletLedger.query.filter_by(userId=booking.userId).one()
+        assert (ledger.bookedAmount, ledger.usedAmount) == (10, 10)
+        assert booking.user.wallet_balance == booking.user.deposit.amount - 10
@@ -0,0 +1,12 @@
+from unittest import mock
+
+from pcapi.workers.send_emails_job import send_emails_job
+
+
+@mock.patch("pcapi.core.mails.send_queued_emails")
+def test_sends_queued_emails(mocked_send_queued_emails):
+    # When
+    send_emails_job()
+
+    # Then
+    mocked_send_queued_emails.assert_called_once_with()